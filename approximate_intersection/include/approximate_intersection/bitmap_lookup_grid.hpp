@@ -0,0 +1,396 @@
+/*
+ * Copyright (C) 2024 LEIDOS.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may not
+ * use this file except in compliance with the License. You may obtain a copy of
+ * the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations under
+ * the License.
+ */
+
+#pragma once
+
+#include <algorithm>
+#include <cmath>
+#include <cstdint>
+#include <cstdlib>
+#include <limits>
+#include <memory>
+#include <vector>
+#include "approximate_intersection/config.hpp"
+
+namespace approximate_intersection
+{
+
+  /**
+   * \brief BitmapLookupGrid provides the same occupancy grid creation and intersection interface as LookupGrid
+   *        but stores the occupancy of each cell as a single bit instead of hashing cell indexes into a set.
+   *        Checking a point then only requires a few arithmetic operations and one memory read.
+   *
+   *        The grid is split into square tiles of config.tile_side_cell_count cells, rounded up to a power of two.
+   *        Only the tiles which contain an occupied cell are allocated, which keeps the memory use low for huge sparse maps.
+   *        If config.tile_side_cell_count is 0 the whole grid is stored as a single dense bitmap.
+   *
+   *        Copying a grid is cheap as the copy shares its tiles with the original. A shared tile is only copied when one of
+   *        the grids modifies it, so an edited copy of a grid only owns the tiles which were actually changed.
+   *
+   *        Points outside of the grid bounds never intersect and are ignored when inserted.
+   *
+   * \tparam PointT The type of 2d point which the grid will be built from. Must have publicly accessible .x and .y members.
+   */
+  template<class PointT>
+  class BitmapLookupGrid
+  {
+  protected:
+    //! Bits of the cells of a tile in row major order
+    using Tile = std::vector<uint64_t>;
+
+    //! Configuration
+    Config config_;
+
+    //! Inverse of the cell side length
+    double cell_side_length_inv_;
+
+    //! Number of cells along the x and y axes
+    size_t cells_x_;
+    size_t cells_y_;
+
+    //! True if the grid is stored as a single dense bitmap
+    bool dense_;
+
+    //! Base 2 logarithm of the number of cells along the side of a tile
+    size_t tile_shift_ = 0;
+
+    //! Number of tiles along the x axis
+    size_t tiles_x_ = 1;
+
+    //! Tiles in row major order. Tiles without occupied cells are null. Tiles may be shared with copies of this grid
+    std::vector<std::shared_ptr<const Tile>> tiles_;
+
+    /**
+     * \brief Returns a tile which can be modified by this grid, allocating it or copying it first if it is shared
+     *
+     * \param index The index of the tile
+     *
+     * \return The tile
+     */
+    Tile& mutable_tile(size_t index) {
+      std::shared_ptr<const Tile>& tile = tiles_[index];
+
+      if (!tile) {
+        size_t tile_cells = dense_ ? cells_x_ * cells_y_ : size_t(1) << (2 * tile_shift_);
+        tile = std::make_shared<const Tile>((tile_cells + 63) / 64, 0);
+      } else if (tile.use_count() > 1) {
+        tile = std::make_shared<const Tile>(*tile);
+      }
+
+      // The tile is owned only by this grid at this point
+      return const_cast<Tile&>(*tile);
+    }
+
+    /**
+     * \brief Returns the tile containing a cell and the index of the bit of the cell in that tile
+     */
+    size_t tile_index(size_t cell_x, size_t cell_y, size_t& bit) const {
+      if (dense_) {
+        bit = cell_y * cells_x_ + cell_x;
+        return 0;
+      }
+
+      size_t mask = (size_t(1) << tile_shift_) - 1;
+      bit = ((cell_y & mask) << tile_shift_) | (cell_x & mask);
+      return (cell_y >> tile_shift_) * tiles_x_ + (cell_x >> tile_shift_);
+    }
+
+    /**
+     * \brief Computes the cell containing a point
+     *
+     * \param point The point
+     * \param[out] cell_x The x index of the cell
+     * \param[out] cell_y The y index of the cell
+     *
+     * \return False if the point is outside of the grid
+     */
+    bool cell_index(const PointT& point, size_t& cell_x, size_t& cell_y) const {
+      double x = (point.x - config_.min_x) * cell_side_length_inv_;
+      double y = (point.y - config_.min_y) * cell_side_length_inv_;
+
+      if (!(x >= 0.0 && y >= 0.0)) { // Also rejects NaN coordinates
+        return false;
+      }
+
+      cell_x = static_cast<size_t>(x);
+      cell_y = static_cast<size_t>(y);
+
+      return cell_x < cells_x_ && cell_y < cells_y_;
+    }
+
+    /**
+     * \brief Marks a cell as occupied. Cells outside of the grid are ignored.
+     *
+     * \param cell_x The x index of the cell
+     * \param cell_y The y index of the cell
+     */
+    void set_cell(int64_t cell_x, int64_t cell_y) {
+      if (cell_x < 0 || cell_y < 0 || static_cast<size_t>(cell_x) >= cells_x_ || static_cast<size_t>(cell_y) >= cells_y_) {
+        return;
+      }
+
+      size_t bit;
+      size_t index = tile_index(cell_x, cell_y, bit);
+      uint64_t mask = uint64_t(1) << (bit & 63);
+
+      // Leave shared tiles alone if the cell is already occupied
+      if (tiles_[index] && ((*tiles_[index])[bit >> 6] & mask)) {
+        return;
+      }
+
+      mutable_tile(index)[bit >> 6] |= mask;
+    }
+
+  public:
+
+    /**
+     * \brief Default constructor
+     *        Note: This constructor is provided for convenience but users should normally use the constructor which takes a Config object.
+     *
+     */
+    BitmapLookupGrid():BitmapLookupGrid(Config()) {};
+
+    /**
+     * \brief Constructor
+     *
+     * \param config The configuration for the grid.
+     */
+    BitmapLookupGrid(Config config):
+      config_(config),
+      cell_side_length_inv_(1.0 / static_cast<double>(config.cell_side_length))
+    {
+      cells_x_ = std::max(1.0, std::ceil((config.max_x - config.min_x) * cell_side_length_inv_));
+      cells_y_ = std::max(1.0, std::ceil((config.max_y - config.min_y) * cell_side_length_inv_));
+
+      dense_ = config.tile_side_cell_count == 0;
+
+      size_t tiles_y = 1;
+      if (!dense_) {
+        while ((size_t(1) << tile_shift_) < config.tile_side_cell_count) {
+          tile_shift_++;
+        }
+        tiles_x_ = ((cells_x_ - 1) >> tile_shift_) + 1;
+        tiles_y = ((cells_y_ - 1) >> tile_shift_) + 1;
+      }
+
+      tiles_.resize(tiles_x_ * tiles_y);
+    }
+
+    /**
+     * \brief Return the current config
+     *
+     * \return the config in use by this object
+     */
+    Config get_config() const {
+      return config_;
+    }
+
+    /**
+     * \brief Checks if a point lies within an occupied cell of the grid
+     *
+     * \param point The point to check for intersection
+     *
+     * \return True if the point lies within an occupied cell, false otherwise
+     */
+    bool intersects(const PointT& point) const {
+      size_t cell_x, cell_y;
+
+      if (!cell_index(point, cell_x, cell_y)) {
+        return false;
+      }
+
+      size_t bit;
+      const std::shared_ptr<const Tile>& tile = tiles_[tile_index(cell_x, cell_y, bit)];
+
+      if (!tile) {
+        return false;
+      }
+
+      return ((*tile)[bit >> 6] >> (bit & 63)) & 1u;
+    }
+
+    /**
+     * \brief Adds a point to the grid.
+     *        The cell which the point lies in is marked as occupied. Points outside of the grid bounds are ignored.
+     *
+     * \param point The point to add to the grid
+     */
+    void insert(const PointT& point) {
+      size_t cell_x, cell_y;
+
+      if (!cell_index(point, cell_x, cell_y)) {
+        return;
+      }
+
+      set_cell(cell_x, cell_y);
+    }
+
+    /**
+     * \brief Marks every cell crossed by a segment as occupied. Parts of the segment outside of the grid bounds are ignored.
+     *
+     * \param start The start point of the segment
+     * \param end The end point of the segment
+     */
+    void insert_segment(const PointT& start, const PointT& end) {
+      // Walk the cells crossed by the segment one cell boundary at a time
+      double x0 = (start.x - config_.min_x) * cell_side_length_inv_;
+      double y0 = (start.y - config_.min_y) * cell_side_length_inv_;
+      double x1 = (end.x - config_.min_x) * cell_side_length_inv_;
+      double y1 = (end.y - config_.min_y) * cell_side_length_inv_;
+
+      int64_t cell_x = std::floor(x0);
+      int64_t cell_y = std::floor(y0);
+      int64_t end_x = std::floor(x1);
+      int64_t end_y = std::floor(y1);
+
+      double dx = x1 - x0;
+      double dy = y1 - y0;
+      int64_t step_x = dx > 0 ? 1 : -1;
+      int64_t step_y = dy > 0 ? 1 : -1;
+
+      // Segment parameter at which the next vertical and horizontal cell boundaries are crossed
+      double t_max_x = dx != 0 ? (step_x > 0 ? cell_x + 1 - x0 : x0 - cell_x) / std::fabs(dx) : std::numeric_limits<double>::infinity();
+      double t_max_y = dy != 0 ? (step_y > 0 ? cell_y + 1 - y0 : y0 - cell_y) / std::fabs(dy) : std::numeric_limits<double>::infinity();
+      double t_delta_x = dx != 0 ? 1.0 / std::fabs(dx) : std::numeric_limits<double>::infinity();
+      double t_delta_y = dy != 0 ? 1.0 / std::fabs(dy) : std::numeric_limits<double>::infinity();
+
+      int64_t steps = std::abs(end_x - cell_x) + std::abs(end_y - cell_y);
+
+      set_cell(cell_x, cell_y);
+      for (int64_t i = 0; i < steps; i++) {
+        if (t_max_x < t_max_y) {
+          cell_x += step_x;
+          t_max_x += t_delta_x;
+        } else {
+          cell_y += step_y;
+          t_max_y += t_delta_y;
+        }
+        set_cell(cell_x, cell_y);
+      }
+    }
+
+    /**
+     * \brief Marks every cell overlapped by a polygon as occupied. Those are the cells crossed by its edges and the cells
+     *        whose center lies inside of it. Parts of the polygon outside of the grid bounds are ignored.
+     *
+     * \param polygon The vertices of the polygon. The polygon is implicitly closed.
+     */
+    void insert_polygon(const std::vector<PointT>& polygon) {
+      if (polygon.empty()) {
+        return;
+      }
+
+      double min_y = std::numeric_limits<double>::max();
+      double max_y = std::numeric_limits<double>::lowest();
+
+      for (size_t i = 0; i < polygon.size(); i++) {
+        insert_segment(polygon[i], polygon[(i + 1) % polygon.size()]);
+        min_y = std::min<double>(min_y, polygon[i].y);
+        max_y = std::max<double>(max_y, polygon[i].y);
+      }
+
+      // Fill the interior one row of cell centers at a time using the even-odd rule
+      int64_t first_row = std::max<double>(0.0, std::ceil((min_y - config_.min_y) * cell_side_length_inv_ - 0.5));
+      int64_t last_row = std::min<double>(cells_y_ - 1.0, std::floor((max_y - config_.min_y) * cell_side_length_inv_ - 0.5));
+
+      std::vector<double> crossings;
+      for (int64_t row = first_row; row <= last_row; row++) {
+        double center_y = config_.min_y + (row + 0.5) * config_.cell_side_length;
+
+        crossings.clear();
+        for (size_t i = 0; i < polygon.size(); i++) {
+          const PointT& a = polygon[i];
+          const PointT& b = polygon[(i + 1) % polygon.size()];
+
+          if ((a.y > center_y) != (b.y > center_y)) {
+            crossings.push_back(a.x + (center_y - a.y) * (b.x - a.x) / (b.y - a.y));
+          }
+        }
+
+        std::sort(crossings.begin(), crossings.end());
+
+        for (size_t i = 0; i + 1 < crossings.size(); i += 2) {
+          int64_t first_col = std::ceil((crossings[i] - config_.min_x) * cell_side_length_inv_ - 0.5);
+          int64_t last_col = std::floor((crossings[i + 1] - config_.min_x) * cell_side_length_inv_ - 0.5);
+
+          for (int64_t col = std::max<int64_t>(0, first_col); col <= last_col && col < static_cast<int64_t>(cells_x_); col++) {
+            set_cell(col, row);
+          }
+        }
+      }
+    }
+
+    /**
+     * \brief Marks every cell overlapping an axis aligned box as unoccupied
+     *
+     * \param min_point The minimum corner of the box
+     * \param max_point The maximum corner of the box
+     */
+    void clear(const PointT& min_point, const PointT& max_point) {
+      int64_t first_col = std::max<double>(0.0, std::floor((min_point.x - config_.min_x) * cell_side_length_inv_));
+      int64_t first_row = std::max<double>(0.0, std::floor((min_point.y - config_.min_y) * cell_side_length_inv_));
+      int64_t last_col = std::min<double>(cells_x_ - 1.0, std::floor((max_point.x - config_.min_x) * cell_side_length_inv_));
+      int64_t last_row = std::min<double>(cells_y_ - 1.0, std::floor((max_point.y - config_.min_y) * cell_side_length_inv_));
+
+      for (int64_t row = first_row; row <= last_row; row++) {
+        for (int64_t col = first_col; col <= last_col; col++) {
+          size_t bit;
+          size_t index = tile_index(col, row, bit);
+          uint64_t mask = uint64_t(1) << (bit & 63);
+
+          // Only tiles with an occupied cell in the box are copied
+          if (tiles_[index] && ((*tiles_[index])[bit >> 6] & mask)) {
+            mutable_tile(index)[bit >> 6] &= ~mask;
+          }
+        }
+      }
+    }
+
+    /**
+     * \brief Returns the number of tiles which contain at least one occupied cell
+     *
+     * \return The number of allocated tiles
+     */
+    size_t allocated_tile_count() const {
+      size_t count = 0;
+      for (const auto& tile : tiles_) {
+        if (tile) {
+          count++;
+        }
+      }
+      return count;
+    }
+
+    /**
+     * \brief Returns the number of allocated tiles which this grid shares with another grid
+     *
+     * \param other The other grid
+     *
+     * \return The number of tiles stored in the same memory by both grids
+     */
+    size_t shared_tile_count(const BitmapLookupGrid& other) const {
+      size_t count = 0;
+      for (size_t i = 0; i < tiles_.size() && i < other.tiles_.size(); i++) {
+        if (tiles_[i] && tiles_[i] == other.tiles_[i]) {
+          count++;
+        }
+      }
+      return count;
+    }
+
+  };
+
+} // approximate_intersection
@@ -43,6 +43,9 @@ namespace approximate_intersection
     //! Cell size length
     size_t cell_side_length = 100;
 
+    //! Number of cells along the side of the tiles of a BitmapLookupGrid. 0 stores the grid as a single dense bitmap
+    size_t tile_side_cell_count = 0;
+
     // Stream operator for this config
     friend std::ostream &operator<<(std::ostream &output, const Config &c)
     {
@@ -52,6 +55,7 @@ namespace approximate_intersection
            << "min_y: " << c.min_y << std::endl
            << "max_y: " << c.max_y << std::endl
            << "cell_side_length: " << c.cell_side_length << std::endl
+           << "tile_side_cell_count: " << c.tile_side_cell_count << std::endl
            << "}" << std::endl;
       return output;
     }
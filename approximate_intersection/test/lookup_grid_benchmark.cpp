@@ -0,0 +1,135 @@
+/*
+ * Copyright (C) 2024 LEIDOS.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may not
+ * use this file except in compliance with the License. You may obtain a copy of
+ * the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations under
+ * the License.
+ */
+
+/**
+ * Benchmark comparing the LookupGrid and BitmapLookupGrid backends.
+ *
+ * A corridor map is approximated by a set of sinusoidal roads sampled every meter. Each backend is built from the road points
+ * and then queried with simulated lidar scans of 120k points around a vehicle driving along the roads.
+ *
+ * Usage: lookup_grid_benchmark [scan_count]
+ */
+
+#include <chrono>
+#include <cmath>
+#include <iostream>
+#include <random>
+#include <string>
+#include <vector>
+
+#include "approximate_intersection/lookup_grid.hpp"
+#include "approximate_intersection/bitmap_lookup_grid.hpp"
+
+namespace
+{
+
+// Lidar points use single precision coordinates
+struct BenchmarkPoint {
+  float x = 0;
+  float y = 0;
+};
+
+constexpr size_t POINTS_PER_SCAN = 120000;
+constexpr double SCAN_RANGE = 100.0;
+constexpr double CORRIDOR_LENGTH = 10000.0;
+constexpr size_t ROAD_COUNT = 8;
+
+std::vector<BenchmarkPoint> roadPoints() {
+  std::vector<BenchmarkPoint> points;
+  for (size_t road = 0; road < ROAD_COUNT; road++) {
+    for (double x = 0; x < CORRIDOR_LENGTH; x += 1.0) {
+      points.push_back({static_cast<float>(x), static_cast<float>(road * 500.0 + 50.0 * std::sin(x / 300.0))});
+    }
+  }
+  return points;
+}
+
+std::vector<std::vector<BenchmarkPoint>> scans(size_t scan_count) {
+  std::mt19937 gen(42);
+  std::uniform_real_distribution<double> offset(-SCAN_RANGE, SCAN_RANGE);
+
+  std::vector<std::vector<BenchmarkPoint>> result(scan_count);
+  for (size_t i = 0; i < scan_count; i++) {
+    double vehicle_x = CORRIDOR_LENGTH * i / scan_count;
+    double vehicle_y = 50.0 * std::sin(vehicle_x / 300.0);
+
+    result[i].reserve(POINTS_PER_SCAN);
+    for (size_t j = 0; j < POINTS_PER_SCAN; j++) {
+      result[i].push_back({static_cast<float>(vehicle_x + offset(gen)), static_cast<float>(vehicle_y + offset(gen))});
+    }
+  }
+  return result;
+}
+
+template<class GridT>
+void run(const std::string& name, const approximate_intersection::Config& config,
+         const std::vector<BenchmarkPoint>& road_points, const std::vector<std::vector<BenchmarkPoint>>& scan_points) {
+
+  auto build_start = std::chrono::steady_clock::now();
+
+  GridT grid(config);
+  for (const auto& p : road_points) {
+    grid.insert(p);
+  }
+
+  auto query_start = std::chrono::steady_clock::now();
+
+  size_t kept = 0;
+  for (const auto& scan : scan_points) {
+    for (const auto& p : scan) {
+      kept += grid.intersects(p);
+    }
+  }
+
+  auto end = std::chrono::steady_clock::now();
+
+  double build_ms = std::chrono::duration<double, std::milli>(query_start - build_start).count();
+  double query_ms = std::chrono::duration<double, std::milli>(end - query_start).count();
+
+  std::cout << name << ": build " << build_ms << " ms, "
+            << query_ms / scan_points.size() << " ms per scan, "
+            << query_ms * 1.0e6 / (scan_points.size() * POINTS_PER_SCAN) << " ns per point, "
+            << kept << " points kept" << std::endl;
+}
+
+} // namespace
+
+int main(int argc, char ** argv)
+{
+  size_t scan_count = argc > 1 ? std::stoul(argv[1]) : 50;
+
+  approximate_intersection::Config config;
+  config.min_x = -SCAN_RANGE;
+  config.max_x = CORRIDOR_LENGTH + SCAN_RANGE;
+  config.min_y = -SCAN_RANGE;
+  config.max_y = ROAD_COUNT * 500.0 + SCAN_RANGE;
+  config.cell_side_length = 3;
+
+  auto road_points = roadPoints();
+  auto scan_points = scans(scan_count);
+
+  std::cout << "Grid " << config << "Scans: " << scan_count << " of " << POINTS_PER_SCAN << " points" << std::endl;
+
+  run<approximate_intersection::LookupGrid<BenchmarkPoint>>("LookupGrid", config, road_points, scan_points);
+
+  config.tile_side_cell_count = 0;
+  run<approximate_intersection::BitmapLookupGrid<BenchmarkPoint>>("BitmapLookupGrid (dense)", config, road_points, scan_points);
+
+  config.tile_side_cell_count = 64;
+  run<approximate_intersection::BitmapLookupGrid<BenchmarkPoint>>("BitmapLookupGrid (64 cell tiles)", config, road_points, scan_points);
+
+  return 0;
+}
@@ -19,8 +19,10 @@
 #include <chrono>
 #include <thread>
 #include <future>
+#include <cmath>
 
 #include "approximate_intersection/lookup_grid.hpp"
+#include "approximate_intersection/bitmap_lookup_grid.hpp"
 
 namespace approximate_intersection {
 
@@ -75,6 +77,159 @@ TEST(approximate_intersection, test){
 
 }
 
+TEST(approximate_intersection, bitmap_grid){
+
+    for (size_t tile_side_cell_count : {0, 1, 3, 64}) {
+
+        Config config;
+        config.min_x = -10;
+        config.max_x = 10;
+        config.min_y = -10;
+        config.max_y = 10;
+        config.cell_side_length = 1;
+        config.tile_side_cell_count = tile_side_cell_count;
+
+        LookupGrid<TestPoint> hash_grid(config);
+        BitmapLookupGrid<TestPoint> grid(config);
+
+        // Add some points on the diagonal and on one row
+        for (double i = -9.5; i < 10; i += 1.0) {
+            hash_grid.insert({i, i});
+            grid.insert({i, i});
+        }
+        for (double i = -9.5; i < 0; i += 1.0) {
+            hash_grid.insert({i, 3.2});
+            grid.insert({i, 3.2});
+        }
+
+        // Verify the bitmap grid matches the hash grid
+        for (double i = -9.75; i < 10; i += 0.5) {
+            for (double j = -9.75; j < 10; j += 0.5) {
+                ASSERT_EQ(hash_grid.intersects({i, j}), grid.intersects({i, j})) << "Mismatch at " << i << ", " << j << " tile side " << tile_side_cell_count;
+            }
+        }
+
+        if (tile_side_cell_count == 0 || tile_side_cell_count == 64) {
+            ASSERT_EQ(1u, grid.allocated_tile_count());
+        }
+    }
+
+    // Points outside of the grid never intersect and are not added
+    Config config;
+    config.min_x = 0;
+    config.max_x = 10;
+    config.min_y = 0;
+    config.max_y = 10;
+    config.cell_side_length = 1;
+    config.tile_side_cell_count = 4;
+
+    BitmapLookupGrid<TestPoint> grid(config);
+    grid.insert({-0.5, 0.5});
+    grid.insert({10.5, 0.5});
+    grid.insert({0.5, 10.5});
+    grid.insert({std::nan(""), 0.5});
+
+    ASSERT_EQ(0u, grid.allocated_tile_count());
+    ASSERT_FALSE(grid.intersects({-0.5, 0.5}));
+    ASSERT_FALSE(grid.intersects({std::nan(""), 0.5}));
+
+    // Only the tiles of the occupied cells are allocated
+    grid.insert({0.5, 0.5});
+    grid.insert({9.5, 9.5});
+
+    ASSERT_EQ(2u, grid.allocated_tile_count());
+    ASSERT_TRUE(grid.intersects({0.5, 0.5}));
+    ASSERT_TRUE(grid.intersects({9.5, 9.5}));
+    ASSERT_FALSE(grid.intersects({5.5, 5.5}));
+}
+
+TEST(approximate_intersection, bitmap_grid_polygon){
+
+    for (size_t tile_side_cell_count : {0, 4}) {
+
+        Config config;
+        config.min_x = 0;
+        config.max_x = 20;
+        config.min_y = 0;
+        config.max_y = 10;
+        config.cell_side_length = 1;
+        config.tile_side_cell_count = tile_side_cell_count;
+
+        BitmapLookupGrid<TestPoint> grid(config);
+
+        // Rectangle whose vertices are far apart compared to the cells
+        grid.insert_polygon({{2.2, 2.2}, {12.7, 2.2}, {12.7, 6.6}, {2.2, 6.6}});
+
+        for (double x = 0.5; x < 20; x += 1.0) {
+            for (double y = 0.5; y < 10; y += 1.0) {
+                bool inside = 2 <= x && x <= 13 && 2 <= y && y <= 7;
+                ASSERT_EQ(inside, grid.intersects({x, y})) << "Mismatch at " << x << ", " << y;
+            }
+        }
+
+        // Clearing a box only clears the cells overlapping it
+        grid.clear({5, 3}, {7.5, 4.5});
+
+        ASSERT_FALSE(grid.intersects({5.5, 3.5}));
+        ASSERT_FALSE(grid.intersects({7.5, 4.5}));
+        ASSERT_TRUE(grid.intersects({4.5, 3.5}));
+        ASSERT_TRUE(grid.intersects({8.5, 3.5}));
+        ASSERT_TRUE(grid.intersects({5.5, 5.5}));
+
+        // Every cell crossed by a segment is occupied, including the ones it only clips
+        grid.insert_segment({0.5, 9.5}, {19.5, 8.5});
+
+        ASSERT_TRUE(grid.intersects({0.5, 9.5}));
+        ASSERT_TRUE(grid.intersects({9.5, 9.5}));
+        ASSERT_TRUE(grid.intersects({10.5, 8.5}));
+        ASSERT_FALSE(grid.intersects({11.5, 9.5}));
+        ASSERT_TRUE(grid.intersects({19.5, 8.5}));
+        ASSERT_FALSE(grid.intersects({19.5, 9.5}));
+        ASSERT_FALSE(grid.intersects({0.5, 8.5}));
+    }
+}
+
+TEST(approximate_intersection, bitmap_grid_copy_on_write){
+
+    Config config;
+    config.min_x = 0;
+    config.max_x = 16;
+    config.min_y = 0;
+    config.max_y = 16;
+    config.cell_side_length = 1;
+    config.tile_side_cell_count = 4;
+
+    BitmapLookupGrid<TestPoint> grid(config);
+    grid.insert_polygon({{0.2, 0.2}, {15.8, 0.2}, {15.8, 15.8}, {0.2, 15.8}});
+
+    ASSERT_EQ(16u, grid.allocated_tile_count());
+
+    // A copy shares every tile with the original
+    BitmapLookupGrid<TestPoint> copy(grid);
+    ASSERT_EQ(16u, copy.shared_tile_count(grid));
+
+    // Clearing cells of the copy only copies the tiles containing them
+    copy.clear({1, 1}, {2.5, 2.5});
+    ASSERT_EQ(15u, copy.shared_tile_count(grid));
+    ASSERT_FALSE(copy.intersects({1.5, 1.5}));
+    ASSERT_TRUE(grid.intersects({1.5, 1.5}));
+
+    // Inserting already occupied cells does not copy the tiles
+    copy.insert({9.5, 9.5});
+    ASSERT_EQ(15u, copy.shared_tile_count(grid));
+
+    copy.insert_polygon({{1.2, 1.2}, {1.8, 1.2}, {1.8, 1.8}, {1.2, 1.8}});
+    ASSERT_TRUE(copy.intersects({1.5, 1.5}));
+    ASSERT_FALSE(copy.intersects({2.5, 2.5}));
+    ASSERT_EQ(15u, copy.shared_tile_count(grid));
+
+    // Modifying the original afterwards does not change the copy
+    grid.clear({8, 8}, {9, 9});
+    ASSERT_EQ(14u, copy.shared_tile_count(grid));
+    ASSERT_FALSE(grid.intersects({8.5, 8.5}));
+    ASSERT_TRUE(copy.intersects({8.5, 8.5}));
+}
+
 } // approximate_intersection
 
 int main(int argc, char ** argv)
@@ -52,6 +52,13 @@ namespace arbitrator
              * \return The sorted list of up to size beam_width
              */
             std::vector<std::pair<carma_planning_msgs::msg::ManeuverPlan, double>> prioritize_plans(std::vector<std::pair<carma_planning_msgs::msg::ManeuverPlan, double>> plans) const;
+
+            /**
+             * \brief Prioritize the plans and eliminate those outside the beam width, without copying the plans
+             * \param plans The plans to evaluate as (plan, cost) pairs
+             * \return The sorted list of up to size beam_width
+             */
+            std::vector<std::pair<PlanPtr, double>> prioritize_plan_ptrs(std::vector<std::pair<PlanPtr, double>> plans) const override;
         private:
             int beam_width_;
     };
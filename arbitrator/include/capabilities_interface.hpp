@@ -22,10 +22,14 @@
 #include <vector>
 #include <map>
 #include <unordered_set>
+#include <mutex>
 #include <string>
 #include <carma_planning_msgs/srv/plugin_list.hpp>
 #include <carma_planning_msgs/srv/get_plugin_api.hpp>
 #include <carma_planning_msgs/srv/plan_maneuvers.hpp>
+#include <carma_planning_msgs/msg/plugin.hpp>
+#include "plugin_call_tracker.hpp"
+#include "plugin_registry.hpp"
 
 
 
@@ -42,8 +46,18 @@ namespace arbitrator
              * \brief Constructor for Capabilities interface
              * \param nh A CarmaLifecycleNode pointer this interface will work with
              */
-            CapabilitiesInterface(std::shared_ptr<carma_ros2_utils::CarmaLifecycleNode> nh): nh_(nh) {
+            CapabilitiesInterface(std::shared_ptr<carma_ros2_utils::CarmaLifecycleNode> nh)
+                : nh_(nh), call_tracker_(PLUGIN_INITIAL_BACKOFF, PLUGIN_MAX_BACKOFF, PLUGIN_TIMEOUTS_BEFORE_BACKOFF), plugin_registry_(PLAN_MANEUVERS_SUFFIX) {
                 sc_s_ = nh_->create_client<carma_planning_msgs::srv::GetPluginApi>("plugins/get_strategic_plugins_by_capability");
+
+                // Keep the strategic plugin registry up to date outside of the planning loop
+                plugin_discovery_sub_ = nh_->create_subscription<carma_planning_msgs::msg::Plugin>("plugin_discovery", 50,
+                    std::bind(&CapabilitiesInterface::plugin_discovery_cb, this, std::placeholders::_1));
+
+                registry_resync_timer_ = nh_->create_timer(nh_->get_clock(), PLUGIN_REGISTRY_RESYNC_PERIOD,
+                    std::bind(&CapabilitiesInterface::request_registry_resync, this));
+
+                request_registry_resync();
             };
 
             /**
@@ -56,17 +70,40 @@ namespace arbitrator
              * \brief Get the list of topics that respond to the capability specified by
              *      the query string
              *
+             *      Strategic plugin topics are served from the local plugin registry. The plugin
+             *      manager is only queried while the registry has never been populated.
+             *
              * \param query_string The string name of the capability to look for
              * \return A list of all responding topics, if any are found.
              */
             std::vector<std::string> get_topics_for_capability(const std::string& query_string);
 
+            /**
+             * \brief Callback for plugin discovery messages. Adds newly discovered active strategic plugins to the registry and removes the deactivated ones
+             *
+             * \param msg The plugin status message
+             */
+            void plugin_discovery_cb(carma_planning_msgs::msg::Plugin::UniquePtr msg);
+
+            /**
+             * \brief Asynchronously requests the strategic plugin topics from the plugin manager
+             *      and replaces the registry content with the response
+             */
+            void request_registry_resync();
+
 
             /**
              * \brief Template function for calling all nodes which respond to a service associated
              *      with a particular capability. Will send the service request to all nodes and
              *      aggregate the responses.
              *
+             *      The requests are sent to all the nodes at once and their responses are collected
+             *      against a single shared deadline, so the call takes as long as the slowest node
+             *      rather than the sum of all of them. Nodes which keep failing to respond are
+             *      skipped with an exponential back-off.
+             *
+             *      This method may be called concurrently from several threads.
+             *
              * \tparam MSrvReq The typename of the service message request
              * \tparam MSrvRes The typename of the service message response
              *
@@ -78,11 +115,41 @@ namespace arbitrator
             std::map<std::string, std::shared_ptr<MSrvRes>> multiplex_service_call_for_capability(const std::string& query_string, std::shared_ptr<MSrvReq> msg);
 
 
+            /**
+             * \brief Returns the latency histograms, failure counts and back-off state of every plugin
+             *      called so far, keyed by service topic
+             */
+            std::map<std::string, PluginCallStats> get_plugin_call_stats() const;
+
+
             const static std::string STRATEGIC_PLAN_CAPABILITY;
+
+            //! Time allowed for all the plugins of a capability to respond to a request
+            const static std::chrono::milliseconds PLUGIN_CALL_TIMEOUT;
+
+            //! Period a plugin is first skipped for once it keeps failing to respond
+            const static std::chrono::milliseconds PLUGIN_INITIAL_BACKOFF;
+
+            //! Maximum period a plugin can be skipped for
+            const static std::chrono::milliseconds PLUGIN_MAX_BACKOFF;
+
+            //! Number of consecutive failures after which a plugin starts being skipped
+            const static uint64_t PLUGIN_TIMEOUTS_BEFORE_BACKOFF;
+
+            //! Period of the resyncs of the plugin registry with the plugin manager, backing up the discovery messages
+            const static std::chrono::milliseconds PLUGIN_REGISTRY_RESYNC_PERIOD;
+
+            //! Suffix appended by the plugin manager to strategic plugin names to get their plan maneuvers service topic
+            const static std::string PLAN_MANEUVERS_SUFFIX;
         protected:
         private:
             std::shared_ptr<carma_ros2_utils::CarmaLifecycleNode> nh_;
+            PluginCallTracker call_tracker_;
+            PluginRegistry plugin_registry_;
+            carma_ros2_utils::SubPtr<carma_planning_msgs::msg::Plugin> plugin_discovery_sub_;
+            rclcpp::TimerBase::SharedPtr registry_resync_timer_;
             std::unordered_map<std::string,carma_ros2_utils::ClientPtr<carma_planning_msgs::srv::PlanManeuvers>> registered_strategic_plugins_;
+            std::mutex registered_strategic_plugins_mutex_;
 
             carma_ros2_utils::ClientPtr<carma_planning_msgs::srv::GetPluginApi> sc_s_;
             std::unordered_set <std::string> capabilities_ ;
@@ -23,6 +23,7 @@
 #include <functional>
 #include <carma_planning_msgs/srv/plan_maneuvers.hpp>
 #include <rclcpp/exceptions/exceptions.hpp>
+#include <algorithm>
 #include <chrono>
 #include <thread>
 namespace arbitrator
@@ -61,51 +62,90 @@ namespace arbitrator
             return responses;
         }
 
-        std::vector<std::string> topics_to_retry = detected_topics;
+        using PlanManeuversClient = rclcpp::Client<carma_planning_msgs::srv::PlanManeuvers>;
+
+        // A call sent to a plugin whose response is pending
+        struct PendingCall
+        {
+            std::string topic;
+            typename PlanManeuversClient::SharedFuture response;
+            std::chrono::steady_clock::time_point send_time;
+        };
+
+        auto get_client = [this](const std::string& topic)
+        {
+            std::lock_guard<std::mutex> lock(registered_strategic_plugins_mutex_);
+
+            if (registered_strategic_plugins_.count(topic) == 0)
+                registered_strategic_plugins_[topic] = nh_->create_client<carma_planning_msgs::srv::PlanManeuvers>(topic);
+
+            return registered_strategic_plugins_[topic];
+        };
+
+        std::vector<std::string> topics_to_retry;
+        for (const auto & topic : detected_topics)
+        {
+            if (call_tracker_.is_backed_off(topic, std::chrono::steady_clock::now()))
+            {
+                RCLCPP_DEBUG_STREAM(rclcpp::get_logger("arbitrator"), "Skipping backed off client: " << topic);
+                continue;
+            }
+            topics_to_retry.push_back(topic);
+        }
+
         std::vector<std::string> current_topics_to_check;
         retry_attempt = 0;
         while (!topics_to_retry.empty() && retry_attempt < MAX_RETRY_ATTEMPTS)
         {
             current_topics_to_check = topics_to_retry;
             topics_to_retry.clear();
+
+            // All the calls of this attempt share one deadline
+            const auto deadline = std::chrono::steady_clock::now() + PLUGIN_CALL_TIMEOUT;
+
+            std::vector<PendingCall> pending_calls;
+            std::vector<std::string> unavailable_topics;
+
+            // Send the request to every available plugin before waiting on any of them
             for (const auto & topic : current_topics_to_check)
             {
                 try {
-                    using std::literals::chrono_literals::operator""ms;
-
-                    if (registered_strategic_plugins_.count(topic) == 0)
-                        registered_strategic_plugins_[topic] = nh_->create_client<carma_planning_msgs::srv::PlanManeuvers>(topic);
+                    auto client = get_client(topic);
 
-                    auto client = registered_strategic_plugins_[topic];
-
-                    if (client->wait_for_service(500ms))
+                    if (client->service_is_ready())
+                    {
                         RCLCPP_DEBUG_STREAM(rclcpp::get_logger("arbitrator"), "found client: " << topic);
+                        pending_calls.push_back({topic, client->async_send_request(msg), std::chrono::steady_clock::now()});
+                    }
                     else
                     {
-                        topics_to_retry.push_back(topic);
-                        RCLCPP_WARN_STREAM(rclcpp::get_logger("arbitrator"), "Following client timed out: " << topic << ", retrying, attempt no: " << retry_attempt);
-                        continue;
+                        unavailable_topics.push_back(topic);
                     }
 
-                    auto response = client->async_send_request(msg);
-
-                    switch (const auto status{response.wait_for(500ms)}) {
-                        case std::future_status::ready:
-                            responses.emplace(topic, response.get());
-                            break;
-                        case std::future_status::deferred:
-                            RCLCPP_WARN_STREAM(rclcpp::get_logger("arbitrator"), "service call to " << topic << " is deferred... Please check if the plugin is active");
-                            break;
-                        case std::future_status::timeout:
-                            RCLCPP_WARN_STREAM(rclcpp::get_logger("arbitrator"), "service call to " << topic << " is timed out... Please check if the plugin is active");
-                            break;
-                        default:
-                            RCLCPP_WARN_STREAM(rclcpp::get_logger("arbitrator"), "service call to " << topic << " is failed... Please check if the plugin is active");
-                            break;
+                } catch(const rclcpp::exceptions::RCLError& error) {
+                    RCLCPP_WARN_STREAM(rclcpp::get_logger("arbitrator"),
+                        "Cannot make service request for service '" << topic << "': " << error.what() <<". So retrying, attempt no: " << retry_attempt);
+                    topics_to_retry.push_back(topic);
+                }
+            }
+
+            // Plugins whose service is not available yet may still come up before the deadline
+            for (const auto & topic : unavailable_topics)
+            {
+                try {
+                    auto client = get_client(topic);
+
+                    auto remaining = std::max(std::chrono::steady_clock::duration::zero(), deadline - std::chrono::steady_clock::now());
+
+                    if (client->wait_for_service(remaining))
+                    {
+                        RCLCPP_DEBUG_STREAM(rclcpp::get_logger("arbitrator"), "found client: " << topic);
+                        pending_calls.push_back({topic, client->async_send_request(msg), std::chrono::steady_clock::now()});
                     }
-                    if (retry_attempt > 0)
+                    else
                     {
-                        RCLCPP_INFO_STREAM(rclcpp::get_logger("arbitrator"),"Service call to: " << topic << ", successfully finished after retrying: " << retry_attempt);
+                        topics_to_retry.push_back(topic);
+                        RCLCPP_WARN_STREAM(rclcpp::get_logger("arbitrator"), "Following client timed out: " << topic << ", retrying, attempt no: " << retry_attempt);
                     }
 
                 } catch(const rclcpp::exceptions::RCLError& error) {
@@ -114,9 +154,55 @@ namespace arbitrator
                     topics_to_retry.push_back(topic);
                 }
             }
+
+            // Collect the responses which arrive before the deadline
+            for (auto & call : pending_calls)
+            {
+                switch (const auto status{call.response.wait_until(deadline)}) {
+                    case std::future_status::ready:
+                    {
+                        auto latency = std::chrono::steady_clock::now() - call.send_time;
+                        call_tracker_.record_success(call.topic, latency);
+                        responses.emplace(call.topic, call.response.get());
+                        RCLCPP_DEBUG_STREAM(rclcpp::get_logger("arbitrator"), "service call to " << call.topic << " took "
+                            << std::chrono::duration_cast<std::chrono::microseconds>(latency).count() / 1000.0 << " ms");
+                        if (retry_attempt > 0)
+                        {
+                            RCLCPP_INFO_STREAM(rclcpp::get_logger("arbitrator"),"Service call to: " << call.topic << ", successfully finished after retrying: " << retry_attempt);
+                        }
+                        break;
+                    }
+                    case std::future_status::deferred:
+                        RCLCPP_WARN_STREAM(rclcpp::get_logger("arbitrator"), "service call to " << call.topic << " is deferred... Please check if the plugin is active");
+                        break;
+                    case std::future_status::timeout:
+                    {
+                        RCLCPP_WARN_STREAM(rclcpp::get_logger("arbitrator"), "service call to " << call.topic << " is timed out... Please check if the plugin is active");
+                        auto backoff = call_tracker_.record_timeout(call.topic, std::chrono::steady_clock::now());
+                        if (backoff.count() > 0)
+                        {
+                            RCLCPP_WARN_STREAM(rclcpp::get_logger("arbitrator"), "service " << call.topic << " keeps timing out, skipping it for " << backoff.count() << " ms");
+                        }
+                        break;
+                    }
+                    default:
+                        RCLCPP_WARN_STREAM(rclcpp::get_logger("arbitrator"), "service call to " << call.topic << " is failed... Please check if the plugin is active");
+                        break;
+                }
+            }
             retry_attempt ++;
         }
 
+        // Plugins which could not be reached at all count as timed out for the back-off
+        for (const auto & topic : topics_to_retry)
+        {
+            auto backoff = call_tracker_.record_timeout(topic, std::chrono::steady_clock::now());
+            if (backoff.count() > 0)
+            {
+                RCLCPP_WARN_STREAM(rclcpp::get_logger("arbitrator"), "service " << topic << " keeps being unavailable, skipping it for " << backoff.count() << " ms");
+            }
+        }
+
         if (retry_attempt >= MAX_RETRY_ATTEMPTS)
         {
             RCLCPP_WARN_STREAM(rclcpp::get_logger("arbitrator"),
@@ -0,0 +1,134 @@
+/*
+ * Copyright (C) 2024 LEIDOS.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may not
+ * use this file except in compliance with the License. You may obtain a copy of
+ * the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations under
+ * the License.
+ */
+
+#ifndef __ARBITRATOR_INCLUDE_PLUGIN_CALL_TRACKER_HPP__
+#define __ARBITRATOR_INCLUDE_PLUGIN_CALL_TRACKER_HPP__
+
+#include <array>
+#include <chrono>
+#include <cstdint>
+#include <map>
+#include <mutex>
+#include <string>
+
+namespace arbitrator
+{
+    /**
+     * \brief Histogram of service call latencies with fixed bucket bounds
+     */
+    struct LatencyHistogram
+    {
+        //! Number of buckets with an upper bound
+        static constexpr size_t BOUNDED_BUCKET_COUNT = 7;
+
+        //! Inclusive upper bounds of the buckets. Latencies above the last bound fall in a final overflow bucket
+        static const std::array<std::chrono::milliseconds, BOUNDED_BUCKET_COUNT> BUCKET_UPPER_BOUNDS;
+
+        //! Number of latencies recorded in each bucket, the last one being the overflow bucket
+        std::array<uint64_t, BOUNDED_BUCKET_COUNT + 1> counts = {};
+
+        /**
+         * \brief Adds a latency to the histogram
+         *
+         * \param latency The latency to add
+         */
+        void record(std::chrono::nanoseconds latency);
+    };
+
+    /**
+     * \brief Statistics of the service calls made to a single plugin
+     */
+    struct PluginCallStats
+    {
+        //! Latencies of the calls which received a response
+        LatencyHistogram latencies;
+
+        //! Number of calls which received a response
+        uint64_t success_count = 0;
+
+        //! Number of calls which failed to receive a response in time
+        uint64_t timeout_count = 0;
+
+        //! Number of calls which failed to receive a response in time since the last response
+        uint64_t consecutive_timeouts = 0;
+
+        //! Time until which the plugin is skipped
+        std::chrono::steady_clock::time_point backoff_until;
+    };
+
+    /**
+     * \brief Tracks the latency of the service calls made to plugins and applies an exponential back-off
+     *        to plugins which keep failing to respond, so a stalled plugin does not cost a timeout on every planning cycle.
+     *
+     *        After timeouts_before_backoff consecutive timeouts a plugin is skipped for initial_backoff, and every
+     *        further timeout doubles that period up to max_backoff. A single response clears the back-off.
+     *
+     *        All methods are thread safe.
+     */
+    class PluginCallTracker
+    {
+        public:
+            /**
+             * \brief Constructor
+             *
+             * \param initial_backoff The period a plugin is first skipped for
+             * \param max_backoff The maximum period a plugin can be skipped for
+             * \param timeouts_before_backoff The number of consecutive timeouts after which a plugin starts being skipped
+             */
+            PluginCallTracker(std::chrono::milliseconds initial_backoff, std::chrono::milliseconds max_backoff, uint64_t timeouts_before_backoff);
+
+            /**
+             * \brief Returns true if calls to the plugin should currently be skipped
+             *
+             * \param topic The service topic of the plugin
+             * \param now The current time
+             */
+            bool is_backed_off(const std::string& topic, std::chrono::steady_clock::time_point now) const;
+
+            /**
+             * \brief Records a response from a plugin
+             *
+             * \param topic The service topic of the plugin
+             * \param latency The time between the request and the response
+             */
+            void record_success(const std::string& topic, std::chrono::nanoseconds latency);
+
+            /**
+             * \brief Records a failure of a plugin to respond in time, backing it off if it keeps failing
+             *
+             * \param topic The service topic of the plugin
+             * \param now The current time
+             *
+             * \return The period the plugin is now skipped for, zero if it is not backed off
+             */
+            std::chrono::milliseconds record_timeout(const std::string& topic, std::chrono::steady_clock::time_point now);
+
+            /**
+             * \brief Returns a copy of the statistics of every plugin called so far, keyed by service topic
+             */
+            std::map<std::string, PluginCallStats> get_stats() const;
+
+        private:
+            std::chrono::milliseconds initial_backoff_;
+            std::chrono::milliseconds max_backoff_;
+            uint64_t timeouts_before_backoff_;
+
+            mutable std::mutex mutex_;
+            std::map<std::string, PluginCallStats> stats_;
+    };
+}
+
+#endif
@@ -0,0 +1,75 @@
+/*
+ * Copyright (C) 2024 LEIDOS.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may not
+ * use this file except in compliance with the License. You may obtain a copy of
+ * the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations under
+ * the License.
+ */
+
+#ifndef __ARBITRATOR_INCLUDE_PLUGIN_REGISTRY_HPP__
+#define __ARBITRATOR_INCLUDE_PLUGIN_REGISTRY_HPP__
+
+#include <mutex>
+#include <string>
+#include <vector>
+#include <boost/optional.hpp>
+#include <carma_planning_msgs/msg/plugin.hpp>
+
+namespace arbitrator
+{
+    /**
+     * \brief Thread safe local copy of the plan maneuvers service topics of the active and available strategic plugins known
+     *      to the guidance plugin manager. It is filled from the plugin discovery messages and from periodic resyncs with the plugin manager,
+     *      so plugin topics can be looked up without a service call.
+     */
+    class PluginRegistry
+    {
+        public:
+            /**
+             * \brief Constructor
+             *
+             * \param plan_maneuvers_suffix The suffix appended to a plugin name to get its plan maneuvers service topic
+             */
+            explicit PluginRegistry(const std::string& plan_maneuvers_suffix);
+
+            /**
+             * \brief Updates the service topic of a strategic plugin from its discovery message. The topic is added if the plugin
+             *      is activated and available, and removed otherwise. Discovery messages do not populate the registry on their own,
+             *      only the plugin manager knows the complete list of plugins.
+             *
+             * \param plugin The plugin discovery message
+             *
+             * \return True if the topic was added or removed
+             */
+            bool add_plugin(const carma_planning_msgs::msg::Plugin& plugin);
+
+            /**
+             * \brief Replaces the registered topics with the ones reported by the plugin manager
+             *
+             * \param topics The plan maneuvers service topics of the strategic plugins
+             */
+            void replace_topics(const std::vector<std::string>& topics);
+
+            /**
+             * \brief Returns the registered topics, or boost::none if the registry was never populated
+             */
+            boost::optional<std::vector<std::string>> get_topics() const;
+
+        private:
+            std::string plan_maneuvers_suffix_;
+
+            mutable std::mutex mutex_;
+            std::vector<std::string> topics_;
+            bool populated_ = false;
+    };
+}
+
+#endif
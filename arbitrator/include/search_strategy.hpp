@@ -18,6 +18,8 @@
 #define __ARBITRATOR_INCLUDE_SEARCH_STRATEGY_HPP__
 
 #include <map>
+#include <memory>
+#include <vector>
 #include <carma_planning_msgs/msg/maneuver_plan.hpp>
 
 namespace arbitrator
@@ -44,6 +46,36 @@ namespace arbitrator
              */
             virtual std::vector<std::pair<carma_planning_msgs::msg::ManeuverPlan, double>> prioritize_plans(std::vector<std::pair<carma_planning_msgs::msg::ManeuverPlan, double>> plans) const = 0;
 
+            //! Shared pointer to an immutable plan of the open-set
+            using PlanPtr = std::shared_ptr<const carma_planning_msgs::msg::ManeuverPlan>;
+
+            /**
+             * \brief Sort the list of plans in the open-set by priority, with plans held by shared pointer
+             *
+             * The default implementation copies the plans to call prioritize_plans, implementations
+             * should override it to avoid the copies.
+             *
+             * \param plans The list of (plan, cost) pairs to sort
+             * \return A sorted (and/or reduced) list of (plan, cost) pairs after a
+             *      heuristic may or may not have been applied
+             */
+            virtual std::vector<std::pair<PlanPtr, double>> prioritize_plan_ptrs(std::vector<std::pair<PlanPtr, double>> plans) const
+            {
+                std::vector<std::pair<carma_planning_msgs::msg::ManeuverPlan, double>> plan_values;
+                plan_values.reserve(plans.size());
+                for (const auto& plan : plans)
+                {
+                    plan_values.emplace_back(*plan.first, plan.second);
+                }
+
+                std::vector<std::pair<PlanPtr, double>> prioritized;
+                for (auto& plan : prioritize_plans(std::move(plan_values)))
+                {
+                    prioritized.emplace_back(std::make_shared<const carma_planning_msgs::msg::ManeuverPlan>(std::move(plan.first)), plan.second);
+                }
+                return prioritized;
+            }
+
             /**
              * \brief Virtual destructor provided for memory safety
              */
@@ -17,7 +17,10 @@
 #ifndef __ARBITRATOR_INCLUDE_TREE_PLANNER_HPP__
 #define __ARBITRATOR_INCLUDE_TREE_PLANNER_HPP__
 
+#include <chrono>
 #include <memory>
+#include <string>
+#include <vector>
 #include <carma_planning_msgs/msg/maneuver_plan.hpp>
 #include "planning_strategy.hpp"
 #include "cost_function.hpp"
@@ -54,6 +57,21 @@ namespace arbitrator
                 return "UNKNOWN";
         }
     }
+    /**
+     * \brief Statistics of a single TreePlanner::generate_plan call
+     */
+    struct TreePlannerStats
+    {
+        //! Number of plans expanded through the neighbor generator
+        size_t expansion_count = 0;
+
+        //! Number of plans which were not expanded because an identical plan was already expanded in the same call
+        size_t memoized_count = 0;
+
+        //! Wall time spent on each depth of the search
+        std::vector<std::chrono::nanoseconds> depth_durations;
+    };
+
     /**
      * \brief Implementation of PlanningStrategy using a generic tree search
      *      algorithm
@@ -62,6 +80,10 @@ namespace arbitrator
      * into this class at construction time to allow for fine-tuning of the
      * algorithm and ensure better testability and separation of algorithmic
      * concerns
+     *
+     * The open list is prioritized and pruned by the search strategy at every
+     * depth, and the surviving plans of a depth are expanded concurrently.
+     * Plans with identical maneuvers are only expanded once per call.
      */
     class TreePlanner : public PlanningStrategy
     {
@@ -89,7 +111,25 @@ namespace arbitrator
              * \param start_state The starting state of the vehicle to plan for
              */
             carma_planning_msgs::msg::ManeuverPlan generate_plan(const VehicleState& start_state);
+
+            /**
+             * \brief Returns the statistics of the latest generate_plan call
+             */
+            const TreePlannerStats& get_last_plan_stats() const;
         protected:
+            /**
+             * \brief Computes the key identifying the expansion of a plan for a vehicle state.
+             *      Plans with the same maneuvers expanded from the same state have the same key.
+             *
+             * \param plan The plan to expand
+             * \param state The vehicle state the plan is expanded from
+             *
+             * \return The key
+             */
+            static std::string expansion_key(const carma_planning_msgs::msg::ManeuverPlan& plan, const VehicleState& state);
+
+            TreePlannerStats last_plan_stats_;
+
             std::shared_ptr<CostFunction> cost_function_;
             std::shared_ptr<NeighborGenerator> neighbor_generator_;
             std::shared_ptr<SearchStrategy> search_strategy_;
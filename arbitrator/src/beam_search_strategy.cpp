@@ -18,21 +18,35 @@
 
 namespace arbitrator
 {
-    std::vector<std::pair<carma_planning_msgs::msg::ManeuverPlan, double>> BeamSearchStrategy::prioritize_plans(std::vector<std::pair<carma_planning_msgs::msg::ManeuverPlan, double>> plans) const
+    namespace
     {
-        std::sort(plans.begin(), 
-            plans.end(), 
-            [] (const std::pair<carma_planning_msgs::msg::ManeuverPlan, double>& a, const std::pair<carma_planning_msgs::msg::ManeuverPlan, double>& b) 
+        template <class PlanT>
+        std::vector<std::pair<PlanT, double>> sort_and_truncate(std::vector<std::pair<PlanT, double>> plans, int beam_width)
+        {
+            std::sort(plans.begin(), 
+                plans.end(), 
+                [] (const std::pair<PlanT, double>& a, const std::pair<PlanT, double>& b) 
+                {
+                    return a.second < b.second;
+                }
+            );
+
+            if (plans.size() > beam_width)
             {
-                return a.second < b.second;
+                plans.resize(beam_width);
             }
-        );
-
-        if (plans.size() > beam_width_)
-        {
-            plans.resize(beam_width_);
+            
+            return plans;
         }
-        
-        return plans;
     }
-}
\ No newline at end of file
+
+    std::vector<std::pair<carma_planning_msgs::msg::ManeuverPlan, double>> BeamSearchStrategy::prioritize_plans(std::vector<std::pair<carma_planning_msgs::msg::ManeuverPlan, double>> plans) const
+    {
+        return sort_and_truncate(std::move(plans), beam_width_);
+    }
+
+    std::vector<std::pair<SearchStrategy::PlanPtr, double>> BeamSearchStrategy::prioritize_plan_ptrs(std::vector<std::pair<PlanPtr, double>> plans) const
+    {
+        return sort_and_truncate(std::move(plans), beam_width_);
+    }
+}
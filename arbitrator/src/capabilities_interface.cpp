@@ -22,13 +22,36 @@
 namespace arbitrator
 {
     const std::string CapabilitiesInterface::STRATEGIC_PLAN_CAPABILITY = "strategic_plan/plan_maneuvers";
+    const std::chrono::milliseconds CapabilitiesInterface::PLUGIN_CALL_TIMEOUT(500);
+    const std::chrono::milliseconds CapabilitiesInterface::PLUGIN_INITIAL_BACKOFF(1000);
+    const std::chrono::milliseconds CapabilitiesInterface::PLUGIN_MAX_BACKOFF(16000);
+    const uint64_t CapabilitiesInterface::PLUGIN_TIMEOUTS_BEFORE_BACKOFF = 2;
+    const std::chrono::milliseconds CapabilitiesInterface::PLUGIN_REGISTRY_RESYNC_PERIOD(10000);
+    const std::string CapabilitiesInterface::PLAN_MANEUVERS_SUFFIX = "/plan_maneuvers";
+
+    std::map<std::string, PluginCallStats> CapabilitiesInterface::get_plugin_call_stats() const
+    {
+        return call_tracker_.get_stats();
+    }
 
     std::vector<std::string> CapabilitiesInterface::get_topics_for_capability(const std::string& query_string)
     {
+        if (query_string == STRATEGIC_PLAN_CAPABILITY)
+        {
+            auto registered_topics = plugin_registry_.get_topics();
+            if (registered_topics)
+            {
+                return *registered_topics;
+            }
+
+            RCLCPP_DEBUG_STREAM(nh_->get_logger(), "Strategic plugin registry not populated yet, querying plugin manager");
+        }
+
         std::vector<std::string> topics = {};
 
+        // An empty capability would also return the deactivated and unavailable plugins
         auto srv = std::make_shared<carma_planning_msgs::srv::GetPluginApi::Request>();
-        srv->capability = "";
+        srv->capability = STRATEGIC_PLAN_CAPABILITY;
 
         auto plan_response = sc_s_->async_send_request(srv);
 
@@ -37,6 +60,7 @@ namespace arbitrator
         if (query_string == STRATEGIC_PLAN_CAPABILITY && future_status == std::future_status::ready)
         {
             topics = plan_response.get()->plan_service;
+            plugin_registry_.replace_topics(topics);
 
             // Log the topics
             std::ostringstream stream;
@@ -56,4 +80,39 @@ namespace arbitrator
         return topics;
 
     }
+
+    void CapabilitiesInterface::plugin_discovery_cb(carma_planning_msgs::msg::Plugin::UniquePtr msg)
+    {
+        if (plugin_registry_.add_plugin(*msg))
+        {
+            if (msg->activated && msg->available)
+            {
+                RCLCPP_INFO_STREAM(nh_->get_logger(), "Discovered strategic plugin: " << msg->name);
+            }
+            else
+            {
+                RCLCPP_INFO_STREAM(nh_->get_logger(), "Removed deactivated or unavailable strategic plugin: " << msg->name);
+            }
+        }
+    }
+
+    void CapabilitiesInterface::request_registry_resync()
+    {
+        if (!sc_s_->service_is_ready())
+        {
+            RCLCPP_DEBUG_STREAM(nh_->get_logger(), "Plugin manager not available, skipping strategic plugin registry resync");
+            return;
+        }
+
+        auto srv = std::make_shared<carma_planning_msgs::srv::GetPluginApi::Request>();
+        srv->capability = STRATEGIC_PLAN_CAPABILITY;
+
+        // The response is handled by the executor so no thread blocks on the plugin manager
+        sc_s_->async_send_request(srv,
+            [this](rclcpp::Client<carma_planning_msgs::srv::GetPluginApi>::SharedFuture response)
+            {
+                plugin_registry_.replace_topics(response.get()->plan_service);
+                RCLCPP_DEBUG_STREAM(nh_->get_logger(), "Resynced strategic plugin registry with " << response.get()->plan_service.size() << " plugins");
+            });
+    }
 }
@@ -0,0 +1,82 @@
+/*
+ * Copyright (C) 2024 LEIDOS.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may not
+ * use this file except in compliance with the License. You may obtain a copy of
+ * the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations under
+ * the License.
+ */
+
+#include "plugin_call_tracker.hpp"
+#include <algorithm>
+
+namespace arbitrator
+{
+    using std::literals::chrono_literals::operator""ms;
+
+    const std::array<std::chrono::milliseconds, LatencyHistogram::BOUNDED_BUCKET_COUNT> LatencyHistogram::BUCKET_UPPER_BOUNDS = {10ms, 25ms, 50ms, 100ms, 200ms, 350ms, 500ms};
+
+    void LatencyHistogram::record(std::chrono::nanoseconds latency)
+    {
+        auto bucket = std::lower_bound(BUCKET_UPPER_BOUNDS.begin(), BUCKET_UPPER_BOUNDS.end(), latency);
+        counts[std::distance(BUCKET_UPPER_BOUNDS.begin(), bucket)]++;
+    }
+
+    PluginCallTracker::PluginCallTracker(std::chrono::milliseconds initial_backoff, std::chrono::milliseconds max_backoff, uint64_t timeouts_before_backoff)
+        : initial_backoff_(initial_backoff), max_backoff_(max_backoff), timeouts_before_backoff_(timeouts_before_backoff)
+    {}
+
+    bool PluginCallTracker::is_backed_off(const std::string& topic, std::chrono::steady_clock::time_point now) const
+    {
+        std::lock_guard<std::mutex> lock(mutex_);
+        auto stats = stats_.find(topic);
+        return stats != stats_.end() && now < stats->second.backoff_until;
+    }
+
+    void PluginCallTracker::record_success(const std::string& topic, std::chrono::nanoseconds latency)
+    {
+        std::lock_guard<std::mutex> lock(mutex_);
+        auto& stats = stats_[topic];
+        stats.latencies.record(latency);
+        stats.success_count++;
+        stats.consecutive_timeouts = 0;
+        stats.backoff_until = std::chrono::steady_clock::time_point();
+    }
+
+    std::chrono::milliseconds PluginCallTracker::record_timeout(const std::string& topic, std::chrono::steady_clock::time_point now)
+    {
+        std::lock_guard<std::mutex> lock(mutex_);
+        auto& stats = stats_[topic];
+        stats.timeout_count++;
+        stats.consecutive_timeouts++;
+
+        if (stats.consecutive_timeouts < timeouts_before_backoff_)
+        {
+            return 0ms;
+        }
+
+        // Double the back-off for every timeout past the threshold, stopping once the maximum is reached to avoid overflowing
+        std::chrono::milliseconds backoff = initial_backoff_;
+        for (uint64_t i = timeouts_before_backoff_; i < stats.consecutive_timeouts && backoff < max_backoff_; ++i)
+        {
+            backoff *= 2;
+        }
+        backoff = std::min(backoff, max_backoff_);
+
+        stats.backoff_until = now + backoff;
+        return backoff;
+    }
+
+    std::map<std::string, PluginCallStats> PluginCallTracker::get_stats() const
+    {
+        std::lock_guard<std::mutex> lock(mutex_);
+        return stats_;
+    }
+}
@@ -0,0 +1,78 @@
+/*
+ * Copyright (C) 2024 LEIDOS.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may not
+ * use this file except in compliance with the License. You may obtain a copy of
+ * the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations under
+ * the License.
+ */
+
+#include "plugin_registry.hpp"
+#include <algorithm>
+
+namespace arbitrator
+{
+    PluginRegistry::PluginRegistry(const std::string& plan_maneuvers_suffix)
+        : plan_maneuvers_suffix_(plan_maneuvers_suffix)
+    {}
+
+    bool PluginRegistry::add_plugin(const carma_planning_msgs::msg::Plugin& plugin)
+    {
+        if (plugin.type != carma_planning_msgs::msg::Plugin::STRATEGIC)
+        {
+            return false;
+        }
+
+        std::string topic = plugin.name + plan_maneuvers_suffix_;
+
+        std::lock_guard<std::mutex> lock(mutex_);
+
+        auto it = std::find(topics_.begin(), topics_.end(), topic);
+
+        // Deactivated or unavailable plugins must not be called anymore
+        if (!plugin.activated || !plugin.available)
+        {
+            if (it == topics_.end())
+            {
+                return false;
+            }
+
+            topics_.erase(it);
+            return true;
+        }
+
+        if (it != topics_.end())
+        {
+            return false;
+        }
+
+        topics_.push_back(topic);
+        return true;
+    }
+
+    void PluginRegistry::replace_topics(const std::vector<std::string>& topics)
+    {
+        std::lock_guard<std::mutex> lock(mutex_);
+        topics_ = topics;
+        populated_ = true;
+    }
+
+    boost::optional<std::vector<std::string>> PluginRegistry::get_topics() const
+    {
+        std::lock_guard<std::mutex> lock(mutex_);
+
+        if (!populated_)
+        {
+            return boost::none;
+        }
+
+        return topics_;
+    }
+}
@@ -19,42 +19,77 @@
 #include <vector>
 #include <map>
 #include <limits>
+#include <future>
+#include <sstream>
+#include <unordered_map>
+#include <unordered_set>
+#include <rclcpp/serialization.hpp>
 
 namespace arbitrator
 {
+    using PlanPtr = SearchStrategy::PlanPtr;
+
+    std::string TreePlanner::expansion_key(const carma_planning_msgs::msg::ManeuverPlan& plan, const VehicleState& state)
+    {
+        std::ostringstream key;
+        key.precision(17);
+        key << state.stamp.nanoseconds() << "," << state.x << "," << state.y << "," << state.downtrack << ","
+            << state.velocity << "," << state.lane_id << ";";
+
+        // The serialized maneuvers identify the plan regardless of its id
+        static const rclcpp::Serialization<carma_planning_msgs::msg::Maneuver> serializer;
+        rclcpp::SerializedMessage serialized;
+
+        for (const auto& mvr : plan.maneuvers)
+        {
+            serializer.serialize_message(&mvr, &serialized);
+            const auto& raw = serialized.get_rcl_serialized_message();
+            key << raw.buffer_length << ":";
+            key.write(reinterpret_cast<const char*>(raw.buffer), raw.buffer_length);
+        }
+
+        return key.str();
+    }
+
+    const TreePlannerStats& TreePlanner::get_last_plan_stats() const
+    {
+        return last_plan_stats_;
+    }
+
     carma_planning_msgs::msg::ManeuverPlan TreePlanner::generate_plan(const VehicleState& start_state)
     {
-        carma_planning_msgs::msg::ManeuverPlan root;
-        std::vector<std::pair<carma_planning_msgs::msg::ManeuverPlan, double>> open_list_to_evaluate;
-        std::vector<std::pair<carma_planning_msgs::msg::ManeuverPlan, double>> final_open_list;
+        last_plan_stats_ = TreePlannerStats();
+
+        auto root = std::make_shared<carma_planning_msgs::msg::ManeuverPlan>();
+        root->maneuver_plan_id = boost::uuids::to_string(boost::uuids::random_generator()());
+
+        std::vector<std::pair<PlanPtr, double>> open_list_to_evaluate;
+        std::vector<std::pair<PlanPtr, double>> final_open_list;
 
         const double INF = std::numeric_limits<double>::infinity();
         open_list_to_evaluate.push_back(std::make_pair(root, INF));
 
-        carma_planning_msgs::msg::ManeuverPlan longest_plan = root; // Track longest plan in case target length is never reached
+        PlanPtr longest_plan = root; // Track longest plan in case target length is never reached
         rclcpp::Duration longest_plan_duration = rclcpp::Duration::from_nanoseconds(0);
 
+        // Keys of the plans expanded so far in this call, the vehicle state being the same for all of them
+        std::unordered_set<std::string> expanded_keys;
 
         while (!open_list_to_evaluate.empty())
         {
-            std::vector<std::pair<carma_planning_msgs::msg::ManeuverPlan, double>> temp_open_list;
+            auto depth_start_time = std::chrono::steady_clock::now();
 
-            for (auto it = open_list_to_evaluate.begin(); it != open_list_to_evaluate.end(); it++)
-            {
-                // Pop the first element off the open list
-                auto& cur_plan = it->first;
+            // Plans to expand at this depth along with the asynchronous expansion of each
+            std::vector<std::pair<PlanPtr, std::future<std::vector<carma_planning_msgs::msg::ManeuverPlan>>>> expansions;
 
-                if (cur_plan.maneuver_plan_id == "")
-                {
-                    // Generate a new unique id for the maneuver plan
-                    cur_plan.maneuver_plan_id =
-                        boost::uuids::to_string(boost::uuids::random_generator()());
-                }
+            for (const auto& node : open_list_to_evaluate)
+            {
+                const auto& cur_plan = *node.first;
 
                 RCLCPP_DEBUG_STREAM(rclcpp::get_logger("arbitrator"),
                     "Start printing newly requested maneuver plan for debugging:");
 
-                for (auto mvr : cur_plan.maneuvers)
+                for (const auto& mvr : cur_plan.maneuvers)
                 {
                     RCLCPP_DEBUG_STREAM(rclcpp::get_logger("arbitrator"),
                         "Maneuver: "<< maneuver_type_to_string(mvr.type));
@@ -76,15 +111,15 @@ namespace arbitrator
                 if (plan_duration > longest_plan_duration)
                 {
                     longest_plan_duration = plan_duration;
-                    longest_plan = cur_plan;
+                    longest_plan = node.first;
                 }
 
                 // Evaluate plan_duration is sufficient do not expand more
                 if (plan_duration >= target_plan_duration_)
                 {
-                    final_open_list.push_back((*it));
+                    final_open_list.push_back(node);
                     RCLCPP_DEBUG_STREAM(rclcpp::get_logger("arbitrator"), "Has enough duration, skipping that which has following mvrs..:");
-                    for (auto mvr : it->first.maneuvers)
+                    for (const auto& mvr : cur_plan.maneuvers)
                     {
                         RCLCPP_DEBUG_STREAM(rclcpp::get_logger("arbitrator"),
                             "Printing successful mvr: " << maneuver_type_to_string(mvr.type));
@@ -92,8 +127,31 @@ namespace arbitrator
                     continue;
                 }
 
-                // Expand it, and reprioritize
-                std::vector<carma_planning_msgs::msg::ManeuverPlan> children = neighbor_generator_->generate_neighbors(cur_plan, start_state);
+                // An identical plan expands to identical children, so only the first one is expanded
+                if (!expanded_keys.insert(expansion_key(cur_plan, start_state)).second)
+                {
+                    RCLCPP_DEBUG_STREAM(rclcpp::get_logger("arbitrator"),
+                        "Skipping expansion of plan_id: " << std::string(cur_plan.maneuver_plan_id) << " identical to an already expanded plan");
+                    last_plan_stats_.memoized_count++;
+                    continue;
+                }
+
+                // Expand it concurrently with the other plans of this depth
+                PlanPtr plan = node.first;
+                expansions.emplace_back(plan, std::async(std::launch::async, [this, plan, &start_state]()
+                    {
+                        return neighbor_generator_->generate_neighbors(*plan, start_state);
+                    }));
+                last_plan_stats_.expansion_count++;
+            }
+
+            std::vector<std::pair<PlanPtr, double>> temp_open_list;
+
+            for (auto& expansion : expansions)
+            {
+                const auto& cur_plan = *expansion.first;
+                std::vector<carma_planning_msgs::msg::ManeuverPlan> children = expansion.second.get();
+
                 RCLCPP_DEBUG_STREAM(
                     rclcpp::get_logger("arbitrator"),
                     "Arbitrator received total of " << children.size()
@@ -101,9 +159,9 @@ namespace arbitrator
                     << std::string(cur_plan.maneuver_plan_id)
                 );
                 // Compute cost for each child and store in open list
-                for (auto child = children.begin(); child != children.end(); child++)
+                for (auto& child : children)
                 {
-                    if (child->maneuvers.empty())
+                    if (child.maneuvers.empty())
                     {
                         RCLCPP_DEBUG_STREAM(
                             rclcpp::get_logger("arbitrator"),
@@ -111,7 +169,7 @@ namespace arbitrator
                             << std::string(cur_plan.maneuver_plan_id)
                             <<", from one of the strategic plugin, which so far had maneuvers: "
                         );
-                        for (auto mvr : cur_plan.maneuvers)
+                        for (const auto& mvr : cur_plan.maneuvers)
                         {
                             RCLCPP_DEBUG_STREAM(
                                 rclcpp::get_logger("arbitrator"),
@@ -121,26 +179,45 @@ namespace arbitrator
                         continue;
                     }
 
-                    temp_open_list.push_back(std::make_pair(*child, cost_function_->compute_cost_per_unit_distance(*child)));
+                    if (child.maneuver_plan_id == "")
+                    {
+                        // Generate a new unique id for the maneuver plan
+                        child.maneuver_plan_id =
+                            boost::uuids::to_string(boost::uuids::random_generator()());
+                    }
+
+                    double cost = cost_function_->compute_cost_per_unit_distance(child);
+                    temp_open_list.push_back(std::make_pair(std::make_shared<const carma_planning_msgs::msg::ManeuverPlan>(std::move(child)), cost));
                 }
             }
 
-            open_list_to_evaluate = temp_open_list;
+            // Only the best plans of this depth are kept for the next one
+            open_list_to_evaluate = search_strategy_->prioritize_plan_ptrs(std::move(temp_open_list));
+
+            last_plan_stats_.depth_durations.push_back(std::chrono::steady_clock::now() - depth_start_time);
+
+            RCLCPP_DEBUG_STREAM(rclcpp::get_logger("arbitrator"),
+                "Search depth " << last_plan_stats_.depth_durations.size() << " expanded " << expansions.size() << " plans in "
+                << std::chrono::duration_cast<std::chrono::microseconds>(last_plan_stats_.depth_durations.back()).count() / 1000.0
+                << " ms, keeping " << open_list_to_evaluate.size() << " plans");
         }
 
+        RCLCPP_DEBUG_STREAM(rclcpp::get_logger("arbitrator"),
+            "Tree search expanded " << last_plan_stats_.expansion_count << " plans, skipped " << last_plan_stats_.memoized_count
+            << " identical plans, over " << last_plan_stats_.depth_durations.size() << " depths");
+
         if (final_open_list.empty())
         {
             RCLCPP_ERROR_STREAM(rclcpp::get_logger("arbitrator"), "None of the strategic plugins generated any valid plans! Please check if any is turned and returning valid maneuvers...");
             throw std::runtime_error("None of the strategic plugins generated any valid plans! Please check if any is turned and returning valid maneuvers...");
         }
 
-        final_open_list = search_strategy_->prioritize_plans(final_open_list);
+        final_open_list = search_strategy_->prioritize_plan_ptrs(std::move(final_open_list));
 
         // now every plan has enough duration if possible and prioritized
-        for (auto pair : final_open_list)
+        for (const auto& pair : final_open_list)
         {
-            // Pop the first element off the open list
-            carma_planning_msgs::msg::ManeuverPlan cur_plan = pair.first;
+            const auto& cur_plan = *pair.first;
             rclcpp::Duration plan_duration(0,0); // zero duration
 
             // get plan duration
@@ -154,6 +231,6 @@ namespace arbitrator
         }
 
         // If no perfect match is found, return the longest plan that fit the criteria
-        return longest_plan;
+        return *longest_plan;
     }
 }
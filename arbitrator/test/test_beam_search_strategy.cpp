@@ -144,4 +144,24 @@ namespace arbitrator
         ASSERT_NEAR(1.0, vec[1].second, 0.01);
         ASSERT_NEAR(2.0, vec[2].second, 0.01);
     }
-}
\ No newline at end of file
+
+    TEST_F(BeamSearchStrategyTest, testSortPlanPtrs)
+    {
+        auto plan = std::make_shared<const carma_planning_msgs::msg::ManeuverPlan>();
+
+        auto vec = bss.prioritize_plan_ptrs({
+                { plan, 10.0 },
+                { plan, 0.0 },
+                { plan, 15.0 },
+                { plan, 5.0 },
+            });
+
+        // Truncated to the beam width of 3 without copying the plans
+        ASSERT_EQ(3, vec.size());
+
+        ASSERT_NEAR(0.0, vec[0].second, 0.01);
+        ASSERT_NEAR(5.0, vec[1].second, 0.01);
+        ASSERT_NEAR(10.0, vec[2].second, 0.01);
+        ASSERT_EQ(plan, vec[0].first);
+    }
+}
@@ -0,0 +1,75 @@
+/*
+ * Copyright (C) 2024 LEIDOS.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may not
+ * use this file except in compliance with the License. You may obtain a copy of
+ * the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations under
+ * the License.
+ */
+
+#include <gtest/gtest.h>
+#include "plugin_call_tracker.hpp"
+
+namespace arbitrator
+{
+    using std::literals::chrono_literals::operator""ms;
+
+    TEST(PluginCallTrackerTest, testLatencyHistogram)
+    {
+        PluginCallTracker tracker(1000ms, 8000ms, 2);
+
+        tracker.record_success("plugin_a", 5ms);
+        tracker.record_success("plugin_a", 10ms);
+        tracker.record_success("plugin_a", 40ms);
+        tracker.record_success("plugin_a", 600ms);
+
+        auto stats = tracker.get_stats().at("plugin_a");
+
+        ASSERT_EQ(4u, stats.success_count);
+        ASSERT_EQ(0u, stats.timeout_count);
+        ASSERT_EQ(2u, stats.latencies.counts[0]); // <= 10 ms
+        ASSERT_EQ(0u, stats.latencies.counts[1]); // <= 25 ms
+        ASSERT_EQ(1u, stats.latencies.counts[2]); // <= 50 ms
+        ASSERT_EQ(1u, stats.latencies.counts.back()); // Overflow
+    }
+
+    TEST(PluginCallTrackerTest, testExponentialBackoff)
+    {
+        PluginCallTracker tracker(1000ms, 3000ms, 2);
+        auto now = std::chrono::steady_clock::now();
+
+        ASSERT_FALSE(tracker.is_backed_off("plugin_a", now));
+
+        // A single timeout is tolerated
+        ASSERT_EQ(0ms, tracker.record_timeout("plugin_a", now));
+        ASSERT_FALSE(tracker.is_backed_off("plugin_a", now));
+
+        // Repeated timeouts double the back-off up to the maximum
+        ASSERT_EQ(1000ms, tracker.record_timeout("plugin_a", now));
+        ASSERT_TRUE(tracker.is_backed_off("plugin_a", now + 999ms));
+        ASSERT_FALSE(tracker.is_backed_off("plugin_a", now + 1000ms));
+
+        ASSERT_EQ(2000ms, tracker.record_timeout("plugin_a", now));
+        ASSERT_EQ(3000ms, tracker.record_timeout("plugin_a", now));
+        ASSERT_EQ(3000ms, tracker.record_timeout("plugin_a", now));
+        ASSERT_TRUE(tracker.is_backed_off("plugin_a", now + 2999ms));
+
+        // Other plugins are unaffected
+        ASSERT_FALSE(tracker.is_backed_off("plugin_b", now));
+
+        // A response clears the back-off
+        tracker.record_success("plugin_a", 20ms);
+        ASSERT_FALSE(tracker.is_backed_off("plugin_a", now));
+        ASSERT_EQ(0u, tracker.get_stats().at("plugin_a").consecutive_timeouts);
+        ASSERT_EQ(5u, tracker.get_stats().at("plugin_a").timeout_count);
+
+        ASSERT_EQ(0ms, tracker.record_timeout("plugin_a", now));
+    }
+}
@@ -0,0 +1,110 @@
+/*
+ * Copyright (C) 2024 LEIDOS.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may not
+ * use this file except in compliance with the License. You may obtain a copy of
+ * the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations under
+ * the License.
+ */
+
+#include <gtest/gtest.h>
+#include "plugin_registry.hpp"
+
+namespace arbitrator
+{
+    TEST(PluginRegistryTest, testRegistry)
+    {
+        PluginRegistry registry("/plan_maneuvers");
+
+        // Not populated until the first resync
+        ASSERT_FALSE(!!registry.get_topics());
+
+        carma_planning_msgs::msg::Plugin tactical;
+        tactical.name = "tactical_plugin";
+        tactical.type = carma_planning_msgs::msg::Plugin::TACTICAL;
+        tactical.activated = true;
+        tactical.available = true;
+
+        ASSERT_FALSE(registry.add_plugin(tactical));
+        ASSERT_FALSE(!!registry.get_topics());
+
+        carma_planning_msgs::msg::Plugin strategic;
+        strategic.name = "plugin_a";
+        strategic.type = carma_planning_msgs::msg::Plugin::STRATEGIC;
+        strategic.activated = true;
+        strategic.available = true;
+
+        // Discovery messages alone do not populate the registry
+        ASSERT_TRUE(registry.add_plugin(strategic));
+        ASSERT_FALSE(!!registry.get_topics());
+
+        registry.replace_topics({});
+        ASSERT_TRUE(registry.add_plugin(strategic));
+        ASSERT_FALSE(registry.add_plugin(strategic)); // Repeated discovery messages are ignored
+
+        auto topics = registry.get_topics();
+        ASSERT_TRUE(!!topics);
+        ASSERT_EQ(1u, topics->size());
+        ASSERT_EQ("plugin_a/plan_maneuvers", topics->front());
+
+        // A resync replaces the known topics
+        registry.replace_topics({"plugin_b/plan_maneuvers", "plugin_c/plan_maneuvers"});
+
+        topics = registry.get_topics();
+        ASSERT_EQ(2u, topics->size());
+        ASSERT_EQ("plugin_b/plan_maneuvers", (*topics)[0]);
+        ASSERT_EQ("plugin_c/plan_maneuvers", (*topics)[1]);
+
+        // An empty resync still counts as populated
+        registry.replace_topics({});
+        topics = registry.get_topics();
+        ASSERT_TRUE(!!topics);
+        ASSERT_TRUE(topics->empty());
+    }
+
+    TEST(PluginRegistryTest, testDeactivation)
+    {
+        PluginRegistry registry("/plan_maneuvers");
+        registry.replace_topics({"plugin_a/plan_maneuvers", "plugin_b/plan_maneuvers"});
+
+        carma_planning_msgs::msg::Plugin plugin;
+        plugin.name = "plugin_a";
+        plugin.type = carma_planning_msgs::msg::Plugin::STRATEGIC;
+        plugin.activated = false;
+        plugin.available = true;
+
+        // A deactivated plugin is removed
+        ASSERT_TRUE(registry.add_plugin(plugin));
+        ASSERT_FALSE(registry.add_plugin(plugin));
+
+        auto topics = registry.get_topics();
+        ASSERT_EQ(1u, topics->size());
+        ASSERT_EQ("plugin_b/plan_maneuvers", topics->front());
+
+        // Unknown inactive plugins are not added
+        plugin.name = "plugin_c";
+        ASSERT_FALSE(registry.add_plugin(plugin));
+        ASSERT_EQ(1u, registry.get_topics()->size());
+
+        // An unavailable plugin is removed even if it is still activated
+        plugin.name = "plugin_b";
+        plugin.activated = true;
+        plugin.available = false;
+        ASSERT_TRUE(registry.add_plugin(plugin));
+        ASSERT_TRUE(registry.get_topics()->empty());
+
+        // A plugin is registered again once it is activated and available
+        plugin.available = true;
+        ASSERT_TRUE(registry.add_plugin(plugin));
+        topics = registry.get_topics();
+        ASSERT_EQ(1u, topics->size());
+        ASSERT_EQ("plugin_b/plan_maneuvers", topics->front());
+    }
+}
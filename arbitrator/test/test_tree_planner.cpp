@@ -19,6 +19,7 @@
 #include <gtest/gtest.h>
 #include <gmock/gmock.h>
 #include "vehicle_state.hpp"
+#include "beam_search_strategy.hpp"
 
 using ::testing::A;
 using ::testing::_;
@@ -26,6 +27,7 @@ using ::testing::DoAll;
 using ::testing::Return;
 using ::testing::ReturnArg;
 using ::testing::InSequence;
+using ::testing::Invoke;
 
 namespace arbitrator
 {
@@ -234,4 +236,58 @@ namespace arbitrator
         ASSERT_EQ(rclcpp::Time(4, 0), rclcpp::Time(plan.maneuvers[2].lane_following_maneuver.start_time, RCL_SYSTEM_TIME));
         ASSERT_EQ(rclcpp::Time(5, 0), rclcpp::Time(plan.maneuvers[2].lane_following_maneuver.end_time, RCL_SYSTEM_TIME));
     }
-}
\ No newline at end of file
+
+    TEST_F(TreePlannerTest, testGeneratePlanBeamPruning)
+    {
+        // Use a real beam search with a width of 2 so the open list is pruned at every depth
+        TreePlanner beam_tp(mcf, mng, std::make_shared<BeamSearchStrategy>(2), rclcpp::Duration(5, 0));
+
+        carma_planning_msgs::msg::Maneuver mvr_a, mvr_c, mvr_end;
+
+        // The start speed is used as the cost of each maneuver
+        mvr_a.type = carma_planning_msgs::msg::Maneuver::LANE_FOLLOWING;
+        mvr_a.lane_following_maneuver.start_time = rclcpp::Time(0, 0);
+        mvr_a.lane_following_maneuver.end_time = rclcpp::Time(2, 0);
+        mvr_a.lane_following_maneuver.start_speed = 1.0;
+
+        mvr_c = mvr_a;
+        mvr_c.lane_following_maneuver.start_speed = 3.0;
+
+        mvr_end.type = carma_planning_msgs::msg::Maneuver::LANE_FOLLOWING;
+        mvr_end.lane_following_maneuver.start_time = rclcpp::Time(2, 0);
+        mvr_end.lane_following_maneuver.end_time = rclcpp::Time(5, 0);
+        mvr_end.lane_following_maneuver.start_speed = 1.0;
+
+        carma_planning_msgs::msg::ManeuverPlan plan_a, plan_a_duplicate, plan_c, plan_a_end;
+        plan_a.maneuvers.push_back(mvr_a);
+        plan_a_duplicate.maneuvers.push_back(mvr_a);
+        plan_c.maneuvers.push_back(mvr_c);
+        plan_a_end.maneuvers = {mvr_a, mvr_end};
+
+        std::vector<carma_planning_msgs::msg::ManeuverPlan> root_children{plan_c, plan_a, plan_a_duplicate};
+        std::vector<carma_planning_msgs::msg::ManeuverPlan> a_children{plan_a_end};
+
+        // The root and plan_a are expanded. plan_c is pruned and plan_a_duplicate is identical to plan_a
+        EXPECT_CALL(*mng, generate_neighbors(_,_))
+            .Times(2)
+            .WillOnce(Return(root_children))
+            .WillOnce(Return(a_children));
+
+        EXPECT_CALL(*mcf, compute_cost_per_unit_distance(_))
+            .WillRepeatedly(Invoke([](const carma_planning_msgs::msg::ManeuverPlan& plan)
+                {
+                    return plan.maneuvers.front().lane_following_maneuver.start_speed;
+                }));
+
+        VehicleState state;
+        carma_planning_msgs::msg::ManeuverPlan plan = beam_tp.generate_plan(state);
+
+        ASSERT_EQ(2, plan.maneuvers.size());
+        ASSERT_EQ(rclcpp::Time(5, 0), rclcpp::Time(plan.maneuvers[1].lane_following_maneuver.end_time, RCL_SYSTEM_TIME));
+
+        const auto& stats = beam_tp.get_last_plan_stats();
+        ASSERT_EQ(2u, stats.expansion_count);
+        ASSERT_EQ(1u, stats.memoized_count);
+        ASSERT_EQ(3u, stats.depth_durations.size());
+    }
+}
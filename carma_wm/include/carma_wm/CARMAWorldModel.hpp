@@ -32,6 +32,10 @@
 #include "carma_wm/SignalizedIntersectionManager.hpp"
 #include <rosgraph_msgs/msg/clock.hpp>
 #include <gtest/gtest_prod.h>
+#include <atomic>
+#include <mutex>
+#include <unordered_map>
+#include <unordered_set>
 namespace carma_wm
 {
 /*! \brief Class which implements the WorldModel interface. In addition this class provides write access to the world
@@ -63,7 +67,7 @@ public:
    *
    *  \param map A shared pointer to the map which will share ownership to this object
    *  \param map_version Optional field to set the map version. While this is technically optional its uses is highly advised to manage synchronization.
-   *  \param recompute_routing_graph Optional field which if true will result in the routing graph being recomputed. NOTE: If this map is the first map set the graph will always be recomputed
+   *  \param recompute_routing_graph Optional field which if true will result in the routing graph being recomputed. NOTE: If this map is the first map set and no graph was set with setRoutingGraph the graph will always be recomputed
    */
   void setMap(lanelet::LaneletMapPtr map, size_t map_version = 0, bool recompute_routing_graph = true);
 
@@ -77,9 +81,35 @@ public:
    * \param graph The graph to set.
    *              NOTE: This graph must be for the participant type specified getVehicleParticipationType().
    *              There is no way to validate this from the object so the user must ensure consistency.
+   * \param participant Optional participant type the graph was built for with the default routing costs.
+   *                    updateRoutingGraph only patches graphs built for the participant type of this world model
    *
    */
-  void setRoutingGraph(LaneletRoutingGraphPtr graph);
+  void setRoutingGraph(LaneletRoutingGraphPtr graph, const std::string& participant = "");
+
+  /*!
+   * \brief Update the routing graph after some lanelets of the current map were added or had their regulatory elements changed,
+   *        such as by a geofence map update. A routing graph is built for the neighborhood of the touched lanelets only, and the
+   *        vertices and edges of the touched lanelets in the current graph are replaced by those of the neighborhood graph.
+   *        The other vertices and edges are copied from the current graph, so the graph may have been built for a previous map
+   *        with the same lanelet ids.
+   *        The full graph is rebuilt if no graph built for the participant type of this world model is available,
+   *        if a touched lanelet is not in the map or if the current graph does not match the map.
+   *
+   * NOTE: setMap should be called with recompute_routing_graph=false before this function
+   * ASSUMPTION: The cost of a lane change does not depend on the length of the lane change, as with the default routing costs
+   *
+   * \param touched_lanelets Ids of the lanelets which were added or whose regulatory elements were added, removed or updated
+   *
+   * \return True if the full graph was rebuilt
+   */
+  bool updateRoutingGraph(const std::unordered_set<lanelet::Id>& touched_lanelets);
+
+  /*!
+   * \brief Returns the number of times the routing graph was replaced. The graph returned by getMapRoutingGraph() is an immutable
+   *        snapshot, so readers can compare versions to know when to refresh data derived from it
+   */
+  size_t getRoutingGraphVersion() const;
 
   /*! \brief Set the current route. This route must match the current map for this class to function properly
    *
@@ -187,6 +217,8 @@ public:
 
   TrackPos routeTrackPos(const lanelet::BasicPoint2d& point) const override;
 
+  std::vector<TrackPos> routeTrackPositions(const lanelet::BasicLineString2d& points) const override;
+
   std::vector<lanelet::ConstLanelet> getLaneletsBetween(double start, double end, bool shortest_path_only = false,  bool bounds_inclusive = true) const override;
 
   std::vector<lanelet::BasicPoint2d> sampleRoutePoints(double start_downtrack, double end_downtrack, double step_size) const override;
@@ -262,6 +294,39 @@ private:
    */
   void computeDowntrackReferenceLine();
 
+  /*! \brief Helper function to build the flattened route reference line points and their grid index used by
+   *         routeTrackPositions. Called from computeDowntrackReferenceLine once the route centerlines are known
+   */
+  void computeRoutePointIndex();
+
+  /*! \brief Helper function to build the routing graph of the full map for the participant type of this world model
+   */
+  void rebuildRoutingGraph();
+
+  /*! \brief Helper function to atomically replace the routing graph and increment its version
+   */
+  void storeRoutingGraph(LaneletRoutingGraphPtr graph);
+
+  /*! \brief Helper function to find the index in route_points_ of the route reference line point nearest to the provided point
+   *
+   *  \param point The point to match
+   *  \param hint Index of a route point expected to be close to the point, such as the match of the previous point in a
+   *  batch. Used to bound the grid search. Pass route_points_.size() when there is no hint
+   *
+   *  \return The index of the nearest route point
+   */
+  size_t nearestRoutePoint(const lanelet::BasicPoint2d& point, size_t hint) const;
+
+  /*! \brief Helper function to compute the route TrackPos of a point given the index of its nearest route point.
+   *         Follows the same segment selection rules as routeTrackPos(const lanelet::BasicPoint2d&)
+   */
+  TrackPos routeTrackPosFromNearestPoint(const lanelet::BasicPoint2d& point, size_t nearest) const;
+
+  /*! \brief Returns the route downtrack of a map point such as the first point of a stop line. The result is cached per point
+   *         id until the next call to setRoute or setMap
+   */
+  double cachedRouteDowntrack(const lanelet::ConstPoint3d& point) const;
+
   /*! \brief Helper function to perform a deep copy of a LineString and assign new ids to all the elements. Used during
    * route centerline construction
    *
@@ -271,9 +336,11 @@ private:
    */
   lanelet::LineString3d copyConstructLineString(const lanelet::ConstLineString3d& line) const;
 
-  std::shared_ptr<lanelet::LaneletMap> semantic_map_;
+  std::shared_ptr<lanelet::LaneletMap> semantic_map_;  // Replaced with std::atomic_store so getMap() always returns a complete map
   LaneletRoutePtr route_;
-  LaneletRoutingGraphPtr map_routing_graph_;
+  LaneletRoutingGraphPtr map_routing_graph_;  // Only accessed through std::atomic_load/std::atomic_store
+  std::atomic<size_t> routing_graph_version_{ 0 };  // Incremented every time map_routing_graph_ is replaced
+  std::string routing_graph_participant_;  // Participant type map_routing_graph_ was built for, empty if unknown
   double route_length_ = 0;
   lanelet::LaneletSubmapConstUPtr shortest_path_view_;  // Map containing only lanelets along the shortest path of the
                                                      // route
@@ -284,6 +351,18 @@ private:
                                                                     // only
   std::vector<carma_perception_msgs::msg::RoadwayObstacle> roadway_objects_; //
 
+  // Flattened copy of shortest_path_centerlines_ used by routeTrackPositions
+  lanelet::BasicLineString2d route_points_;  // All reference line points in route order
+  std::vector<double> route_point_downtracks_;  // Route downtrack of each point in route_points_
+  std::vector<size_t> route_point_centerlines_;  // Index in shortest_path_centerlines_ of each point in route_points_
+  std::vector<size_t> route_centerline_offsets_;  // Index in route_points_ of the first point of each centerline, plus the total size
+  std::unordered_map<int64_t, std::vector<size_t>> route_point_grid_;  // Grid cell key -> indexes in route_points_
+  int64_t route_grid_min_x_ = 0, route_grid_min_y_ = 0, route_grid_max_x_ = -1, route_grid_max_y_ = -1;  // Occupied cell bounds
+
+  // Route downtrack of stop line and regulatory element points keyed by point id. Cleared on setRoute and setMap
+  mutable std::unordered_map<lanelet::Id, double> route_downtrack_cache_;
+  mutable std::mutex route_downtrack_cache_mutex_;
+
   size_t map_version_ = 0; // The current map version. This is cached from calls to setMap();
 
   std::string route_name_; // The current route name. This is set from calls to setRouteName();
@@ -295,6 +374,9 @@ private:
   static constexpr double YELLOW_LIGHT_DURATION = 3.0; //in sec
   static constexpr double GREEN_LIGHT_DURATION = 20.0; //in sec
 
+  static constexpr double ROUTING_UPDATE_SEARCH_MARGIN = 1.0; // Margin in meters around touched lanelets when searching for their routing neighbors
+  static constexpr double ROUTE_GRID_CELL_SIZE = 10.0; // Cell size in meters of the route point grid used by routeTrackPositions
+
   FRIEND_TEST(CARMAWorldModelTest, getFirstLaneletOnShortestPath);
 };
 }  // namespace carma_wm
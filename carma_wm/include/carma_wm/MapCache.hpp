@@ -0,0 +1,118 @@
+#pragma once
+
+/*
+ * Copyright (C) 2024 LEIDOS.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may not
+ * use this file except in compliance with the License. You may obtain a copy of
+ * the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations under
+ * the License.
+ */
+
+#include <cstdint>
+#include <string>
+#include <autoware_lanelet2_msgs/msg/map_bin.hpp>
+#include <autoware_lanelet2_msgs/msg/routing_graph.hpp>
+#include <lanelet2_core/LaneletMap.h>
+#include "carma_wm/WorldModel.hpp"
+
+namespace carma_wm
+{
+/*! \brief On disk cache of processed maps and of their routing graphs, used to skip the map conformance and the routing graph
+ *         build when a node restarts with an unchanged map.
+ *
+ *  Entries are stored in a sub directory of the cache directory named after the content key of the map message the entry
+ *  was computed from. The key is the SHA-256 digest of the map message content, its format version, the image version of
+ *  this cache and the parameters of the processing. Since the map message is the projected vector map, the key changes
+ *  whenever the map file or the georeference change.
+ *
+ *  Each entry holds one image file for the processed map and one per participant type for the routing graph. Images are
+ *  flat arrays read directly from a read only memory mapping of the file. The routing graph image holds the vertices and
+ *  edges of the graph, so the graph is rebuilt from the mapping without recomputing relations and costs. The header of each
+ *  image holds the SHA-256 digest of the rest of the image, which is checked before the image is used.
+ *
+ *  The cache is best effort. Any read or write failure is logged and reported as a cache miss.
+ */
+class MapCache
+{
+public:
+  /*! \brief Version of the image layout. Part of the content key so images written by other versions are never read
+   */
+  static constexpr uint32_t IMAGE_VERSION = 2;
+
+  /*! \brief Constructor
+   *
+   *  \param cache_dir The directory holding the cache entries. It is created on the first store.
+   */
+  explicit MapCache(const std::string& cache_dir);
+
+  /*! \brief Returns the content key of a map message
+   *
+   *  \param map_msg The map message
+   *  \param params Additional string identifying the processing applied to the map, for example the configured speed limit
+   *
+   *  \return The key, as a hexadecimal SHA-256 digest
+   */
+  static std::string contentKey(const autoware_lanelet2_msgs::msg::MapBin& map_msg, const std::string& params = "");
+
+  /*! \brief Loads the map stored under a key
+   *
+   *  \param key The content key of the entry
+   *  \param[out] map_msg The map message holding the loaded map
+   *
+   *  \return True if the map was loaded, false on a cache miss
+   */
+  bool loadMap(const std::string& key, autoware_lanelet2_msgs::msg::MapBin& map_msg) const;
+
+  /*! \brief Stores the map of a map message under a key
+   *
+   *  \param key The content key of the entry
+   *  \param map_msg The map message to store
+   *
+   *  \return True if the map was stored
+   */
+  bool storeMap(const std::string& key, const autoware_lanelet2_msgs::msg::MapBin& map_msg) const;
+
+  /*! \brief Loads the routing graph of a participant type stored under a key
+   *
+   *  \param key The content key of the entry
+   *  \param participant The participant type of the graph
+   *  \param map The map loaded from the same entry
+   *
+   *  \return The routing graph, or nullptr on a cache miss
+   */
+  LaneletRoutingGraphPtr loadRoutingGraph(const std::string& key, const std::string& participant,
+                                          const lanelet::LaneletMapPtr& map) const;
+
+  /*! \brief Stores a routing graph message under a key. The graph is stored for its participant type.
+   *
+   *  \param key The content key of the entry
+   *  \param graph_msg The routing graph message to store
+   *
+   *  \return True if the graph was stored
+   */
+  bool storeRoutingGraph(const std::string& key, const autoware_lanelet2_msgs::msg::RoutingGraph& graph_msg) const;
+
+private:
+  std::string entryFile(const std::string& key, const std::string& name) const;
+
+  std::string cache_dir_;
+};
+
+/*! \brief Rebuilds a routing graph from its message representation without recomputing the relations and costs of the map
+ *
+ *  \param msg The routing graph message
+ *  \param map The map the graph was built from
+ *
+ *  \return The routing graph, or nullptr if the message references lanelets or areas which are not in the map
+ */
+LaneletRoutingGraphPtr routingGraphFromMsg(const autoware_lanelet2_msgs::msg::RoutingGraph& msg, const lanelet::LaneletMapPtr& map);
+
+}  // namespace carma_wm
@@ -0,0 +1,153 @@
+#pragma once
+
+/*
+ * Copyright (C) 2024 LEIDOS.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may not
+ * use this file except in compliance with the License. You may obtain a copy of
+ * the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations under
+ * the License.
+ */
+
+#include <functional>
+#include <map>
+#include <mutex>
+#include <memory>
+#include <string>
+#include <unordered_map>
+#include <unordered_set>
+#include <boost/optional.hpp>
+#include <autoware_lanelet2_msgs/msg/map_bin.hpp>
+#include <lanelet2_core/LaneletMap.h>
+#include "carma_wm/CARMAWorldModel.hpp"
+
+namespace carma_wm
+{
+/*! \brief Process wide store of the semantic map, shared by every WMListener of the process which enables it.
+ *         When many nodes are loaded into the same component container they would otherwise each deserialize
+ *         and update their own copy of the map and build their own routing graph.
+ *
+ *  The store publishes one immutable snapshot of the map per map update. The first listener to receive a map message
+ *  deserializes it, the first listener to receive a map update applies it to a copy of the previous snapshot which becomes
+ *  the snapshot of that update, and the first listener to need the routing graph of a snapshot builds it. Every other
+ *  listener reuses the result.
+ *
+ *  A published snapshot is never modified, so listeners keep reading their current snapshot while another listener applies
+ *  an update and only switch to the new snapshot from their own map update callback. A snapshot shares every primitive the
+ *  update does not modify with the previous snapshot. Snapshots are reference counted and released once no listener uses them anymore.
+ *
+ *  Traffic signal states received in SPaT messages are recorded in the traffic signals of the map a listener reads, so a listener
+ *  reads its own view of the snapshot, returned by signalView, with its own traffic signals.
+ */
+class SharedMapStore
+{
+public:
+  /*! \brief Returns the store of this process
+   */
+  static SharedMapStore& instance();
+
+  /*! \brief Returns the snapshot of the provided map message. The message is only deserialized if no other listener already did
+   *         for the same map version and content.
+   *
+   *  \param map_msg The map message
+   *
+   *  \return The shared map
+   */
+  lanelet::LaneletMapPtr getMap(const autoware_lanelet2_msgs::msg::MapBin& map_msg);
+
+  /*! \brief Returns the snapshot of the shared map after a map update. If no other listener published it yet, the update is
+   *         applied to a copy of the provided snapshot and the copy is published. The provided snapshot is never modified.
+   *         Calls are serialized, so a listener which reuses the snapshot only returns once the update is complete.
+   *
+   *  \param map The snapshot the update applies to, as returned by getMap or by a previous call to applyUpdate
+   *  \param seq_id The sequence number of the map update
+   *  \param lanelet_ids The ids of the lanelets the update modifies. Only these lanelets get new data in the copy, ids which are not in map yet are ignored
+   *  \param apply Function performing the edits on the map it is given
+   *
+   *  \return The snapshot with the update applied
+   */
+  lanelet::LaneletMapPtr applyUpdate(const lanelet::LaneletMapPtr& map, long seq_id, const std::unordered_set<lanelet::Id>& lanelet_ids,
+                                     const std::function<void(const lanelet::LaneletMapPtr&)>& apply);
+
+  /*! \brief Returns the routing graph of a snapshot, calling build only if no other listener already did.
+   *
+   *  \param map The snapshot returned by getMap or applyUpdate
+   *  \param seq_id The sequence number of the last map update applied to the map, or -1 for the base map
+   *  \param participant The participant type the graph is built for
+   *  \param build Function building the graph
+   *
+   *  \return The shared routing graph
+   */
+  LaneletRoutingGraphPtr getRoutingGraph(const lanelet::LaneletMapPtr& map, long seq_id, const std::string& participant,
+                                         const std::function<LaneletRoutingGraphPtr()>& build);
+
+  /*! \brief Releases the stored snapshots and routing graphs. Listeners keep the snapshot they already hold.
+   */
+  void clear();
+
+  /*! \brief Returns the map a single listener reads for a snapshot. The view has its own instances of the traffic signals of the
+   *         snapshot, and of the lanelets and areas holding them, and shares every other primitive with the snapshot.
+   *         The snapshot itself is returned if it has no traffic signal.
+   *
+   *  \param map The snapshot
+   *  \param previous_view The previous view of the listener, the signal states of which are kept in the new view. May be null
+   *
+   *  \return The view of the listener
+   */
+  static lanelet::LaneletMapPtr signalView(const lanelet::LaneletMapPtr& map, const lanelet::LaneletMapPtr& previous_view);
+
+  /*! \brief Returns a routing graph with the vertices and edges of a graph, which references the lanelets and areas of map with the same ids.
+   *         Used to share the graph of a snapshot with the views of that snapshot
+   *
+   *  \param graph The routing graph
+   *  \param map A map with the same lanelet and area ids as the map of the graph
+   *
+   *  \return The routing graph of map
+   */
+  static LaneletRoutingGraphPtr rebindRoutingGraph(const LaneletRoutingGraphPtr& graph, const lanelet::LaneletMapPtr& map);
+
+private:
+  SharedMapStore() = default;
+
+  /*! \brief Returns a copy of a map which shares the primitives of the original, except for new instances of the lanelets with the
+   *         given ids and of the lanelets and areas holding a replaced regulatory element.
+   *         NOTE: Regulatory elements of the copy which reference a new lanelet as a parameter still reference the original instance
+   *
+   *  \param map The map to copy
+   *  \param lanelet_ids The ids of the lanelets which get new instances
+   *  \param regems The regulatory elements replacing those of the map with the same id
+   *
+   *  \return The copy
+   */
+  static lanelet::LaneletMapPtr copyMap(const lanelet::LaneletMapPtr& map, const std::unordered_set<lanelet::Id>& lanelet_ids,
+                                        const std::unordered_map<lanelet::Id, lanelet::RegulatoryElementPtr>& regems = {});
+
+  /*! \brief Returns the sequence number of a live snapshot of the current map version, or boost::none if the map is not one
+   */
+  boost::optional<long> snapshotSeq(const lanelet::LaneletMapPtr& map) const;
+
+  /*! \brief A routing graph along with the snapshot it was built for
+   */
+  struct RoutingGraphEntry
+  {
+    std::weak_ptr<lanelet::LaneletMap> map;
+    LaneletRoutingGraphPtr graph;
+  };
+
+  std::mutex mutex_;
+
+  size_t map_version_ = 0;
+  size_t map_hash_ = 0;
+  lanelet::LaneletMapPtr base_map_;  // Snapshot of the map message, kept for listeners which receive the map later
+  lanelet::LaneletMapPtr latest_map_;  // Snapshot of the most recent map update
+  std::map<long, std::weak_ptr<lanelet::LaneletMap>> snapshots_;  // Keyed by update sequence number, -1 for base_map_
+  std::map<std::pair<long, std::string>, RoutingGraphEntry> routing_graphs_;  // Keyed by update sequence number and participant
+};
+}  // namespace carma_wm
@@ -124,6 +124,34 @@ class WorldModel
     */
     virtual TrackPos routeTrackPos(const lanelet::BasicPoint2d& point) const = 0;
 
+    /*! \brief Returns the TrackPos, computed in 2d, of each of the provided points relative to the current route.
+    *        The result matches calling routeTrackPos(const lanelet::BasicPoint2d&) on each point, which is what the default
+    *        implementation does. CARMAWorldModel overrides it with a search over a precomputed array of the route reference line
+    *        points starting from the match of the previous point, which is much cheaper for sequences of nearby points such as
+    *        trajectories or maneuver boundaries.
+    *
+    * NOTE: The route definition used in this class contains discontinuities in the reference line at lane changes. It is
+    * important to consider that when using route related functions.
+    *
+    * \param points The points which will have their distance computed. Ordering the points along the route gives the best
+    * performance
+    *
+    * \throws std::invalid_argument If the route is not yet loaded
+    *
+    * \return The TrackPos of each point, in the same order as the input
+    */
+    virtual std::vector<TrackPos> routeTrackPositions(const lanelet::BasicLineString2d& points) const
+    {
+      // Implementations which cannot speed up the batched search fall back to one routeTrackPos call per point
+      std::vector<TrackPos> track_positions;
+      track_positions.reserve(points.size());
+      for (const auto& point : points)
+      {
+        track_positions.push_back(routeTrackPos(point));
+      }
+      return track_positions;
+    }
+
     /*! \brief Returns a list of lanelets which are part of the route and whose downtrack bounds exist within the provided
     * start and end distances.
     *
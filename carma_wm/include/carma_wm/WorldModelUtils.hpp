@@ -23,6 +23,7 @@
 #include <lanelet2_core/primitives/Lanelet.h>
 #include <lanelet2_core/primitives/Polygon.h>
 #include <lanelet2_core/geometry/Polygon.h>
+#include <lanelet2_core/geometry/Lanelet.h>
 #include <lanelet2_core/geometry/LineString.h>
 #include <lanelet2_core/utility/Optional.h>
 #include "carma_wm/TrackPos.hpp"
@@ -108,12 +109,25 @@ std::vector<lanelet::Lanelet> nonConnectedAdjacentLeft(const lanelet::LaneletMap
                                                           const unsigned int n = 10);
 
 
+/*!
+  * \brief Gets the lanelets within a radius of each of the given points
+  * \param points Points in the map's frame
+  * \param lanelet_map Lanelet Map Ptr
+  * \param radius Maximum distance in meters between a point and a lanelet polygon. 0 returns the lanelets containing each point
+  *
+  * Consecutive points are grouped into corridors of limited extent and each corridor is resolved with a single search of the
+  * lanelet layer, so a polyline of many points costs one search per corridor instead of one or more nearest neighbor searches per point.
+  *
+  * \return The lanelets near each point, in the same order as the points. Lanelets are in no particular order
+  */
+std::vector<lanelet::Lanelets> getLaneletsNearPoints(const lanelet::Points3d& points, const lanelet::LaneletMapPtr& lanelet_map, double radius);
+
 /*!
   * \brief Gets the affected lanelet or areas based on the points in the given map's frame
   * \param geofence_msg lanelet::Points3d in local frame
   * \param lanelet_map Lanelet Map Ptr
   * \param routing_graph Routing graph of the lanelet map
-  * \param max_lane_width max lane width of the lanes in the map
+  * \param max_lane_width max lane width of the lanes in the map. Unused since only the lanelets containing the points are considered
   * 
   * NOTE:Currently this function only checks lanelets and will be expanded to areas in the future.
   */
@@ -24,6 +24,7 @@
 #include <boost/geometry/geometries/point_xy.hpp>
 #include <boost/foreach.hpp>
 #include <vector>
+#include <unordered_map>
 #include <boost/assign/std/vector.hpp>
 
 #include <iostream>
@@ -50,22 +51,104 @@ namespace carma_wm {
                                                                             // element is (t, polygon), where t is time in future, ms
         };
 
+        //! Default maximum time difference in seconds between a trajectory point and a predicted state for them to be compared
+        constexpr double DEFAULT_COLLISION_TIME_TOLERANCE = 0.5;
+
+        //! Default side length in meters of the spatial cells of a PredictionIndex
+        constexpr double DEFAULT_COLLISION_CELL_SIDE_LENGTH = 10.0;
+
+        /*! \brief Spatio-temporal index of the predicted states of a list of roadway obstacles.
+        *
+        * Every predicted state is bucketed once into a uniform grid of time slices and square spatial cells, and stored with the
+        * radius of the circle bounding its obstacle. A query then only visits the cells of the neighbouring time slices which
+        * can hold a state close enough to collide, instead of every prediction of every obstacle.
+        */
+        class PredictionIndex {
+        public:
+
+            /*! \brief Builds the index
+            * \param rwol The list of roadway obstacles whose predictions are indexed. Only referenced during construction
+            * \param time_tolerance The maximum time difference in seconds between a query and a predicted state for them to be compared.
+            *                       Also used as the length of the time slices
+            * \param cell_side_length The side length in meters of the spatial cells
+            */
+            PredictionIndex(const carma_perception_msgs::msg::RoadwayObstacleList& rwol, double time_tolerance, double cell_side_length);
+
+            /*! \brief Marks the obstacles with a predicted state overlapping a circle at a given time
+            * \param x The x coordinate of the center of the circle in the map frame
+            * \param y The y coordinate of the center of the circle in the map frame
+            * \param time The time of the query in seconds
+            * \param radius The radius of the circle in meters
+            * \param[in,out] collisions Flag per obstacle, in the order of the indexed list, set to true for every overlapping obstacle.
+            *                            Obstacles already flagged are skipped
+            * \return The number of obstacles newly flagged
+            */
+            size_t markCollisions(double x, double y, double time, double radius, std::vector<bool>& collisions) const;
+
+            /*! \brief Returns the number of indexed predicted states
+            */
+            size_t size() const;
+
+        private:
+
+            struct Entry {
+                double x;
+                double y;
+                double time;
+                double radius;
+                size_t obstacle;
+            };
+
+            struct CellKey {
+                int64_t slice;
+                int64_t cell_x;
+                int64_t cell_y;
+
+                bool operator==(const CellKey& other) const {
+                    return slice == other.slice && cell_x == other.cell_x && cell_y == other.cell_y;
+                }
+            };
+
+            struct CellKeyHash {
+                size_t operator()(const CellKey& key) const {
+                    size_t hash = std::hash<int64_t>()(key.slice);
+                    hash = hash * 31 + std::hash<int64_t>()(key.cell_x);
+                    return hash * 31 + std::hash<int64_t>()(key.cell_y);
+                }
+            };
+
+            double time_tolerance_;
+            double cell_side_length_;
+            double max_radius_ = 0.0;
+            size_t size_ = 0;
+            std::unordered_map<CellKey, std::vector<Entry>, CellKeyHash> cells_;
+        };
+
         /*!
         * Main Function for the CollisionChecking interfacing.
         */
 
         /*! \brief Main collision detection function to be called when needed to check for collision detection of the vehicle with 
-        * the current trajectory plan and the current world objects
-        * \param size The size of the host vehicle defined in meters
+        * the current trajectory plan and the current world objects.
+        *
+        * The host vehicle at each trajectory point and each obstacle at each predicted state are approximated by the circles bounding
+        * their footprints. An obstacle collides with the plan if one of its predicted states overlaps a trajectory point less than
+        * time_tolerance seconds apart. The predictions are indexed once per call with a PredictionIndex so the check scales with the
+        * number of nearby states rather than with obstacle_count*prediction_count*trajectory_point_count.
+        *
         * \param rwol The list of Roadway Obstacle
         * \param tp The TrajectoryPlan of the host vehicle
         * \param size The size of the host vehicle defined in meters
-        * \param velocity of the host vehicle m/s
-        * \return A list of obstacles the provided trajectory plan collides with
+        * \param velocity of the host vehicle m/s. Unused, the trajectory point times already describe the host motion
+        * \param time_tolerance The maximum time difference in seconds between a trajectory point and a predicted state for them to be compared
+        * \param cell_side_length The side length in meters of the spatial cells used to index the predictions
+        * \return A list of obstacles the provided trajectory plan collides with, each reported once in the order of rwol
         */
         std::vector<carma_perception_msgs::msg::RoadwayObstacle> WorldCollisionDetection(const carma_perception_msgs::msg::RoadwayObstacleList& rwol, 
                                                                     const carma_planning_msgs::msg::TrajectoryPlan& tp, const geometry_msgs::msg::Vector3& size, 
-                                                                    const geometry_msgs::msg::Twist& velocity);
+                                                                    const geometry_msgs::msg::Twist& velocity,
+                                                                    double time_tolerance = DEFAULT_COLLISION_TIME_TOLERANCE,
+                                                                    double cell_side_length = DEFAULT_COLLISION_CELL_SIDE_LENGTH);
         
         /*! \brief Convert RodwayObstable object to the collision_detection::MovingObject 
         * \param rwo A RoadwayObstacle
@@ -30,7 +30,12 @@
 #include <boost/geometry.hpp>
 #include <boost/geometry/geometries/polygon.hpp>
 #include "carma_wm/Geometry.hpp"
+#include "RoutingGraphAccessor.hpp"
 #include <queue>
+#include <limits>
+#include <atomic>
+#include <unordered_set>
+#include <lanelet2_core/geometry/Lanelet.h>
 #include <boost/math/special_functions/sign.hpp>
 #include <boost/date_time/posix_time/conversion.hpp>
 
@@ -52,30 +57,34 @@ namespace carma_wm
       throw std::invalid_argument("Provided area outer bound is invalid as it contains no points");
     }
 
+    lanelet::BasicLineString2d bound_points;
+    for (lanelet::ConstLineString3d sub_bound3d : outer_bound)
+    {
+      for (lanelet::ConstPoint2d point : lanelet::utils::to2D(sub_bound3d))
+      {
+        bound_points.push_back(point.basicPoint());
+      }
+    }
+
     TrackPos minPos(0, 0);
     TrackPos maxPos(0, 0);
     bool first = true;
-    for (lanelet::ConstLineString3d sub_bound3d : outer_bound)
+    for (const TrackPos& tp : routeTrackPositions(bound_points))
     {
-      auto sub_bound = lanelet::utils::to2D(sub_bound3d);
-      for (lanelet::ConstPoint2d point : sub_bound)
+      if (first)
       {
-        TrackPos tp = routeTrackPos(point);
-        if (first)
-        {
-          minPos = maxPos = tp;
-          first = false;
-        }
-        else if (tp.downtrack < minPos.downtrack)
-        {
-          minPos.downtrack = tp.downtrack;
-          minPos.crosstrack = tp.crosstrack;
-        }
-        else if (tp.downtrack > maxPos.downtrack)
-        {
-          maxPos.downtrack = tp.downtrack;
-          maxPos.crosstrack = tp.crosstrack;
-        }
+        minPos = maxPos = tp;
+        first = false;
+      }
+      else if (tp.downtrack < minPos.downtrack)
+      {
+        minPos.downtrack = tp.downtrack;
+        minPos.crosstrack = tp.crosstrack;
+      }
+      else if (tp.downtrack > maxPos.downtrack)
+      {
+        maxPos.downtrack = tp.downtrack;
+        maxPos.crosstrack = tp.crosstrack;
       }
     }
     return std::make_pair(minPos, maxPos);
@@ -134,7 +143,7 @@ namespace carma_wm
         }
         else
         {
-          double bus_stop_downtrack = routeTrackPos(stop_line.front().front().basicPoint2d()).downtrack;
+          double bus_stop_downtrack = cachedRouteDowntrack(stop_line.front().front());
           double distance_remaining_to_bus_stop = bus_stop_downtrack - curr_downtrack;
 
           if (distance_remaining_to_bus_stop < 0)
@@ -265,6 +274,216 @@ namespace carma_wm
     return tp;
   }
 
+  std::vector<TrackPos> CARMAWorldModel::routeTrackPositions(const lanelet::BasicLineString2d& points) const
+  {
+    // Check if the route was loaded yet
+    if (!route_ || route_points_.empty())
+    {
+      throw std::invalid_argument("Route has not yet been loaded");
+    }
+
+    std::vector<TrackPos> track_positions;
+    track_positions.reserve(points.size());
+
+    size_t hint = route_points_.size();  // No hint for the first point
+    for (const auto& point : points)
+    {
+      hint = nearestRoutePoint(point, hint);
+      track_positions.push_back(routeTrackPosFromNearestPoint(point, hint));
+    }
+
+    return track_positions;
+  }
+
+  namespace
+  {
+    int64_t routeGridCell(double coordinate, double cell_size)
+    {
+      return static_cast<int64_t>(std::floor(coordinate / cell_size));
+    }
+
+    int64_t routeGridKey(int64_t cell_x, int64_t cell_y)
+    {
+      return (cell_x << 32) ^ (cell_y & 0xffffffff);
+    }
+  }
+
+  void CARMAWorldModel::computeRoutePointIndex()
+  {
+    route_points_.clear();
+    route_point_downtracks_.clear();
+    route_point_centerlines_.clear();
+    route_centerline_offsets_.clear();
+    route_point_grid_.clear();
+    route_grid_min_x_ = route_grid_min_y_ = std::numeric_limits<int64_t>::max();
+    route_grid_max_x_ = route_grid_max_y_ = std::numeric_limits<int64_t>::min();
+
+    for (size_t ls_i = 0; ls_i < shortest_path_centerlines_.size(); ls_i++)
+    {
+      route_centerline_offsets_.push_back(route_points_.size());
+      auto centerline = lanelet::utils::to2D(shortest_path_centerlines_[ls_i]);
+      for (size_t p_i = 0; p_i < centerline.size(); p_i++)
+      {
+        const lanelet::BasicPoint2d& point = centerline[p_i].basicPoint();
+        int64_t cell_x = routeGridCell(point.x(), ROUTE_GRID_CELL_SIZE);
+        int64_t cell_y = routeGridCell(point.y(), ROUTE_GRID_CELL_SIZE);
+
+        route_point_grid_[routeGridKey(cell_x, cell_y)].push_back(route_points_.size());
+        route_grid_min_x_ = std::min(route_grid_min_x_, cell_x);
+        route_grid_min_y_ = std::min(route_grid_min_y_, cell_y);
+        route_grid_max_x_ = std::max(route_grid_max_x_, cell_x);
+        route_grid_max_y_ = std::max(route_grid_max_y_, cell_y);
+
+        route_points_.push_back(point);
+        route_point_downtracks_.push_back(shortest_path_distance_map_.distanceToElement(ls_i) +
+                                          shortest_path_distance_map_.distanceToPointAlongElement(ls_i, p_i));
+        route_point_centerlines_.push_back(ls_i);
+      }
+    }
+    route_centerline_offsets_.push_back(route_points_.size());
+  }
+
+  size_t CARMAWorldModel::nearestRoutePoint(const lanelet::BasicPoint2d& point, size_t hint) const
+  {
+    size_t best = route_points_.size();
+    double best_dist_sq = std::numeric_limits<double>::max();
+
+    if (hint < route_points_.size())
+    {
+      // Walk along the route from the hint while the distance decreases. This usually lands on the nearest point
+      // which gives the grid search below a tight bound
+      best = hint;
+      best_dist_sq = (route_points_[best] - point).squaredNorm();
+      bool improved = true;
+      while (improved)
+      {
+        improved = false;
+        for (size_t candidate : { best - 1, best + 1 })  // best - 1 wraps to a value >= size when best is 0
+        {
+          if (candidate >= route_points_.size())
+            continue;
+          double dist_sq = (route_points_[candidate] - point).squaredNorm();
+          if (dist_sq < best_dist_sq)
+          {
+            best = candidate;
+            best_dist_sq = dist_sq;
+            improved = true;
+          }
+        }
+      }
+    }
+
+    // Search rings of grid cells around the point until no unvisited cell can contain a closer point
+    int64_t cell_x = routeGridCell(point.x(), ROUTE_GRID_CELL_SIZE);
+    int64_t cell_y = routeGridCell(point.y(), ROUTE_GRID_CELL_SIZE);
+    int64_t first_ring = std::max({ (int64_t)0, route_grid_min_x_ - cell_x, cell_x - route_grid_max_x_,
+                                    route_grid_min_y_ - cell_y, cell_y - route_grid_max_y_ });
+    int64_t last_ring = std::max({ cell_x - route_grid_min_x_, route_grid_max_x_ - cell_x,
+                                   cell_y - route_grid_min_y_, route_grid_max_y_ - cell_y });
+
+    for (int64_t ring = first_ring; ring <= last_ring; ring++)
+    {
+      // Every point in ring r is at least (r - 1) cells away from the point
+      double ring_dist = std::max((double)(ring - 1), 0.0) * ROUTE_GRID_CELL_SIZE;
+      if (ring_dist * ring_dist > best_dist_sq)
+        break;
+
+      for (int64_t x = cell_x - ring; x <= cell_x + ring; x++)
+      {
+        // Only the border of the ring is visited
+        int64_t y_step = (x == cell_x - ring || x == cell_x + ring) ? 1 : std::max((int64_t)1, 2 * ring);
+        for (int64_t y = cell_y - ring; y <= cell_y + ring; y += y_step)
+        {
+          auto cell = route_point_grid_.find(routeGridKey(x, y));
+          if (cell == route_point_grid_.end())
+            continue;
+
+          for (size_t index : cell->second)
+          {
+            double dist_sq = (route_points_[index] - point).squaredNorm();
+            if (dist_sq < best_dist_sq)
+            {
+              best = index;
+              best_dist_sq = dist_sq;
+            }
+          }
+        }
+      }
+    }
+
+    return best;
+  }
+
+  TrackPos CARMAWorldModel::routeTrackPosFromNearestPoint(const lanelet::BasicPoint2d& point, size_t nearest) const
+  {
+    size_t ls_i = route_point_centerlines_[nearest];
+    size_t ls_start = route_centerline_offsets_[ls_i];
+    size_t ls_end = route_centerline_offsets_[ls_i + 1] - 1;  // Index of the last point of the centerline
+
+    TrackPos tp(0, 0);
+    if (nearest == ls_start)
+    {  // Nearest point is at the start of a line string
+      tp = geometry::trackPos(point, route_points_[nearest], route_points_[nearest + 1]);
+
+      if (tp.downtrack >= 0 || ls_i == 0)
+      {
+        tp.downtrack += route_point_downtracks_[nearest];
+      }
+      else
+      {
+        // Use the last segment of the preceeding centerline
+        size_t prev = ls_start - 2;
+        tp = geometry::trackPos(point, route_points_[prev], route_points_[prev + 1]);
+        tp.downtrack += route_point_downtracks_[prev];
+      }
+    }
+    else if (nearest == ls_end)
+    {  // Nearest point is the end of a line string
+      tp = geometry::trackPos(point, route_points_[nearest - 1], route_points_[nearest]);
+      double last_seg_length = route_point_downtracks_[nearest] - route_point_downtracks_[nearest - 1];
+
+      if (tp.downtrack < last_seg_length || ls_i == shortest_path_centerlines_.size() - 1)
+      {
+        tp.downtrack += route_point_downtracks_[nearest - 1];
+      }
+      else
+      {
+        // Use the first segment of the succeeding centerline
+        size_t next = ls_end + 1;
+        tp = geometry::trackPos(point, route_points_[next], route_points_[next + 1]);
+        tp.downtrack += route_point_downtracks_[next];
+      }
+    }
+    else
+    {  // The nearest point is in the middle of a line string
+      lanelet::BasicLineString2d subSegment = lanelet::BasicLineString2d(
+          { route_points_[nearest - 1], route_points_[nearest], route_points_[nearest + 1] });
+
+      tp = std::get<0>(geometry::matchSegment(point, subSegment));
+      tp.downtrack += route_point_downtracks_[nearest - 1];
+    }
+
+    return tp;
+  }
+
+  double CARMAWorldModel::cachedRouteDowntrack(const lanelet::ConstPoint3d& point) const
+  {
+    {
+      std::lock_guard<std::mutex> lock(route_downtrack_cache_mutex_);
+      auto cached = route_downtrack_cache_.find(point.id());
+      if (cached != route_downtrack_cache_.end())
+      {
+        return cached->second;
+      }
+    }
+
+    double downtrack = routeTrackPos(point.basicPoint2d()).downtrack;
+
+    std::lock_guard<std::mutex> lock(route_downtrack_cache_mutex_);
+    route_downtrack_cache_[point.id()] = downtrack;
+    return downtrack;
+  }
+
   class LaneletDowntrackPair
   {
   public:
@@ -528,7 +747,7 @@ namespace carma_wm
 
   lanelet::LaneletMapConstPtr CARMAWorldModel::getMap() const
   {
-    return std::static_pointer_cast<lanelet::LaneletMap const>(semantic_map_);  // Cast pointer to const variant
+    return std::static_pointer_cast<lanelet::LaneletMap const>(std::atomic_load(&semantic_map_));  // Cast pointer to const variant
   }
 
   LaneletRouteConstPtr CARMAWorldModel::getRoute() const
@@ -544,8 +763,8 @@ namespace carma_wm
 
   void CARMAWorldModel::setMap(lanelet::LaneletMapPtr map, size_t map_version, bool recompute_routing_graph)
   {
-    // If this is the first time the map has been set, then recompute the routing graph
-    if (!semantic_map_)
+    // If this is the first time the map has been set and no graph was provided, then recompute the routing graph
+    if (!semantic_map_ && !getMapRoutingGraph())
     {
 
       RCLCPP_INFO_STREAM(rclcpp::get_logger("carma_wm"), "First time map is set in carma_wm. Routing graph will be recomputed reguardless of method inputs.");
@@ -553,36 +772,131 @@ namespace carma_wm
       recompute_routing_graph = true;
     }
 
-    semantic_map_ = map;
+    std::atomic_store(&semantic_map_, map);
     map_version_ = map_version;
 
+    {
+      std::lock_guard<std::mutex> lock(route_downtrack_cache_mutex_);
+      route_downtrack_cache_.clear();
+    }
+
     // If the routing graph should be updated then recompute it
     if (recompute_routing_graph)
     {
+      rebuildRoutingGraph();
+    }
+  }
+
+  void CARMAWorldModel::rebuildRoutingGraph()
+  {
+    RCLCPP_INFO_STREAM(rclcpp::get_logger("carma_wm"), "Building routing graph");
+
+    auto tr = getTrafficRules(participant_type_);
+
+    if (!tr)
+    {
+      throw std::invalid_argument("Could not construct traffic rules for participant");
+    }
 
-      RCLCPP_INFO_STREAM(rclcpp::get_logger("carma_wm"), "Building routing graph");
+    TrafficRulesConstPtr traffic_rules = *tr;
 
-      auto tr = getTrafficRules(participant_type_);
+    LaneletRoutingGraphPtr map_graph = lanelet::routing::RoutingGraph::build(*semantic_map_, *traffic_rules);
+    routing_graph_participant_ = participant_type_;
+    storeRoutingGraph(map_graph);
 
-      if (!tr)
+    RCLCPP_INFO_STREAM(rclcpp::get_logger("carma_wm"), "Done building routing graph");
+  }
+
+  bool CARMAWorldModel::updateRoutingGraph(const std::unordered_set<lanelet::Id>& touched_lanelets)
+  {
+    auto current_graph = std::atomic_load(&map_routing_graph_);
+    if (!current_graph || routing_graph_participant_ != participant_type_)
+    {
+      RCLCPP_INFO_STREAM(rclcpp::get_logger("carma_wm"), "No routing graph built for participant " << participant_type_ << " to update. Rebuilding the full routing graph");
+      rebuildRoutingGraph();
+      return true;
+    }
+
+    auto tr = getTrafficRules(participant_type_);
+    if (!tr)
+    {
+      throw std::invalid_argument("Could not construct traffic rules for participant");
+    }
+    TrafficRulesConstPtr traffic_rules = *tr;
+
+    // Collect the touched lanelets and every lanelet or area geometrically close enough to share a routing relation with them
+    std::unordered_set<lanelet::Id> neighborhood;
+    lanelet::ConstLanelets local_lanelets;
+    lanelet::ConstAreas local_areas;
+    lanelet::BasicPoint2d margin(ROUTING_UPDATE_SEARCH_MARGIN, ROUTING_UPDATE_SEARCH_MARGIN);
+    for (lanelet::Id id : touched_lanelets)
+    {
+      auto llt = semantic_map_->laneletLayer.find(id);
+      if (llt == semantic_map_->laneletLayer.end())
       {
-        throw std::invalid_argument("Could not construct traffic rules for participant");
+        RCLCPP_INFO_STREAM(rclcpp::get_logger("carma_wm"), "Updated lanelet " << id << " is not in the map. Rebuilding the full routing graph");
+        rebuildRoutingGraph();
+        return true;
       }
 
-      TrafficRulesConstPtr traffic_rules = *tr;
+      lanelet::BoundingBox2d box = lanelet::geometry::boundingBox2d(lanelet::ConstLanelet(*llt));
+      lanelet::BoundingBox2d search_box(lanelet::BasicPoint2d(box.min() - margin), lanelet::BasicPoint2d(box.max() + margin));
+      for (const auto& neighbor : semantic_map_->laneletLayer.search(search_box))
+      {
+        if (neighborhood.insert(neighbor.id()).second)
+        {
+          local_lanelets.push_back(neighbor);
+        }
+      }
+      for (const auto& neighbor : semantic_map_->areaLayer.search(search_box))
+      {
+        if (neighborhood.insert(neighbor.id()).second)
+        {
+          local_areas.push_back(neighbor);
+        }
+      }
+    }
 
-      lanelet::routing::RoutingGraphUPtr map_graph = lanelet::routing::RoutingGraph::build(*semantic_map_, *traffic_rules);
-      map_routing_graph_ = std::move(map_graph);
+    // Relations between two untouched lanelets do not depend on the touched lanelets, so only the relations of the touched
+    // lanelets are taken from the graph of the neighborhood. Every other relation is copied from the current graph
+    lanelet::routing::RoutingGraphUPtr local_graph;
+    if (!touched_lanelets.empty())
+    {
+      auto local_map = lanelet::utils::createConstSubmap(local_lanelets, local_areas);
+      local_graph = lanelet::routing::RoutingGraph::build(*local_map, *traffic_rules);
+    }
 
-      RCLCPP_INFO_STREAM(rclcpp::get_logger("carma_wm"), "Done building routing graph");
+    auto updated_graph = std::static_pointer_cast<const RoutingGraphAccessor>(current_graph)->rebind(semantic_map_, local_graph.get(), touched_lanelets);
+    if (!updated_graph)
+    {
+      RCLCPP_INFO_STREAM(rclcpp::get_logger("carma_wm"), "Routing graph does not match the map. Rebuilding the full routing graph");
+      rebuildRoutingGraph();
+      return true;
     }
+
+    storeRoutingGraph(updated_graph);
+
+    RCLCPP_INFO_STREAM(rclcpp::get_logger("carma_wm"), "Updated the routing graph for " << touched_lanelets.size() << " lanelets");
+    return false;
+  }
+
+  void CARMAWorldModel::storeRoutingGraph(LaneletRoutingGraphPtr graph)
+  {
+    std::atomic_store(&map_routing_graph_, graph);
+    routing_graph_version_++;
+  }
+
+  size_t CARMAWorldModel::getRoutingGraphVersion() const
+  {
+    return routing_graph_version_;
   }
 
-  void CARMAWorldModel::setRoutingGraph(LaneletRoutingGraphPtr graph) {
+  void CARMAWorldModel::setRoutingGraph(LaneletRoutingGraphPtr graph, const std::string& participant) {
 
     RCLCPP_INFO_STREAM(rclcpp::get_logger("carma_wm"), "Setting the routing graph with user or listener provided graph");
 
-    map_routing_graph_ = graph;
+    routing_graph_participant_ = participant;
+    storeRoutingGraph(graph);
   }
 
   size_t CARMAWorldModel::getMapVersion() const
@@ -592,7 +906,7 @@ namespace carma_wm
 
   lanelet::LaneletMapPtr CARMAWorldModel::getMutableMap() const
   {
-    return semantic_map_;
+    return std::atomic_load(&semantic_map_);
   }
 
   void CARMAWorldModel::setRos1Clock(const rclcpp::Time& time_now)
@@ -611,6 +925,10 @@ namespace carma_wm
     lanelet::ConstLanelets path_lanelets(route_->shortestPath().begin(), route_->shortestPath().end());
     shortest_path_view_ = lanelet::utils::createConstSubmap(path_lanelets, {});
     computeDowntrackReferenceLine();
+    {
+      std::lock_guard<std::mutex> lock(route_downtrack_cache_mutex_);
+      route_downtrack_cache_.clear();
+    }
     // NOTE: Setting the route_length_ field here will likely result in the final lanelets final point being used. Call setRouteEndPoint to use the destination point value
     route_length_ = routeTrackPos(route_->getEndPoint().basicPoint2d()).downtrack;  // Cache the route length with
                                                                                    // consideration for endpoint
@@ -659,11 +977,13 @@ namespace carma_wm
     IndexedDistanceMap distance_map;
 
     lanelet::routing::LaneletPath shortest_path = route_->shortestPath();
-    // Build shortest path routing graph
-    TrafficRulesConstPtr traffic_rules = *(getTrafficRules(participant_type_ ));
 
-    lanelet::routing::RoutingGraphUPtr shortest_path_graph =
-        lanelet::routing::RoutingGraph::build(*shortest_path_view_, *traffic_rules);
+    // The route already holds the following relations of its lanelets, so no routing graph is built for the shortest path
+    std::unordered_set<lanelet::Id> shortest_path_ids;
+    for (const auto& ll : shortest_path)
+    {
+      shortest_path_ids.insert(ll.id());
+    }
 
     std::vector<lanelet::LineString3d> lineStrings;  // List of continuos line strings representing segments of the route
                                                     // reference line
@@ -683,7 +1003,12 @@ namespace carma_wm
       {  // Check for remaining lanelets
         auto nextLanelet = shortest_path[next_index];
         lanelet::LineString3d nextCenterline = copyConstructLineString(nextLanelet.centerline());
-        size_t connectionCount = shortest_path_graph->possiblePaths(ll, (uint32_t)2, false).size();
+        size_t connectionCount = 0;  // Number of lanelets on the shortest path directly following ll without a lane change
+        for (const auto& relation : route_->followingRelations(ll))
+        {
+          if (shortest_path_ids.find(relation.lanelet.id()) != shortest_path_ids.end())
+            connectionCount++;
+        }
 
         if (connectionCount == 1)
         {  // Get list of connected lanelets without lanechanges. On the shortest path this should only return 1 or 0
@@ -733,12 +1058,15 @@ namespace carma_wm
     // Since our copy constructed linestrings do not contain references to lanelets they can be added to a full map
     // instead of a submap
     shortest_path_filtered_centerline_view_ = lanelet::utils::createMap(shortest_path_centerlines_);
+
+    computeRoutePointIndex();
   }
 
   LaneletRoutingGraphConstPtr CARMAWorldModel::getMapRoutingGraph() const
   {
-    return std::static_pointer_cast<const lanelet::routing::RoutingGraph>(map_routing_graph_);  // Cast pointer to const
-                                                                                               // variant
+    // The graph is replaced atomically so readers always get a complete snapshot without locking
+    return std::static_pointer_cast<const lanelet::routing::RoutingGraph>(std::atomic_load(&map_routing_graph_));  // Cast pointer to const
+                                                                                                                // variant
   }
 
   lanelet::Optional<TrafficRulesConstPtr> CARMAWorldModel::getTrafficRules(const std::string& participant) const
@@ -865,6 +1193,8 @@ namespace carma_wm
       obj_idxs_queue.push((int)i);
     }
 
+    auto routing_graph = getMapRoutingGraph();
+
     // check each lanelets
     for (auto llt : lane)
     {
@@ -885,8 +1215,8 @@ namespace carma_wm
         }
         // handle a case where an object might be lane-changing, so check adjacent ids
         // a bit faster than checking intersection solely as && is left-to-right evaluation
-        else if (((map_routing_graph_->left(llt) && curr_obj.lanelet_id == map_routing_graph_->left(llt).get().id()) ||
-                  (map_routing_graph_->right(llt) && curr_obj.lanelet_id == map_routing_graph_->right(llt).get().id())) &&
+        else if (((routing_graph->left(llt) && curr_obj.lanelet_id == routing_graph->left(llt).get().id()) ||
+                  (routing_graph->right(llt) && curr_obj.lanelet_id == routing_graph->right(llt).get().id())) &&
                  boost::geometry::intersects(
                      llt.polygon2d().basicPolygon(),
                      geometry::objectToMapPolygon(curr_obj.object.pose.pose, curr_obj.object.size)))
@@ -1014,6 +1344,8 @@ namespace carma_wm
       obj_idxs_queue.push((int)i);
     }
 
+    auto routing_graph = getMapRoutingGraph();
+
     // For each lanelet, check if each object is inside it. if so, calculate downtrack
     for (auto llt : lane_section)
     {
@@ -1034,10 +1366,10 @@ namespace carma_wm
           object_idxs.push_back(curr_idx);
         }
         // if it's not on it, try adjacent lanelets because the object could be lane changing
-        else if ((map_routing_graph_->left(llt) &&
-                  lane_objects[curr_idx].lanelet_id == map_routing_graph_->left(llt).get().id()) ||
-                 (map_routing_graph_->right(llt) &&
-                  lane_objects[curr_idx].lanelet_id == map_routing_graph_->right(llt).get().id()))
+        else if ((routing_graph->left(llt) &&
+                  lane_objects[curr_idx].lanelet_id == routing_graph->left(llt).get().id()) ||
+                 (routing_graph->right(llt) &&
+                  lane_objects[curr_idx].lanelet_id == routing_graph->right(llt).get().id()))
         {
           // no need to check intersection as the objects are guaranteed to be intersecting this lane
           lanelet::BasicPoint2d obj_center(lane_objects[curr_idx].object.pose.pose.position.x,
@@ -1119,23 +1451,24 @@ namespace carma_wm
     std::vector<lanelet::ConstLanelet> following_lane = {lanelet};
     std::stack<lanelet::ConstLanelet> prev_lane_helper;
     std::vector<lanelet::ConstLanelet> prev_lane;
-    std::vector<lanelet::ConstLanelet> connecting_lanelet = map_routing_graph_->following(lanelet, false);
+    auto routing_graph = getMapRoutingGraph();
+    std::vector<lanelet::ConstLanelet> connecting_lanelet = routing_graph->following(lanelet, false);
 
     // if only interested in following lanelets, as it is the most case
     while (connecting_lanelet.size() != 0)
     {
       following_lane.push_back(connecting_lanelet[0]);
-      connecting_lanelet = map_routing_graph_->following(connecting_lanelet[0], false);
+      connecting_lanelet = routing_graph->following(connecting_lanelet[0], false);
     }
     if (section == LANE_AHEAD)
       return following_lane;
 
     // if interested in lanelets behind
-    connecting_lanelet = map_routing_graph_->previous(lanelet, false);
+    connecting_lanelet = routing_graph->previous(lanelet, false);
     while (connecting_lanelet.size() != 0)
     {
       prev_lane_helper.push(connecting_lanelet[0]);
-      connecting_lanelet = map_routing_graph_->previous(connecting_lanelet[0], false);
+      connecting_lanelet = routing_graph->previous(connecting_lanelet[0], false);
     }
 
     // gather all lanelets with correct start order
@@ -1233,7 +1566,7 @@ namespace carma_wm
         }
         else
         {
-          double light_downtrack = routeTrackPos(stop_line.get().front().basicPoint2d()).downtrack;
+          double light_downtrack = cachedRouteDowntrack(stop_line.get().front());
           double distance_remaining_to_traffic_light = light_downtrack - curr_downtrack;
 
           if (distance_remaining_to_traffic_light < 0)
@@ -1323,7 +1656,7 @@ namespace carma_wm
       }
       for (auto intersection : intersections)
       {
-        double intersection_downtrack = routeTrackPos(intersection->stopLines().front().front().basicPoint2d()).downtrack;
+        double intersection_downtrack = cachedRouteDowntrack(intersection->stopLines().front().front());
         if (intersection_downtrack < curr_downtrack)
         {
           continue;
@@ -1360,7 +1693,7 @@ namespace carma_wm
       }
       for (auto intersection : intersections)
       {
-        double intersection_downtrack = routeTrackPos(ll.centerline().back().basicPoint2d()).downtrack;
+        double intersection_downtrack = cachedRouteDowntrack(ll.centerline().back());
         if (intersection_downtrack < curr_downtrack)
         {
           continue;
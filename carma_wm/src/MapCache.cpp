@@ -0,0 +1,587 @@
+/*
+ * Copyright (C) 2024 LEIDOS.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may not
+ * use this file except in compliance with the License. You may obtain a copy of
+ * the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations under
+ * the License.
+ */
+
+#include <algorithm>
+#include <cerrno>
+#include <cstddef>
+#include <cstring>
+#include <filesystem>
+#include <fstream>
+#include <iomanip>
+#include <memory>
+#include <sstream>
+#include <type_traits>
+#include <unordered_map>
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#include <openssl/evp.h>
+#include <lanelet2_core/utility/Utilities.h>
+#include <lanelet2_routing/internal/Graph.h>
+#include <rclcpp/rclcpp.hpp>
+#include "carma_wm/MapCache.hpp"
+
+namespace carma_wm
+{
+namespace
+{
+constexpr char IMAGE_MAGIC[8] = { 'C', 'W', 'M', 'C', 'A', 'C', 'H', 'E' };
+
+enum class ImageKind : uint32_t
+{
+  MAP = 1,
+  ROUTING_GRAPH = 2
+};
+
+constexpr size_t DIGEST_SIZE = 32;  // SHA-256
+
+/*! \brief Header at the start of every image file
+ */
+struct ImageHeader
+{
+  char magic[8];
+  uint32_t image_version;
+  ImageKind kind;
+  unsigned char payload_digest[DIGEST_SIZE];  // SHA-256 of every byte following the header
+};
+
+/*! \brief Follows the header of a map image. It is followed by data_size bytes of map message data
+ */
+struct MapSection
+{
+  uint64_t data_size;
+};
+
+/*! \brief Follows the header of a routing graph image. It is followed by the GraphVertex array of the lanelet vertices, the
+ *         GraphVertex array of the area vertices and the GraphEdge array of all the edges, grouped by source vertex
+ */
+struct GraphSection
+{
+  uint64_t num_unique_routing_cost_ids;
+  uint64_t lanelet_vertex_count;
+  uint64_t area_vertex_count;
+  uint64_t edge_count;
+  char participant[64];  // Null terminated
+};
+
+struct GraphVertex
+{
+  int64_t lanelet_or_area;
+  uint64_t first_edge;
+  uint64_t edge_count;
+};
+
+struct GraphEdge
+{
+  int64_t lanelet_or_area;
+  double routing_cost;
+  uint64_t routing_cost_source_id;
+  uint64_t relation;
+};
+
+static_assert(std::is_trivially_copyable<ImageHeader>::value && std::is_trivially_copyable<MapSection>::value &&
+                  std::is_trivially_copyable<GraphSection>::value && std::is_trivially_copyable<GraphVertex>::value &&
+                  std::is_trivially_copyable<GraphEdge>::value,
+              "Image sections must be readable in place from the mapped file");
+
+/*! \brief Computes the SHA-256 digest of a buffer
+ */
+void sha256(const void* data, size_t size, unsigned char (&digest)[DIGEST_SIZE])
+{
+  unsigned int digest_size = 0;
+  EVP_Digest(data, size, digest, &digest_size, EVP_sha256(), nullptr);
+}
+
+/*! \brief Read only memory mapping of a whole file. The mapping is released on destruction
+ */
+class MappedFile
+{
+public:
+  explicit MappedFile(const std::string& path)
+  {
+    int fd = ::open(path.c_str(), O_RDONLY);
+    if (fd < 0)
+    {
+      return;  // No entry
+    }
+
+    struct stat file_stat;
+    if (::fstat(fd, &file_stat) == 0 && file_stat.st_size > 0)
+    {
+      void* data = ::mmap(nullptr, file_stat.st_size, PROT_READ, MAP_PRIVATE, fd, 0);
+      if (data != MAP_FAILED)
+      {
+        data_ = static_cast<const char*>(data);
+        size_ = file_stat.st_size;
+      }
+      else
+      {
+        RCLCPP_WARN_STREAM(rclcpp::get_logger("carma_wm::MapCache"), "Failed to map cache file: " << path << " Error: " << std::strerror(errno));
+      }
+    }
+    ::close(fd);  // The mapping stays valid after the file is closed
+  }
+
+  ~MappedFile()
+  {
+    if (data_)
+    {
+      ::munmap(const_cast<char*>(data_), size_);
+    }
+  }
+
+  MappedFile(const MappedFile&) = delete;
+  MappedFile& operator=(const MappedFile&) = delete;
+
+  /*! \brief Returns a pointer to count objects of type T at offset, or nullptr if the file is too small to hold them
+   */
+  template <class T>
+  const T* at(size_t offset, size_t count = 1) const
+  {
+    if (!data_ || offset % alignof(T) != 0 || offset > size_ || count > (size_ - offset) / sizeof(T))
+    {
+      return nullptr;
+    }
+    return reinterpret_cast<const T*>(data_ + offset);
+  }
+
+  /*! \brief Returns the header of the image if the file is an image of the provided kind written with the current layout
+   *         and its content matches the digest stored in the header
+   */
+  const ImageHeader* header(ImageKind kind, const std::string& path) const
+  {
+    const ImageHeader* header = at<ImageHeader>(0);
+    if (!header || std::memcmp(header->magic, IMAGE_MAGIC, sizeof(IMAGE_MAGIC)) != 0 ||
+        header->image_version != MapCache::IMAGE_VERSION || header->kind != kind)
+    {
+      return nullptr;
+    }
+
+    unsigned char digest[DIGEST_SIZE];
+    sha256(data_ + sizeof(ImageHeader), size_ - sizeof(ImageHeader), digest);
+    if (std::memcmp(digest, header->payload_digest, DIGEST_SIZE) != 0)
+    {
+      RCLCPP_WARN_STREAM(rclcpp::get_logger("carma_wm::MapCache"), "Ignoring corrupted map cache file: " << path);
+      return nullptr;
+    }
+    return header;
+  }
+
+private:
+  const char* data_ = nullptr;
+  size_t size_ = 0;
+};
+
+/*! \brief Writes a file. The file is written under a temporary name then renamed so a partially written file is never read.
+ */
+bool writeFile(const std::string& path, const std::string& data)
+{
+  std::error_code ec;
+  std::filesystem::create_directories(std::filesystem::path(path).parent_path(), ec);
+  if (ec)
+  {
+    RCLCPP_WARN_STREAM(rclcpp::get_logger("carma_wm::MapCache"), "Failed to create map cache directory for: " << path << " Error: " << ec.message());
+    return false;
+  }
+
+  std::string tmp_path = path + ".tmp";
+  {
+    std::ofstream file(tmp_path, std::ios::binary | std::ios::trunc);
+    if (!file.write(data.data(), data.size()))
+    {
+      RCLCPP_WARN_STREAM(rclcpp::get_logger("carma_wm::MapCache"), "Failed to write map cache file: " << path);
+      return false;
+    }
+  }
+
+  std::filesystem::rename(tmp_path, path, ec);
+  if (ec)
+  {
+    RCLCPP_WARN_STREAM(rclcpp::get_logger("carma_wm::MapCache"), "Failed to write map cache file: " << path << " Error: " << ec.message());
+    return false;
+  }
+
+  return true;
+}
+
+/*! \brief Appends the bytes of trivially copyable objects to an image being written
+ */
+template <class T>
+void append(std::string& image, const T* objects, size_t count = 1)
+{
+  image.append(reinterpret_cast<const char*>(objects), sizeof(T) * count);
+}
+
+ImageHeader imageHeader(ImageKind kind)
+{
+  ImageHeader header{};
+  std::memcpy(header.magic, IMAGE_MAGIC, sizeof(IMAGE_MAGIC));
+  header.image_version = MapCache::IMAGE_VERSION;
+  header.kind = kind;
+  return header;
+}
+
+/*! \brief Stores the digest of the content of a complete image in its header
+ */
+void signImage(std::string& image)
+{
+  unsigned char digest[DIGEST_SIZE];
+  sha256(image.data() + sizeof(ImageHeader), image.size() - sizeof(ImageHeader), digest);
+  std::memcpy(&image[offsetof(ImageHeader, payload_digest)], digest, DIGEST_SIZE);
+}
+
+/*! \brief Adds a length prefixed field to a digest, so the boundaries between fields are part of the digest
+ */
+void digestField(EVP_MD_CTX* ctx, const void* data, uint64_t size)
+{
+  EVP_DigestUpdate(ctx, &size, sizeof(size));
+  EVP_DigestUpdate(ctx, data, size);
+}
+
+std::string routingGraphFileName(std::string participant)
+{
+  std::replace(participant.begin(), participant.end(), ':', '_');  // Participant types look like vehicle:car
+  return "routing_graph_" + participant + ".img";
+}
+
+lanelet::routing::RelationType relationFromMsg(uint8_t relation)
+{
+  switch (relation)
+  {
+    case autoware_lanelet2_msgs::msg::RoutingGraphVertexAndEdges::RELATION_SUCCESSOR:
+      return lanelet::routing::RelationType::Successor;
+
+    case autoware_lanelet2_msgs::msg::RoutingGraphVertexAndEdges::RELATION_LEFT:
+      return lanelet::routing::RelationType::Left;
+
+    case autoware_lanelet2_msgs::msg::RoutingGraphVertexAndEdges::RELATION_RIGHT:
+      return lanelet::routing::RelationType::Right;
+
+    case autoware_lanelet2_msgs::msg::RoutingGraphVertexAndEdges::RELATION_ADJACENT_LEFT:
+      return lanelet::routing::RelationType::AdjacentLeft;
+
+    case autoware_lanelet2_msgs::msg::RoutingGraphVertexAndEdges::RELATION_ADJACENT_RIGHT:
+      return lanelet::routing::RelationType::AdjacentRight;
+
+    case autoware_lanelet2_msgs::msg::RoutingGraphVertexAndEdges::RELATION_CONFLICTING:
+      return lanelet::routing::RelationType::Conflicting;
+
+    case autoware_lanelet2_msgs::msg::RoutingGraphVertexAndEdges::RELATION_AREA:
+      return lanelet::routing::RelationType::Area;
+
+    default:  // Treat default as RELATION_NONE
+      return lanelet::routing::RelationType::None;
+  }
+}
+}  // namespace
+
+MapCache::MapCache(const std::string& cache_dir) : cache_dir_(cache_dir)
+{
+}
+
+std::string MapCache::contentKey(const autoware_lanelet2_msgs::msg::MapBin& map_msg, const std::string& params)
+{
+  std::ostringstream format_version;
+  format_version << map_msg.format_version;
+
+  std::unique_ptr<EVP_MD_CTX, decltype(&EVP_MD_CTX_free)> ctx(EVP_MD_CTX_new(), EVP_MD_CTX_free);
+  EVP_DigestInit_ex(ctx.get(), EVP_sha256(), nullptr);
+
+  uint32_t image_version = IMAGE_VERSION;
+  digestField(ctx.get(), &image_version, sizeof(image_version));
+  digestField(ctx.get(), format_version.str().data(), format_version.str().size());
+  digestField(ctx.get(), params.data(), params.size());
+  digestField(ctx.get(), map_msg.data.data(), map_msg.data.size());
+
+  unsigned char digest[EVP_MAX_MD_SIZE];
+  unsigned int digest_size = 0;
+  EVP_DigestFinal_ex(ctx.get(), digest, &digest_size);
+
+  std::ostringstream key;
+  key << std::hex << std::setfill('0');
+  for (unsigned int i = 0; i < digest_size; ++i)
+  {
+    key << std::setw(2) << static_cast<int>(digest[i]);
+  }
+  return key.str();
+}
+
+std::string MapCache::entryFile(const std::string& key, const std::string& name) const
+{
+  return (std::filesystem::path(cache_dir_) / key / name).string();
+}
+
+bool MapCache::loadMap(const std::string& key, autoware_lanelet2_msgs::msg::MapBin& map_msg) const
+{
+  std::string path = entryFile(key, "map.img");
+  MappedFile file(path);
+  const ImageHeader* header = file.header(ImageKind::MAP, path);
+  if (!header)
+  {
+    return false;  // No entry, written with another layout or corrupted
+  }
+
+  const MapSection* section = file.at<MapSection>(sizeof(ImageHeader));
+  using DataType = std::remove_reference<decltype(map_msg.data)>::type::value_type;
+  const DataType* data = section ? file.at<DataType>(sizeof(ImageHeader) + sizeof(MapSection), section->data_size) : nullptr;
+  if (!data)
+  {
+    RCLCPP_WARN_STREAM(rclcpp::get_logger("carma_wm::MapCache"), "Ignoring truncated map cache file: " << path);
+    return false;
+  }
+
+  map_msg.data.assign(data, data + section->data_size);
+  return true;
+}
+
+bool MapCache::storeMap(const std::string& key, const autoware_lanelet2_msgs::msg::MapBin& map_msg) const
+{
+  std::string image;
+  image.reserve(sizeof(ImageHeader) + sizeof(MapSection) + map_msg.data.size());
+
+  ImageHeader header = imageHeader(ImageKind::MAP);
+  MapSection section{ map_msg.data.size() };
+  append(image, &header);
+  append(image, &section);
+  append(image, map_msg.data.data(), map_msg.data.size());
+  signImage(image);
+
+  return writeFile(entryFile(key, "map.img"), image);
+}
+
+LaneletRoutingGraphPtr MapCache::loadRoutingGraph(const std::string& key, const std::string& participant,
+                                                  const lanelet::LaneletMapPtr& map) const
+{
+  std::string path = entryFile(key, routingGraphFileName(participant));
+  MappedFile file(path);
+  if (!file.header(ImageKind::ROUTING_GRAPH, path))
+  {
+    return nullptr;  // No entry, written with another layout or corrupted
+  }
+
+  size_t offset = sizeof(ImageHeader);
+  const GraphSection* section = file.at<GraphSection>(offset);
+  offset += sizeof(GraphSection);
+  const GraphVertex* vertices = section ? file.at<GraphVertex>(offset, section->lanelet_vertex_count + section->area_vertex_count) : nullptr;
+  offset += section ? sizeof(GraphVertex) * (section->lanelet_vertex_count + section->area_vertex_count) : 0;
+  const GraphEdge* edges = vertices ? file.at<GraphEdge>(offset, section->edge_count) : nullptr;
+  if (!edges)
+  {
+    RCLCPP_WARN_STREAM(rclcpp::get_logger("carma_wm::MapCache"), "Ignoring truncated map cache file: " << path);
+    return nullptr;
+  }
+
+  if (std::string(section->participant, strnlen(section->participant, sizeof(section->participant))) != participant)
+  {
+    return nullptr;
+  }
+
+  size_t vertex_count = section->lanelet_vertex_count + section->area_vertex_count;
+
+  // Get the passable lanelets and areas in the order of the vertices
+  lanelet::ConstLanelets passable_lanelets;
+  lanelet::ConstAreas passable_areas;
+  std::vector<lanelet::ConstLaneletOrArea> vertex_primitives;
+  passable_lanelets.reserve(section->lanelet_vertex_count);
+  passable_areas.reserve(section->area_vertex_count);
+  vertex_primitives.reserve(vertex_count);
+
+  std::unordered_map<lanelet::Id, size_t> vertex_index;
+  try
+  {
+    for (size_t i = 0; i < vertex_count; ++i)
+    {
+      if (i < section->lanelet_vertex_count)
+      {
+        passable_lanelets.emplace_back(map->laneletLayer.get(vertices[i].lanelet_or_area));
+        vertex_primitives.emplace_back(passable_lanelets.back());
+      }
+      else
+      {
+        passable_areas.emplace_back(map->areaLayer.get(vertices[i].lanelet_or_area));
+        vertex_primitives.emplace_back(passable_areas.back());
+      }
+      vertex_index[vertices[i].lanelet_or_area] = i;
+    }
+  }
+  catch (const lanelet::NoSuchPrimitiveError& e)
+  {
+    RCLCPP_WARN_STREAM(rclcpp::get_logger("carma_wm::MapCache"), "Cached routing graph does not match the cached map: " << path << " Error: " << e.what());
+    return nullptr;
+  }
+
+  auto passable_map = lanelet::utils::createConstSubmap(passable_lanelets, passable_areas);
+  auto graph = std::make_unique<lanelet::routing::internal::RoutingGraphGraph>(section->num_unique_routing_cost_ids);
+
+  for (const auto& primitive : vertex_primitives)
+  {
+    graph->addVertex(lanelet::routing::internal::VertexInfo{ primitive });
+  }
+
+  for (size_t i = 0; i < vertex_count; ++i)
+  {
+    if (vertices[i].first_edge > section->edge_count || vertices[i].edge_count > section->edge_count - vertices[i].first_edge)
+    {
+      RCLCPP_WARN_STREAM(rclcpp::get_logger("carma_wm::MapCache"), "Ignoring corrupted map cache file: " << path);
+      return nullptr;
+    }
+
+    for (const GraphEdge* edge = edges + vertices[i].first_edge; edge != edges + vertices[i].first_edge + vertices[i].edge_count; ++edge)
+    {
+      auto target = vertex_index.find(edge->lanelet_or_area);
+      if (target == vertex_index.end())
+      {
+        RCLCPP_WARN_STREAM(rclcpp::get_logger("carma_wm::MapCache"), "Ignoring corrupted map cache file: " << path);
+        return nullptr;
+      }
+
+      graph->addEdge(vertex_primitives[i], vertex_primitives[target->second],
+                     lanelet::routing::internal::EdgeInfo{ edge->routing_cost,
+                                                           static_cast<lanelet::routing::RoutingCostId>(edge->routing_cost_source_id),
+                                                           relationFromMsg(static_cast<uint8_t>(edge->relation)) });
+    }
+  }
+
+  return std::make_shared<lanelet::routing::RoutingGraph>(std::move(graph), std::move(passable_map));
+}
+
+bool MapCache::storeRoutingGraph(const std::string& key, const autoware_lanelet2_msgs::msg::RoutingGraph& graph_msg) const
+{
+  GraphSection section{};
+  if (graph_msg.participant_type.size() >= sizeof(section.participant))
+  {
+    RCLCPP_WARN_STREAM(rclcpp::get_logger("carma_wm::MapCache"), "Not caching routing graph of participant type: " << graph_msg.participant_type);
+    return false;
+  }
+
+  section.num_unique_routing_cost_ids = graph_msg.num_unique_routing_cost_ids;
+  section.lanelet_vertex_count = graph_msg.lanelet_vertices.size();
+  section.area_vertex_count = graph_msg.area_vertices.size();
+  std::memcpy(section.participant, graph_msg.participant_type.data(), graph_msg.participant_type.size());
+
+  std::vector<GraphVertex> vertices;
+  std::vector<GraphEdge> edges;
+  vertices.reserve(section.lanelet_vertex_count + section.area_vertex_count);
+
+  for (const auto* vertex_list : { &graph_msg.lanelet_vertices, &graph_msg.area_vertices })
+  {
+    for (const auto& vertex : *vertex_list)
+    {
+      vertices.push_back(GraphVertex{ vertex.lanelet_or_area, edges.size(), vertex.lanelet_or_area_ids.size() });
+      for (size_t j = 0; j < vertex.lanelet_or_area_ids.size(); ++j)
+      {
+        edges.push_back(GraphEdge{ vertex.lanelet_or_area_ids[j], vertex.edge_routing_costs[j],
+                                   vertex.edge_routing_cost_source_ids[j], vertex.edge_relations[j] });
+      }
+    }
+  }
+  section.edge_count = edges.size();
+
+  std::string image;
+  ImageHeader header = imageHeader(ImageKind::ROUTING_GRAPH);
+  append(image, &header);
+  append(image, &section);
+  append(image, vertices.data(), vertices.size());
+  append(image, edges.data(), edges.size());
+  signImage(image);
+
+  return writeFile(entryFile(key, routingGraphFileName(graph_msg.participant_type)), image);
+}
+
+LaneletRoutingGraphPtr routingGraphFromMsg(const autoware_lanelet2_msgs::msg::RoutingGraph& msg, const lanelet::LaneletMapPtr& map)
+{
+  // Get the lists of passable lanelets and areas
+  // Both these lists must be populated in the same order as the message to support later logic
+  lanelet::ConstLanelets passable_lanelets;
+  lanelet::ConstAreas passable_areas;
+
+  passable_lanelets.reserve(msg.lanelet_vertices.size());
+  passable_areas.reserve(msg.area_vertices.size());
+
+  try
+  {
+    // All the passable lanelets and areas should be included as a vertext so just iterate over each and store
+    for (const auto& vertex : msg.lanelet_vertices)
+    {
+      passable_lanelets.emplace_back(map->laneletLayer.get(vertex.lanelet_or_area));
+    }
+
+    for (const auto& vertex : msg.area_vertices)
+    {
+      passable_areas.emplace_back(map->areaLayer.get(vertex.lanelet_or_area));
+    }
+  }
+  catch (const lanelet::NoSuchPrimitiveError& e)
+  {
+    RCLCPP_ERROR_STREAM(rclcpp::get_logger("carma_wm"), "Routing graph specifies lanelets which do not match the current map version. Actual exception: " << e.what());
+
+    return nullptr;
+  }
+
+  // Build the submap
+  // This operation does increase in time as the number of lanelets and areas increase
+  // however testing shows it to less than 1% of the total routing graph build time so this is a reasonable operation to keep
+  auto passable_map = lanelet::utils::createConstSubmap(passable_lanelets, passable_areas);
+
+  // This is the actual graph object which is used to initialize a RoutingGraph
+  auto graph = std::make_unique<lanelet::routing::internal::RoutingGraphGraph>(msg.num_unique_routing_cost_ids);
+
+  // Vertex must be added first then the edge can be added
+  for (const auto& ll : passable_lanelets)
+  {
+    graph->addVertex(lanelet::routing::internal::VertexInfo{ ll });
+  }
+
+  for (const auto& area : passable_areas)
+  {
+    graph->addVertex(lanelet::routing::internal::VertexInfo{ area });
+  }
+
+  // Now we can add edges
+  for (size_t i = 0; i < msg.lanelet_vertices.size(); ++i)
+  {
+    const auto& vertex = msg.lanelet_vertices[i];
+    auto lanelet = passable_lanelets[i];  // passable_lanelets should be in the same order based on how its constructed
+
+    for (size_t j = 0; j < vertex.lanelet_or_area_ids.size(); ++j)
+    {
+      lanelet::routing::RelationType relation = relationFromMsg(vertex.edge_relations[j]);
+
+      try
+      {
+        // Create edge
+        graph->addEdge(
+          lanelet,
+          map->laneletLayer.get(vertex.lanelet_or_area_ids[j]),
+          lanelet::routing::internal::EdgeInfo{ vertex.edge_routing_costs[j], vertex.edge_routing_cost_source_ids[j], relation }
+        );
+      }
+      catch (const lanelet::NoSuchPrimitiveError& e)
+      {
+        RCLCPP_ERROR_STREAM(rclcpp::get_logger("carma_wm"), "Routing graph specifies lanelets which do not match the current map version. Not found lanelet or area: "
+          << vertex.lanelet_or_area_ids[j] << " Actual exception: " << e.what());
+
+        return nullptr;
+      }
+    }
+  }
+
+  // Build and return the final initialized routing graph
+  return std::make_shared<lanelet::routing::RoutingGraph>(std::move(graph), std::move(passable_map));
+}
+
+}  // namespace carma_wm
@@ -0,0 +1,168 @@
+#pragma once
+
+/*
+ * Copyright (C) 2024 LEIDOS.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may not
+ * use this file except in compliance with the License. You may obtain a copy of
+ * the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations under
+ * the License.
+ */
+
+#include <unordered_map>
+#include <unordered_set>
+#include <vector>
+#include <boost/range/iterator_range.hpp>
+#include <lanelet2_core/LaneletMap.h>
+#include <lanelet2_routing/RoutingGraph.h>
+#include <lanelet2_routing/internal/Graph.h>
+#include "carma_wm/WorldModel.hpp"
+
+namespace carma_wm
+{
+/**
+ * \brief This class serves as a method of exposing the internal protected members of the lanelet2 RoutingGraph.
+ *        This allows a graph to be copied onto another map, and parts of it to be replaced, without building it again.
+ *        Instances are never created, a RoutingGraph is cast to this class instead.
+ *
+ *  ASSUMPTION: Note this class is heavily dependant on the non-public implementation API of lanelet2 (v1.1.1).
+ *              Any change to the underlying data structures may negatively impact this classes performance or ability to compile.
+ */
+class RoutingGraphAccessor : public lanelet::routing::RoutingGraph
+{
+public:
+  /**
+   * \brief Returns a copy of this graph which references the lanelets and areas of map with the same ids.
+   *        The vertices and edges of the lanelets in replaced_lanelets are taken from local_graph instead of this graph.
+   *        local_graph must be built with the same traffic rules and routing costs for a submap of map, which holds the
+   *        replaced lanelets and every lanelet and area they can share a relation with.
+   *
+   * \param map The map the copy references
+   * \param local_graph The graph providing the relations of the replaced lanelets. May be null if no lanelet is replaced
+   * \param replaced_lanelets The ids of the lanelets whose relations are taken from local_graph
+   *
+   * \return The copy, or nullptr if one of the graphs references a lanelet or area which is not in map,
+   *         or if both graphs do not use the same number of routing costs
+   */
+  LaneletRoutingGraphPtr rebind(const lanelet::LaneletMapPtr& map, const lanelet::routing::RoutingGraph* local_graph = nullptr,
+                                const std::unordered_set<lanelet::Id>& replaced_lanelets = {}) const
+  {
+    const auto& graph = this->graph_->get();
+
+    lanelet::ConstLanelets passable_lanelets;
+    lanelet::ConstAreas passable_areas;
+    std::vector<lanelet::ConstLaneletOrArea> vertex_primitives;
+    std::unordered_map<lanelet::Id, lanelet::ConstLaneletOrArea> primitives_by_id;
+
+    // Returns false if the primitive is not in the map
+    auto add_vertex = [&](const lanelet::ConstLaneletOrArea& primitive) {
+      if (primitive.isLanelet())
+      {
+        auto llt = map->laneletLayer.find(primitive.id());
+        if (llt == map->laneletLayer.end())
+        {
+          return false;
+        }
+        passable_lanelets.emplace_back(*llt);
+        vertex_primitives.emplace_back(passable_lanelets.back());
+      }
+      else
+      {
+        auto area = map->areaLayer.find(primitive.id());
+        if (area == map->areaLayer.end())
+        {
+          return false;
+        }
+        passable_areas.emplace_back(*area);
+        vertex_primitives.emplace_back(passable_areas.back());
+      }
+      primitives_by_id.emplace(primitive.id(), vertex_primitives.back());
+      return true;
+    };
+
+    auto is_replaced = [&replaced_lanelets](const lanelet::ConstLaneletOrArea& primitive) {
+      return primitive.isLanelet() && replaced_lanelets.find(primitive.id()) != replaced_lanelets.end();
+    };
+
+    // Type will be boost::adjacency_list<boost::vecS, boost::vecS, boost::bidirectionalS, VertexInfo, EdgeInfo>
+    // As version of lanelet2 used when writing this function
+    for (auto vertex : boost::make_iterator_range(boost::vertices(graph)))
+    {
+      if (!is_replaced(graph[vertex].laneletOrArea) && !add_vertex(graph[vertex].laneletOrArea))
+      {
+        return nullptr;
+      }
+    }
+
+    const lanelet::routing::internal::GraphType* local = nullptr;
+    if (local_graph)
+    {
+      const auto& local_internal_graph = *static_cast<const RoutingGraphAccessor*>(local_graph)->graph_;
+      if (local_internal_graph.numRoutingCosts() != this->graph_->numRoutingCosts())
+      {
+        return nullptr;
+      }
+      local = &local_internal_graph.get();
+
+      // Replaced lanelets which are not passable anymore are not in the local graph
+      for (auto vertex : boost::make_iterator_range(boost::vertices(*local)))
+      {
+        if (is_replaced((*local)[vertex].laneletOrArea) && !add_vertex((*local)[vertex].laneletOrArea))
+        {
+          return nullptr;
+        }
+      }
+    }
+
+    auto rebound_graph = std::make_unique<lanelet::routing::internal::RoutingGraphGraph>(this->graph_->numRoutingCosts());
+
+    // Vertex must be added first then the edge can be added
+    for (const auto& primitive : vertex_primitives)
+    {
+      rebound_graph->addVertex(lanelet::routing::internal::VertexInfo{ primitive });
+    }
+
+    for (auto edge : boost::make_iterator_range(boost::edges(graph)))
+    {
+      const auto& source = graph[boost::source(edge, graph)].laneletOrArea;
+      const auto& target = graph[boost::target(edge, graph)].laneletOrArea;
+      if (!is_replaced(source) && !is_replaced(target))
+      {
+        rebound_graph->addEdge(primitives_by_id.at(source.id()), primitives_by_id.at(target.id()), graph[edge]);
+      }
+    }
+
+    if (local)
+    {
+      // The relations between the replaced lanelets and their neighbors, in both directions
+      for (auto edge : boost::make_iterator_range(boost::edges(*local)))
+      {
+        const auto& source = (*local)[boost::source(edge, *local)].laneletOrArea;
+        const auto& target = (*local)[boost::target(edge, *local)].laneletOrArea;
+        if (!is_replaced(source) && !is_replaced(target))
+        {
+          continue;
+        }
+
+        auto from = primitives_by_id.find(source.id());
+        auto to = primitives_by_id.find(target.id());
+        if (from == primitives_by_id.end() || to == primitives_by_id.end())
+        {
+          return nullptr;  // A neighbor which is passable in the local graph only
+        }
+        rebound_graph->addEdge(from->second, to->second, (*local)[edge]);
+      }
+    }
+
+    return std::make_shared<lanelet::routing::RoutingGraph>(std::move(rebound_graph),
+                                                            lanelet::utils::createConstSubmap(passable_lanelets, passable_areas));
+  }
+};
+}  // namespace carma_wm
@@ -0,0 +1,287 @@
+/*
+ * Copyright (C) 2024 LEIDOS.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may not
+ * use this file except in compliance with the License. You may obtain a copy of
+ * the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations under
+ * the License.
+ */
+
+#include <string_view>
+#include <autoware_lanelet2_ros2_interface/utility/message_conversion.hpp>
+#include <lanelet2_extension/regulatory_elements/CarmaTrafficSignal.h>
+#include <rclcpp/rclcpp.hpp>
+#include "carma_wm/SharedMapStore.hpp"
+#include "RoutingGraphAccessor.hpp"
+
+namespace carma_wm
+{
+
+SharedMapStore& SharedMapStore::instance()
+{
+  static SharedMapStore store;
+  return store;
+}
+
+lanelet::LaneletMapPtr SharedMapStore::getMap(const autoware_lanelet2_msgs::msg::MapBin& map_msg)
+{
+  size_t hash = std::hash<std::string_view>()(
+      std::string_view(reinterpret_cast<const char*>(map_msg.data.data()), map_msg.data.size()));
+
+  const std::lock_guard<std::mutex> lock(mutex_);
+
+  if (base_map_ && map_version_ == map_msg.map_version && map_hash_ == hash)
+  {
+    RCLCPP_INFO_STREAM(rclcpp::get_logger("carma_wm::SharedMapStore"), "Reusing shared map version: " << map_version_);
+    return base_map_;
+  }
+
+  RCLCPP_INFO_STREAM(rclcpp::get_logger("carma_wm::SharedMapStore"), "Deserializing shared map version: " << map_msg.map_version);
+
+  lanelet::LaneletMapPtr new_map(new lanelet::LaneletMap);
+  lanelet::utils::conversion::fromBinMsg(map_msg, new_map);
+
+  map_version_ = map_msg.map_version;
+  map_hash_ = hash;
+  base_map_ = new_map;
+  latest_map_ = new_map;
+  snapshots_.clear();
+  snapshots_[-1] = new_map;
+  routing_graphs_.clear();
+
+  return base_map_;
+}
+
+lanelet::LaneletMapPtr SharedMapStore::applyUpdate(const lanelet::LaneletMapPtr& map, long seq_id,
+                                                   const std::unordered_set<lanelet::Id>& lanelet_ids,
+                                                   const std::function<void(const lanelet::LaneletMapPtr&)>& apply)
+{
+  const std::lock_guard<std::mutex> lock(mutex_);
+
+  if (!snapshotSeq(map))
+  {
+    // The map is not a snapshot of the current map version (it was replaced by a newer version), so the update is not shared.
+    // Other listeners may still be reading the map, so it is copied all the same
+    lanelet::LaneletMapPtr updated_map = copyMap(map, lanelet_ids);
+    apply(updated_map);
+    return updated_map;
+  }
+
+  auto snapshot = snapshots_.find(seq_id);
+  if (snapshot != snapshots_.end())
+  {
+    lanelet::LaneletMapPtr updated_map = snapshot->second.lock();
+    if (updated_map)
+    {
+      RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm::SharedMapStore"), "Map update " << seq_id << " already applied to the shared map");
+      return updated_map;
+    }
+  }
+
+  RCLCPP_INFO_STREAM(rclcpp::get_logger("carma_wm::SharedMapStore"), "Publishing shared map snapshot for update: " << seq_id);
+
+  lanelet::LaneletMapPtr updated_map = copyMap(map, lanelet_ids);
+  apply(updated_map);  // Nothing is published if the update fails
+
+  snapshots_[seq_id] = updated_map;
+  if (seq_id >= snapshots_.rbegin()->first)
+  {
+    latest_map_ = updated_map;
+  }
+
+  // Forget the snapshots which no listener uses anymore
+  for (auto it = snapshots_.begin(); it != snapshots_.end();)
+  {
+    it = it->second.expired() ? snapshots_.erase(it) : std::next(it);
+  }
+
+  return updated_map;
+}
+
+LaneletRoutingGraphPtr SharedMapStore::getRoutingGraph(const lanelet::LaneletMapPtr& map, long seq_id,
+                                                       const std::string& participant,
+                                                       const std::function<LaneletRoutingGraphPtr()>& build)
+{
+  const std::lock_guard<std::mutex> lock(mutex_);
+
+  if (snapshotSeq(map) != seq_id)
+  {
+    return build();
+  }
+
+  auto key = std::make_pair(seq_id, participant);
+  auto graph = routing_graphs_.find(key);
+  if (graph != routing_graphs_.end() && graph->second.map.lock() == map)
+  {
+    return graph->second.graph;
+  }
+
+  LaneletRoutingGraphPtr entry = build();
+
+  // Graphs of older map revisions are not needed anymore
+  routing_graphs_.erase(routing_graphs_.begin(), routing_graphs_.lower_bound(std::make_pair(seq_id, std::string())));
+  routing_graphs_[key] = RoutingGraphEntry{ map, entry };
+
+  return entry;
+}
+
+void SharedMapStore::clear()
+{
+  const std::lock_guard<std::mutex> lock(mutex_);
+  map_version_ = 0;
+  map_hash_ = 0;
+  base_map_ = nullptr;
+  latest_map_ = nullptr;
+  snapshots_.clear();
+  routing_graphs_.clear();
+}
+
+lanelet::LaneletMapPtr SharedMapStore::signalView(const lanelet::LaneletMapPtr& map, const lanelet::LaneletMapPtr& previous_view)
+{
+  std::unordered_map<lanelet::Id, lanelet::RegulatoryElementPtr> signals;
+  for (const auto& regem : map->regulatoryElementLayer)
+  {
+    auto signal = std::dynamic_pointer_cast<lanelet::CarmaTrafficSignal>(regem);
+    if (!signal)
+    {
+      continue;
+    }
+
+    // The state is kept from the previous view of the listener, or taken from the snapshot for a new signal
+    lanelet::CarmaTrafficSignalPtr state = signal;
+    if (previous_view)
+    {
+      auto previous = previous_view->regulatoryElementLayer.find(signal->id());
+      if (previous != previous_view->regulatoryElementLayer.end())
+      {
+        if (auto previous_signal = std::dynamic_pointer_cast<lanelet::CarmaTrafficSignal>(*previous))
+        {
+          state = previous_signal;
+        }
+      }
+    }
+
+    // SPaT messages only modify the state of a signal, so its regulatory element data is shared
+    auto own_signal = std::make_shared<lanelet::CarmaTrafficSignal>(
+        std::const_pointer_cast<lanelet::RegulatoryElementData>(signal->constData()));
+    own_signal->revision_ = state->revision_;
+    own_signal->fixed_cycle_duration = state->fixed_cycle_duration;
+    own_signal->signal_durations = state->signal_durations;
+    own_signal->recorded_time_stamps = state->recorded_time_stamps;
+    own_signal->recorded_start_time_stamps = state->recorded_start_time_stamps;
+
+    signals.emplace(signal->id(), own_signal);
+  }
+
+  if (signals.empty())
+  {
+    return map;
+  }
+
+  return copyMap(map, {}, signals);
+}
+
+LaneletRoutingGraphPtr SharedMapStore::rebindRoutingGraph(const LaneletRoutingGraphPtr& graph, const lanelet::LaneletMapPtr& map)
+{
+  return std::static_pointer_cast<RoutingGraphAccessor>(graph)->rebind(map);
+}
+
+lanelet::LaneletMapPtr SharedMapStore::copyMap(const lanelet::LaneletMapPtr& map, const std::unordered_set<lanelet::Id>& lanelet_ids,
+                                               const std::unordered_map<lanelet::Id, lanelet::RegulatoryElementPtr>& regems)
+{
+  // Lanelet2 primitives are handles to shared data, so the copy holds the handles of the original for every primitive which
+  // is not modified. Lanelets and areas are modified through their list of regulatory elements, so they get new data with the same ids
+  auto replace_regems = [&regems](lanelet::RegulatoryElementPtrs primitive_regems, bool& replaced) {
+    for (auto& regem : primitive_regems)
+    {
+      auto replacement = regems.find(regem->id());
+      if (replacement != regems.end())
+      {
+        regem = replacement->second;
+        replaced = true;
+      }
+    }
+    return primitive_regems;
+  };
+
+  lanelet::LaneletLayer::Map lanelets;
+  for (auto llt : map->laneletLayer)
+  {
+    bool replaced = lanelet_ids.count(llt.id()) > 0;
+    auto llt_regems = replace_regems(llt.regulatoryElements(), replaced);
+    if (!replaced)
+    {
+      lanelets.emplace(llt.id(), llt);
+      continue;
+    }
+
+    lanelet::Lanelet copy(llt.id(), llt.leftBound3d(), llt.rightBound3d(), llt.attributes(), llt_regems);
+    if (llt.hasCustomCenterline())
+    {
+      auto centerline = llt.centerline3d();
+      copy.setCenterline(lanelet::LineString3d(std::const_pointer_cast<lanelet::LineStringData>(centerline.constData()),
+                                               centerline.inverted()));
+    }
+    lanelets.emplace(llt.id(), copy);
+  }
+
+  lanelet::AreaLayer::Map areas;
+  for (auto area : map->areaLayer)
+  {
+    bool replaced = false;
+    auto area_regems = replace_regems(area.regulatoryElements(), replaced);
+    areas.emplace(area.id(), replaced ? lanelet::Area(area.id(), area.outerBound(), area.innerBounds(), area.attributes(), area_regems)
+                                      : area);
+  }
+
+  lanelet::RegulatoryElementLayer::Map map_regems;
+  for (const auto& regem : map->regulatoryElementLayer)
+  {
+    auto replacement = regems.find(regem->id());
+    map_regems.emplace(regem->id(), replacement != regems.end() ? replacement->second : regem);
+  }
+
+  lanelet::PolygonLayer::Map polygons;
+  for (const auto& polygon : map->polygonLayer)
+  {
+    polygons.emplace(polygon.id(), polygon);
+  }
+  lanelet::LineStringLayer::Map line_strings;
+  for (const auto& line_string : map->lineStringLayer)
+  {
+    line_strings.emplace(line_string.id(), line_string);
+  }
+  lanelet::PointLayer::Map points;
+  for (const auto& point : map->pointLayer)
+  {
+    points.emplace(point.id(), point);
+  }
+
+  return std::make_shared<lanelet::LaneletMap>(lanelets, areas, map_regems, polygons, line_strings, points);
+}
+
+boost::optional<long> SharedMapStore::snapshotSeq(const lanelet::LaneletMapPtr& map) const
+{
+  if (!map)
+  {
+    return boost::none;
+  }
+
+  for (const auto& snapshot : snapshots_)
+  {
+    if (snapshot.second.lock() == map)
+    {
+      return snapshot.first;
+    }
+  }
+  return boost::none;
+}
+
+}  // namespace carma_wm
@@ -59,22 +59,31 @@ WMListener::WMListener(
     use_real_time_spat_in_sim_param_value = node_params_->declare_parameter("use_real_time_spat_in_sim", rclcpp::ParameterValue (false));
   }
 
+  rclcpp::Parameter use_shared_map_store_param("use_shared_map_store");
+  if(!node_params_->get_parameter("use_shared_map_store", use_shared_map_store_param)){
+    rclcpp::ParameterValue use_shared_map_store_param_value;
+    use_shared_map_store_param_value = node_params_->declare_parameter("use_shared_map_store", rclcpp::ParameterValue (false));
+  }
+
   // Get params
   config_speed_limit_param = node_params_->get_parameter("config_speed_limit");
   participant_param = node_params_->get_parameter("vehicle_participant_type");
   use_sim_time_param = node_params_->get_parameter("use_sim_time");
   use_real_time_spat_in_sim_param = node_params_->get_parameter("use_real_time_spat_in_sim");
+  use_shared_map_store_param = node_params_->get_parameter("use_shared_map_store");
 
   RCLCPP_INFO_STREAM(node_logging->get_logger(), "Loaded config speed limit: " << config_speed_limit_param.as_double());
   RCLCPP_INFO_STREAM(node_logging->get_logger(), "Loaded vehicle participant type: " << participant_param.as_string());
   RCLCPP_INFO_STREAM(node_logging->get_logger(), "Is using simulation time? : " << use_sim_time_param.as_bool());
   RCLCPP_INFO_STREAM(node_logging->get_logger(), "Is SPaT using wall time? : " << use_real_time_spat_in_sim_param.as_bool());
+  RCLCPP_INFO_STREAM(node_logging->get_logger(), "Is sharing the map with the process? : " << use_shared_map_store_param.as_bool());
 
 
   setConfigSpeedLimit(config_speed_limit_param.as_double());
   worker_->setVehicleParticipationType(participant_param.as_string());
   worker_->isUsingSimTime(use_sim_time_param.as_bool());
   worker_->isSpatWallTime(use_real_time_spat_in_sim_param.as_bool());
+  worker_->setShareMap(use_shared_map_store_param.as_bool());
 
   rclcpp::SubscriptionOptions map_update_options;
   rclcpp::SubscriptionOptions map_options;
@@ -19,7 +19,8 @@
 #include <lanelet2_extension/regulatory_elements/StopRule.h>
 #include <lanelet2_extension/regulatory_elements/CarmaTrafficSignal.h>
 #include <lanelet2_extension/regulatory_elements/SignalizedIntersection.h>
-#include <lanelet2_routing/internal/Graph.h>
+#include <carma_wm/MapCache.hpp>
+#include <carma_wm/SharedMapStore.hpp>
 #include "WMListenerWorker.hpp"
 
 namespace carma_wm
@@ -57,11 +58,46 @@ void WMListenerWorker::mapCallback(const autoware_lanelet2_msgs::msg::MapBin::Sh
 {
   current_map_version_ = map_msg->map_version;
 
-  lanelet::LaneletMapPtr new_map(new lanelet::LaneletMap);
+  if (share_map_)
+  {
+    // Deserialize the map and build its routing graph once for all the listeners of this process
+    shared_map_ = SharedMapStore::instance().getMap(*map_msg);
+
+    auto graph = SharedMapStore::instance().getRoutingGraph(shared_map_, -1, world_model_->getVehicleParticipationType(),
+      [&]() {
+        if (map_msg->has_routing_graph) {
+          auto graph = routingGraphFromMsg(map_msg->routing_graph, shared_map_);
+          if (graph) {
+            return graph;
+          }
+        }
+        world_model_->setMap(shared_map_, current_map_version_, true);
+        return std::const_pointer_cast<lanelet::routing::RoutingGraph>(world_model_->getMapRoutingGraph());
+      });
+
+    // The graph of the message is used by the first listener when it matches the map, whatever participant it was built for
+    std::string participant = map_msg->has_routing_graph ? map_msg->routing_graph.participant_type : world_model_->getVehicleParticipationType();
+    setSharedMap(graph, participant, nullptr); // Signal states of a previous map version are not kept
+  }
+  else
+  {
+    lanelet::LaneletMapPtr new_map(new lanelet::LaneletMap);
 
-  lanelet::utils::conversion::fromBinMsg(*map_msg, new_map);
+    lanelet::utils::conversion::fromBinMsg(*map_msg, new_map);
 
-  world_model_->setMap(new_map, current_map_version_);
+    // Reuse the routing graph computed by the map publisher when possible instead of building it again
+    LaneletRoutingGraphPtr graph;
+    if (map_msg->has_routing_graph) {
+      graph = routingGraphFromMsg(map_msg->routing_graph, new_map);
+    }
+
+    if (graph) {
+      world_model_->setRoutingGraph(graph, map_msg->routing_graph.participant_type);
+      world_model_->setMap(new_map, current_map_version_, false);
+    } else {
+      world_model_->setMap(new_map, current_map_version_);
+    }
+  }
 
   // After setting map evaluate the current update queue to apply any updates that arrived before the map
   bool more_updates_to_apply = true;
@@ -116,6 +152,11 @@ void WMListenerWorker::enableUpdatesWithoutRoute()
   route_node_flag_=true;
 }
 
+void WMListenerWorker::setShareMap(bool share_map)
+{
+  share_map_ = share_map;
+}
+
 // helper function to log SignalizedIntersectionManager content
 void logSignalizedIntersectionManager(const carma_wm::SignalizedIntersectionManager& sim)
 {
@@ -189,11 +230,144 @@ void WMListenerWorker::mapUpdateCallback(autoware_lanelet2_msgs::msg::MapBin::Sh
 
   auto gf_ptr = std::shared_ptr<carma_wm::TrafficControl>(new carma_wm::TrafficControl);
 
+  lanelet::LaneletMapPtr map = world_model_->getMutableMap();
+
   // convert ros msg to geofence object
-  carma_wm::fromBinMsg(*geofence_msg, gf_ptr, world_model_->getMutableMap());
+  carma_wm::fromBinMsg(*geofence_msg, gf_ptr, map);
 
   RCLCPP_INFO_STREAM(rclcpp::get_logger("carma_wm::WMListenerWorker"), "Processing Map Update with Geofence Id:" << gf_ptr->id_);
 
+  // Lanelets are modified through their list of regulatory elements. Added lanelets are included as their routing relations are new
+  std::unordered_set<lanelet::Id> touched_lanelets;
+  for (const auto& llt : gf_ptr->lanelet_additions_)
+  {
+    touched_lanelets.insert(llt.id());
+  }
+  for (const auto& edit : gf_ptr->remove_list_)
+  {
+    touched_lanelets.insert(edit.first);
+  }
+  for (const auto& edit : gf_ptr->update_list_)
+  {
+    touched_lanelets.insert(edit.first);
+  }
+
+  if (share_map_)
+  {
+    // Snapshots of the shared map are never modified. The first listener of the process applies the update to a copy of the
+    // current snapshot and every listener switches to that copy below
+    shared_map_ = SharedMapStore::instance().applyUpdate(shared_map_, geofence_msg->seq_id, touched_lanelets,
+      [&](const lanelet::LaneletMapPtr& updated_map) {
+      // The edits must reference the primitives of the copy they are applied to
+      auto update_ptr = std::shared_ptr<carma_wm::TrafficControl>(new carma_wm::TrafficControl);
+      carma_wm::fromBinMsg(*geofence_msg, update_ptr, updated_map);
+      applyMapEdits(update_ptr, updated_map);
+    });
+  }
+  else
+  {
+    applyMapEdits(gf_ptr, map);
+  }
+
+  RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm::WMListenerWorker"), "Geofence id" << gf_ptr->id_ << " sends record of traffic_lights_id size: " << gf_ptr->traffic_light_id_lookup_.size());
+  for (auto const &[traffic_light_id, lanelet_id] : gf_ptr->traffic_light_id_lookup_)
+  {
+    RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm::WMListenerWorker"), "Adding new pair for traffic light ids: " << traffic_light_id << ", and lanelet::Id: " << lanelet_id);
+    world_model_->setTrafficLightIds(traffic_light_id, lanelet_id);
+  }
+
+  RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm::WMListenerWorker"), "Geofence id" << gf_ptr->id_ << " sends record of intersections size: " << gf_ptr->sim_.intersection_id_to_regem_id_.size());
+  if (gf_ptr->sim_.intersection_id_to_regem_id_.size() > 0)
+  {
+    world_model_->sim_ = gf_ptr->sim_;
+    logSignalizedIntersectionManager(world_model_->sim_);
+  }
+
+  // update the route graph around the touched lanelets if rerouting was required by the updates and a new graph was not provided
+  bool recompute_routing_graph = recompute_route_flag_ && !geofence_msg->has_routing_graph;
+  if (share_map_)
+  {
+    LaneletRoutingGraphPtr graph;
+    if (recompute_routing_graph)
+    {
+      graph = SharedMapStore::instance().getRoutingGraph(shared_map_, geofence_msg->seq_id, world_model_->getVehicleParticipationType(),
+        [&]() {
+          world_model_->setMap(shared_map_, current_map_version_, false);
+          world_model_->updateRoutingGraph(touched_lanelets);
+          return std::const_pointer_cast<lanelet::routing::RoutingGraph>(world_model_->getMapRoutingGraph());
+        });
+    }
+    map = setSharedMap(graph, world_model_->getVehicleParticipationType(), map);
+  }
+  else
+  {
+    world_model_->setMap(map, current_map_version_, false);
+    if (recompute_routing_graph)
+    {
+      world_model_->updateRoutingGraph(touched_lanelets);
+    }
+  }
+
+  // If a new graph was provided then set that graph
+  // recompute_route_flag_ not checked here to support the case of the first map or map version changing
+  if (geofence_msg->has_routing_graph) {
+
+    LaneletRoutingGraphPtr graph = routingGraphFromMsg(geofence_msg->routing_graph, map);
+
+    if (!graph) {
+      throw std::invalid_argument("Map updated provided routing graph which could not be applied to the current map.");
+    }
+
+    world_model_->setRoutingGraph(graph, geofence_msg->routing_graph.participant_type);
+
+  }
+
+  // no need to reroute again unless received invalidated msg again
+  if (recompute_route_flag_)
+    recompute_route_flag_ = false;
+
+
+  RCLCPP_INFO_STREAM(rclcpp::get_logger("carma_wm::WMListenerWorker"), "Finished Applying the Map Update with Geofence Id:" << gf_ptr->id_);
+
+  // Call user defined map callback
+  if (map_callback_)
+  {
+    RCLCPP_INFO_STREAM(rclcpp::get_logger("carma_wm::WMListenerWorker"), "Calling user defined map update callback");
+    map_callback_();
+  }
+}
+
+
+/*!
+  * \brief Helper function which sets the view of this listener of the current shared snapshot as the map of the world model.
+  *        The view has its own traffic signals, so the signal states this listener receives are not seen by the other listeners
+  * \param graph The routing graph of the snapshot, or nullptr to keep the current routing graph
+  * \param participant The participant type the graph was built for
+  * \param previous_map The previous map of this listener, the signal states of which are kept. May be null
+  * \return The view
+  */
+lanelet::LaneletMapPtr WMListenerWorker::setSharedMap(const LaneletRoutingGraphPtr& graph, const std::string& participant,
+                                                      const lanelet::LaneletMapPtr& previous_map)
+{
+  lanelet::LaneletMapPtr view = SharedMapStore::signalView(shared_map_, previous_map);
+
+  if (graph)
+  {
+    world_model_->setRoutingGraph(view == shared_map_ ? graph : SharedMapStore::rebindRoutingGraph(graph, view), participant);
+  }
+  world_model_->setMap(view, current_map_version_, false);
+
+  return view;
+}
+
+/*!
+  * \brief Helper function which applies the lanelet additions, regulatory element removals and regulatory element updates
+  *        of a map update to a map
+  * \param gf_ptr The deserialized map update
+  * \param map The map to apply the update to
+  */
+void WMListenerWorker::applyMapEdits(std::shared_ptr<carma_wm::TrafficControl> gf_ptr, const lanelet::LaneletMapPtr& map) const
+{
   RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm::WMListenerWorker"), "Geofence id" << gf_ptr->id_ << " requests addition of lanelets size: " << gf_ptr->lanelet_additions_.size());
   for (auto llt : gf_ptr->lanelet_additions_)
   {
@@ -205,41 +379,27 @@ void WMListenerWorker::mapUpdateCallback(autoware_lanelet2_msgs::msg::MapBin::Sh
     // so that lanelet library can recognize they are same objects
     for (size_t i = 0; i < left.size(); i ++)
     {
-      if (world_model_->getMutableMap()->pointLayer.exists(left[i].id())) //rewrite the memory address of new pts with that of local
+      if (map->pointLayer.exists(left[i].id())) //rewrite the memory address of new pts with that of local
       {
-        llt.leftBound3d()[i] = world_model_->getMutableMap()->pointLayer.get(left[i].id());
+        llt.leftBound3d()[i] = map->pointLayer.get(left[i].id());
       }
     }
     auto right = llt.rightBound3d(); //new lanelet coming in
     for (size_t i = 0; i < right.size(); i ++)
     {
-      if (world_model_->getMutableMap()->pointLayer.exists(right[i].id())) //rewrite the memory address of new pts with that of local
+      if (map->pointLayer.exists(right[i].id())) //rewrite the memory address of new pts with that of local
       {
-        llt.rightBound3d()[i] = world_model_->getMutableMap()->pointLayer.get(right[i].id());
+        llt.rightBound3d()[i] = map->pointLayer.get(right[i].id());
       }
     }
 
-    world_model_->getMutableMap()->add(llt);
-  }
-
-  RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm::WMListenerWorker"), "Geofence id" << gf_ptr->id_ << " sends record of traffic_lights_id size: " << gf_ptr->traffic_light_id_lookup_.size());
-  for (auto const &[traffic_light_id, lanelet_id] : gf_ptr->traffic_light_id_lookup_)
-  {
-    RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm::WMListenerWorker"), "Adding new pair for traffic light ids: " << traffic_light_id << ", and lanelet::Id: " << lanelet_id);
-    world_model_->setTrafficLightIds(traffic_light_id, lanelet_id);
-  }
-
-  RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm::WMListenerWorker"), "Geofence id" << gf_ptr->id_ << " sends record of intersections size: " << gf_ptr->sim_.intersection_id_to_regem_id_.size());
-  if (gf_ptr->sim_.intersection_id_to_regem_id_.size() > 0)
-  {
-    world_model_->sim_ = gf_ptr->sim_;
-    logSignalizedIntersectionManager(world_model_->sim_);
+    map->add(llt);
   }
 
   RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm::WMListenerWorker"), "Geofence id" << gf_ptr->id_ << " requests removal of size: " << gf_ptr->remove_list_.size());
   for (auto const &[lanelet_id, lanelet_to_remove] : gf_ptr->remove_list_)
   {
-    auto parent_llt = world_model_->getMutableMap()->laneletLayer.get(lanelet_id);
+    auto parent_llt = map->laneletLayer.get(lanelet_id);
     // we can only check by id, if the element is there
     // this is only for speed optimization, as world model here should blindly accept the map update received
     auto regems_copy_to_check = parent_llt.regulatoryElements(); // save local copy as the regem can be deleted during iteration
@@ -247,7 +407,7 @@ void WMListenerWorker::mapUpdateCallback(autoware_lanelet2_msgs::msg::MapBin::Sh
     for (auto regem: regems_copy_to_check)
     {
       // we can't use the deserialized element as its data address conflicts the one in this node
-      if (lanelet_to_remove->id() == regem->id()) world_model_->getMutableMap()->remove(parent_llt, regem);
+      if (lanelet_to_remove->id() == regem->id()) map->remove(parent_llt, regem);
     }
     RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm::WMListenerWorker"), "Regems left in lanelet after removal: " << parent_llt.regulatoryElements().size());
 
@@ -259,67 +419,36 @@ void WMListenerWorker::mapUpdateCallback(autoware_lanelet2_msgs::msg::MapBin::Sh
   for (auto const &[lanelet_id, lanelet_to_update]: gf_ptr->update_list_)
   {
 
-    auto parent_llt = world_model_->getMutableMap()->laneletLayer.get(lanelet_id);
+    auto parent_llt = map->laneletLayer.get(lanelet_id);
 
-    auto regemptr_it = world_model_->getMutableMap()->regulatoryElementLayer.find(lanelet_to_update->id());
+    auto regemptr_it = map->regulatoryElementLayer.find(lanelet_to_update->id());
 
     // if this regem is already in the map.
     // This section is expected to be called to add back regulations which were previously removed by expired geofences.
-    if (regemptr_it != world_model_->getMutableMap()->regulatoryElementLayer.end())
+    if (regemptr_it != map->regulatoryElementLayer.end())
     {
 
       RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm::WMListenerWorker"), "Reapplying previously existing element for lanelet id:" << parent_llt.id() << ", and regem id: " << regemptr_it->get()->id());
       // again we should use the element with correct data address to be consistent
-      world_model_->getMutableMap()->update(parent_llt, *regemptr_it);
+      map->update(parent_llt, *regemptr_it);
     }
     else // Updates are treated as new regulations after the old value was removed. In both cases we enter this block.
     {
       RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm::WMListenerWorker"), "New regulatory element at lanelet: " << parent_llt.id() << ", and id: " << lanelet_to_update->id());
-      newRegemUpdateHelper(parent_llt, lanelet_to_update.get());
-    }
-  }
-
-  // set the Map to trigger a new route graph construction if rerouting was required by the updates and a new graph was not provided
-  world_model_->setMap(world_model_->getMutableMap(), current_map_version_, recompute_route_flag_ && !geofence_msg->has_routing_graph );
-
-  // If a new graph was provided then set that graph
-  // recompute_route_flag_ not checked here to support the case of the first map or map version changing
-  if (geofence_msg->has_routing_graph) {
-
-    LaneletRoutingGraphPtr graph = routingGraphFromMsg(geofence_msg->routing_graph, world_model_->getMutableMap());
-
-    if (!graph) {
-      throw std::invalid_argument("Map updated provided routing graph which could not be applied to the current map.");
+      newRegemUpdateHelper(parent_llt, lanelet_to_update.get(), map);
     }
-
-    world_model_->setRoutingGraph(graph);
-
-  }
-
-  // no need to reroute again unless received invalidated msg again
-  if (recompute_route_flag_)
-    recompute_route_flag_ = false;
-
-
-  RCLCPP_INFO_STREAM(rclcpp::get_logger("carma_wm::WMListenerWorker"), "Finished Applying the Map Update with Geofence Id:" << gf_ptr->id_);
-
-  // Call user defined map callback
-  if (map_callback_)
-  {
-    RCLCPP_INFO_STREAM(rclcpp::get_logger("carma_wm::WMListenerWorker"), "Calling user defined map update callback");
-    map_callback_();
   }
 }
 
-
 /*!
   * \brief This is a helper function updates the parent_llt with specified regem. This function is needed
   *        as we need to dynamic_cast from general regem to specific type of regem based on the geofence
   * \param parent_llt The Lanelet that need to register the regem
   * \param regem lanelet::RegulatoryElement* which is the type that the serializer decodes from binary
+  * \param map The map holding parent_llt
   * NOTE: Currently this function supports items in carma_wm::GeofenceType
   */
-void WMListenerWorker::newRegemUpdateHelper(lanelet::Lanelet parent_llt, lanelet::RegulatoryElement* regem) const
+void WMListenerWorker::newRegemUpdateHelper(lanelet::Lanelet parent_llt, lanelet::RegulatoryElement* regem, const lanelet::LaneletMapPtr& map) const
 {
   auto factory_regem = lanelet::RegulatoryElementFactory::create(regem->attribute(lanelet::AttributeName::Subtype).value(),
                                                             std::const_pointer_cast<lanelet::RegulatoryElementData>(regem->constData()));
@@ -332,7 +461,7 @@ void WMListenerWorker::newRegemUpdateHelper(lanelet::Lanelet parent_llt, lanelet
       lanelet::PassingControlLinePtr control_line = std::dynamic_pointer_cast<lanelet::PassingControlLine>(factory_regem);
       if (control_line)
       {
-        world_model_->getMutableMap()->update(parent_llt, control_line);
+        map->update(parent_llt, control_line);
       }
       else
       {
@@ -346,7 +475,7 @@ void WMListenerWorker::newRegemUpdateHelper(lanelet::Lanelet parent_llt, lanelet
       lanelet::DigitalSpeedLimitPtr speed = std::dynamic_pointer_cast<lanelet::DigitalSpeedLimit>(factory_regem);
       if (speed)
       {
-        world_model_->getMutableMap()->update(parent_llt, speed);
+        map->update(parent_llt, speed);
       }
       else
       {
@@ -360,7 +489,7 @@ void WMListenerWorker::newRegemUpdateHelper(lanelet::Lanelet parent_llt, lanelet
       lanelet::RegionAccessRulePtr rar = std::dynamic_pointer_cast<lanelet::RegionAccessRule>(factory_regem);
       if (rar)
       {
-        world_model_->getMutableMap()->update(parent_llt, rar);
+        map->update(parent_llt, rar);
       }
       else
       {
@@ -375,7 +504,7 @@ void WMListenerWorker::newRegemUpdateHelper(lanelet::Lanelet parent_llt, lanelet
       lanelet::DigitalMinimumGapPtr min_gap = std::dynamic_pointer_cast<lanelet::DigitalMinimumGap>(factory_regem);
       if (min_gap)
       {
-        world_model_->getMutableMap()->update(parent_llt, min_gap);
+        map->update(parent_llt, min_gap);
       }
       else
       {
@@ -390,7 +519,7 @@ void WMListenerWorker::newRegemUpdateHelper(lanelet::Lanelet parent_llt, lanelet
       lanelet::DirectionOfTravelPtr dot = std::dynamic_pointer_cast<lanelet::DirectionOfTravel>(factory_regem);
       if (dot)
       {
-        world_model_->getMutableMap()->update(parent_llt, dot);
+        map->update(parent_llt, dot);
       }
       else
       {
@@ -405,7 +534,7 @@ void WMListenerWorker::newRegemUpdateHelper(lanelet::Lanelet parent_llt, lanelet
       lanelet::StopRulePtr sr = std::dynamic_pointer_cast<lanelet::StopRule>(factory_regem);
       if (sr)
       {
-        world_model_->getMutableMap()->update(parent_llt, sr);
+        map->update(parent_llt, sr);
       }
       else
       {
@@ -418,7 +547,7 @@ void WMListenerWorker::newRegemUpdateHelper(lanelet::Lanelet parent_llt, lanelet
       lanelet::CarmaTrafficSignalPtr ctl = std::dynamic_pointer_cast<lanelet::CarmaTrafficSignal>(factory_regem);
       if (ctl)
       {
-        world_model_->getMutableMap()->update(parent_llt, ctl);
+        map->update(parent_llt, ctl);
       }
       else
       {
@@ -431,7 +560,7 @@ void WMListenerWorker::newRegemUpdateHelper(lanelet::Lanelet parent_llt, lanelet
       lanelet::SignalizedIntersectionPtr si = std::dynamic_pointer_cast<lanelet::SignalizedIntersection>(factory_regem);
       if (si)
       {
-        world_model_->getMutableMap()->update(parent_llt, si);
+        map->update(parent_llt, si);
       }
       else
       {
@@ -458,111 +587,7 @@ LaneletRoutingGraphPtr WMListenerWorker::routingGraphFromMsg(const autoware_lane
     return nullptr;
   }
 
-  // Get the lists of passable lanelets and areas
-  // Both these lists must be populated in the same order as the message to support later logic
-  lanelet::ConstLanelets passable_lanelets;
-  lanelet::ConstAreas passable_areas;
-
-  passable_lanelets.reserve(msg.lanelet_vertices.size());
-  passable_areas.reserve(msg.area_vertices.size());
-
-  try {
-
-    // All the passable lanelets and areas should be included as a vertext so just iterate over each and store
-    for (auto vertex : msg.lanelet_vertices) {
-      passable_lanelets.emplace_back(map->laneletLayer.get(vertex.lanelet_or_area));
-    }
-
-    for (auto vertex : msg.area_vertices) {
-      passable_areas.emplace_back(map->areaLayer.get(vertex.lanelet_or_area));
-    }
-
-  } catch(const lanelet::NoSuchPrimitiveError& e) {
-
-    RCLCPP_ERROR_STREAM(rclcpp::get_logger("carma_wm::WMListenerWorker"), "Received routing graph specifies lanelets which do not match the current map version. Actual exception: " << e.what());
-
-    return nullptr;
-  }
-
-
-  // Build the submap
-  // This operation does increase in time as the number of lanelets and areas increase
-  // however testing shows it to less than 1% of the total routing graph build time so this is a reasonable operation to keep
-  auto passable_map = lanelet::utils::createConstSubmap(passable_lanelets, passable_areas);
-
-  // This is the actual graph object which is used to initialize a RoutingGraph
-  auto graph = std::make_unique<lanelet::routing::internal::RoutingGraphGraph>(msg.num_unique_routing_cost_ids);
-
-  // Vertex must be added first then the edge can be added
-  for (auto ll : passable_lanelets) {
-    graph->addVertex(lanelet::routing::internal::VertexInfo{ll});
-  }
-
-  for (auto area : passable_areas) {
-    graph->addVertex(lanelet::routing::internal::VertexInfo{area});
-  }
-
-  // Now we can add edges
-  for (size_t i = 0; i < msg.lanelet_vertices.size(); ++i) {
-
-    auto vertex = msg.lanelet_vertices[i];
-    auto lanelet = passable_lanelets[i]; // passable_lanelets should be in the same order based on how its constructed
-
-    for (size_t j = 0; j < vertex.lanelet_or_area_ids.size(); ++j) {
-
-      lanelet::routing::RelationType relation;
-
-      // Get relation
-      switch (vertex.edge_relations[j])
-      {
-        case autoware_lanelet2_msgs::msg::RoutingGraphVertexAndEdges::RELATION_SUCCESSOR:
-          relation = lanelet::routing::RelationType::Successor; break;
-
-        case autoware_lanelet2_msgs::msg::RoutingGraphVertexAndEdges::RELATION_LEFT:
-          relation = lanelet::routing::RelationType::Left; break;
-
-        case autoware_lanelet2_msgs::msg::RoutingGraphVertexAndEdges::RELATION_RIGHT:
-          relation = lanelet::routing::RelationType::Right; break;
-
-        case autoware_lanelet2_msgs::msg::RoutingGraphVertexAndEdges::RELATION_ADJACENT_LEFT:
-          relation = lanelet::routing::RelationType::AdjacentLeft; break;
-
-        case autoware_lanelet2_msgs::msg::RoutingGraphVertexAndEdges::RELATION_ADJACENT_RIGHT:
-          relation = lanelet::routing::RelationType::AdjacentRight; break;
-
-        case autoware_lanelet2_msgs::msg::RoutingGraphVertexAndEdges::RELATION_CONFLICTING:
-          relation = lanelet::routing::RelationType::Conflicting; break;
-
-        case autoware_lanelet2_msgs::msg::RoutingGraphVertexAndEdges::RELATION_AREA:
-          relation = lanelet::routing::RelationType::Area; break;
-
-        default: // Treat default as RELATION_NONE
-          relation = lanelet::routing::RelationType::None; break;
-      }
-
-      try {
-
-        // Create edge
-        graph->addEdge(
-          lanelet,
-          map->laneletLayer.get(vertex.lanelet_or_area_ids[j]),
-          lanelet::routing::internal::EdgeInfo{vertex.edge_routing_costs[j], vertex.edge_routing_cost_source_ids[j], relation}
-        );
-
-      }  catch(const lanelet::NoSuchPrimitiveError& e) {
-
-        RCLCPP_ERROR_STREAM(rclcpp::get_logger("carma_wm::WMListenerWorker"),"Received routing graph specifies lanelets which do not match the current map version. Not found lanelet or area: "
-          << vertex.lanelet_or_area_ids[j] << " Actual exception: " << e.what());
-
-        return nullptr;
-      }
-
-    }
-  }
-
-  // Build and return the final initialized routing graph
-  return std::make_shared<lanelet::routing::RoutingGraph>(std::move(graph), std::move(passable_map));
-
+  return carma_wm::routingGraphFromMsg(msg, map);
 }
 
 std::string WMListenerWorker::getVehicleParticipationType() const
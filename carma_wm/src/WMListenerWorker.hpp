@@ -131,6 +131,14 @@ public:
    */
   void enableUpdatesWithoutRoute();
 
+  /**
+   *  \brief Share the map, its updates and its routing graph with the other listeners of this process through the SharedMapStore
+   *          instead of keeping a private copy. Must be set before the first map is received
+   *
+   *  \param share_map True to use the SharedMapStore
+   */
+  void setShareMap(bool share_map);
+
   /**
    * \brief Helper function to convert a routing graph message into a actual RoutingGraph object
    *
@@ -172,7 +180,10 @@ private:
   std::shared_ptr<CARMAWorldModel> world_model_;
   std::function<void()> map_callback_;
   std::function<void()> route_callback_;
-  void newRegemUpdateHelper(lanelet::Lanelet parent_llt, lanelet::RegulatoryElement* regem) const;
+  void newRegemUpdateHelper(lanelet::Lanelet parent_llt, lanelet::RegulatoryElement* regem, const lanelet::LaneletMapPtr& map) const;
+  void applyMapEdits(std::shared_ptr<carma_wm::TrafficControl> gf_ptr, const lanelet::LaneletMapPtr& map) const;
+  lanelet::LaneletMapPtr setSharedMap(const LaneletRoutingGraphPtr& graph, const std::string& participant,
+                                      const lanelet::LaneletMapPtr& previous_map);
   double config_speed_limit_;
 
   size_t current_map_version_ = 0; // Current map version based on recived map messages
@@ -182,6 +193,8 @@ private:
   bool recompute_route_flag_=false; // indicates whether if this node should recompute its route based on invalidated msg
   bool rerouting_flag_=false; //indicates whether if route node is in middle of rerouting
   bool route_node_flag_=false; //indicates whether if this node is route node
+  bool share_map_=false; //indicates whether the map is shared with the other listeners of this process through the SharedMapStore
+  lanelet::LaneletMapPtr shared_map_; // Current SharedMapStore snapshot. The world model holds the view of this listener of the snapshot
   long most_recent_update_msg_seq_ = -1; // Tracks the current sequence number for map update messages. Dropping even a single message would invalidate the map
 
 };
@@ -114,52 +114,74 @@ std::vector<lanelet::ConstLanelet> nonConnectedAdjacentLeft(const lanelet::Lanel
 }
 
 
-lanelet::ConstLaneletOrAreas getAffectedLaneletOrAreas(const lanelet::Points3d& gf_pts, const lanelet::LaneletMapPtr& lanelet_map, std::shared_ptr<const lanelet::routing::RoutingGraph> routing_graph, double max_lane_width)
+std::vector<lanelet::Lanelets> getLaneletsNearPoints(const lanelet::Points3d& points, const lanelet::LaneletMapPtr& lanelet_map, double radius)
 {
-  // Logic to detect which part is affected
-  RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm::query"), "Get affected lanelets loop");
-  std::unordered_set<lanelet::Lanelet> affected_lanelets;
-  for (size_t idx = 0; idx < gf_pts.size(); idx ++)
+  // Maximum side length in meters of the bounding box of a corridor of consecutive points. Bounds the number of
+  // candidate lanelets of a corridor on curved geofences, whose bounding box would otherwise cover unrelated lanelets
+  constexpr double max_corridor_extent = 100.0;
+
+  std::vector<lanelet::Lanelets> nearby_lanelets(points.size());
+  lanelet::BasicPoint2d margin(radius, radius);
+
+  size_t corridor_start = 0;
+  while (corridor_start < points.size())
   {
-    RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm::query"), "Index: " << idx << " Point: " << gf_pts[idx].x() << ", " << gf_pts[idx].y());
-    std::unordered_set<lanelet::Lanelet> possible_lanelets;
-
-    // This loop identifes the lanelets which this point lies within that could be impacted by the geofence
-    // This loop somewhat inefficiently calls the findNearest method iteratively until all the possible lanelets are identified. 
-    // The reason findNearest is used instead of nearestUntil is because that method orders results by bounding box which
-    // can give invalid sequences when dealing with large curved lanelets.  
-    bool continue_search = true; 
-    size_t nearest_count = 0;
-    while (continue_search) {
-      
-      nearest_count += 10; // Increase the index search radius by 10 each loop until all nearby lanelets are found
+    lanelet::BoundingBox2d corridor(points[corridor_start].basicPoint2d(), points[corridor_start].basicPoint2d());
+    size_t corridor_end = corridor_start + 1;
+    for (; corridor_end < points.size(); corridor_end++)
+    {
+      lanelet::BoundingBox2d extended = corridor;
+      extended.extend(points[corridor_end].basicPoint2d());
+      if (extended.sizes().maxCoeff() > max_corridor_extent)
+      {
+        break;
+      }
+      corridor = extended;
+    }
 
-      for (const auto& ll_pair : lanelet::geometry::findNearest(lanelet_map->laneletLayer, gf_pts[idx].basicPoint2d(), nearest_count)) { // Get the nearest lanelets and iterate over them
-        auto ll = std::get<1>(ll_pair);
+    lanelet::Lanelets candidates = lanelet_map->laneletLayer.search(lanelet::BoundingBox2d(corridor.min() - margin, corridor.max() + margin));
+    std::vector<lanelet::BoundingBox2d> candidate_boxes;
+    candidate_boxes.reserve(candidates.size());
+    for (const auto& llt : candidates)
+    {
+      candidate_boxes.push_back(lanelet::geometry::boundingBox2d(llt));
+    }
 
-        if (possible_lanelets.find(ll) != possible_lanelets.end()) { // Skip if already found
-          continue;
-        }
+    for (size_t idx = corridor_start; idx < corridor_end; idx++)
+    {
+      lanelet::BasicPoint2d point = points[idx].basicPoint2d();
+      lanelet::BoundingBox2d point_box(point - margin, point + margin);
 
-        double dist = std::get<0>(ll_pair);
-        RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm::query"), "Distance to lanelet " << ll.id() << ": " << dist << " max_lane_width: " << max_lane_width);
-        
-        if (dist > max_lane_width) { // Only save values closer than max_lane_width. Since we are iterating in distance order when we reach this distance the search can stop
-          continue_search = false;
-          break;
+      for (size_t i = 0; i < candidates.size(); i++)
+      {
+        // The polygon distance is only computed for the lanelets whose bounding box is close enough to the point.
+        // boost geometry uses a distance of 0 to indicate a point is within a polygon
+        if (candidate_boxes[i].intersects(point_box) && lanelet::geometry::distance2d(candidates[i], point) <= radius)
+        {
+          nearby_lanelets[idx].push_back(candidates[i]);
         }
+      }
+    }
 
-        // Check if the point is inside this lanelet
-        if(dist == 0.0) { // boost geometry uses a distance of 0 to indicate a point is within a polygon
-          possible_lanelets.insert(ll);
-        }
+    corridor_start = corridor_end;
+  }
 
-      }
+  return nearby_lanelets;
+}
 
-      if (nearest_count >= lanelet_map->laneletLayer.size()) { // if we are out of lanelets to evaluate then end the search
-        continue_search = false;
-      }
-    }
+lanelet::ConstLaneletOrAreas getAffectedLaneletOrAreas(const lanelet::Points3d& gf_pts, const lanelet::LaneletMapPtr& lanelet_map, std::shared_ptr<const lanelet::routing::RoutingGraph> routing_graph, double max_lane_width)
+{
+  // Logic to detect which part is affected
+  RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm::query"), "Get affected lanelets loop");
+  std::unordered_set<lanelet::Lanelet> affected_lanelets;
+
+  // Lanelets which each point lies within that could be impacted by the geofence
+  auto lanelets_per_point = getLaneletsNearPoints(gf_pts, lanelet_map, 0.0);
+
+  for (size_t idx = 0; idx < gf_pts.size(); idx ++)
+  {
+    RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm::query"), "Index: " << idx << " Point: " << gf_pts[idx].x() << ", " << gf_pts[idx].y());
+    std::unordered_set<lanelet::Lanelet> possible_lanelets(lanelets_per_point[idx].begin(), lanelets_per_point[idx].end());
 
     // among these llts, filter the ones that are on same direction as the geofence using routing
     if (idx + 1 == gf_pts.size()) // we only check this for the last gf_pt after saving everything
@@ -17,74 +17,139 @@
 ------------------------------------------------------------------------------*/
 
 #include "carma_wm/collision_detection.hpp"
+#include <cmath>
+#include <stdexcept>
 
 namespace carma_wm {
 
     namespace collision_detection {
 
-        //TODO: consider rewriting this method to improve efficiency; it has object_count*prediction_count*trajectory_point sqrt calls!
-        std::vector<carma_perception_msgs::msg::RoadwayObstacle> WorldCollisionDetection(const carma_perception_msgs::msg::RoadwayObstacleList& rwol, const carma_planning_msgs::msg::TrajectoryPlan& tp, 
-                                                                        const geometry_msgs::msg::Vector3& size, const geometry_msgs::msg::Twist& velocity) {
-
+        namespace {
 
-            RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm::collision_detection"), "WorldCollisionDetection");
+            double toSeconds(const builtin_interfaces::msg::Time& stamp) {
+                return stamp.sec + stamp.nanosec * 1e-9;
+            }
 
-            std::vector<carma_perception_msgs::msg::RoadwayObstacle> rwo_collison;
+            // Radius of the circle bounding a rectangular footprint centered on its pose
+            double boundingRadius(const geometry_msgs::msg::Vector3& size) {
+                return 0.5 * std::sqrt(size.x * size.x + size.y * size.y);
+            }
 
+            int64_t bucket(double value, double bucket_size) {
+                return static_cast<int64_t>(std::floor(value / bucket_size));
+            }
+        }
 
-            for (auto i : rwol.roadway_obstacles) {
+        PredictionIndex::PredictionIndex(const carma_perception_msgs::msg::RoadwayObstacleList& rwol, double time_tolerance, double cell_side_length)
+            : time_tolerance_(time_tolerance), cell_side_length_(cell_side_length) {
 
-                for (auto j : i.object.predictions) {
+            if (time_tolerance <= 0 || cell_side_length <= 0) {
+                throw std::invalid_argument("PredictionIndex time_tolerance and cell_side_length must be positive");
+            }
 
-                    for(size_t k=0; k < tp.trajectory_points.size(); k++) {
+            for (size_t i = 0; i < rwol.roadway_obstacles.size(); i++) {
 
-                        RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm::collision_detection"), "in for loop");
+                const auto& object = rwol.roadway_obstacles[i].object;
+                double radius = boundingRadius(object.size);
+                max_radius_ = std::max(max_radius_, radius);
 
-                        double distancex = (tp.trajectory_points[k].x - j.predicted_position.position.x)*(tp.trajectory_points[k].x - j.predicted_position.position.x);
-                        double distancey = (tp.trajectory_points[k].y - j.predicted_position.position.y)*(tp.trajectory_points[k].y - j.predicted_position.position.y);
+                for (const auto& prediction : object.predictions) {
 
-                        RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm::collision_detection"), "tp.trajectory_points[k].x");
-                        RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm::collision_detection"), tp.trajectory_points[k].x);
+                    Entry entry = {prediction.predicted_position.position.x, prediction.predicted_position.position.y, 
+                                   toSeconds(prediction.header.stamp), radius, i};
 
-                        RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm::collision_detection"), "j.predicted_position.position.x");
-                        RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm::collision_detection"), j.predicted_position.position.x);
+                    CellKey key = {bucket(entry.time, time_tolerance_), bucket(entry.x, cell_side_length_), bucket(entry.y, cell_side_length_)};
+                    cells_[key].push_back(entry);
+                    size_++;
+                }
+            }
+        }
 
-                        RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm::collision_detection"), "tp.trajectory_points[k].y");
-                        RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm::collision_detection"), tp.trajectory_points[k].y);
+        size_t PredictionIndex::markCollisions(double x, double y, double time, double radius, std::vector<bool>& collisions) const {
 
-                        RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm::collision_detection"), "j.predicted_position.position.y");
-                        RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm::collision_detection"), j.predicted_position.position.y);
+            if (cells_.empty()) {
+                return 0;
+            }
 
+            // States within time_tolerance of the query can only be in its own slice or the two adjacent ones,
+            // and states which can overlap the query circle can only be in cells within the largest combined radius
+            double reach = radius + max_radius_;
+            int64_t slice = bucket(time, time_tolerance_);
+            int64_t min_cell_x = bucket(x - reach, cell_side_length_);
+            int64_t max_cell_x = bucket(x + reach, cell_side_length_);
+            int64_t min_cell_y = bucket(y - reach, cell_side_length_);
+            int64_t max_cell_y = bucket(y + reach, cell_side_length_);
 
-                        double calcdistance = sqrt(abs(distancex + distancey));
+            size_t marked = 0;
 
-                        rclcpp::Duration diff= rclcpp::Time(j.header.stamp) - rclcpp::Time(tp.trajectory_points[k].target_time);
+            for (int64_t s = slice - 1; s <= slice + 1; s++) {
+                for (int64_t cell_x = min_cell_x; cell_x <= max_cell_x; cell_x++) {
+                    for (int64_t cell_y = min_cell_y; cell_y <= max_cell_y; cell_y++) {
 
-                        double timediff = diff.seconds();
+                        auto cell = cells_.find({s, cell_x, cell_y});
+                        if (cell == cells_.end()) {
+                            continue;
+                        }
 
-                        double x = (i.object.size.x - size.x)*(i.object.size.x - size.x);
-                        double y = (i.object.size.y - size.y)*(i.object.size.y - size.y);
-                        
-                        double car_t_x = tp.trajectory_points[k].x - tp.trajectory_points[0].x / velocity.linear.x;
-                        // double car_t_y = tp.trajectory_points[k].y - tp.trajectory_points[0].y/velocity.linear.y;
+                        for (const auto& entry : cell->second) {
 
-                        double object_t_x = j.predicted_position.position.x - i.object.predictions[0].predicted_position.position.x / i.object.velocity.twist.linear.x;
-                        // double object_t_y = j.predicted_position.position.y - i.object.predictions[0].predicted_position.position.y / j.predicted_velocity.linear.y;
+                            if (collisions[entry.obstacle] || std::abs(entry.time - time) > time_tolerance_) {
+                                continue;
+                            }
 
+                            double dx = entry.x - x;
+                            double dy = entry.y - y;
+                            double combined_radius = entry.radius + radius;
 
-                        if(timediff <= 5) {
-                            if(calcdistance <= sqrt(x - y) ) {
-                                rwo_collison.push_back(i);
-                                break;
+                            if (dx * dx + dy * dy <= combined_radius * combined_radius) {
+                                collisions[entry.obstacle] = true;
+                                marked++;
                             }
                         }
                     }
                 }
+            }
 
+            return marked;
+        }
 
+        size_t PredictionIndex::size() const {
+            return size_;
+        }
+
+        std::vector<carma_perception_msgs::msg::RoadwayObstacle> WorldCollisionDetection(const carma_perception_msgs::msg::RoadwayObstacleList& rwol, const carma_planning_msgs::msg::TrajectoryPlan& tp, 
+                                                                        const geometry_msgs::msg::Vector3& size, const geometry_msgs::msg::Twist& velocity,
+                                                                        double time_tolerance, double cell_side_length) {
+
+            std::vector<carma_perception_msgs::msg::RoadwayObstacle> rwo_collison;
+
+            if (rwol.roadway_obstacles.empty() || tp.trajectory_points.empty()) {
+                return rwo_collison;
             }
 
+            PredictionIndex index(rwol, time_tolerance, cell_side_length);
+
+            double host_radius = boundingRadius(size);
+            std::vector<bool> collisions(rwol.roadway_obstacles.size(), false);
+            size_t remaining = rwol.roadway_obstacles.size();
+
+            for (const auto& point : tp.trajectory_points) {
+
+                remaining -= index.markCollisions(point.x, point.y, toSeconds(point.target_time), host_radius, collisions);
+
+                if (remaining == 0) {
+                    break;
+                }
+            }
+
+            for (size_t i = 0; i < collisions.size(); i++) {
+                if (collisions[i]) {
+                    rwo_collison.push_back(rwol.roadway_obstacles[i]);
+                }
+            }
 
+            RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm::collision_detection"), "WorldCollisionDetection checked " << tp.trajectory_points.size() 
+                                << " trajectory points against " << index.size() << " predicted states and found " << rwo_collison.size() << " colliding obstacles");
 
             return rwo_collison;
         }
@@ -16,6 +16,8 @@
 
 #include <gtest/gtest.h>
 #include <iostream>
+#include <algorithm>
+#include <tuple>
 #include <carma_wm/CARMAWorldModel.hpp>
 #include <lanelet2_core/geometry/LineString.h>
 #include <lanelet2_traffic_rules/TrafficRulesFactory.h>
@@ -23,6 +25,7 @@
 #include <tf2/LinearMath/Quaternion.h>
 #include "TestHelpers.hpp"
 #include <lanelet2_extension/regulatory_elements/PassingControlLine.h>
+#include <lanelet2_extension/regulatory_elements/DigitalSpeedLimit.h>
 #include <carma_wm/WMTestLibForGuidance.hpp>
 #include <rclcpp/rclcpp.hpp>
 
@@ -727,6 +730,57 @@ TEST(CARMAWorldModelTest, routeTrackPos_point)
   ASSERT_NEAR(1.0, result.crosstrack, 0.000001);
 }
 
+TEST(CARMAWorldModelTest, routeTrackPositions)
+{
+  CARMAWorldModel cmw;
+
+  ///// Test route exception
+  lanelet::BasicLineString2d points = { getBasicPoint(0.5, 0) };
+  ASSERT_THROW(cmw.routeTrackPositions(points), std::invalid_argument);
+
+  ///// Test straight routes
+  addStraightRoute(cmw);
+
+  points = { getBasicPoint(0.5, 0), getBasicPoint(0.5, 2.0), getBasicPoint(0.5, 1.0), getBasicPoint(0.0, -0.5) };
+  std::vector<TrackPos> results = cmw.routeTrackPositions(points);
+  ASSERT_EQ(4u, results.size());
+  ASSERT_NEAR(0.0, results[0].downtrack, 0.000001);
+  ASSERT_NEAR(0.0, results[0].crosstrack, 0.000001);
+  ASSERT_NEAR(2.0, results[1].downtrack, 0.000001);
+  ASSERT_NEAR(0.0, results[1].crosstrack, 0.000001);
+  ASSERT_NEAR(1.0, results[2].downtrack, 0.000001);
+  ASSERT_NEAR(0.0, results[2].crosstrack, 0.000001);
+  ASSERT_NEAR(-0.5, results[3].downtrack, 0.000001);
+  ASSERT_NEAR(-0.5, results[3].crosstrack, 0.000001);
+
+  ///// Test disjoint route, the batch must match the single point queries
+  addDisjointRoute(cmw);
+
+  points = { getBasicPoint(0.5, 0), getBasicPoint(0.5, 1.0), getBasicPoint(1.5, 1.5), getBasicPoint(1.5, 0.5),
+             getBasicPoint(0.5, 1.5), getBasicPoint(1.5, 2.0), getBasicPoint(2.0, 2.5), getBasicPoint(1.5, -1.0) };
+  results = cmw.routeTrackPositions(points);
+  ASSERT_EQ(points.size(), results.size());
+  for (size_t i = 0; i < points.size(); i++)
+  {
+    TrackPos expected = cmw.routeTrackPos(points[i]);
+    ASSERT_NEAR(expected.downtrack, results[i].downtrack, 0.000001);
+    ASSERT_NEAR(expected.crosstrack, results[i].crosstrack, 0.000001);
+  }
+
+  ///// Points far from the route
+  points = { getBasicPoint(500.0, 2.5), getBasicPoint(1.5, -300.0) };
+  results = cmw.routeTrackPositions(points);
+  for (size_t i = 0; i < points.size(); i++)
+  {
+    TrackPos expected = cmw.routeTrackPos(points[i]);
+    ASSERT_NEAR(expected.downtrack, results[i].downtrack, 0.000001);
+    ASSERT_NEAR(expected.crosstrack, results[i].crosstrack, 0.000001);
+  }
+
+  ///// Empty input
+  ASSERT_TRUE(cmw.routeTrackPositions(lanelet::BasicLineString2d()).empty());
+}
+
 TEST(CARMAWorldModelTest, routeTrackPos_lanelet)
 {
   CARMAWorldModel cmw;
@@ -1314,6 +1368,131 @@ TEST(CARMAWorldModelTest, getSignalsAlongRoute)
   EXPECT_EQ(lights[0]->id(), traffic_light_id1);
   EXPECT_EQ(lights[1]->id(), traffic_light_id2);
 
+  lights = cmw_ptr->getSignalsAlongRoute({0.5, 1.5});
+  EXPECT_EQ(lights.size(), 1u);
+
+  // Cached stop line downtracks must be recomputed for the new route
+  carma_wm::test::setRouteByIds({ 1201, 1202}, cmw_ptr);
+  EXPECT_EQ(cmw_ptr->getSignalsAlongRoute({0.5, 1.5}).size(), 1u);
+  EXPECT_TRUE(cmw_ptr->getSignalsAlongRoute({0.5, 2.5}).empty());
+}
+
+TEST(CARMAWorldModelTest, getRoutingGraphVersion)
+{
+  auto cmw = test::getGuidanceTestMap(test::MapOptions(3.7, 25, test::MapOptions::Obstacle::NONE, test::MapOptions::SpeedLimit::NONE));
+  size_t version = cmw->getRoutingGraphVersion();
+  auto graph = cmw->getMapRoutingGraph();
+
+  // Setting the map without recomputing keeps the current graph
+  cmw->setMap(cmw->getMutableMap(), 0, false);
+  EXPECT_EQ(version, cmw->getRoutingGraphVersion());
+  EXPECT_EQ(graph, cmw->getMapRoutingGraph());
+
+  // Readers holding the previous graph keep a valid snapshot after it is replaced
+  cmw->setMap(cmw->getMutableMap(), 0, true);
+  EXPECT_EQ(version + 1, cmw->getRoutingGraphVersion());
+  EXPECT_NE(graph, cmw->getMapRoutingGraph());
+  EXPECT_EQ(graph->following(cmw->getMap()->laneletLayer.get(1200), false).front().id(), 1201);
+}
+
+namespace
+{
+// Every routing relation of every lanelet in the map, as (lanelet id, relation, related id) sorted by lanelet id
+std::vector<std::tuple<lanelet::Id, std::string, lanelet::Id>> routingRelations(const LaneletRoutingGraphConstPtr& graph,
+                                                                                const lanelet::LaneletMapConstPtr& map)
+{
+  std::vector<std::tuple<lanelet::Id, std::string, lanelet::Id>> relations;
+  auto add = [&relations](lanelet::Id id, const std::string& relation, const lanelet::ConstLanelets& related) {
+    for (const auto& llt : related)
+    {
+      relations.emplace_back(id, relation, llt.id());
+    }
+  };
+
+  for (const auto& llt : map->laneletLayer)
+  {
+    if (graph->passableSubmap()->laneletLayer.exists(llt.id()))
+    {
+      relations.emplace_back(llt.id(), "passable", llt.id());
+    }
+    add(llt.id(), "following", graph->following(llt, false));
+    add(llt.id(), "previous", graph->previous(llt, false));
+    add(llt.id(), "lefts", graph->lefts(llt));
+    add(llt.id(), "rights", graph->rights(llt));
+    add(llt.id(), "adjacentLefts", graph->adjacentLefts(llt));
+    add(llt.id(), "adjacentRights", graph->adjacentRights(llt));
+  }
+  std::sort(relations.begin(), relations.end());
+  return relations;
+}
+
+LaneletRoutingGraphConstPtr buildFullGraph(const std::shared_ptr<CARMAWorldModel>& cmw)
+{
+  return lanelet::routing::RoutingGraph::build(*cmw->getMap(), **cmw->getTrafficRules(cmw->getVehicleParticipationType()));
+}
+}  // namespace
+
+TEST(CARMAWorldModelTest, updateRoutingGraph)
+{
+  using namespace lanelet::units::literals;
+  auto cmw = test::getGuidanceTestMap(test::MapOptions(3.7, 25, test::MapOptions::Obstacle::NONE, test::MapOptions::SpeedLimit::NONE));
+  auto map = cmw->getMutableMap();
+
+  // A graph of unknown participant type cannot be patched
+  cmw->setRoutingGraph(std::const_pointer_cast<lanelet::routing::RoutingGraph>(cmw->getMapRoutingGraph()));
+  EXPECT_TRUE(cmw->updateRoutingGraph({ 1200 }));
+  EXPECT_EQ(routingRelations(buildFullGraph(cmw), cmw->getMap()), routingRelations(cmw->getMapRoutingGraph(), cmw->getMap()));
+
+  // Adding a traffic light to a lanelet only patches the graph around it
+  test::addTrafficLight(cmw, 1300, { 1200 }, { 1201 });
+  cmw->setMap(map, 0, false);
+  size_t version = cmw->getRoutingGraphVersion();
+  EXPECT_FALSE(cmw->updateRoutingGraph({ 1200 }));
+  EXPECT_EQ(version + 1, cmw->getRoutingGraphVersion());
+  EXPECT_EQ(routingRelations(buildFullGraph(cmw), cmw->getMap()), routingRelations(cmw->getMapRoutingGraph(), cmw->getMap()));
+  EXPECT_EQ(cmw->getMap()->laneletLayer.get(1200).constData(),
+            cmw->getMapRoutingGraph()->passableSubmap()->laneletLayer.get(1200).constData());
+
+  // Lane change relations are patched on both sides of a changed bound
+  std::shared_ptr<lanelet::PassingControlLine> pcl(new lanelet::PassingControlLine(lanelet::PassingControlLine::buildData(
+      lanelet::utils::getId(), { map->laneletLayer.get(1200).rightBound() }, {}, {})));
+  map->update(map->laneletLayer.get(1200), pcl);
+  map->laneletLayer.get(1210).addRegulatoryElement(pcl);
+  cmw->setMap(map, 0, false);
+  EXPECT_FALSE(cmw->updateRoutingGraph({ 1200, 1210 }));
+  EXPECT_EQ(routingRelations(buildFullGraph(cmw), cmw->getMap()), routingRelations(cmw->getMapRoutingGraph(), cmw->getMap()));
+
+  // Changing a lanelet in the middle of a lane keeps the routes through it
+  std::shared_ptr<lanelet::DigitalSpeedLimit> dsl(new lanelet::DigitalSpeedLimit(lanelet::DigitalSpeedLimit::buildData(
+      lanelet::utils::getId(), 15_mph, { map->laneletLayer.get(1201) }, {}, { lanelet::Participants::VehicleCar })));
+  map->update(map->laneletLayer.get(1201), dsl);
+  cmw->setMap(map, 0, false);
+  EXPECT_FALSE(cmw->updateRoutingGraph({ 1201 }));
+  EXPECT_EQ(routingRelations(buildFullGraph(cmw), cmw->getMap()), routingRelations(cmw->getMapRoutingGraph(), cmw->getMap()));
+
+  auto full_path = buildFullGraph(cmw)->shortestPath(cmw->getMap()->laneletLayer.get(1200), cmw->getMap()->laneletLayer.get(1203));
+  auto patched_path = cmw->getMapRoutingGraph()->shortestPath(cmw->getMap()->laneletLayer.get(1200), cmw->getMap()->laneletLayer.get(1203));
+  ASSERT_TRUE(!!full_path);
+  ASSERT_TRUE(!!patched_path);
+  ASSERT_EQ(full_path->size(), patched_path->size());
+  for (size_t i = 0; i < full_path->size(); i++)
+  {
+    EXPECT_EQ((*full_path)[i].id(), (*patched_path)[i].id());
+  }
+
+  // A lanelet added at the end of a lane is connected to it
+  auto end = map->laneletLayer.get(1203);
+  auto added = test::getLanelet(1204, { end.leftBound().back(), test::getPoint(0, 125, 0) },
+                                { end.rightBound().back(), test::getPoint(3.7, 125, 0) },
+                                lanelet::AttributeValueString::Solid, lanelet::AttributeValueString::Dashed);
+  map->add(added);
+  cmw->setMap(map, 0, false);
+  EXPECT_FALSE(cmw->updateRoutingGraph({ 1204 }));
+  EXPECT_EQ(routingRelations(buildFullGraph(cmw), cmw->getMap()), routingRelations(cmw->getMapRoutingGraph(), cmw->getMap()));
+
+  // Lanelets which are not in the map fall back to a full rebuild
+  EXPECT_TRUE(cmw->updateRoutingGraph({ 987654 }));
+  EXPECT_EQ(routingRelations(buildFullGraph(cmw), cmw->getMap()), routingRelations(cmw->getMapRoutingGraph(), cmw->getMap()));
 }
 
 TEST(CARMAWorldModelTest, getFirstLaneletOnShortestPath)
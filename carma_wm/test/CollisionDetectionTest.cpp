@@ -259,9 +259,6 @@ namespace carma_wm
     ASSERT_TRUE(result);
 
   }
-  // These tests has been temporarily disabled to support Continuous Improvement (CI) processes.
-  // Related GitHub Issue: <https://github.com/usdot-fhwa-stol/carma-platform/issues/2335>
-  /**
   TEST(CollisionDetectionTest, WorldCollisionDetection)
   {
 
@@ -382,7 +379,119 @@ namespace carma_wm
     ASSERT_EQ(result.size(),1);
 
   }
-  */
+
+  carma_perception_msgs::msg::PredictedState predictedState(double x, double y, int32_t sec, uint32_t nanosec)
+  {
+    carma_perception_msgs::msg::PredictedState state;
+    state.header.stamp.sec = sec;
+    state.header.stamp.nanosec = nanosec;
+    state.predicted_position.position.x = x;
+    state.predicted_position.position.y = y;
+    state.predicted_position.orientation.w = 1;
+    return state;
+  }
+
+  TEST(CollisionDetectionTest, PredictionIndex)
+  {
+    carma_perception_msgs::msg::RoadwayObstacleList rwol;
+
+    // Radius of the bounding circle of each obstacle is 0.5 * sqrt(3^2 + 4^2) = 2.5
+    carma_perception_msgs::msg::RoadwayObstacle rwo;
+    rwo.object.size.x = 3;
+    rwo.object.size.y = 4;
+
+    // Obstacle 0 crosses a cell boundary at x = 10 during the first second
+    rwo.object.predictions = {predictedState(9, 0, 10, 0), predictedState(11, 0, 10, 500000000), predictedState(13, 0, 11, 0)};
+    rwol.roadway_obstacles.push_back(rwo);
+
+    // Obstacle 1 stays far from obstacle 0
+    rwo.object.predictions = {predictedState(100, 100, 10, 0), predictedState(100, 100, 11, 0)};
+    rwol.roadway_obstacles.push_back(rwo);
+
+    // Obstacle 2 reaches the location of obstacle 0 three seconds later
+    rwo.object.predictions = {predictedState(11, 0, 13, 500000000)};
+    rwol.roadway_obstacles.push_back(rwo);
+
+    collision_detection::PredictionIndex index(rwol, 0.5, 10.0);
+    ASSERT_EQ(index.size(), 6u);
+
+    std::vector<bool> collisions(rwol.roadway_obstacles.size(), false);
+
+    // Overlapping circles at the same time
+    ASSERT_EQ(index.markCollisions(12, 0, 10.5, 1.0, collisions), 1u);
+    ASSERT_EQ(collisions, std::vector<bool>({true, false, false}));
+
+    // Already flagged obstacles are not counted again
+    ASSERT_EQ(index.markCollisions(12, 0, 10.5, 1.0, collisions), 0u);
+
+    // Same location but outside of the time tolerance of every state of obstacle 2
+    collisions.assign(collisions.size(), false);
+    ASSERT_EQ(index.markCollisions(11, 0, 12.9, 1.0, collisions), 0u);
+
+    // Within the time tolerance of obstacle 2 only
+    ASSERT_EQ(index.markCollisions(11, 0, 13.2, 1.0, collisions), 1u);
+    ASSERT_EQ(collisions, std::vector<bool>({false, false, true}));
+
+    // Circles just apart, the combined radius being 3.5
+    collisions.assign(collisions.size(), false);
+    ASSERT_EQ(index.markCollisions(100, 96.4, 10.0, 1.0, collisions), 0u);
+
+    // Circles overlapping from a neighbouring cell
+    ASSERT_EQ(index.markCollisions(100, 96.6, 10.0, 1.0, collisions), 1u);
+    ASSERT_TRUE(collisions[1]);
+
+    ASSERT_THROW(collision_detection::PredictionIndex(rwol, 0.0, 10.0), std::invalid_argument);
+  }
+
+  TEST(CollisionDetectionTest, WorldCollisionDetectionReportsEachObstacleOnce)
+  {
+    carma_perception_msgs::msg::RoadwayObstacleList rwol;
+
+    carma_perception_msgs::msg::RoadwayObstacle rwo;
+    rwo.object.size.x = 4;
+    rwo.object.size.y = 2;
+
+    // Obstacle 0 overlaps the whole trajectory, obstacle 1 overlaps it only after the trajectory ends
+    rwo.object.id = 0;
+    rwo.object.predictions = {predictedState(0, 0, 0, 0), predictedState(1, 0, 1, 0), predictedState(2, 0, 2, 0)};
+    rwol.roadway_obstacles.push_back(rwo);
+
+    rwo.object.id = 1;
+    rwo.object.predictions = {predictedState(2, 0, 5, 0)};
+    rwol.roadway_obstacles.push_back(rwo);
+
+    // Obstacle 2 has no predictions
+    rwo.object.id = 2;
+    rwo.object.predictions.clear();
+    rwol.roadway_obstacles.push_back(rwo);
+
+    carma_planning_msgs::msg::TrajectoryPlan tp;
+    for (int32_t i = 0; i < 3; i++)
+    {
+      carma_planning_msgs::msg::TrajectoryPlanPoint point;
+      point.x = i;
+      point.y = 0;
+      point.target_time.sec = i;
+      tp.trajectory_points.push_back(point);
+    }
+
+    geometry_msgs::msg::Vector3 size;
+    size.x = 4;
+    size.y = 2;
+
+    auto result = collision_detection::WorldCollisionDetection(rwol, tp, size, geometry_msgs::msg::Twist());
+
+    ASSERT_EQ(result.size(), 1u);
+    ASSERT_EQ(result[0].object.id, 0u);
+
+    // Widening the time tolerance catches obstacle 1 as well
+    result = collision_detection::WorldCollisionDetection(rwol, tp, size, geometry_msgs::msg::Twist(), 3.0);
+
+    ASSERT_EQ(result.size(), 2u);
+    ASSERT_EQ(result[1].object.id, 1u);
+
+    ASSERT_TRUE(collision_detection::WorldCollisionDetection(carma_perception_msgs::msg::RoadwayObstacleList(), tp, size, geometry_msgs::msg::Twist()).empty());
+  }
   TEST(CollisionDetectionFalseTest, WorldCollisionDetection)
   {
 
@@ -19,6 +19,7 @@
 #include <autoware_lanelet2_ros2_interface/utility/message_conversion.hpp>
 #include <../src/WMListenerWorker.hpp>
 #include <carma_wm/CARMAWorldModel.hpp>
+#include <carma_wm/SharedMapStore.hpp>
 #include <lanelet2_core/geometry/LineString.h>
 #include <lanelet2_traffic_rules/TrafficRulesFactory.h>
 #include <lanelet2_core/Attribute.h>
@@ -35,6 +36,7 @@
 #include <autoware_lanelet2_ros2_interface/utility/utilities.hpp>
 #include <lanelet2_extension/projection/local_frame_projector.h>
 #include <lanelet2_extension/io/autoware_osm_parser.h>
+#include <lanelet2_extension/regulatory_elements/CarmaTrafficSignal.h>
 
 
 namespace carma_wm
@@ -81,6 +83,182 @@ TEST(WMListenerWorkerTest, mapCallback)
   ASSERT_TRUE(flag);
 }
 
+TEST(WMListenerWorkerTest, sharedMapCallback)
+{
+  CARMAWorldModel cwm;
+
+  addStraightRoute(cwm);
+
+  auto map_ptr = lanelet::utils::removeConst(cwm.getMap());
+
+  autoware_lanelet2_msgs::msg::MapBin msg;
+  lanelet::utils::conversion::toBinMsg(map_ptr, &msg);
+
+  WMListenerWorker wmlw1, wmlw2, wmlw_private;
+  wmlw1.setShareMap(true);
+  wmlw2.setShareMap(true);
+
+  wmlw1.mapCallback(std::make_unique<autoware_lanelet2_msgs::msg::MapBin>(msg));
+  wmlw2.mapCallback(std::make_unique<autoware_lanelet2_msgs::msg::MapBin>(msg));
+  wmlw_private.mapCallback(std::make_unique<autoware_lanelet2_msgs::msg::MapBin>(msg));
+
+  ///// Listeners sharing the map get the same map and routing graph
+  ASSERT_TRUE((bool)wmlw1.getWorldModel()->getMap());
+  ASSERT_EQ(wmlw1.getWorldModel()->getMap(), wmlw2.getWorldModel()->getMap());
+  ASSERT_TRUE((bool)wmlw1.getWorldModel()->getMapRoutingGraph());
+  ASSERT_EQ(wmlw1.getWorldModel()->getMapRoutingGraph(), wmlw2.getWorldModel()->getMapRoutingGraph());
+
+  ///// Other listeners keep a private copy
+  ASSERT_NE(wmlw1.getWorldModel()->getMap(), wmlw_private.getWorldModel()->getMap());
+  ASSERT_EQ(wmlw1.getWorldModel()->getMap()->laneletLayer.size(), wmlw_private.getWorldModel()->getMap()->laneletLayer.size());
+
+  ///// A new map version is deserialized again
+  msg.map_version = 1;
+  wmlw2.mapCallback(std::make_unique<autoware_lanelet2_msgs::msg::MapBin>(msg));
+  ASSERT_NE(wmlw1.getWorldModel()->getMap(), wmlw2.getWorldModel()->getMap());
+
+  SharedMapStore::instance().clear();
+}
+
+TEST(WMListenerWorkerTest, sharedMapUpdateCallback)
+{
+  using namespace lanelet::units::literals;
+  auto p1 = getPoint(0, 0, 0);
+  auto p2 = getPoint(0, 1, 0);
+  auto p3 = getPoint(1, 1, 0);
+  auto p4 = getPoint(1, 0, 0);
+  lanelet::LineString3d left_ls_1(lanelet::utils::getId(), { p1, p2 });
+  lanelet::LineString3d right_ls_1(lanelet::utils::getId(), { p4, p3 });
+
+  auto ll_1 = getLanelet(left_ls_1, right_ls_1, lanelet::AttributeValueString::SolidSolid,
+                         lanelet::AttributeValueString::Dashed);
+
+  lanelet::DigitalSpeedLimitPtr speed_limit_old = std::make_shared<lanelet::DigitalSpeedLimit>(lanelet::DigitalSpeedLimit::buildData(lanelet::utils::getId(), 5_mph, {ll_1}, {},
+                                                     { lanelet::Participants::VehicleCar }));
+  lanelet::DigitalSpeedLimitPtr speed_limit_new = std::make_shared<lanelet::DigitalSpeedLimit>(lanelet::DigitalSpeedLimit::buildData(lanelet::utils::getId(), 10_mph, {ll_1}, {},
+                                                     { lanelet::Participants::VehicleCar }));
+
+  auto gf_ptr = std::make_shared<carma_wm::TrafficControl>(carma_wm::TrafficControl());
+  gf_ptr->id_ = boost::uuids::random_generator()();
+  gf_ptr->remove_list_.push_back(std::make_pair(ll_1.id(), speed_limit_old));
+  gf_ptr->update_list_.push_back(std::make_pair(ll_1.id(), speed_limit_new));
+
+  autoware_lanelet2_msgs::msg::MapBin gf_obj_msg;
+  carma_wm::toBinMsg(gf_ptr, &gf_obj_msg);
+
+  ll_1.addRegulatoryElement(speed_limit_old);
+  lanelet::LaneletMapPtr map = lanelet::utils::createMap({ ll_1 }, { });
+  autoware_lanelet2_msgs::msg::MapBin map_msg;
+  lanelet::utils::conversion::toBinMsg(map, &map_msg);
+
+  WMListenerWorker wmlw1, wmlw2;
+  wmlw1.setShareMap(true);
+  wmlw2.setShareMap(true);
+
+  wmlw1.mapCallback(std::make_unique<autoware_lanelet2_msgs::msg::MapBin>(map_msg));
+  wmlw2.mapCallback(std::make_unique<autoware_lanelet2_msgs::msg::MapBin>(map_msg));
+  auto base_map = wmlw2.getWorldModel()->getMap();
+  ASSERT_EQ(wmlw1.getWorldModel()->getMap(), base_map);
+
+  ///// The update is applied to a new snapshot, the snapshot read by the other listener is unchanged
+  wmlw1.mapUpdateCallback(std::make_unique<autoware_lanelet2_msgs::msg::MapBin>(gf_obj_msg));
+  ASSERT_NE(wmlw1.getWorldModel()->getMap(), base_map);
+  ASSERT_EQ(wmlw1.getWorldModel()->getMap()->laneletLayer.get(ll_1.id()).regulatoryElements()[0]->id(), speed_limit_new->id());
+  ASSERT_EQ(wmlw2.getWorldModel()->getMap(), base_map);
+  ASSERT_EQ(base_map->laneletLayer.get(ll_1.id()).regulatoryElements().size(), 1);
+  ASSERT_EQ(base_map->laneletLayer.get(ll_1.id()).regulatoryElements()[0]->id(), speed_limit_old->id());
+
+  ///// The other listener switches to the published snapshot when it receives the update
+  wmlw2.mapUpdateCallback(std::make_unique<autoware_lanelet2_msgs::msg::MapBin>(gf_obj_msg));
+  ASSERT_EQ(wmlw1.getWorldModel()->getMap(), wmlw2.getWorldModel()->getMap());
+  ASSERT_EQ(base_map->laneletLayer.get(ll_1.id()).regulatoryElements()[0]->id(), speed_limit_old->id());
+
+  SharedMapStore::instance().clear();
+}
+
+TEST(WMListenerWorkerTest, sharedMapSignalState)
+{
+  using namespace lanelet::units::literals;
+  auto p1 = getPoint(0, 0, 0);
+  auto p2 = getPoint(0, 1, 0);
+  auto p3 = getPoint(1, 1, 0);
+  auto p4 = getPoint(1, 0, 0);
+  auto p5 = getPoint(0, 2, 0);
+  auto p6 = getPoint(1, 2, 0);
+  lanelet::LineString3d left_ls_1(lanelet::utils::getId(), { p1, p2 });
+  lanelet::LineString3d right_ls_1(lanelet::utils::getId(), { p4, p3 });
+  lanelet::LineString3d left_ls_2(lanelet::utils::getId(), { p2, p5 });
+  lanelet::LineString3d right_ls_2(lanelet::utils::getId(), { p3, p6 });
+
+  auto ll_1 = getLanelet(left_ls_1, right_ls_1, lanelet::AttributeValueString::SolidSolid,
+                         lanelet::AttributeValueString::Dashed);
+  auto ll_2 = getLanelet(left_ls_2, right_ls_2, lanelet::AttributeValueString::SolidSolid,
+                         lanelet::AttributeValueString::Dashed);
+
+  lanelet::LineString3d stop_line(lanelet::utils::getId(), { p2, p3 });
+  std::shared_ptr<lanelet::CarmaTrafficSignal> traffic_light(new lanelet::CarmaTrafficSignal(lanelet::CarmaTrafficSignal::buildData(lanelet::utils::getId(), { stop_line }, { ll_1 }, { ll_2 })));
+  ll_1.addRegulatoryElement(traffic_light);
+
+  lanelet::DigitalSpeedLimitPtr speed_limit = std::make_shared<lanelet::DigitalSpeedLimit>(lanelet::DigitalSpeedLimit::buildData(lanelet::utils::getId(), 10_mph, {ll_2}, {},
+                                                     { lanelet::Participants::VehicleCar }));
+
+  auto gf_ptr = std::make_shared<carma_wm::TrafficControl>(carma_wm::TrafficControl());
+  gf_ptr->id_ = boost::uuids::random_generator()();
+  gf_ptr->update_list_.push_back(std::make_pair(ll_2.id(), speed_limit));
+
+  autoware_lanelet2_msgs::msg::MapBin gf_obj_msg;
+  carma_wm::toBinMsg(gf_ptr, &gf_obj_msg);
+
+  lanelet::LaneletMapPtr map = lanelet::utils::createMap({ ll_1, ll_2 }, { });
+  autoware_lanelet2_msgs::msg::MapBin map_msg;
+  lanelet::utils::conversion::toBinMsg(map, &map_msg);
+
+  WMListenerWorker wmlw1, wmlw2;
+  wmlw1.setShareMap(true);
+  wmlw2.setShareMap(true);
+
+  wmlw1.mapCallback(std::make_unique<autoware_lanelet2_msgs::msg::MapBin>(map_msg));
+  wmlw2.mapCallback(std::make_unique<autoware_lanelet2_msgs::msg::MapBin>(map_msg));
+
+  ///// Each listener has its own traffic signal, the primitives which do not hold it are shared
+  auto map_1 = wmlw1.getWorldModel()->getMap();
+  auto map_2 = wmlw2.getWorldModel()->getMap();
+  ASSERT_NE(map_1, map_2);
+  ASSERT_EQ(map_1->laneletLayer.get(ll_2.id()).constData(), map_2->laneletLayer.get(ll_2.id()).constData());
+
+  auto signal_1 = map_1->laneletLayer.get(ll_1.id()).regulatoryElementsAs<lanelet::CarmaTrafficSignal>();
+  auto signal_2 = map_2->laneletLayer.get(ll_1.id()).regulatoryElementsAs<lanelet::CarmaTrafficSignal>();
+  ASSERT_EQ(signal_1.size(), 1);
+  ASSERT_EQ(signal_2.size(), 1);
+  ASSERT_NE(signal_1[0], signal_2[0]);
+  ASSERT_EQ(map_1->regulatoryElementLayer.get(traffic_light->id()), signal_1[0]);
+
+  ///// A state recorded by one listener, as done by its SPaT callback, is not seen by the other
+  int revision = signal_2[0]->revision_ + 1;
+  std::const_pointer_cast<lanelet::CarmaTrafficSignal>(signal_1[0])->revision_ = revision;
+  ASSERT_NE(signal_2[0]->revision_, revision);
+
+  ///// The routing graph is shared but references the lanelets of each listener
+  auto graph_signal_1 = wmlw1.getWorldModel()->getMapRoutingGraph()->passableSubmap()->laneletLayer.get(ll_1.id())
+                        .regulatoryElementsAs<lanelet::CarmaTrafficSignal>();
+  ASSERT_EQ(graph_signal_1.size(), 1);
+  ASSERT_EQ(graph_signal_1[0], signal_1[0]);
+  ASSERT_EQ(wmlw1.getWorldModel()->getMapRoutingGraph()->following(map_1->laneletLayer.get(ll_1.id())).size(), 1);
+
+  ///// The state is kept when the listener switches to the snapshot of a map update
+  wmlw1.mapUpdateCallback(std::make_unique<autoware_lanelet2_msgs::msg::MapBin>(gf_obj_msg));
+  wmlw2.mapUpdateCallback(std::make_unique<autoware_lanelet2_msgs::msg::MapBin>(gf_obj_msg));
+
+  map_1 = wmlw1.getWorldModel()->getMap();
+  map_2 = wmlw2.getWorldModel()->getMap();
+  ASSERT_EQ(map_1->laneletLayer.get(ll_2.id()).regulatoryElements().size(), 1);
+  ASSERT_EQ(map_1->laneletLayer.get(ll_2.id()).constData(), map_2->laneletLayer.get(ll_2.id()).constData());
+  ASSERT_EQ(map_1->laneletLayer.get(ll_1.id()).regulatoryElementsAs<lanelet::CarmaTrafficSignal>()[0]->revision_, revision);
+  ASSERT_NE(map_2->laneletLayer.get(ll_1.id()).regulatoryElementsAs<lanelet::CarmaTrafficSignal>()[0]->revision_, revision);
+
+  SharedMapStore::instance().clear();
+}
+
 TEST(WMListenerWorkerTest, routeCallback)
 {
   WMListenerWorker wmlw;
@@ -20,11 +20,53 @@
 #include "TestHelpers.hpp"
 #include <carma_wm/WMTestLibForGuidance.hpp>
 #include <rclcpp/rclcpp.hpp>
+#include <set>
 #include <carma_wm/WorldModelUtils.hpp>
 
 namespace carma_wm
 {
 
+namespace query
+{
+
+TEST(WorldModelUtilsTest, getLaneletsNearPoints)
+{
+  // 3 lanes of 3.7 m wide and 25 m long lanelets starting at lanelets 1200, 1210 and 1220
+  auto map = test::buildGuidanceTestMap(3.7, 25);
+
+  auto ids = [](const lanelet::Lanelets& llts) {
+    std::set<lanelet::Id> ids;
+    for (const auto& llt : llts)
+    {
+      ids.insert(llt.id());
+    }
+    return ids;
+  };
+
+  // Points are spread over more than one corridor
+  lanelet::Points3d points = { getPoint(1.85, 10, 0), getPoint(3.7, 30, 0), getPoint(5.55, 140, 0),
+                               getPoint(-5, 10, 0), getPoint(9.2, 95, 0) };
+
+  auto nearby = getLaneletsNearPoints(points, map, 0.0);
+  ASSERT_EQ(points.size(), nearby.size());
+  EXPECT_EQ(std::set<lanelet::Id>({ 1200 }), ids(nearby[0]));
+  EXPECT_EQ(std::set<lanelet::Id>({ 1201, 1211 }), ids(nearby[1]));  // On the shared bound
+  EXPECT_TRUE(nearby[2].empty());  // Past the end of the map
+  EXPECT_TRUE(nearby[3].empty());
+  EXPECT_EQ(std::set<lanelet::Id>({ 1223 }), ids(nearby[4]));
+
+  nearby = getLaneletsNearPoints(points, map, 2.0);
+  EXPECT_EQ(std::set<lanelet::Id>({ 1200, 1210 }), ids(nearby[0]));
+  EXPECT_TRUE(nearby[3].empty());
+
+  nearby = getLaneletsNearPoints(points, map, 6.0);
+  EXPECT_EQ(std::set<lanelet::Id>({ 1200 }), ids(nearby[3]));
+
+  EXPECT_TRUE(getLaneletsNearPoints({}, map, 0.0).empty());
+}
+
+}
+
 namespace utils
 {
 
@@ -0,0 +1,167 @@
+/*
+ * Copyright (C) 2024 LEIDOS.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may not
+ * use this file except in compliance with the License. You may obtain a copy of
+ * the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations under
+ * the License.
+ */
+
+/**
+ * Benchmark of collision_detection::WorldCollisionDetection against an exhaustive check with the same semantics.
+ *
+ * Obstacles are scattered along a 1 km multi lane road and predicted for 5 s at 10 Hz while the host trajectory drives
+ * along the road for 10 s at 10 Hz. Scenes of 50, 200 and 1000 obstacles are checked.
+ *
+ * Usage: collision_detection_benchmark [iteration_count]
+ */
+
+#include <chrono>
+#include <cmath>
+#include <iostream>
+#include <random>
+#include <string>
+#include <vector>
+
+#include <carma_wm/collision_detection.hpp>
+
+namespace
+{
+
+constexpr double ROAD_LENGTH = 1000.0;
+constexpr double ROAD_WIDTH = 15.0;
+constexpr size_t PREDICTION_COUNT = 50;
+constexpr size_t TRAJECTORY_POINT_COUNT = 100;
+constexpr double TIME_STEP = 0.1;
+constexpr int32_t START_SEC = 1000;
+
+builtin_interfaces::msg::Time stamp(double offset) {
+  builtin_interfaces::msg::Time time;
+  double seconds = START_SEC + offset;
+  time.sec = static_cast<int32_t>(std::floor(seconds));
+  time.nanosec = static_cast<uint32_t>((seconds - time.sec) * 1e9);
+  return time;
+}
+
+double toSeconds(const builtin_interfaces::msg::Time& time) {
+  return time.sec + time.nanosec * 1e-9;
+}
+
+carma_perception_msgs::msg::RoadwayObstacleList obstacles(size_t count, std::mt19937& generator) {
+  std::uniform_real_distribution<double> position_x(0.0, ROAD_LENGTH);
+  std::uniform_real_distribution<double> position_y(-ROAD_WIDTH / 2, ROAD_WIDTH / 2);
+  std::uniform_real_distribution<double> speed(0.0, 20.0);
+
+  carma_perception_msgs::msg::RoadwayObstacleList rwol;
+  for (size_t i = 0; i < count; i++) {
+    carma_perception_msgs::msg::RoadwayObstacle rwo;
+    rwo.object.size.x = 4.0;
+    rwo.object.size.y = 2.0;
+
+    double x = position_x(generator);
+    double y = position_y(generator);
+    double v = speed(generator);
+
+    for (size_t j = 0; j < PREDICTION_COUNT; j++) {
+      carma_perception_msgs::msg::PredictedState state;
+      state.header.stamp = stamp(j * TIME_STEP);
+      state.predicted_position.position.x = x + v * j * TIME_STEP;
+      state.predicted_position.position.y = y;
+      rwo.object.predictions.push_back(state);
+    }
+    rwol.roadway_obstacles.push_back(rwo);
+  }
+  return rwol;
+}
+
+carma_planning_msgs::msg::TrajectoryPlan trajectory() {
+  carma_planning_msgs::msg::TrajectoryPlan tp;
+  for (size_t i = 0; i < TRAJECTORY_POINT_COUNT; i++) {
+    carma_planning_msgs::msg::TrajectoryPlanPoint point;
+    point.x = 15.0 * i * TIME_STEP;
+    point.y = 0.0;
+    point.target_time = stamp(i * TIME_STEP);
+    tp.trajectory_points.push_back(point);
+  }
+  return tp;
+}
+
+// Checks every trajectory point against every predicted state, with the semantics of WorldCollisionDetection
+size_t exhaustiveCollisionCount(const carma_perception_msgs::msg::RoadwayObstacleList& rwol, const carma_planning_msgs::msg::TrajectoryPlan& tp,
+                                const geometry_msgs::msg::Vector3& size) {
+  double host_radius = 0.5 * std::sqrt(size.x * size.x + size.y * size.y);
+  size_t count = 0;
+
+  for (const auto& rwo : rwol.roadway_obstacles) {
+    double radius = host_radius + 0.5 * std::sqrt(rwo.object.size.x * rwo.object.size.x + rwo.object.size.y * rwo.object.size.y);
+    bool collision = false;
+
+    for (const auto& state : rwo.object.predictions) {
+      for (const auto& point : tp.trajectory_points) {
+        double dx = state.predicted_position.position.x - point.x;
+        double dy = state.predicted_position.position.y - point.y;
+
+        if (std::abs(toSeconds(state.header.stamp) - toSeconds(point.target_time)) <= carma_wm::collision_detection::DEFAULT_COLLISION_TIME_TOLERANCE &&
+            dx * dx + dy * dy <= radius * radius) {
+          collision = true;
+          break;
+        }
+      }
+      if (collision) {
+        break;
+      }
+    }
+    count += collision;
+  }
+  return count;
+}
+
+template <class F>
+double averageMicroseconds(size_t iteration_count, F&& f) {
+  auto start = std::chrono::steady_clock::now();
+  for (size_t i = 0; i < iteration_count; i++) {
+    f();
+  }
+  auto end = std::chrono::steady_clock::now();
+  return std::chrono::duration<double, std::micro>(end - start).count() / iteration_count;
+}
+
+}  // namespace
+
+int main(int argc, char** argv) {
+  size_t iteration_count = argc > 1 ? std::stoul(argv[1]) : 20;
+
+  std::mt19937 generator(42);
+  auto tp = trajectory();
+
+  geometry_msgs::msg::Vector3 size;
+  size.x = 5.0;
+  size.y = 2.0;
+  geometry_msgs::msg::Twist velocity;
+
+  for (size_t object_count : {50, 200, 1000}) {
+    auto rwol = obstacles(object_count, generator);
+
+    size_t indexed_count = 0;
+    double indexed_us = averageMicroseconds(iteration_count, [&]() {
+      indexed_count = carma_wm::collision_detection::WorldCollisionDetection(rwol, tp, size, velocity).size();
+    });
+
+    size_t exhaustive_count = 0;
+    double exhaustive_us = averageMicroseconds(iteration_count, [&]() {
+      exhaustive_count = exhaustiveCollisionCount(rwol, tp, size);
+    });
+
+    std::cout << object_count << " objects: indexed " << indexed_us << " us, exhaustive " << exhaustive_us << " us, "
+              << indexed_count << " collisions" << (indexed_count == exhaustive_count ? "" : " (MISMATCH)") << std::endl;
+  }
+
+  return 0;
+}
@@ -0,0 +1,103 @@
+#pragma once
+/*
+ * Copyright (C) 2024 LEIDOS.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may not
+ * use this file except in compliance with the License. You may obtain a copy of
+ * the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations under
+ * the License.
+ */
+#include <set>
+#include <unordered_map>
+#include <unordered_set>
+#include <utility>
+#include <vector>
+#include <boost/optional.hpp>
+#include <lanelet2_core/primitives/Lanelet.h>
+
+namespace carma_wm_ctrl
+{
+/**
+ * @brief Index of the lanelets affected by active geofences, along with the downtrack of their start on the current route.
+ *
+ * Route lanelets are assigned the distance along the route to their start once when the route is set. The active lanelets
+ * on the route are then kept sorted by that distance, so finding the next active lanelet ahead of a point is a binary search
+ * and checking if a lanelet is active is a hash lookup, regardless of the route length or the number of active geofences.
+ *
+ * Lanelets which appear several times on a route are indexed at their first occurrence.
+ */
+class ActiveGeofenceIndex
+{
+public:
+  /**
+   * @brief Sets the route the downtracks are computed along. Active lanelets are kept.
+   *
+   * Consecutive route lanelets which share a bound are a lane change and start at the same downtrack.
+   *
+   * @param route_path The lanelets of the route in order
+   */
+  void setRoute(const lanelet::ConstLanelets& route_path);
+
+  /**
+   * @brief Marks a lanelet as affected by an active geofence
+   *
+   * @param id The lanelet id
+   */
+  void activate(lanelet::Id id);
+
+  /**
+   * @brief Marks a lanelet as no longer affected by an active geofence
+   *
+   * @param id The lanelet id
+   */
+  void deactivate(lanelet::Id id);
+
+  /**
+   * @brief Returns true if the lanelet is affected by an active geofence
+   */
+  bool isActive(lanelet::Id id) const;
+
+  /**
+   * @brief Returns true if no lanelet is affected by an active geofence
+   */
+  bool empty() const;
+
+  /**
+   * @brief Returns the downtrack along the route of a point on a lanelet
+   *
+   * @param llt The lanelet the point is on
+   * @param point The point
+   *
+   * @return The downtrack in meters, or boost::none if the lanelet is not on the route
+   */
+  boost::optional<double> routeDowntrack(const lanelet::ConstLanelet& llt, const lanelet::BasicPoint2d& point) const;
+
+  /**
+   * @brief Returns the distance along the route to the start of the nearest active lanelet ahead of a downtrack
+   *
+   * @param route_downtrack The downtrack along the route in meters
+   * @param current_llt_id Id of the lanelet the downtrack is on, which is never reported
+   *
+   * @return The distance in meters, or boost::none if there is no active lanelet ahead on the route
+   */
+  boost::optional<double> distanceToNextActive(double route_downtrack, lanelet::Id current_llt_id) const;
+
+  /**
+   * @brief Returns the ids of the active lanelets on the route in route order
+   */
+  std::vector<lanelet::Id> activeIdsOnRoute() const;
+
+private:
+  std::unordered_set<lanelet::Id> active_ids_;
+  std::unordered_map<lanelet::Id, double> route_start_downtracks_;
+  std::set<std::pair<double, lanelet::Id>> active_on_route_;  // (start downtrack, id) of the active lanelets on the route
+};
+
+}  // namespace carma_wm_ctrl
@@ -30,6 +30,7 @@
 #include <autoware_lanelet2_ros2_interface/utility/message_conversion.hpp>
 #include <lanelet2_extension/projection/local_frame_projector.h>
 #include <carma_wm_ctrl/GeofenceScheduler.hpp>
+#include <carma_wm_ctrl/ActiveGeofenceIndex.hpp>
 #include <lanelet2_core/geometry/BoundingBox.h>
 #include <lanelet2_core/primitives/BoundingBox.h>
 #include <carma_wm/WMListener.hpp>
@@ -40,6 +41,7 @@
 #include <geometry_msgs/msg/pose_stamped.h>
 
 #include <carma_wm/MapConformer.hpp>
+#include <carma_wm/MapCache.hpp>
 
 #include <lanelet2_extension/traffic_rules/CarmaUSTrafficRules.h>
 #include <lanelet2_core/utility/Units.h>
@@ -195,6 +197,14 @@ public:
  */
   void setVehicleParticipationType(std::string participant);
 
+  /**
+   * @brief Set the directory of the on disk cache of the compliant base map and its routing graph.
+   *        An empty string disables the cache.
+   *
+   * @param map_cache_dir The cache directory
+   */
+  void setMapCacheDir(const std::string& map_cache_dir);
+
   /**
    * @brief Get the Vehicle Participation Type object
    *
@@ -412,13 +422,14 @@ public:
 private:
   double error_distance_ = 5; //meters
   lanelet::ConstLanelets route_path_;
-  std::unordered_set<lanelet::Id> active_geofence_llt_ids_;
+  ActiveGeofenceIndex active_geofence_index_;
   std::unordered_map<uint8_t, std::shared_ptr<Geofence>> work_zone_geofence_cache_;
   std::unordered_map<uint32_t, lanelet::Id> traffic_light_id_lookup_;
   void addRegulatoryComponent(std::shared_ptr<Geofence> gf_ptr) const;
   void addBackRegulatoryComponent(std::shared_ptr<Geofence> gf_ptr) const;
   void removeGeofenceHelper(std::shared_ptr<Geofence> gf_ptr) const;
   void addGeofenceHelper(std::shared_ptr<Geofence> gf_ptr);
+  double distToNearestActiveGeofenceFromLanelet(const lanelet::BasicPoint2d& curr_pos, const lanelet::ConstLanelet& curr_lanelet) const;
   bool shouldChangeControlLine(const lanelet::ConstLaneletOrArea& el,const lanelet::RegulatoryElementConstPtr& regem, std::shared_ptr<Geofence> gf_ptr) const;
   bool shouldChangeTrafficSignal(const lanelet::ConstLaneletOrArea& el,const lanelet::RegulatoryElementConstPtr& regem, std::shared_ptr<carma_wm::SignalizedIntersectionManager> sim) const;
   void addPassingControlLineFromMsg(std::shared_ptr<Geofence> gf_ptr, const carma_v2x_msgs::msg::TrafficControlMessageV01& msg_v01, const std::vector<lanelet::Lanelet>& affected_llts) const;
@@ -434,6 +445,7 @@ private:
   lanelet::routing::RoutingGraphPtr current_routing_graph_; // Current map routing graph
   lanelet::Velocity config_limit;
   std::string participant_ = lanelet::Participants::VehicleCar;//Default participant type
+  std::unique_ptr<carma_wm::MapCache> map_cache_; // Cache of the compliant base map and its routing graph, null if disabled
   std::unordered_set<std::string>  checked_geofence_ids_;
   std::unordered_set<std::string>  generated_geofence_reqids_;
   std::vector<lanelet::LaneletMapPtr> cached_maps_;
@@ -35,6 +35,7 @@ namespace carma_wm_ctrl
     double config_limit = 6.67; //config speed limit in m/s
     std::string vehicle_id = "CARMA"; 
     std::string participant = "vehicle:car";
+    std::string map_cache_dir = ""; // Directory of the on disk cache of the compliant base map and its routing graph. Empty to disable the cache
     
     // Stream operator for this config
     friend std::ostream &operator<<(std::ostream &output, const Config &c)
@@ -48,6 +49,7 @@ namespace carma_wm_ctrl
            << "vehicle_id: " << c.vehicle_id << std::endl
            << "participant: " << c.participant << std::endl
            << "config_limit: " << c.config_limit << std::endl
+           << "map_cache_dir: " << c.map_cache_dir << std::endl
            << "}" << std::endl;
       return output;
     }
@@ -0,0 +1,134 @@
+/*
+ * Copyright (C) 2024 LEIDOS.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may not
+ * use this file except in compliance with the License. You may obtain a copy of
+ * the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations under
+ * the License.
+ */
+
+#include <carma_wm_ctrl/ActiveGeofenceIndex.hpp>
+#include <carma_wm/Geometry.hpp>
+#include <lanelet2_core/geometry/Lanelet.h>
+#include <limits>
+
+namespace carma_wm_ctrl
+{
+namespace
+{
+bool isLaneChange(const lanelet::ConstLanelet& from, const lanelet::ConstLanelet& to)
+{
+  return from.leftBound().id() == to.rightBound().id() || from.rightBound().id() == to.leftBound().id();
+}
+}  // namespace
+
+void ActiveGeofenceIndex::setRoute(const lanelet::ConstLanelets& route_path)
+{
+  route_start_downtracks_.clear();
+  active_on_route_.clear();
+
+  double downtrack = 0;
+  for (size_t i = 0; i < route_path.size(); i++)
+  {
+    if (i > 0 && !isLaneChange(route_path[i - 1], route_path[i]))
+    {
+      downtrack += lanelet::geometry::length2d(route_path[i - 1]);
+    }
+    route_start_downtracks_.emplace(route_path[i].id(), downtrack);
+  }
+
+  for (auto id : active_ids_)
+  {
+    auto start = route_start_downtracks_.find(id);
+    if (start != route_start_downtracks_.end())
+    {
+      active_on_route_.emplace(start->second, id);
+    }
+  }
+}
+
+void ActiveGeofenceIndex::activate(lanelet::Id id)
+{
+  if (!active_ids_.insert(id).second)
+  {
+    return;
+  }
+
+  auto start = route_start_downtracks_.find(id);
+  if (start != route_start_downtracks_.end())
+  {
+    active_on_route_.emplace(start->second, id);
+  }
+}
+
+void ActiveGeofenceIndex::deactivate(lanelet::Id id)
+{
+  if (active_ids_.erase(id) == 0)
+  {
+    return;
+  }
+
+  auto start = route_start_downtracks_.find(id);
+  if (start != route_start_downtracks_.end())
+  {
+    active_on_route_.erase({ start->second, id });
+  }
+}
+
+bool ActiveGeofenceIndex::isActive(lanelet::Id id) const
+{
+  return active_ids_.find(id) != active_ids_.end();
+}
+
+bool ActiveGeofenceIndex::empty() const
+{
+  return active_ids_.empty();
+}
+
+boost::optional<double> ActiveGeofenceIndex::routeDowntrack(const lanelet::ConstLanelet& llt, const lanelet::BasicPoint2d& point) const
+{
+  auto start = route_start_downtracks_.find(llt.id());
+  if (start == route_start_downtracks_.end())
+  {
+    return boost::none;
+  }
+
+  return start->second + carma_wm::geometry::trackPos(llt, point).downtrack;
+}
+
+boost::optional<double> ActiveGeofenceIndex::distanceToNextActive(double route_downtrack, lanelet::Id current_llt_id) const
+{
+  // First active lanelet starting strictly ahead of the downtrack
+  auto next = active_on_route_.upper_bound({ route_downtrack, std::numeric_limits<lanelet::Id>::max() });
+  while (next != active_on_route_.end() && next->second == current_llt_id)
+  {
+    next++;
+  }
+
+  if (next == active_on_route_.end())
+  {
+    return boost::none;
+  }
+
+  return next->first - route_downtrack;
+}
+
+std::vector<lanelet::Id> ActiveGeofenceIndex::activeIdsOnRoute() const
+{
+  std::vector<lanelet::Id> ids;
+  ids.reserve(active_on_route_.size());
+  for (const auto& start_id : active_on_route_)
+  {
+    ids.push_back(start_id.second);
+  }
+  return ids;
+}
+
+}  // namespace carma_wm_ctrl
@@ -72,27 +72,70 @@ void WMBroadcaster::baseMapCallback(autoware_lanelet2_msgs::msg::MapBin::UniqueP
   lanelet::LaneletMapPtr new_map(new lanelet::LaneletMap);
   lanelet::LaneletMapPtr new_map_to_change(new lanelet::LaneletMap);
 
-  lanelet::utils::conversion::fromBinMsg(*map_msg, new_map);
-  lanelet::utils::conversion::fromBinMsg(*map_msg, new_map_to_change);
+  autoware_lanelet2_msgs::msg::MapBin compliant_map_msg;
 
-  base_map_ = new_map;  // Store map
-  current_map_ = new_map_to_change; // broadcaster makes changes to this
+  // The compliant map and its routing graph only depend on the received map, the speed limit and the participant
+  std::string cache_key;
+  if (map_cache_)
+  {
+    cache_key = carma_wm::MapCache::contentKey(*map_msg, std::to_string(config_limit.value()));
+  }
 
-  lanelet::MapConformer::ensureCompliance(base_map_, config_limit);     // Update map to ensure it complies with expectations
-  lanelet::MapConformer::ensureCompliance(current_map_, config_limit);
+  bool loaded_from_cache = false;
+  if (map_cache_ && map_cache_->loadMap(cache_key, compliant_map_msg))
+  {
+    RCLCPP_INFO_STREAM(rclcpp::get_logger("carma_wm_ctrl"), "Loading base map and routing graph from cache entry: " << cache_key);
 
-  RCLCPP_INFO_STREAM(rclcpp::get_logger("carma_wm_ctrl"), "Building routing graph for base map");
+    carma_wm::LaneletRoutingGraphPtr cached_graph;
+    try
+    {
+      lanelet::utils::conversion::fromBinMsg(compliant_map_msg, new_map);
+      lanelet::utils::conversion::fromBinMsg(compliant_map_msg, new_map_to_change);
 
-  lanelet::traffic_rules::TrafficRulesUPtr traffic_rules_car = lanelet::traffic_rules::TrafficRulesFactory::create(
-  lanelet::traffic_rules::CarmaUSTrafficRules::Location, participant_);
-  current_routing_graph_ = lanelet::routing::RoutingGraph::build(*current_map_, *traffic_rules_car);
+      cached_graph = map_cache_->loadRoutingGraph(cache_key, participant_, new_map_to_change);
+    }
+    catch (const std::exception& e)
+    {
+      // An unreadable entry is a cache miss, it is overwritten by the rebuilt map below
+      RCLCPP_WARN_STREAM(rclcpp::get_logger("carma_wm_ctrl"), "Failed to read map cache entry: " << cache_key << " Error: " << e.what());
+    }
 
-  RCLCPP_INFO_STREAM(rclcpp::get_logger("carma_wm_ctrl"), "Done building routing graph for base map");
+    if (cached_graph)
+    {
+      base_map_ = new_map;  // Store map
+      current_map_ = new_map_to_change; // broadcaster makes changes to this
+      current_routing_graph_ = cached_graph;
+      loaded_from_cache = true;
+    }
+    else
+    {
+      RCLCPP_WARN_STREAM(rclcpp::get_logger("carma_wm_ctrl"), "Ignoring map cache entry without a usable routing graph: " << cache_key);
+      new_map = lanelet::LaneletMapPtr(new lanelet::LaneletMap);
+      new_map_to_change = lanelet::LaneletMapPtr(new lanelet::LaneletMap);
+    }
+  }
 
-  // Publish map
-  current_map_version_ += 1; // Increment the map version. It should always start from 1 for the first map
+  if (!loaded_from_cache)
+  {
+    lanelet::utils::conversion::fromBinMsg(*map_msg, new_map);
+    lanelet::utils::conversion::fromBinMsg(*map_msg, new_map_to_change);
 
-  autoware_lanelet2_msgs::msg::MapBin compliant_map_msg;
+    base_map_ = new_map;  // Store map
+    current_map_ = new_map_to_change; // broadcaster makes changes to this
+
+    lanelet::MapConformer::ensureCompliance(base_map_, config_limit);     // Update map to ensure it complies with expectations
+    lanelet::MapConformer::ensureCompliance(current_map_, config_limit);
+
+    RCLCPP_INFO_STREAM(rclcpp::get_logger("carma_wm_ctrl"), "Building routing graph for base map");
+
+    lanelet::traffic_rules::TrafficRulesUPtr traffic_rules_car = lanelet::traffic_rules::TrafficRulesFactory::create(
+    lanelet::traffic_rules::CarmaUSTrafficRules::Location, participant_);
+    current_routing_graph_ = lanelet::routing::RoutingGraph::build(*current_map_, *traffic_rules_car);
+
+    RCLCPP_INFO_STREAM(rclcpp::get_logger("carma_wm_ctrl"), "Done building routing graph for base map");
+
+    lanelet::utils::conversion::toBinMsg(current_map_, &compliant_map_msg);
+  }
 
   // Populate the routing graph message
   RCLCPP_INFO_STREAM(rclcpp::get_logger("carma_wm_ctrl"), "Creating routing graph message.");
@@ -100,11 +143,19 @@ void WMBroadcaster::baseMapCallback(autoware_lanelet2_msgs::msg::MapBin::UniqueP
   auto readable_graph = std::static_pointer_cast<RoutingGraphAccessor>(current_routing_graph_);
 
   compliant_map_msg.routing_graph = readable_graph->routingGraphToMsg(participant_);
-  compliant_map_msg.has_routing_graph = true;
 
   RCLCPP_INFO_STREAM(rclcpp::get_logger("carma_wm_ctrl"), "Done creating routing graph message.");
 
-  lanelet::utils::conversion::toBinMsg(current_map_, &compliant_map_msg);
+  if (map_cache_ && !loaded_from_cache)
+  {
+    map_cache_->storeMap(cache_key, compliant_map_msg);
+    map_cache_->storeRoutingGraph(cache_key, compliant_map_msg.routing_graph);
+  }
+
+  // Publish map
+  current_map_version_ += 1; // Increment the map version. It should always start from 1 for the first map
+
+  compliant_map_msg.has_routing_graph = true;
   compliant_map_msg.map_version = current_map_version_;
   map_pub_(compliant_map_msg);
 };
@@ -1248,6 +1299,16 @@ void WMBroadcaster::setVehicleParticipationType(std::string participant)
   participant_ = participant;
 }
 
+void WMBroadcaster::setMapCacheDir(const std::string& map_cache_dir)
+{
+  if (map_cache_dir.empty())
+  {
+    map_cache_.reset();
+    return;
+  }
+  map_cache_ = std::make_unique<carma_wm::MapCache>(map_cache_dir);
+}
+
 std::string WMBroadcaster::getVehicleParticipationType()
 {
   return participant_;
@@ -1560,7 +1621,7 @@ void WMBroadcaster::addGeofence(std::shared_ptr<Geofence> gf_ptr)
 
     if (!detected_map_msg_signal)
     {
-      for (auto pair : update->update_list_) active_geofence_llt_ids_.insert(pair.first);
+      for (auto pair : update->update_list_) active_geofence_index_.activate(pair.first);
     }
 
     autoware_lanelet2_msgs::msg::MapBin gf_msg;
@@ -1618,7 +1679,7 @@ void WMBroadcaster::removeGeofence(std::shared_ptr<Geofence> gf_ptr)
 
   removeGeofenceHelper(gf_ptr);
 
-  for (auto pair : gf_ptr->remove_list_) active_geofence_llt_ids_.erase(pair.first);
+  for (auto pair : gf_ptr->remove_list_) active_geofence_index_.deactivate(pair.first);
 
   // publish
   autoware_lanelet2_msgs::msg::MapBin gf_msg_revert;
@@ -1690,6 +1751,10 @@ carma_v2x_msgs::msg::TrafficControlRequest WMBroadcaster::controlRequestFromRout
 
   // update local copy
   route_path_ = path;
+  {
+    std::lock_guard<std::mutex> guard(map_mutex_);
+    active_geofence_index_.setRoute(route_path_);
+  }
 
   if(path.size() == 0) throw lanelet::InvalidObjectStateError(std::string("No lanelets available in path."));
 
@@ -1905,13 +1970,6 @@ double WMBroadcaster::distToNearestActiveGeofence(const lanelet::BasicPoint2d& c
     throw lanelet::InvalidObjectStateError(std::string("Lanelet map (current_map_) is not loaded to the WMBroadcaster"));
   }
 
-  // filter only the lanelets in the route
-  std::vector<lanelet::Id> active_geofence_on_route;
-  for (auto llt : route_path_)
-  {
-    if (active_geofence_llt_ids_.find(llt.id()) != active_geofence_llt_ids_.end())
-      active_geofence_on_route.push_back(llt.id());
-  }
   // Get the lanelet of this point
   auto curr_lanelet = lanelet::geometry::findNearest(current_map_->laneletLayer, curr_pos, 1)[0].second;
 
@@ -1919,10 +1977,22 @@ double WMBroadcaster::distToNearestActiveGeofence(const lanelet::BasicPoint2d& c
   if (!boost::geometry::within(curr_pos, curr_lanelet.polygon2d().basicPolygon()))
     throw std::invalid_argument("Given point is not within any lanelet");
 
-  // get route distance (downtrack + cross_track) distances to every lanelets by their ids
+  return distToNearestActiveGeofenceFromLanelet(curr_pos, curr_lanelet);
+}
+
+double WMBroadcaster::distToNearestActiveGeofenceFromLanelet(const lanelet::BasicPoint2d& curr_pos, const lanelet::ConstLanelet& curr_lanelet) const
+{
+  // On the route the distance is read from the downtracks precomputed along the route
+  auto route_downtrack = active_geofence_index_.routeDowntrack(curr_lanelet, curr_pos);
+  if (route_downtrack)
+  {
+    return active_geofence_index_.distanceToNextActive(*route_downtrack, curr_lanelet.id()).value_or(0.0);
+  }
+
+  // Off the route, get route distance (downtrack + cross_track) distances to every active lanelet on the route
   std::vector<double> route_distances;
   // and take abs of cross_track to add them to get route distance
-  for (auto id: active_geofence_on_route)
+  for (auto id: active_geofence_index_.activeIdsOnRoute())
   {
     carma_wm::TrackPos tp = carma_wm::geometry::trackPos(current_map_->laneletLayer.get(id), curr_pos);
     // downtrack needs to be negative for lanelet to be in front of the point,
@@ -2059,7 +2129,7 @@ carma_perception_msgs::msg::CheckActiveGeofence WMBroadcaster::checkActiveGeofen
   carma_perception_msgs::msg::CheckActiveGeofence outgoing_geof; //message to publish
   double next_distance = 0 ; //Distance to next geofence
 
-  if (active_geofence_llt_ids_.size() <= 0 )
+  if (active_geofence_index_.empty())
   {
     return outgoing_geof;
   }
@@ -2071,115 +2141,115 @@ carma_perception_msgs::msg::CheckActiveGeofence WMBroadcaster::checkActiveGeofen
   /* determine whether or not the vehicle's current position is within an active geofence */
   if (boost::geometry::within(curr_pos, current_llt.polygon2d().basicPolygon()))
   {
-    next_distance = distToNearestActiveGeofence(curr_pos);
+    {
+      std::lock_guard<std::mutex> guard(map_mutex_);
+      next_distance = distToNearestActiveGeofenceFromLanelet(curr_pos, current_llt);
+    }
     outgoing_geof.distance_to_next_geofence = next_distance;
 
-    for(auto id : active_geofence_llt_ids_)
+    if (active_geofence_index_.isActive(current_llt.id()))
     {
-      if (id == current_llt.id())
+      RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm_ctrl"), "Vehicle is on Lanelet " << current_llt.id() << ", which has an active geofence");
+      outgoing_geof.is_on_active_geofence = true;
+      for (auto regem: current_llt.regulatoryElements())
       {
-        RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm_ctrl"), "Vehicle is on Lanelet " << current_llt.id() << ", which has an active geofence");
-        outgoing_geof.is_on_active_geofence = true;
-        for (auto regem: current_llt.regulatoryElements())
+        // Assign active geofence fields based on the speed limit associated with this lanelet
+        if (regem->attribute(lanelet::AttributeName::Subtype).value().compare(lanelet::DigitalSpeedLimit::RuleName) == 0)
         {
-          // Assign active geofence fields based on the speed limit associated with this lanelet
-          if (regem->attribute(lanelet::AttributeName::Subtype).value().compare(lanelet::DigitalSpeedLimit::RuleName) == 0)
-          {
-            lanelet::DigitalSpeedLimitPtr speed =  std::dynamic_pointer_cast<lanelet::DigitalSpeedLimit>
-            (current_map_->regulatoryElementLayer.get(regem->id()));
-            outgoing_geof.value = speed->speed_limit_.value();
-            outgoing_geof.advisory_speed = speed->speed_limit_.value();
-            outgoing_geof.reason = speed->getReason();
+          lanelet::DigitalSpeedLimitPtr speed =  std::dynamic_pointer_cast<lanelet::DigitalSpeedLimit>
+          (current_map_->regulatoryElementLayer.get(regem->id()));
+          outgoing_geof.value = speed->speed_limit_.value();
+          outgoing_geof.advisory_speed = speed->speed_limit_.value();
+          outgoing_geof.reason = speed->getReason();
 
-            RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm_ctrl"), "Active geofence has a speed limit of " << speed->speed_limit_.value());
+          RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm_ctrl"), "Active geofence has a speed limit of " << speed->speed_limit_.value());
 
-            // Cannot overrule outgoing_geof.type if it is already set to LANE_CLOSED
-            if(outgoing_geof.type != carma_perception_msgs::msg::CheckActiveGeofence::LANE_CLOSED)
-            {
-              outgoing_geof.type = carma_perception_msgs::msg::CheckActiveGeofence::SPEED_LIMIT;
-            }
+          // Cannot overrule outgoing_geof.type if it is already set to LANE_CLOSED
+          if(outgoing_geof.type != carma_perception_msgs::msg::CheckActiveGeofence::LANE_CLOSED)
+          {
+            outgoing_geof.type = carma_perception_msgs::msg::CheckActiveGeofence::SPEED_LIMIT;
           }
+        }
+
+        // Assign active geofence fields based on the minimum gap associated with this lanelet (if it exists)
+        if(regem->attribute(lanelet::AttributeName::Subtype).value().compare(lanelet::DigitalMinimumGap::RuleName) == 0)
+        {
+          lanelet::DigitalMinimumGapPtr min_gap =  std::dynamic_pointer_cast<lanelet::DigitalMinimumGap>
+          (current_map_->regulatoryElementLayer.get(regem->id()));
+          outgoing_geof.minimum_gap = min_gap->getMinimumGap();
+          RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm_ctrl"), "Active geofence has a minimum gap of " << min_gap->getMinimumGap());
+        }
 
-          // Assign active geofence fields based on the minimum gap associated with this lanelet (if it exists)
-          if(regem->attribute(lanelet::AttributeName::Subtype).value().compare(lanelet::DigitalMinimumGap::RuleName) == 0)
+        // Assign active geofence fields based on whether the current lane is closed or is immediately adjacent to a closed lane
+        if(regem->attribute(lanelet::AttributeName::Subtype).value().compare(lanelet::RegionAccessRule::RuleName) == 0)
+        {
+          lanelet::RegionAccessRulePtr accessRuleReg =  std::dynamic_pointer_cast<lanelet::RegionAccessRule>
+          (current_map_->regulatoryElementLayer.get(regem->id()));
+
+          // Update the 'type' and 'reason' for this active geofence if the vehicle is in a closed lane
+          if(!accessRuleReg->accessable(lanelet::Participants::VehicleCar) || !accessRuleReg->accessable(lanelet::Participants::VehicleTruck))
           {
-            lanelet::DigitalMinimumGapPtr min_gap =  std::dynamic_pointer_cast<lanelet::DigitalMinimumGap>
-            (current_map_->regulatoryElementLayer.get(regem->id()));
-            outgoing_geof.minimum_gap = min_gap->getMinimumGap();
-            RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm_ctrl"), "Active geofence has a minimum gap of " << min_gap->getMinimumGap());
+            RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm_ctrl"), "Active geofence is a closed lane.");
+            RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm_ctrl"), "Closed lane reason: " << accessRuleReg->getReason());
+            outgoing_geof.reason = accessRuleReg->getReason();
+            outgoing_geof.type = carma_perception_msgs::msg::CheckActiveGeofence::LANE_CLOSED;
           }
-
-          // Assign active geofence fields based on whether the current lane is closed or is immediately adjacent to a closed lane
-          if(regem->attribute(lanelet::AttributeName::Subtype).value().compare(lanelet::RegionAccessRule::RuleName) == 0)
+          // Otherwise, update the 'type' and 'reason' for this active geofence if the vehicle is in a lane immediately adjacent to a closed lane with the same travel direction
+          else
           {
-            lanelet::RegionAccessRulePtr accessRuleReg =  std::dynamic_pointer_cast<lanelet::RegionAccessRule>
-            (current_map_->regulatoryElementLayer.get(regem->id()));
+            // Obtain all same-direction lanes sharing the right lane boundary (will include the current lanelet)
+            auto right_boundary_lanelets = current_map_->laneletLayer.findUsages(current_llt.rightBound());
 
-            // Update the 'type' and 'reason' for this active geofence if the vehicle is in a closed lane
-            if(!accessRuleReg->accessable(lanelet::Participants::VehicleCar) || !accessRuleReg->accessable(lanelet::Participants::VehicleTruck))
-            {
-              RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm_ctrl"), "Active geofence is a closed lane.");
-              RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm_ctrl"), "Closed lane reason: " << accessRuleReg->getReason());
-              outgoing_geof.reason = accessRuleReg->getReason();
-              outgoing_geof.type = carma_perception_msgs::msg::CheckActiveGeofence::LANE_CLOSED;
-            }
-            // Otherwise, update the 'type' and 'reason' for this active geofence if the vehicle is in a lane immediately adjacent to a closed lane with the same travel direction
-            else
+            // Check if the adjacent right lane is closed
+            if(right_boundary_lanelets.size() > 1)
             {
-              // Obtain all same-direction lanes sharing the right lane boundary (will include the current lanelet)
-              auto right_boundary_lanelets = current_map_->laneletLayer.findUsages(current_llt.rightBound());
-
-              // Check if the adjacent right lane is closed
-              if(right_boundary_lanelets.size() > 1)
+              for(auto lanelet : right_boundary_lanelets)
               {
-                for(auto lanelet : right_boundary_lanelets)
+                // Only check the adjacent right lanelet; ignore the current lanelet
+                if(lanelet.id() != current_llt.id())
                 {
-                  // Only check the adjacent right lanelet; ignore the current lanelet
-                  if(lanelet.id() != current_llt.id())
+                  for (auto rightRegem: lanelet.regulatoryElements())
                   {
-                    for (auto rightRegem: lanelet.regulatoryElements())
+                    if(rightRegem->attribute(lanelet::AttributeName::Subtype).value().compare(lanelet::RegionAccessRule::RuleName) == 0)
                     {
-                      if(rightRegem->attribute(lanelet::AttributeName::Subtype).value().compare(lanelet::RegionAccessRule::RuleName) == 0)
+                      lanelet::RegionAccessRulePtr rightAccessRuleReg =  std::dynamic_pointer_cast<lanelet::RegionAccessRule>
+                      (current_map_->regulatoryElementLayer.get(rightRegem->id()));
+                      if(!rightAccessRuleReg->accessable(lanelet::Participants::VehicleCar) || !rightAccessRuleReg->accessable(lanelet::Participants::VehicleTruck))
                       {
-                        lanelet::RegionAccessRulePtr rightAccessRuleReg =  std::dynamic_pointer_cast<lanelet::RegionAccessRule>
-                        (current_map_->regulatoryElementLayer.get(rightRegem->id()));
-                        if(!rightAccessRuleReg->accessable(lanelet::Participants::VehicleCar) || !rightAccessRuleReg->accessable(lanelet::Participants::VehicleTruck))
-                        {
-                          RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm_ctrl"), "Right adjacent Lanelet " << lanelet.id() << " is CLOSED");
-                          RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm_ctrl"), "Assigning LANE_CLOSED type to active geofence");
-                          RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm_ctrl"), "Assigning reason " << rightAccessRuleReg->getReason());
-                          outgoing_geof.reason = rightAccessRuleReg->getReason();
-                          outgoing_geof.type = carma_perception_msgs::msg::CheckActiveGeofence::LANE_CLOSED;
-                        }
+                        RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm_ctrl"), "Right adjacent Lanelet " << lanelet.id() << " is CLOSED");
+                        RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm_ctrl"), "Assigning LANE_CLOSED type to active geofence");
+                        RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm_ctrl"), "Assigning reason " << rightAccessRuleReg->getReason());
+                        outgoing_geof.reason = rightAccessRuleReg->getReason();
+                        outgoing_geof.type = carma_perception_msgs::msg::CheckActiveGeofence::LANE_CLOSED;
                       }
                     }
                   }
                 }
               }
+            }
 
-              // Check if the adjacent left lane is closed
-              auto left_boundary_lanelets = current_map_->laneletLayer.findUsages(current_llt.leftBound());
-              if(left_boundary_lanelets.size() > 1)
+            // Check if the adjacent left lane is closed
+            auto left_boundary_lanelets = current_map_->laneletLayer.findUsages(current_llt.leftBound());
+            if(left_boundary_lanelets.size() > 1)
+            {
+              for(auto lanelet : left_boundary_lanelets)
               {
-                for(auto lanelet : left_boundary_lanelets)
+                // Only check the adjacent left lanelet; ignore the current lanelet
+                if(lanelet.id() != current_llt.id())
                 {
-                  // Only check the adjacent left lanelet; ignore the current lanelet
-                  if(lanelet.id() != current_llt.id())
+                  for (auto leftRegem: lanelet.regulatoryElements())
                   {
-                    for (auto leftRegem: lanelet.regulatoryElements())
+                    if(leftRegem->attribute(lanelet::AttributeName::Subtype).value().compare(lanelet::RegionAccessRule::RuleName) == 0)
                     {
-                      if(leftRegem->attribute(lanelet::AttributeName::Subtype).value().compare(lanelet::RegionAccessRule::RuleName) == 0)
+                      lanelet::RegionAccessRulePtr leftAccessRuleReg =  std::dynamic_pointer_cast<lanelet::RegionAccessRule>
+                      (current_map_->regulatoryElementLayer.get(leftRegem->id()));
+                      if(!leftAccessRuleReg->accessable(lanelet::Participants::VehicleCar) || !leftAccessRuleReg->accessable(lanelet::Participants::VehicleTruck))
                       {
-                        lanelet::RegionAccessRulePtr leftAccessRuleReg =  std::dynamic_pointer_cast<lanelet::RegionAccessRule>
-                        (current_map_->regulatoryElementLayer.get(leftRegem->id()));
-                        if(!leftAccessRuleReg->accessable(lanelet::Participants::VehicleCar) || !leftAccessRuleReg->accessable(lanelet::Participants::VehicleTruck))
-                        {
-                          RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm_ctrl"), "Left adjacent Lanelet " << lanelet.id() << " is CLOSED");
-                          RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm_ctrl"), "Assigning LANE_CLOSED type to active geofence");
-                          RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm_ctrl"), "Assigning reason " << leftAccessRuleReg->getReason());
-                          outgoing_geof.reason = leftAccessRuleReg->getReason();
-                          outgoing_geof.type = carma_perception_msgs::msg::CheckActiveGeofence::LANE_CLOSED;
-                        }
+                        RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm_ctrl"), "Left adjacent Lanelet " << lanelet.id() << " is CLOSED");
+                        RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm_ctrl"), "Assigning LANE_CLOSED type to active geofence");
+                        RCLCPP_DEBUG_STREAM(rclcpp::get_logger("carma_wm_ctrl"), "Assigning reason " << leftAccessRuleReg->getReason());
+                        outgoing_geof.reason = leftAccessRuleReg->getReason();
+                        outgoing_geof.type = carma_perception_msgs::msg::CheckActiveGeofence::LANE_CLOSED;
                       }
                     }
                   }
@@ -61,6 +61,7 @@ WMBroadcasterNode::WMBroadcasterNode(const rclcpp::NodeOptions &options)
   config_.vehicle_id = declare_parameter<std::string>("vehicle_id", config_.vehicle_id);
   config_.participant = declare_parameter<std::string>("vehicle_participant_type", config_.participant);
   config_.participant = declare_parameter<double>("config_speed_limit", config_.config_limit);
+  config_.map_cache_dir = declare_parameter<std::string>("map_cache_dir", config_.map_cache_dir);
 
   declare_parameter("intersection_ids_for_correction", config_.intersection_ids_for_correction);
   declare_parameter("intersection_coord_correction", config_.intersection_coord_correction);
@@ -91,12 +92,14 @@ carma_ros2_utils::CallbackReturn WMBroadcasterNode::handle_on_configure(const rc
   get_parameter<std::string>("vehicle_id", config_.vehicle_id);
   get_parameter<std::string>("vehicle_participant_type", config_.participant);
   get_parameter<double>("config_speed_limit", config_.config_limit);
+  get_parameter<std::string>("map_cache_dir", config_.map_cache_dir);
 
   wmb_->setConfigACKPubTimes(config_.ack_pub_times);
   wmb_->setMaxLaneWidth(config_.max_lane_width);
   wmb_->setConfigSpeedLimit(config_.config_limit);
   wmb_->setConfigVehicleId(config_.vehicle_id);
   wmb_->setVehicleParticipationType(config_.participant);
+  wmb_->setMapCacheDir(config_.map_cache_dir);
 
   rclcpp::Parameter intersection_coord_correction_param = get_parameter("intersection_coord_correction");
   config_.intersection_coord_correction = intersection_coord_correction_param.as_double_array();
@@ -0,0 +1,119 @@
+/*
+ * Copyright (C) 2024 LEIDOS.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may not
+ * use this file except in compliance with the License. You may obtain a copy of
+ * the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations under
+ * the License.
+ */
+
+#include <gtest/gtest.h>
+#include <carma_wm_ctrl/ActiveGeofenceIndex.hpp>
+#include "TestHelpers.hpp"
+
+namespace carma_wm_ctrl
+{
+namespace
+{
+using carma_wm::getBasicPoint;
+using carma_wm::getLanelet;
+using carma_wm::getPoint;
+
+/**
+ * Route of 10 m long lanelets heading along +y. Lanelet 5 is to the right of lanelet 2 and the route changes lane into it
+ *
+ *  | 6 |     20 m
+ *  | 2 | 5 | 10 m
+ *  | 1 |      0 m
+ */
+lanelet::ConstLanelets getRoute()
+{
+  lanelet::LineString3d left_1(lanelet::utils::getId(), { getPoint(0, 0, 0), getPoint(0, 10, 0) });
+  lanelet::LineString3d right_1(lanelet::utils::getId(), { getPoint(3.7, 0, 0), getPoint(3.7, 10, 0) });
+  lanelet::LineString3d left_2(lanelet::utils::getId(), { getPoint(0, 10, 0), getPoint(0, 20, 0) });
+  lanelet::LineString3d right_2(lanelet::utils::getId(), { getPoint(3.7, 10, 0), getPoint(3.7, 20, 0) });
+  lanelet::LineString3d right_5(lanelet::utils::getId(), { getPoint(7.4, 10, 0), getPoint(7.4, 20, 0) });
+  lanelet::LineString3d left_6(lanelet::utils::getId(), { getPoint(3.7, 20, 0), getPoint(3.7, 30, 0) });
+  lanelet::LineString3d right_6(lanelet::utils::getId(), { getPoint(7.4, 20, 0), getPoint(7.4, 30, 0) });
+
+  return { getLanelet(1, left_1, right_1), getLanelet(2, left_2, right_2), getLanelet(5, right_2, right_5),
+           getLanelet(6, left_6, right_6) };
+}
+}  // namespace
+
+TEST(ActiveGeofenceIndex, activateAndDeactivate)
+{
+  ActiveGeofenceIndex index;
+  ASSERT_TRUE(index.empty());
+
+  index.activate(2);
+  index.activate(2);
+  index.activate(100);  // Not on the route
+  ASSERT_TRUE(index.isActive(2));
+  ASSERT_TRUE(index.isActive(100));
+  ASSERT_FALSE(index.isActive(1));
+  ASSERT_TRUE(index.activeIdsOnRoute().empty());
+
+  index.setRoute(getRoute());
+  ASSERT_EQ(std::vector<lanelet::Id>({ 2 }), index.activeIdsOnRoute());
+
+  index.deactivate(2);
+  ASSERT_FALSE(index.isActive(2));
+  ASSERT_TRUE(index.activeIdsOnRoute().empty());
+
+  index.deactivate(100);
+  ASSERT_TRUE(index.empty());
+}
+
+TEST(ActiveGeofenceIndex, routeDowntrack)
+{
+  ActiveGeofenceIndex index;
+  auto route = getRoute();
+
+  ASSERT_FALSE(!!index.routeDowntrack(route[0], getBasicPoint(1.85, 5)));
+
+  index.setRoute(route);
+  ASSERT_NEAR(5.0, index.routeDowntrack(route[0], getBasicPoint(1.85, 5)).get(), 0.0001);
+  ASSERT_NEAR(12.0, index.routeDowntrack(route[1], getBasicPoint(1.85, 12)).get(), 0.0001);
+  // The lane change does not add the length of the lanelet it starts from
+  ASSERT_NEAR(12.0, index.routeDowntrack(route[2], getBasicPoint(5.55, 12)).get(), 0.0001);
+  ASSERT_NEAR(25.0, index.routeDowntrack(route[3], getBasicPoint(5.55, 25)).get(), 0.0001);
+
+  lanelet::ConstLanelet off_route = getLanelet(100, { getPoint(10, 0, 0), getPoint(10, 10, 0) },
+                                               { getPoint(13.7, 0, 0), getPoint(13.7, 10, 0) });
+  ASSERT_FALSE(!!index.routeDowntrack(off_route, getBasicPoint(11.85, 5)));
+}
+
+TEST(ActiveGeofenceIndex, distanceToNextActive)
+{
+  ActiveGeofenceIndex index;
+  index.setRoute(getRoute());
+
+  ASSERT_FALSE(!!index.distanceToNextActive(0, 1));
+
+  index.activate(6);
+  ASSERT_NEAR(15.0, index.distanceToNextActive(5, 1).get(), 0.0001);
+  ASSERT_FALSE(!!index.distanceToNextActive(25, 6));
+
+  // Lanelets are kept active across route updates
+  index.activate(5);
+  index.setRoute(getRoute());
+  ASSERT_NEAR(5.0, index.distanceToNextActive(5, 1).get(), 0.0001);
+
+  // The lanelet the downtrack is on is skipped even if its start is ahead of the downtrack
+  ASSERT_NEAR(8.0, index.distanceToNextActive(12, 2).get(), 0.0001);
+  ASSERT_NEAR(8.0, index.distanceToNextActive(12, 5).get(), 0.0001);
+
+  index.deactivate(5);
+  index.deactivate(6);
+  ASSERT_FALSE(!!index.distanceToNextActive(5, 1));
+}
+
+}  // namespace carma_wm_ctrl
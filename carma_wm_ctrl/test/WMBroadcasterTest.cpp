@@ -28,6 +28,9 @@
 #include <autoware_lanelet2_ros2_interface/utility/message_conversion.hpp>
 #include <lanelet2_extension/io/autoware_osm_parser.h>
 #include <memory>
+#include <filesystem>
+#include <carma_wm/MapCache.hpp>
+#include <fstream>
 #include <chrono>
 #include <ctime>
 #include <atomic>
@@ -90,6 +93,106 @@ TEST(WMBroadcaster, baseMapCallback)
   ASSERT_EQ(1, base_map_call_count);
 }
 
+TEST(WMBroadcaster, baseMapCallbackCache)
+{
+  std::string cache_dir = (std::filesystem::temp_directory_path() / "carma_wm_ctrl_map_cache_test").string();
+  std::filesystem::remove_all(cache_dir);
+
+  std::vector<autoware_lanelet2_msgs::msg::MapBin> published_maps;
+  auto make_broadcaster = [&]() {
+    auto wmb = std::make_unique<WMBroadcaster>(
+      [&](const autoware_lanelet2_msgs::msg::MapBin& map_bin) { published_maps.push_back(map_bin); },
+      [](const autoware_lanelet2_msgs::msg::MapBin& map_bin) {}, [](const carma_v2x_msgs::msg::TrafficControlRequest& control_msg_pub_){},
+      [](const carma_perception_msgs::msg::CheckActiveGeofence& active_pub_){},
+      std::make_shared<TestTimerFactory>(), [](const carma_v2x_msgs::msg::MobilityOperation& tcm_ack_pub_){});
+    wmb->setMapCacheDir(cache_dir);
+    return wmb;
+  };
+
+  auto map = carma_wm::getDisjointRouteMap();
+
+  autoware_lanelet2_msgs::msg::MapBin msg;
+  lanelet::utils::conversion::toBinMsg(map, &msg);
+
+  // First start builds the compliant map and routing graph and stores them
+  auto wmb = make_broadcaster();
+  wmb->baseMapCallback(std::make_unique<autoware_lanelet2_msgs::msg::MapBin>(msg));
+
+  // A single entry holding the map and the graph of the configured participant
+  std::vector<std::filesystem::path> entries(std::filesystem::directory_iterator(cache_dir), {});
+  ASSERT_EQ(1u, entries.size());
+  ASSERT_EQ(64u, entries[0].filename().string().size());  // Hexadecimal SHA-256 digest
+  ASSERT_TRUE(std::filesystem::exists(entries[0] / "map.img"));
+  ASSERT_TRUE(std::filesystem::exists(entries[0] / "routing_graph_vehicle_car.img"));
+
+  // Restart loads them from the cache
+  wmb = make_broadcaster();
+  wmb->baseMapCallback(std::make_unique<autoware_lanelet2_msgs::msg::MapBin>(msg));
+
+  ASSERT_EQ(2u, published_maps.size());
+  ASSERT_EQ(published_maps[0].routing_graph, published_maps[1].routing_graph);
+  ASSERT_TRUE(published_maps[1].has_routing_graph);
+
+  lanelet::LaneletMapPtr loaded_map(new lanelet::LaneletMap);
+  lanelet::utils::conversion::fromBinMsg(published_maps[1], loaded_map);
+  ASSERT_EQ(4, loaded_map->laneletLayer.size());
+
+  auto graph = carma_wm::routingGraphFromMsg(published_maps[1].routing_graph, loaded_map);
+  ASSERT_TRUE(!!graph);
+
+  // The graph loaded from the cache has the same relations as one built from the map
+  lanelet::traffic_rules::TrafficRulesUPtr traffic_rules = lanelet::traffic_rules::TrafficRulesFactory::create(
+    lanelet::traffic_rules::CarmaUSTrafficRules::Location, lanelet::Participants::VehicleCar);
+  auto built_graph = lanelet::routing::RoutingGraph::build(*loaded_map, *traffic_rules);
+
+  for (const auto& llt : loaded_map->laneletLayer)
+  {
+    ASSERT_EQ(built_graph->following(llt).size(), graph->following(llt).size());
+    ASSERT_EQ(!!built_graph->left(llt), !!graph->left(llt));
+    ASSERT_EQ(!!built_graph->right(llt), !!graph->right(llt));
+  }
+
+  // A corrupted image is a cache miss, the map is rebuilt and the entry rewritten
+  std::filesystem::path map_image = entries[0] / "map.img";
+  {
+    std::fstream file(map_image, std::ios::in | std::ios::out | std::ios::binary);
+    file.seekg(-1, std::ios::end);
+    char last = file.get();
+    file.seekp(-1, std::ios::end);
+    file.put(static_cast<char>(~last));
+  }
+
+  carma_wm::MapCache cache(cache_dir);
+  std::string key = entries[0].filename().string();
+  autoware_lanelet2_msgs::msg::MapBin cached_msg;
+  ASSERT_FALSE(cache.loadMap(key, cached_msg));
+
+  wmb = make_broadcaster();
+  wmb->baseMapCallback(std::make_unique<autoware_lanelet2_msgs::msg::MapBin>(msg));
+
+  ASSERT_EQ(3u, published_maps.size());
+  ASSERT_EQ(published_maps[0].routing_graph, published_maps[2].routing_graph);
+  ASSERT_TRUE(cache.loadMap(key, cached_msg));
+
+  // An intact image holding map data which cannot be deserialized is a cache miss too
+  autoware_lanelet2_msgs::msg::MapBin garbage_msg;
+  garbage_msg.data = { 1, 2, 3, 4 };
+  ASSERT_TRUE(cache.storeMap(key, garbage_msg));
+
+  wmb = make_broadcaster();
+  wmb->baseMapCallback(std::make_unique<autoware_lanelet2_msgs::msg::MapBin>(msg));
+
+  ASSERT_EQ(4u, published_maps.size());
+  ASSERT_EQ(published_maps[0].routing_graph, published_maps[3].routing_graph);
+  ASSERT_TRUE(cache.loadMap(key, cached_msg));
+  ASSERT_EQ(published_maps[0].data, cached_msg.data);
+
+  // Other processing parameters use another entry
+  ASSERT_NE(carma_wm::MapCache::contentKey(msg, "25"), carma_wm::MapCache::contentKey(msg, "35"));
+
+  std::filesystem::remove_all(cache_dir);
+}
+
 // These tests has been temporarily disabled to support Continuous Improvement (CI) processes.
 // Related GitHub Issue: <https://github.com/usdot-fhwa-stol/carma-platform/issues/2335>
 
@@ -0,0 +1,165 @@
+/*
+ * Copyright (C) 2024 LEIDOS.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may not
+ * use this file except in compliance with the License. You may obtain a copy of
+ * the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations under
+ * the License.
+ */
+
+/**
+ * Benchmark of carma_wm::query::getLaneletsNearPoints, which finds the lanelets containing each geofence point in
+ * getAffectedLaneletOrAreas, against the previous iterative findNearest search.
+ *
+ * The map is a grid of 3.7 m wide and 10 m long lanelets, 16 lanes wide and 2 km long. Geofences of 50, 200 and 1000 points
+ * follow a lane along the map.
+ *
+ * Usage: affected_lanelets_benchmark [iteration_count]
+ */
+
+#include <chrono>
+#include <iostream>
+#include <set>
+#include <string>
+#include <vector>
+
+#include <lanelet2_core/geometry/Lanelet.h>
+#include <lanelet2_core/geometry/LaneletMap.h>
+#include <lanelet2_core/LaneletMap.h>
+#include <lanelet2_core/utility/Utilities.h>
+#include <carma_wm/WorldModelUtils.hpp>
+
+namespace
+{
+
+constexpr double LANE_WIDTH = 3.7;
+constexpr double SEGMENT_LENGTH = 10.0;
+constexpr size_t LANE_COUNT = 16;
+constexpr size_t SEGMENT_COUNT = 200;
+constexpr double MAX_LANE_WIDTH = 4.0;
+
+lanelet::LaneletMapPtr gridMap() {
+  std::vector<std::vector<lanelet::Point3d>> columns(LANE_COUNT + 1);
+  for (size_t i = 0; i <= LANE_COUNT; i++) {
+    for (size_t j = 0; j <= SEGMENT_COUNT; j++) {
+      columns[i].emplace_back(lanelet::utils::getId(), i * LANE_WIDTH, j * SEGMENT_LENGTH, 0.0);
+    }
+  }
+
+  lanelet::Lanelets lanelets;
+  for (size_t j = 0; j < SEGMENT_COUNT; j++) {
+    std::vector<lanelet::LineString3d> bounds;
+    for (size_t i = 0; i <= LANE_COUNT; i++) {
+      bounds.emplace_back(lanelet::utils::getId(), lanelet::Points3d{ columns[i][j], columns[i][j + 1] });
+    }
+    for (size_t i = 0; i < LANE_COUNT; i++) {
+      lanelets.emplace_back(lanelet::utils::getId(), bounds[i], bounds[i + 1]);
+    }
+  }
+  return lanelet::utils::createMap(lanelets, {});
+}
+
+lanelet::Points3d geofence(size_t point_count) {
+  // Points weave across the boundary of two lanes so some points are in two lanelets
+  lanelet::Points3d points;
+  double spacing = SEGMENT_LENGTH * SEGMENT_COUNT / (point_count + 1);
+  for (size_t i = 0; i < point_count; i++) {
+    double x = 4 * LANE_WIDTH + (i % 3) * 0.5 * LANE_WIDTH;
+    points.emplace_back(lanelet::utils::getId(), x, (i + 0.5) * spacing, 0.0);
+  }
+  return points;
+}
+
+// The search previously done in getAffectedLaneletOrAreas, kept as a reference
+std::vector<lanelet::Lanelets> iterativeNearestSearch(const lanelet::Points3d& points, const lanelet::LaneletMapPtr& map) {
+  std::vector<lanelet::Lanelets> nearby(points.size());
+  for (size_t idx = 0; idx < points.size(); idx++) {
+    std::set<lanelet::Id> found;
+    bool continue_search = true;
+    size_t nearest_count = 0;
+    while (continue_search) {
+      nearest_count += 10;
+      for (const auto& ll_pair : lanelet::geometry::findNearest(map->laneletLayer, points[idx].basicPoint2d(), nearest_count)) {
+        if (found.find(ll_pair.second.id()) != found.end()) {
+          continue;
+        }
+        if (ll_pair.first > MAX_LANE_WIDTH) {
+          continue_search = false;
+          break;
+        }
+        if (ll_pair.first == 0.0) {
+          found.insert(ll_pair.second.id());
+          nearby[idx].push_back(ll_pair.second);
+        }
+      }
+      if (nearest_count >= map->laneletLayer.size()) {
+        continue_search = false;
+      }
+    }
+  }
+  return nearby;
+}
+
+bool sameLanelets(const std::vector<lanelet::Lanelets>& a, const std::vector<lanelet::Lanelets>& b) {
+  if (a.size() != b.size()) {
+    return false;
+  }
+  for (size_t i = 0; i < a.size(); i++) {
+    std::set<lanelet::Id> a_ids, b_ids;
+    for (const auto& llt : a[i]) {
+      a_ids.insert(llt.id());
+    }
+    for (const auto& llt : b[i]) {
+      b_ids.insert(llt.id());
+    }
+    if (a_ids != b_ids) {
+      return false;
+    }
+  }
+  return true;
+}
+
+template <class F>
+double averageMicroseconds(size_t iteration_count, F&& f) {
+  auto start = std::chrono::steady_clock::now();
+  for (size_t i = 0; i < iteration_count; i++) {
+    f();
+  }
+  auto end = std::chrono::steady_clock::now();
+  return std::chrono::duration<double, std::micro>(end - start).count() / iteration_count;
+}
+
+}  // namespace
+
+int main(int argc, char** argv) {
+  size_t iteration_count = argc > 1 ? std::stoul(argv[1]) : 5;
+
+  auto map = gridMap();
+  std::cout << map->laneletLayer.size() << " lanelets" << std::endl;
+
+  for (size_t point_count : {50, 200, 1000}) {
+    auto points = geofence(point_count);
+
+    std::vector<lanelet::Lanelets> indexed;
+    double indexed_us = averageMicroseconds(iteration_count, [&]() {
+      indexed = carma_wm::query::getLaneletsNearPoints(points, map, 0.0);
+    });
+
+    std::vector<lanelet::Lanelets> iterative;
+    double iterative_us = averageMicroseconds(iteration_count, [&]() {
+      iterative = iterativeNearestSearch(points, map);
+    });
+
+    std::cout << point_count << " points: corridor query " << indexed_us << " us, iterative nearest search " << iterative_us << " us"
+              << (sameLanelets(indexed, iterative) ? "" : " (MISMATCH)") << std::endl;
+  }
+
+  return 0;
+}
@@ -0,0 +1,216 @@
+#!/usr/bin/python3
+
+#  Copyright (C) 2024 LEIDOS.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"); you may not
+#  use this file except in compliance with the License. You may obtain a copy of
+#  the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#  WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#  License for the specific language governing permissions and limitations under
+#  the License.
+
+import os
+import csv
+import glob
+import time
+import shutil
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import rosbag # Imported to python env with pip install --extra-index-url https://rospypi.github.io/simple/ rospy rosbag
+import rospy
+import genpy
+
+# Usage
+# process_bags.py <date_of_test> [--filter <seconds>] [--topics topics.txt] [--jobs <processes>]
+#                 [--chunk <seconds>] [--format csv|parquet]
+#
+# Replacement for process_bags.bash / process_one_bag.bash which reads the bags directly instead of
+# replaying them through a roscore and one "rostopic echo -p" per topic.
+#
+# Run from inside a vehicle folder. Every subfolder containing a bag is processed, each bag is split
+# into time chunks and the (bag, chunk) pairs are spread across a process pool. Each topic listed in
+# topics.txt is written to <vehicle>_<date_of_test>/<bag name>/<file name> next to the vehicle folder,
+# in the same column layout as "rostopic echo -p".
+
+def read_topics(path):
+  """Returns a list of (topic, output file name) from a topics.txt file, skipping # comment lines"""
+  topics = []
+  with open(path, 'r') as f:
+    for line in f:
+      line = line.strip()
+      if not line or line.startswith("#"):
+        continue
+      topic, _, file_name = line.partition(">")
+      topics.append((topic.strip(), file_name.strip()))
+  return topics
+
+def flatten(prefix, value, names, values):
+  """Flattens a message into rostopic echo -p style column names and values"""
+  # rosbag returns genpy times and durations, which rospy.Time and rospy.Duration only subclass
+  if isinstance(value, genpy.TVal):
+    names.append(prefix)
+    values.append(value.to_nsec())
+  elif hasattr(value, "__slots__"):
+    for slot in value.__slots__:
+      flatten(prefix + "." + slot, getattr(value, slot), names, values)
+  elif isinstance(value, (list, tuple)) and not isinstance(value, (str, bytes)):
+    for i, item in enumerate(value):
+      flatten(prefix + str(i), item, names, values)
+  else:
+    names.append(prefix)
+    values.append(value)
+
+def chunk_path(output_dir, file_name, chunk):
+  return os.path.join(output_dir, "." + file_name + ".part" + str(chunk))
+
+def process_chunk(bag_path, topics, output_dir, chunk, start, end):
+  """Writes the messages of every topic between start and end (seconds) into per-chunk part files.
+  An end of None reads until the end of the bag"""
+  files = {}
+  writers = {}
+  file_names = dict(topics)
+  end_time = rospy.Time.from_sec(end) if end is not None else None
+  try:
+    with rosbag.Bag(bag_path) as bag:
+      for topic, msg, t in bag.read_messages(topics=list(file_names), start_time=rospy.Time.from_sec(start),
+                                             end_time=end_time):
+        # read_messages end_time is inclusive, drop the boundary so messages are not duplicated across chunks
+        if end is not None and t.to_sec() >= end:
+          continue
+        names = ["%time"]
+        values = [t.to_nsec()]
+        flatten("field", msg, names, values)
+        writer = writers.get(topic)
+        if writer is None:
+          files[topic] = open(chunk_path(output_dir, file_names[topic], chunk), 'w', newline='')
+          writer = writers[topic] = csv.writer(files[topic])
+          writer.writerow(names)
+        writer.writerow(values)
+  finally:
+    for f in files.values():
+      f.close()
+  return chunk
+
+def merge_chunks(output_dir, file_name, chunk_count, output_format):
+  """Concatenates the part files of one topic in chunk order, keeping only the first header"""
+  output = os.path.join(output_dir, file_name)
+  header_written = False
+  with open(output, 'w', newline='') as out:
+    for chunk in range(chunk_count):
+      part = chunk_path(output_dir, file_name, chunk)
+      if not os.path.exists(part):
+        continue
+      with open(part, 'r', newline='') as f:
+        header = f.readline()
+        if not header_written:
+          out.write(header)
+          header_written = True
+        shutil.copyfileobj(f, out)
+      os.remove(part)
+
+  if not header_written:
+    os.remove(output) # Topic was not recorded in this bag
+    return None
+
+  if output_format == "parquet":
+    import pyarrow.csv as pv # Optional dependency, only needed for parquet output
+    import pyarrow.parquet as pq
+    parquet_output = os.path.splitext(output)[0] + ".parquet"
+    pq.write_table(pv.read_csv(output), parquet_output)
+    os.remove(output)
+    return parquet_output
+  return output
+
+def write_position_fallback(bag_dir, output_dir):
+  """Recreates position.csv from route.txt when the bag has no nav_sat_fix data"""
+  route_file = os.path.join(bag_dir, "route.txt")
+  nav_sat_fix = glob.glob(os.path.join(output_dir, "nav_sat_fix.*"))
+  if not os.path.exists(route_file) or (nav_sat_fix and os.path.getsize(nav_sat_fix[0]) > 0):
+    return
+  print("nav_sat_fix did not work, extracting position from " + route_file)
+  with open(route_file, 'r') as route, open(os.path.join(output_dir, "position.csv"), 'w') as position:
+    for line in route:
+      if "Downtrack:" in line:
+        position.write(line)
+
+def plan_bag(bag_path, filter_seconds, chunk_seconds):
+  """Returns the list of (start, end) chunks for a bag, or None if the bag is shorter than the filter"""
+  with rosbag.Bag(bag_path) as bag:
+    start = bag.get_start_time()
+    end = bag.get_end_time()
+  duration = end - start
+  if duration <= filter_seconds:
+    print("The bag file " + bag_path + "'s duration was only " + str(int(duration)) + " seconds, so it was not processed")
+    return None
+  chunks = []
+  chunk_start = start
+  while chunk_start < end:
+    chunks.append((chunk_start, chunk_start + chunk_seconds))
+    chunk_start += chunk_seconds
+  # The last chunk is open ended so the message stamped exactly at the end time is kept
+  chunks[-1] = (chunks[-1][0], None)
+  return chunks
+
+def main():
+  parser = argparse.ArgumentParser(description="Convert the topics in topics.txt from every bag below the current vehicle folder")
+  parser.add_argument("date", help="Date the test was conducted, ex. 20180627")
+  parser.add_argument("--filter", type=float, default=0.0, help="Skip bags with a duration up to this many seconds")
+  parser.add_argument("--topics", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "topics.txt"),
+    help="Topic list in the topics.txt format")
+  parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="Number of worker processes")
+  parser.add_argument("--chunk", type=float, default=300.0, help="Length in seconds of the time chunks a bag is split into")
+  parser.add_argument("--format", choices=["csv", "parquet"], default="csv", help="Output format of each topic file")
+  args = parser.parse_args()
+
+  topics = read_topics(args.topics)
+  vehicle_dir = os.getcwd()
+  result_dir = os.path.join(os.path.dirname(vehicle_dir), os.path.basename(vehicle_dir) + "_" + args.date)
+
+  bags = []
+  for folder in sorted(glob.glob(os.path.join(vehicle_dir, "*", ""))):
+    folder_bags = sorted(glob.glob(os.path.join(folder, "*.bag")))
+    if not folder_bags:
+      print("A bag file was not found in " + folder)
+      continue
+    bags.append(folder_bags[0])
+
+  start_time = time.time()
+  with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+    chunk_counts = {}
+    futures = {}
+    for bag_path in bags:
+      chunks = plan_bag(bag_path, args.filter, args.chunk)
+      if chunks is None:
+        continue
+      output_dir = os.path.join(result_dir, os.path.splitext(os.path.basename(bag_path))[0])
+      os.makedirs(output_dir, exist_ok=True)
+      chunk_counts[bag_path] = (output_dir, len(chunks))
+      for chunk, (start, end) in enumerate(chunks):
+        futures[pool.submit(process_chunk, bag_path, topics, output_dir, chunk, start, end)] = bag_path
+
+    remaining = {bag_path: count for bag_path, (_, count) in chunk_counts.items()}
+    done = 0
+    for future in as_completed(futures):
+      bag_path = futures[future]
+      future.result()
+      done += 1
+      remaining[bag_path] -= 1
+      print("Processed chunk " + str(done) + "/" + str(len(futures)) + " (" + os.path.basename(bag_path) + ") after "
+        + str(round(time.time() - start_time, 1)) + "s")
+
+      if remaining[bag_path] == 0:
+        output_dir, chunk_count = chunk_counts[bag_path]
+        for _, file_name in topics:
+          merge_chunks(output_dir, file_name, chunk_count, args.format)
+        write_position_fallback(os.path.dirname(bag_path), output_dir)
+        print("Finished " + bag_path + " -> " + output_dir)
+
+  print("Processed " + str(len(chunk_counts)) + " bags into " + result_dir + " in " + str(round(time.time() - start_time, 1)) + "s")
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,55 @@
+#!/usr/bin/python3
+
+#  Copyright (C) 2024 LEIDOS.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"); you may not
+#  use this file except in compliance with the License. You may obtain a copy of
+#  the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#  WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#  License for the specific language governing permissions and limitations under
+#  the License.
+
+# Usage
+# python3 -m unittest test_process_bags.py
+
+import unittest
+import genpy
+
+from process_bags import flatten
+
+class Header:
+  __slots__ = ["seq", "stamp", "frame_id"]
+
+  def __init__(self, seq, stamp, frame_id):
+    self.seq = seq
+    self.stamp = stamp
+    self.frame_id = frame_id
+
+class Stamped:
+  __slots__ = ["header", "age", "values"]
+
+  def __init__(self, header, age, values):
+    self.header = header
+    self.age = age
+    self.values = values
+
+class TestFlatten(unittest.TestCase):
+
+  def test_genpy_times_are_single_columns(self):
+    msg = Stamped(Header(3, genpy.Time(10, 5), "map"), genpy.Duration(2, 1), [1.5, 2.5])
+
+    names, values = [], []
+    flatten("field", msg, names, values)
+
+    # Same names as rostopic echo -p, without .secs/.nsecs columns for times and durations
+    self.assertEqual(["field.header.seq", "field.header.stamp", "field.header.frame_id", "field.age",
+                      "field.values0", "field.values1"], names)
+    self.assertEqual([3, 10000000005, "map", 2000000001, 1.5, 2.5], values)
+
+if __name__ == "__main__":
+  unittest.main()
@@ -1,22 +1,39 @@
 """
-This script creates a vector map with two parallel lanes using the Lanelet2 library and saves it as an OSM file.
+This script creates a Lanelet2 vector map of a parametric road and saves it as an OSM file.
+By default it produces a straight road with two parallel lanes. The road can be extended to any number of lanes
+and kilometers, with alternating curves and signalized intersections, to produce maps of 100k-10M nodes for load testing.
 The script can be run from the command line with the following arguments:
 - filename: The output filename for the vector map.
-- total_length: The length of the lanes (default is 50.0).
+- total_length: The length of the road in meters (default is 50.0).
 - lane_width: The width of the lanes (default is 3.7).
-- points_per_meter: The number of points per meter (default is 5).
+- points_per_meter: The number of points per meter of lane boundary (default is 5).
+- num_lanes: The number of parallel lanes, all driving in the same direction (default is 2).
+- lanelet_length: The maximum length of a single lanelet (default is 25.0).
+- curve_radius: Radius of the curves inserted along the road, 0 for a straight road (default is 0).
+- curve_angle: Heading change of each curve in degrees. Consecutive curves alternate direction (default is 30).
+- curve_spacing: Length of the straight section between curves (default is 200.0).
+- intersection_spacing: Distance along the road between signalized intersections, 0 for none (default is 0).
+- cross_road_length: Length of each arm of the crossing road at an intersection (default is 50.0).
+
+The XML is streamed: nodes, ways and relations are written to temporary section files as they are generated and
+concatenated into the output file at the end, so memory use does not grow with the size of the map.
 
 Dependencies:
-- lanelet2: The Lanelet2 library for handling lanelet maps.
+- pyproj: For converting the local map coordinates to lat/lon.
+- numpy: For generating the lane boundary geometry.
 - argparse: For parsing command line arguments.
 Usage:
     python3 create_two_lane_map.py --filename output.osm --total_length <total_length> --lane_width <lane_width> --points_per_meter <points_per_meter>
+    python3 create_two_lane_map.py --filename corridor.osm --total_length 20000 --num_lanes 4 --curve_radius 300 --intersection_spacing 1000
 """
 
 from pyproj import Proj, Transformer
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
+from xml.sax.saxutils import quoteattr
 import argparse
+import math
+import os
+import shutil
+import numpy as np
 
 
 # Adjusted geoReference (removed vertical geoid grid)
@@ -26,125 +43,278 @@ geo_reference = "+proj=tmerc +lat_0=0 +lon_0=0 +k=1 +x_0=0 +y_0=0 +datum=WGS84 +
 proj = Proj(geo_reference)
 transformer = Transformer.from_proj(proj, "epsg:4326", always_xy=True)
 
-# Globals
-node_id = 1000000
-way_id = 1000
-relation_id = 100
-nodes, ways, relations = [], [], []
-
-def add_node(x, y, z=0.0):
-    global node_id
-    lon, lat = transformer.transform(x, y)
-    node = ET.Element("node", id=str(node_id), version="1", lat=f"{lat:.9f}", lon=f"{lon:.9f}", visible="true")
-    ET.SubElement(node, "tag", k="ele", v=f"{z:.2f}")
-    ET.SubElement(node, "tag", k="lat", v=f"{lat:.9f}")
-    ET.SubElement(node, "tag", k="lon", v=f"{lon:.9f}")
-    nodes.append((node_id, node))
-    node_id += 1
-    return node_id - 1
-
-def create_way(node_ids, tags):
-    global way_id
-    way = ET.Element("way", id=str(way_id), version="1", visible="true")
-    for nid in node_ids:
-        ET.SubElement(way, "nd", ref=str(nid))
-    for k, v in tags.items():
-        ET.SubElement(way, "tag", k=k, v=v)
-    ways.append((way_id, way))
-    way_id += 1
-    return way_id - 1
-
-def create_lanelet(left_id, right_id, tags):
-    global relation_id
-    rel = ET.Element("relation", id=str(relation_id), version="1", visible="true")
-    ET.SubElement(rel, "member", type="way", ref=str(left_id), role="left")
-    ET.SubElement(rel, "member", type="way", ref=str(right_id), role="right")
-    for k, v in tags.items():
-        ET.SubElement(rel, "tag", k=k, v=v)
-    ET.SubElement(rel, "tag", k="cad_id", v=str(relation_id))
-    relations.append((relation_id, rel))
-    relation_id += 1
-
-def create_vector_map(filename, total_length, lane_width, points_per_meter):
+lanelet_dict = {"type": "lanelet",
+                "subtype": "road",
+                "road_type": "road",
+                "turn_direction": "straight",
+                "from_cad_id" : "",
+                "direction" : "ONE_WAY",
+                "level" : "0",
+                "location" : "private",
+                "near_spaces" : "",
+                "participant:vehicle" : "yes",
+                "to_cad_id" : "",
+                }
+
+
+def format_tags(tags, indent="    "):
+    return "".join(f'{indent}<tag k={quoteattr(k)} v={quoteattr(str(v))}/>\n' for k, v in tags.items())
+
+
+class OsmWriter:
+    """
+    Streams OSM elements to disk. Nodes, ways and relations each go to their own temporary section file so the
+    output keeps the usual node/way/relation order without holding any element in memory.
     """
-    Create a vector map with two parallel lanes.
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.section_names = [f"{filename}.{section}.tmp" for section in ("nodes", "ways", "relations")]
+        self.nodes_file, self.ways_file, self.relations_file = [open(name, "w", encoding="utf-8") for name in self.section_names]
+        self.node_id = 1000000
+        self.way_id = 1000
+        self.relation_id = 100
+        self.node_count = 0
+
+    def add_nodes(self, xs, ys, z=0.0):
+        """Adds one node per (x, y) map coordinate, converting all of them to lat/lon in a single call."""
+        lons, lats = transformer.transform(xs, ys)
+        ids = list(range(self.node_id, self.node_id + len(xs)))
+        self.node_id += len(xs)
+        self.node_count += len(xs)
+        ele = f"{z:.2f}"
+        self.nodes_file.write("".join(
+            f'  <node id="{nid}" version="1" lat="{lat:.9f}" lon="{lon:.9f}" visible="true">\n'
+            f'    <tag k="ele" v="{ele}"/>\n'
+            f'    <tag k="lat" v="{lat:.9f}"/>\n'
+            f'    <tag k="lon" v="{lon:.9f}"/>\n'
+            f'  </node>\n'
+            for nid, lat, lon in zip(ids, lats.tolist(), lons.tolist())))
+        return ids
+
+    def create_way(self, node_ids, tags):
+        way_id = self.way_id
+        self.way_id += 1
+        self.ways_file.write(f'  <way id="{way_id}" version="1" visible="true">\n'
+                             + "".join(f'    <nd ref="{nid}"/>\n' for nid in node_ids)
+                             + format_tags(tags)
+                             + "  </way>\n")
+        return way_id
+
+    def reserve_relation_id(self):
+        """Returns a relation id that can be referenced before the relation itself is written."""
+        relation_id = self.relation_id
+        self.relation_id += 1
+        return relation_id
+
+    def create_relation(self, members, tags, relation_id=None):
+        """members is a list of (type, ref, role)."""
+        if relation_id is None:
+            relation_id = self.reserve_relation_id()
+        self.relations_file.write(f'  <relation id="{relation_id}" version="1" visible="true">\n'
+                                  + "".join(f'    <member type="{t}" ref="{ref}" role="{role}"/>\n' for t, ref, role in members)
+                                  + format_tags(tags)
+                                  + "  </relation>\n")
+        return relation_id
+
+    def create_lanelet(self, left_id, right_id, tags, regulatory_element_ids=()):
+        relation_id = self.reserve_relation_id()
+        members = [("way", left_id, "left"), ("way", right_id, "right")]
+        members += [("relation", regem_id, "regulatory_element") for regem_id in regulatory_element_ids]
+        return self.create_relation(members, dict(tags, cad_id=str(relation_id)), relation_id)
+
+    def close(self):
+        for f in (self.nodes_file, self.ways_file, self.relations_file):
+            f.close()
+        with open(self.filename, "w", encoding="utf-8") as out:
+            out.write('<?xml version="1.0" encoding="utf-8"?>\n<osm version="0.6">\n')
+            out.write(f"  <geoReference v={quoteattr(geo_reference)}/>\n")
+            for name in self.section_names:
+                with open(name, "r", encoding="utf-8") as section:
+                    shutil.copyfileobj(section, out)
+                os.remove(name)
+            out.write("</osm>\n")
+
+
+class RoadBuilder:
+    """
+    Generates consecutive rows of lanelets along a reference line. Lane boundaries are offset from the reference
+    line and consecutive rows share their boundary nodes, so every lanelet is connected to its successor.
+    """
+
+    def __init__(self, writer, num_lanes, lane_width, points_per_meter, x, y, heading):
+        self.writer = writer
+        self.num_lanes = num_lanes
+        self.points_per_meter = points_per_meter
+        # Boundary j is offset to the left of the reference line, lane i is between boundaries i (right) and i + 1 (left)
+        self.offsets = (np.arange(num_lanes + 1) - num_lanes / 2.0) * lane_width
+        self.x = x
+        self.y = y
+        self.heading = heading
+        self.last_column = None  # Node ids of the last sampled column of boundary points, shared with the next row
+
+    def emit(self, length, curvature=0.0, boundary_type="line_thin", regulatory_element_ids=()):
+        """
+        Adds one row of lanelets (one per lane) covering length meters of the reference line.
+        Returns (lanelet ids, node ids of the end column of boundary points).
+        """
+        samples = max(int(round(length * self.points_per_meter)), 1)
+        t = np.linspace(0.0, length, samples + 1)
+        headings = self.heading + curvature * t
+        if curvature == 0.0:
+            xs = self.x + t * math.cos(self.heading)
+            ys = self.y + t * math.sin(self.heading)
+        else:
+            xs = self.x + (np.sin(headings) - math.sin(self.heading)) / curvature
+            ys = self.y - (np.cos(headings) - math.cos(self.heading)) / curvature
+
+        # Boundary points, shape (boundaries, samples + 1)
+        bx = xs[np.newaxis, :] - np.sin(headings)[np.newaxis, :] * self.offsets[:, np.newaxis]
+        by = ys[np.newaxis, :] + np.cos(headings)[np.newaxis, :] * self.offsets[:, np.newaxis]
+
+        first = 0
+        if self.last_column is not None:
+            first = 1  # The first column of points already exists as the end of the previous row
+        ids = self.writer.add_nodes(bx[:, first:].ravel(), by[:, first:].ravel())
+        columns = samples + 1 - first
+        boundary_nodes = []
+        for j in range(self.num_lanes + 1):
+            row = ids[j * columns:(j + 1) * columns]
+            if self.last_column is not None:
+                row = [self.last_column[j]] + row
+            boundary_nodes.append(row)
+
+        way_ids = []
+        for j, node_ids in enumerate(boundary_nodes):
+            if boundary_type == "virtual":
+                tags = {"type": "virtual"}
+            else:
+                outer = j == 0 or j == self.num_lanes
+                tags = {"type": boundary_type, "subtype": "solid" if outer else "dashed"}
+            way_ids.append(self.writer.create_way(node_ids, tags))
+
+        lanelet_ids = [self.writer.create_lanelet(way_ids[i + 1], way_ids[i], lanelet_dict, regulatory_element_ids)
+                       for i in range(self.num_lanes)]
+
+        self.x = float(xs[-1])
+        self.y = float(ys[-1])
+        self.heading = float(headings[-1])
+        self.last_column = [row[-1] for row in boundary_nodes]
+        return lanelet_ids, self.last_column
+
+
+def add_signalized_approach(writer, road, approach_length, box_length):
+    """
+    Emits the approach to an intersection, with a stop line at its end, followed by the lanelets crossing the
+    intersection box. Both are linked by a carma_traffic_signal regulatory element (ref_line: stop line,
+    entry: approach lanelets, exit: lanelets inside the intersection).
+    """
+    regem_id = writer.reserve_relation_id()
+    entry_ids, end_column = road.emit(approach_length, regulatory_element_ids=(regem_id,))
+    stop_line_id = writer.create_way(end_column, {"type": "stop_line"})
+    exit_ids, _ = road.emit(box_length, boundary_type="virtual")
+
+    members = [("way", stop_line_id, "ref_line")]
+    members += [("relation", lanelet_id, "entry") for lanelet_id in entry_ids]
+    members += [("relation", lanelet_id, "exit") for lanelet_id in exit_ids]
+    writer.create_relation(members, {"type": "regulatory_element", "subtype": "carma_traffic_signal"}, regem_id)
+
+
+def emit_straight(road, length, lanelet_length, curvature=0.0):
+    """Emits length meters of road, split into lanelets no longer than lanelet_length."""
+    while length > 1e-6:
+        step = min(lanelet_length, length)
+        road.emit(step, curvature)
+        length -= step
+
+
+def create_vector_map(filename, total_length, lane_width, points_per_meter, num_lanes=2, lanelet_length=25.0,
+                      curve_radius=0.0, curve_angle=30.0, curve_spacing=200.0, intersection_spacing=0.0,
+                      cross_road_length=50.0):
+    """
+    Create a vector map of a parametric road.
     Inputs:
     - filename: The output filename for the vector map.
-    - total_length: The length of the lanes.
+    - total_length: The length of the road.
     - lane_width: The width of the lanes.
     - points_per_meter: The number of points per meter.
+    - num_lanes: The number of parallel lanes.
+    - lanelet_length: The maximum length of a lanelet.
+    - curve_radius, curve_angle, curve_spacing: Alternating curves along the road, disabled when curve_radius is 0.
+    - intersection_spacing, cross_road_length: Signalized four way intersections, disabled when intersection_spacing is 0.
     """
-    # Road geometry
-    lanelet_length = 25.0
-    total_points = int(total_length * points_per_meter) + 1
-    points_per_lanelet = int(lanelet_length * points_per_meter) + 1
-    # Generate lane boundaries
-    x_offset = -total_length / 2
-    y_offset = -lane_width
-    left1, right1, left2, right2 = [], [], [], []
-    for i in range(total_points):
-        x = i / points_per_meter + x_offset
-        right1.append(add_node(x, 0 + y_offset))
-        left1.append(add_node(x, lane_width + y_offset))
-        right2.append(add_node(x, lane_width + y_offset))
-        left2.append(add_node(x, 2 * lane_width + y_offset))
-
-    stride = points_per_lanelet - 1
-    way_dict = {"type": "line_thin", "subtype": "solid"}
-    lanelet_dict = {"type": "lanelet",
-                    "subtype": "road",
-                    "road_type": "road",
-                    "turn_direction": "straight",
-                    "from_cad_id" : [],
-                    "direction" : "ONE_WAY",
-                    "level" : "0",
-                    "location" : "private",
-                    "near_spaces" : [],
-                    "participant:vehicle" : "yes",
-                    "to_cad_id" : [],
-                    }
-    for i in range(0, total_points - stride, stride):
-         # Outer left boundary of lane 2
-        l2_nodes = left2[i:i + points_per_lanelet]
-        l2_id = create_way(l2_nodes, way_dict)  # solid
-
-        # Shared dashed centerline between lanes
-        center_nodes = right2[i:i + points_per_lanelet]
-        center_id = create_way(center_nodes, {"type": "line_thin", "subtype": "dashed"})
-
-        # Outer right boundary of lane 1
-        r1_nodes = right1[i:i + points_per_lanelet]
-        r1_id = create_way(r1_nodes, way_dict)  # solid
-
-        # Lanelet for lane 2 (left: outer left, right: dashed center)
-        create_lanelet(l2_id, center_id, lanelet_dict)
-
-        # Lanelet for lane 1 (left: dashed center, right: outer right)
-        create_lanelet(center_id, r1_id, lanelet_dict)
-
-    # Build OSM XML tree
-    osm = ET.Element("osm", version="0.6")
-    ET.SubElement(osm, "geoReference", v=geo_reference)
-    for _, node in nodes:
-        osm.append(node)
-    for _, way in ways:
-        osm.append(way)
-    for _, rel in relations:
-        osm.append(rel)
-
-    # Write to file
-    with open(filename, "w", encoding="utf-8") as f:
-        xml_str = minidom.parseString(ET.tostring(osm)).toprettyxml(indent="  ")
-        f.write(xml_str)
-
-    print(f"Map saved to {filename}")
+    writer = OsmWriter(filename)
+    road_width = num_lanes * lane_width
+    # The road starts centered around the origin like the original two lane map
+    road = RoadBuilder(writer, num_lanes, lane_width, points_per_meter, -total_length / 2, 0.0, 0.0)
+
+    eps = 1e-6
+    inf = float("inf")
+    curve_length = curve_radius * math.radians(curve_angle) if curve_radius > 0.0 else 0.0
+    next_curve = curve_spacing if curve_radius > 0.0 else inf
+    next_intersection = intersection_spacing if intersection_spacing > 0.0 else inf
+    curve_sign = 1.0
+    s = 0.0
+
+    while s < total_length - eps:
+        if s >= next_curve - eps:
+            # Curves are never split by an intersection so the crossing roads are always perpendicular
+            length = min(curve_length, total_length - s)
+            emit_straight(road, length, lanelet_length, curve_sign / curve_radius)
+            s += length
+            curve_sign = -curve_sign
+            next_curve = s + curve_spacing
+            next_intersection = max(next_intersection, s + lanelet_length)
+            continue
+
+        to_intersection = next_intersection - s
+        if to_intersection <= lanelet_length + eps:
+            if s + to_intersection + road_width > total_length:
+                next_intersection = inf  # No room left for another intersection
+                continue
+            # The last lanelets before the intersection carry the signal, the crossing road is built around the box center
+            heading = road.heading
+            add_signalized_approach(writer, road, to_intersection, road_width)
+            center_x = road.x - math.cos(heading) * road_width / 2
+            center_y = road.y - math.sin(heading) * road_width / 2
+
+            cross_heading = heading + math.pi / 2
+            start_offset = cross_road_length + road_width / 2
+            cross_road = RoadBuilder(writer, num_lanes, lane_width, points_per_meter,
+                                     center_x - math.cos(cross_heading) * start_offset,
+                                     center_y - math.sin(cross_heading) * start_offset, cross_heading)
+            cross_approach = min(lanelet_length, cross_road_length)
+            emit_straight(cross_road, cross_road_length - cross_approach, lanelet_length)
+            add_signalized_approach(writer, cross_road, cross_approach, road_width)
+            emit_straight(cross_road, cross_road_length, lanelet_length)
+
+            s += to_intersection + road_width
+            next_intersection = s + intersection_spacing
+            next_curve = max(next_curve, s)
+            continue
+
+        step = min(lanelet_length, total_length - s, next_curve - s)
+        road.emit(step)
+        s += step
+
+    writer.close()
+    print(f"Map saved to {filename} ({writer.node_count} nodes)")
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Create a vector map with two parallel lanes.")
+    parser = argparse.ArgumentParser(description="Create a vector map with parallel lanes, curves and signalized intersections.")
     parser.add_argument("--filename", type=str, default="two_lane_straight.osm", help="Output filename for the vector map.")
     parser.add_argument("--total_length", type=float, default=50.0, help="Length of the lanes.")
     parser.add_argument("--lane_width", type=float, default=3.7, help="Width of the lanes.")
-    parser.add_argument("--points_per_meter", type=int, default=5, help="Number of points per meter.")
+    parser.add_argument("--points_per_meter", type=float, default=5, help="Number of points per meter.")
+    parser.add_argument("--num_lanes", type=int, default=2, help="Number of parallel lanes.")
+    parser.add_argument("--lanelet_length", type=float, default=25.0, help="Maximum length of a lanelet.")
+    parser.add_argument("--curve_radius", type=float, default=0.0, help="Radius of the curves, 0 for a straight road.")
+    parser.add_argument("--curve_angle", type=float, default=30.0, help="Heading change of each curve in degrees.")
+    parser.add_argument("--curve_spacing", type=float, default=200.0, help="Length of the straight sections between curves.")
+    parser.add_argument("--intersection_spacing", type=float, default=0.0, help="Distance between signalized intersections, 0 for none.")
+    parser.add_argument("--cross_road_length", type=float, default=50.0, help="Length of each arm of the crossing roads.")
     args = parser.parse_args()
-    create_vector_map(args.filename, args.total_length, args.lane_width, args.points_per_meter)
-    print("Vector map with two parallel lanes created successfully.")
\ No newline at end of file
+    create_vector_map(args.filename, args.total_length, args.lane_width, args.points_per_meter, args.num_lanes,
+                      args.lanelet_length, args.curve_radius, args.curve_angle, args.curve_spacing,
+                      args.intersection_spacing, args.cross_road_length)
+    print("Vector map created successfully.")
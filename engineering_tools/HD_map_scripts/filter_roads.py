@@ -1,49 +1,381 @@
 """
 Purpose:
-This script filters an .xodr map file to retain only a specified subset of roads based on their IDs.
+This script filters an .xodr map file to retain only a subset of roads, selected by ID, by area or by corridor,
+or cuts the whole map into spatial tiles.
 
 Key Features:
 
-- Allows user to define a set of road IDs to keep (road_ids_to_keep).
-- Removes all roads and junctions not associated with the specified IDs.
-- Outputs a new .xodr file containing only the filtered elements.
+- Streams the input, so city scale maps are never fully loaded in memory.
+- Builds a grid index over the bounding boxes of the roads, computed from the planView <geometry> elements
+  (x, y, hdg, length, arc curvature) padded by the lane widths.
+- Keeps roads by ID (--ids), within a bounding box (--bbox) or within a corridor around a polyline (--corridor).
+- Cuts the map into square tiles (--tile_size), writing one .xodr per non empty tile. Roads crossing a tile
+  boundary are written to every tile they touch.
+- Keeps the connecting roads of the junctions whose incoming and outgoing roads are both selected, and removes the junctions and
+  junction connections that reference roads which were not kept.
+- Outputs new .xodr files containing only the filtered elements.
 
 Use Case:
-Creating a trimmed-down version of a map with only selected road segments for focused simulation or testing.
+Creating trimmed-down versions of a map with only selected road segments, or small per test site / per tile maps,
+for focused simulation or testing.
+
+Dependency:
+- pip install lxml numpy
+
+Usage:
+    python3 filter_roads.py original_map.xodr filtered_map.xodr --ids 23,24
+    python3 filter_roads.py original_map.xodr filtered_map.xodr --bbox <xmin>,<ymin>,<xmax>,<ymax>
+    python3 filter_roads.py original_map.xodr filtered_map.xodr --corridor <x1>,<y1>,<x2>,<y2>,... --corridor_width 30
+    python3 filter_roads.py original_map.xodr tiles_dir --tile_size 500
 """
+import argparse
+import collections
+import copy
+import math
+import os
+from array import array
+
+import numpy as np
 from lxml import etree
 
-# === EDIT THIS LIST: IDs of roads you want to keep ===
-road_ids_to_keep = {"23"}
+# Spacing of the points sampled along curved geometries to compute their bounding boxes (m)
+ARC_SAMPLE_SPACING = 1.0
+
+# Maximum number of output files kept open at once, well below the default open file limit
+MAX_OPEN_OUTPUTS = 64
+
+
+def local_name(elem):
+    return etree.QName(elem).localname
+
+
+def iter_top_level(input_file):
+    """Yields (root, element) for every direct child of the root once it is fully parsed, then frees it."""
+    context = etree.iterparse(input_file, events=("start", "end"), strip_cdata=False, remove_comments=True)
+    _, root = next(context)
+    depth = 1
+    for event, elem in context:
+        if event == "start":
+            depth += 1
+            continue
+        depth -= 1
+        if depth != 1:
+            continue
+        yield root, elem
+        elem.clear()
+        while elem.getprevious() is not None:
+            del root[0]
+
+
+def geometry_samples(geometry):
+    """Returns the x and y arrays of points sampled along one planView <geometry> element."""
+    x = float(geometry.get("x"))
+    y = float(geometry.get("y"))
+    hdg = float(geometry.get("hdg"))
+    length = float(geometry.get("length"))
+
+    curvature = 0.0
+    for child in geometry:
+        if local_name(child) == "arc":
+            curvature = float(child.get("curvature"))
+        elif local_name(child) == "spiral":
+            # Bound the spiral by an arc with its mean curvature, the lane width padding absorbs the difference
+            curvature = (float(child.get("curvStart")) + float(child.get("curvEnd"))) / 2.0
+
+    if curvature == 0.0:
+        t = np.array([0.0, length])
+        return x + t * math.cos(hdg), y + t * math.sin(hdg)
+
+    t = np.linspace(0.0, length, max(int(length / ARC_SAMPLE_SPACING), 1) + 1)
+    headings = hdg + curvature * t
+    return (x + (np.sin(headings) - math.sin(hdg)) / curvature,
+            y - (np.cos(headings) - math.cos(hdg)) / curvature)
+
+
+def lateral_extent(road):
+    """Returns the largest total width of the lanes on either side of the road reference line."""
+    extent = 0.0
+    for lane_section in road.iter("{*}laneSection", "laneSection"):
+        for side in lane_section:
+            if local_name(side) not in ("left", "right"):
+                continue
+            width = sum(max(float(w.get("a", 0.0)), 0.0) for lane in side for w in lane if local_name(w) == "width")
+            extent = max(extent, width)
+    return extent
+
+
+class RoadIndex:
+    """
+    Bounding boxes and sampled reference lines of every road, with a uniform grid index over the bounding boxes.
+    Junction connections are kept so junctions can be resolved for any selection of roads.
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.ids = []
+        self.bounds = array("d")  # xmin, ymin, xmax, ymax per road
+        self.padding = array("d")  # lateral extent per road
+        self.samples = []  # (xs, ys) per road
+        self.road_junction = {}  # road id -> junction id, for connecting roads
+        self.road_links = {}  # road id -> ids of the roads it links to, for connecting roads
+        self.junction_connections = {}  # junction id -> [(incoming road, connecting road)]
+        self.grid = {}
+
+    def add_road(self, road):
+        xs, ys = [], []
+        for geometry in road.iter("{*}geometry", "geometry"):
+            gx, gy = geometry_samples(geometry)
+            xs.append(gx)
+            ys.append(gy)
+        if not xs:
+            return
+        xs = np.concatenate(xs)
+        ys = np.concatenate(ys)
+        pad = lateral_extent(road)
+
+        road_id = road.get("id")
+        index = len(self.ids)
+        self.ids.append(road_id)
+        self.samples.append((xs, ys))
+        self.padding.append(pad)
+        bounds = (xs.min() - pad, ys.min() - pad, xs.max() + pad, ys.max() + pad)
+        self.bounds.extend(bounds)
+        if road.get("junction") not in (None, "", "-1"):
+            self.road_junction[road_id] = road.get("junction")
+            self.road_links[road_id] = {
+                link.get("elementId") for link in road.iter("{*}predecessor", "predecessor", "{*}successor", "successor")
+                if link.get("elementType") == "road"
+            }
+
+        for cell in self.cells(bounds):
+            self.grid.setdefault(cell, []).append(index)
+
+    def add_junction(self, junction):
+        self.junction_connections[junction.get("id")] = [
+            (connection.get("incomingRoad"), connection.get("connectingRoad"))
+            for connection in junction if local_name(connection) == "connection"
+        ]
+
+    def cells(self, bounds):
+        xmin, ymin, xmax, ymax = bounds
+        for i in range(math.floor(xmin / self.cell_size), math.floor(xmax / self.cell_size) + 1):
+            for j in range(math.floor(ymin / self.cell_size), math.floor(ymax / self.cell_size) + 1):
+                yield (i, j)
+
+    def road_bounds(self, index):
+        return self.bounds[4 * index:4 * index + 4]
+
+    def candidates(self, bounds):
+        found = set()
+        for cell in self.cells(bounds):
+            found.update(self.grid.get(cell, ()))
+        return found
+
+    def query_bbox(self, bounds):
+        """Returns the ids of the roads whose bounding box intersects bounds."""
+        xmin, ymin, xmax, ymax = bounds
+        result = set()
+        for index in self.candidates(bounds):
+            rxmin, rymin, rxmax, rymax = self.road_bounds(index)
+            if rxmin <= xmax and rxmax >= xmin and rymin <= ymax and rymax >= ymin:
+                result.add(self.ids[index])
+        return result
+
+    def query_corridor(self, points, width):
+        """Returns the ids of the roads passing within width / 2 of the polyline through points."""
+        result = set()
+        half_width = width / 2.0
+        for (x1, y1), (x2, y2) in zip(points[:-1], points[1:]):
+            segment_bounds = (min(x1, x2) - half_width, min(y1, y2) - half_width,
+                              max(x1, x2) + half_width, max(y1, y2) + half_width)
+            dx, dy = x2 - x1, y2 - y1
+            length_sq = dx * dx + dy * dy
+            for index in self.candidates(segment_bounds):
+                road_id = self.ids[index]
+                if road_id in result:
+                    continue
+                xs, ys = self.samples[index]
+                t = np.zeros(len(xs)) if length_sq == 0.0 else np.clip(((xs - x1) * dx + (ys - y1) * dy) / length_sq, 0.0, 1.0)
+                dist_sq = (xs - (x1 + t * dx)) ** 2 + (ys - (y1 + t * dy)) ** 2
+                limit = half_width + self.padding[index]
+                if dist_sq.min() <= limit * limit:
+                    result.add(road_id)
+        return result
+
+    def tiles(self, tile_size):
+        """Returns a dict of tile name -> ids of the roads whose bounding box intersects the tile."""
+        tiles = {}
+        for index, road_id in enumerate(self.ids):
+            xmin, ymin, xmax, ymax = self.road_bounds(index)
+            for i in range(math.floor(xmin / tile_size), math.floor(xmax / tile_size) + 1):
+                for j in range(math.floor(ymin / tile_size), math.floor(ymax / tile_size) + 1):
+                    tiles.setdefault(f"tile_{i}_{j}", set()).add(road_id)
+        return tiles
+
+    def resolve_junctions(self, road_ids):
+        """
+        Adds the connecting roads of the junctions between selected roads to road_ids, and returns the set of
+        junctions to keep. A connecting road is added only if both the incoming road and the road it leads to
+        are selected, so no kept road links to a road which was not kept.
+        """
+        selected = frozenset(road_ids)
+        junctions = set()
+        for junction_id, connections in self.junction_connections.items():
+            for incoming, connecting in connections:
+                if incoming in selected or connecting in selected:
+                    junctions.add(junction_id)
+                    if incoming not in selected or self.road_junction.get(connecting) != junction_id:
+                        continue
+                    outgoing = self.road_links.get(connecting, set()) - {incoming}
+                    if outgoing and outgoing <= selected:
+                        road_ids.add(connecting)
+        return junctions
+
+
+def scan_map(input_file, cell_size):
+    index = RoadIndex(cell_size)
+    for _, elem in iter_top_level(input_file):
+        name = local_name(elem)
+        if name == "road":
+            index.add_road(elem)
+        elif name == "junction":
+            index.add_junction(elem)
+    return index
+
+
+class OutputFiles:
+    """Appends to any number of output files while keeping at most max_open of them open, closing the least recently used."""
+
+    def __init__(self, max_open=MAX_OPEN_OUTPUTS):
+        self.max_open = max_open
+        self.open_files = collections.OrderedDict()
+        self.created = set()
+
+    def write(self, path, data):
+        f = self.open_files.pop(path, None)
+        if f is None:
+            if len(self.open_files) >= self.max_open:
+                self.open_files.popitem(last=False)[1].close()
+            # The first open truncates any previous output, later ones append to what was written so far
+            f = open(path, "ab" if path in self.created else "wb")
+            self.created.add(path)
+        self.open_files[path] = f
+        f.write(data)
+
+    def close(self):
+        while self.open_files:
+            self.open_files.popitem()[1].close()
+
+
+def write_filtered(input_file, selections):
+    """
+    Streams the input once, writing each output of selections (output path -> (road ids, junction ids)).
+    Junction connections referencing roads missing from an output are dropped from that output.
+    """
+    files = OutputFiles()
+    header = None
+
+    # Outputs of every selected road and junction, so each element is looked up once instead of once per output
+    road_outputs = {}
+    junction_outputs = {}
+    for path, (road_ids, junction_ids) in selections.items():
+        for road_id in road_ids:
+            road_outputs.setdefault(road_id, []).append(path)
+        for junction_id in junction_ids:
+            junction_outputs.setdefault(junction_id, []).append(path)
+
+    try:
+        for root, elem in iter_top_level(input_file):
+            if header is None:
+                # Write the root start tag using an empty copy of the root
+                empty_root = etree.Element(root.tag, dict(root.attrib), nsmap=root.nsmap)
+                start_tag = etree.tostring(empty_root, encoding="UTF-8").decode("utf-8")
+                header = b"<?xml version='1.0' encoding='UTF-8'?>\n" + (start_tag[:-len("/>")] + ">\n").encode("utf-8")
+                for path in selections:
+                    files.write(path, header)
+
+            name = local_name(elem)
+            if name == "road":
+                paths = road_outputs.get(elem.get("id"), ())
+            elif name == "junction":
+                paths = junction_outputs.get(elem.get("id"), ())
+            else:
+                paths = selections
+            if not paths:
+                continue
+
+            etree.indent(elem, level=1)
+            elem.tail = None
+            for path in paths:
+                out_elem = elem
+                if name == "junction":
+                    road_ids = selections[path][0]
+                    out_elem = copy.deepcopy(elem)
+                    for connection in list(out_elem):
+                        if local_name(connection) == "connection" and (
+                                connection.get("incomingRoad") not in road_ids
+                                or connection.get("connectingRoad") not in road_ids):
+                            out_elem.remove(connection)
+                    if not any(local_name(c) == "connection" for c in out_elem):
+                        continue
+                files.write(path, b"  " + etree.tostring(out_elem, encoding="UTF-8") + b"\n")
+
+        if header is not None:
+            for path in selections:
+                files.write(path, f"</{etree.QName(root).localname}>\n".encode("utf-8"))
+    finally:
+        files.close()
+
+
+def parse_floats(text, count=None):
+    values = [float(v) for v in text.split(",")]
+    if count is not None and len(values) != count:
+        raise ValueError(f"Expected {count} comma separated values, got '{text}'")
+    return values
 
-# === Input and output file paths ===
-# TODO: Change these to match actual files
-input_file = "original_map.xodr"
-output_file = "filtered_map.xodr"
 
 def filter_xodr(input_file, output_file, road_ids_to_keep):
-    tree = etree.parse(input_file)
-    root = tree.getroot()
-
-    # Remove roads not in the list
-    for road in root.findall("road"):
-        if road.get("id") not in road_ids_to_keep:
-            root.remove(road)
-
-    # Remove unrelated junctions
-    for junction in root.findall("junction"):
-        remove = True
-        for connection in junction.findall("connection"):
-            if (connection.get("incomingRoad") in road_ids_to_keep or
-                connection.get("connectingRoad") in road_ids_to_keep):
-                remove = False
-                break
-        if remove:
-            root.remove(junction)
-
-    # Write the result to output
-    tree.write(output_file, pretty_print=True, xml_declaration=True, encoding='UTF-8')
+    """Keeps only the roads in road_ids_to_keep, and the junctions connecting them."""
+    index = scan_map(input_file, 100.0)
+    road_ids = set(road_ids_to_keep)
+    junction_ids = index.resolve_junctions(road_ids)
+    write_filtered(input_file, {output_file: (road_ids, junction_ids)})
     print(f"Filtered XODR written to: {output_file}")
 
-# === Run the filter ===
-filter_xodr(input_file, output_file, road_ids_to_keep)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Filter an XODR map by road ID, area or corridor, or cut it into tiles.")
+    parser.add_argument("input_file", help="Path to the input .xodr file")
+    parser.add_argument("output", help="Path to the output .xodr file, or the output directory with --tile_size")
+    selection = parser.add_mutually_exclusive_group(required=True)
+    selection.add_argument("--ids", help="Comma separated IDs of the roads to keep")
+    selection.add_argument("--bbox", help="Keep roads within <xmin>,<ymin>,<xmax>,<ymax> (map coordinates, m)")
+    selection.add_argument("--corridor", help="Keep roads along the polyline <x1>,<y1>,<x2>,<y2>,... (map coordinates, m)")
+    selection.add_argument("--tile_size", type=float, help="Cut the map into square tiles of this size (m)")
+    parser.add_argument("--corridor_width", type=float, default=30.0, help="Width of the --corridor (m, default 30)")
+    parser.add_argument("--grid_cell", type=float, default=100.0, help="Cell size of the road index grid (m, default 100)")
+    args = parser.parse_args()
+
+    if args.ids:
+        filter_xodr(args.input_file, args.output, set(args.ids.split(",")))
+    else:
+        road_index = scan_map(args.input_file, args.grid_cell)
+        print(f"Indexed {len(road_index.ids)} roads and {len(road_index.junction_connections)} junctions")
+
+        if args.tile_size:
+            os.makedirs(args.output, exist_ok=True)
+            outputs = {}
+            for tile, tile_roads in road_index.tiles(args.tile_size).items():
+                tile_junctions = road_index.resolve_junctions(tile_roads)
+                outputs[os.path.join(args.output, tile + ".xodr")] = (tile_roads, tile_junctions)
+        else:
+            if args.bbox:
+                roads = road_index.query_bbox(parse_floats(args.bbox, 4))
+            else:
+                values = parse_floats(args.corridor)
+                roads = road_index.query_corridor(list(zip(values[0::2], values[1::2])), args.corridor_width)
+            outputs = {args.output: (roads, road_index.resolve_junctions(roads))}
+
+        write_filtered(args.input_file, outputs)
+        for path, (roads, junctions) in sorted(outputs.items()):
+            print(f"Filtered XODR written to: {path} ({len(roads)} roads, {len(junctions)} junctions)")
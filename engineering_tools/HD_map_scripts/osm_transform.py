@@ -9,12 +9,15 @@ Steps:
 
 1. Read the input OSM XML file.
 2. Extract the original geoReference (a Transverse Mercator projection centered at some latitude/longitude).
-3. Convert each nodes lat/lon to projected (X, Y) coordinates using the original projection.
-4. Apply a 2D rotation (optional) around the local origin (0, 0).
+3. Convert all node lat/lon to projected (X, Y) coordinates using the original projection, in a single batched call.
+4. Apply a 2D rotation (optional) around the local origin (0, 0), vectorized over all nodes.
 5. Transform the rotated (X, Y) into new lat/lon coordinates using a new projection centered at a new location.
 6. Update the <geoReference> tag to reflect the new center.
 7. Save the updated OSM XML file with transformed coordinates.
 
+The input is streamed twice with lxml iterparse (once to collect coordinates, once to write the
+output incrementally), so memory stays bounded by the coordinate arrays rather than the XML tree.
+
 ---
 
 Inputs:
@@ -50,6 +53,7 @@ import argparse
 from lxml import etree
 from pyproj import CRS, Transformer
 import math
+from array import array
 import numpy as np
 
 # === Fixed reference and rotation config ===
@@ -72,19 +76,28 @@ parser.add_argument("input_file", help="Path to the input .osm file")
 parser.add_argument("output_file", help="Path to the output .osm file")
 args = parser.parse_args()
 
-# === Parse XML ===
-tree = etree.parse(args.input_file)
-root = tree.getroot()
+# === Pass 1: stream the XML to collect node coordinates and the geoReference ===
+# Every top level element is cleared and removed from the root once read, along with its children,
+# so memory only grows with the coordinate arrays
+lats = array("d")
+lons = array("d")
+old_proj_str = None
+for _, elem in etree.iterparse(args.input_file, events=("end",)):
+    parent = elem.getparent()
+    if parent is None or parent.getparent() is not None:
+        continue
+    if elem.tag == "node":
+        lats.append(float(elem.get("lat")))
+        lons.append(float(elem.get("lon")))
+    elif elem.tag == "geoReference" and old_proj_str is None and (elem.text or elem.attrib.get("v")):
+        old_proj_str = elem.text.strip() if elem.text else elem.attrib.get("v").strip()
+    elem.clear()
+    while elem.getprevious() is not None:
+        del parent[0]
 
 # === Read original geoReference string from map file ===
-geo_ref_elem = root.find("geoReference")
-if geo_ref_elem is None or (not geo_ref_elem.text and not geo_ref_elem.attrib.get("v")):
+if old_proj_str is None:
     raise ValueError("❌ geoReference tag not found or is empty in the OSM file.")
-
-if geo_ref_elem.text:
-    old_proj_str = geo_ref_elem.text.strip()
-else:
-    old_proj_str = geo_ref_elem.attrib.get("v").strip()
 print(f"📌 Extracted old geoReference:\n{old_proj_str}\n")
 
 new_proj_str = f"+proj=tmerc +lat_0={new_lat_0} +lon_0={new_lon_0} +k=1 +x_0=0 +y_0=0 +datum=WGS84 +units=m +geoidgrids=egm96_15.gtx +vunits=m +no_defs"
@@ -99,20 +112,8 @@ crs_new = CRS.from_proj4(new_proj_str)
 to_old_xy = Transformer.from_crs(crs_wgs84, crs_old, always_xy=True)
 to_new_latlon = Transformer.from_crs(crs_new, crs_wgs84, always_xy=True)
 
-# === Update <geoReference> to new projection ===
-if geo_ref_elem.text:
-    geo_ref_elem.text = new_proj_str
-else:
-    geo_ref_elem.set("v", new_proj_str)
-
-# === Step 1: Convert all nodes to old projected coordinates and compute centroid ===
-xs_old, ys_old = [], []
-for node in root.findall("node"):
-    lat = float(node.get("lat"))
-    lon = float(node.get("lon"))
-    x_old, y_old = to_old_xy.transform(lon, lat)
-    xs_old.append(x_old)
-    ys_old.append(y_old)
+# === Step 1: Convert all nodes to old projected coordinates in one batch and compute centroid ===
+xs_old, ys_old = to_old_xy.transform(np.frombuffer(lons), np.frombuffer(lats))
 
 cx_old = np.mean(xs_old)
 cy_old = np.mean(ys_old)
@@ -125,29 +126,112 @@ rotate_x, rotate_y = to_new_xy.transform(rotate_lon, rotate_lat)
 offset_x = rotate_x - cx_old
 offset_y = rotate_y - cy_old
 
-# === Step 3: Apply shift + rotation ===
-for i, node in enumerate(root.findall("node")):
-    x = xs_old[i] + offset_x
-    y = ys_old[i] + offset_y
-
-    # Rotate around new center
-    x_rel, y_rel = x - rotate_x, y - rotate_y
-    x_rot = x_rel * math.cos(theta_rad) - y_rel * math.sin(theta_rad)
-    y_rot = x_rel * math.sin(theta_rad) + y_rel * math.cos(theta_rad)
-    x_rot += rotate_x
-    y_rot += rotate_y
-
-    # Convert to final lat/lon using new projection
-    new_lon, new_lat = to_new_latlon.transform(x_rot, y_rot)
-    node.set("lat", f"{new_lat:.10f}")
-    node.set("lon", f"{new_lon:.10f}")
-    # Update tag values for lat and lon
-    for tag in node.findall('tag'):
-        if tag.get('k') == 'lat':
-            tag.set('v', f"{new_lat:.10f}")
-        elif tag.get('k') == 'lon':
-            tag.set('v', f"{new_lon:.10f}")
-
-# === Save transformed file ===
-tree.write(args.output_file, pretty_print=True, xml_declaration=True, encoding="UTF-8")
+# === Step 3: Apply shift + rotation to all nodes at once ===
+# Rotate around new center
+x_rel = xs_old + offset_x - rotate_x
+y_rel = ys_old + offset_y - rotate_y
+x_rot = x_rel * math.cos(theta_rad) - y_rel * math.sin(theta_rad) + rotate_x
+y_rot = x_rel * math.sin(theta_rad) + y_rel * math.cos(theta_rad) + rotate_y
+
+# Convert to final lat/lon using new projection
+new_lons, new_lats = to_new_latlon.transform(x_rot, y_rot)
+
+# === Pass 2: stream the XML again, writing each top level element as soon as it is updated ===
+def update_element(elem):
+    """Relocates a top level node or updates the geoReference, other elements are left unchanged"""
+    global node_index
+    if elem.tag == "node":
+        new_lat = f"{new_lats[node_index]:.10f}"
+        new_lon = f"{new_lons[node_index]:.10f}"
+        node_index += 1
+        elem.set("lat", new_lat)
+        elem.set("lon", new_lon)
+        # Update tag values for lat and lon
+        for tag in elem.iterchildren("tag"):
+            if tag.get("k") == "lat":
+                tag.set("v", new_lat)
+            elif tag.get("k") == "lon":
+                tag.set("v", new_lon)
+    elif elem.tag == "geoReference" and geo_ref_pending[0]:
+        # === Update <geoReference> to new projection ===
+        geo_ref_pending[0] = False
+        if elem.text:
+            elem.text = new_proj_str
+        else:
+            elem.set("v", new_proj_str)
+
+def write_child(out, child, indented):
+    """Writes a top level element, comment or processing instruction of the root.
+    The original whitespace is kept, unless the input has none in which case the child is indented
+    the way lxml pretty prints a tree"""
+    if indented:
+        out.write(etree.tostring(child, encoding="UTF-8", with_tail=True))
+    else:
+        child.tail = None
+        if isinstance(child.tag, str):
+            etree.indent(child, level=1)
+        out.write(b"\n  " + etree.tostring(child, encoding="UTF-8"))
+
+node_index = 0
+geo_ref_pending = [True]  # Only the first geoReference is used and updated, as in pass 1
+with open(args.output_file, "wb") as out:
+    out.write(b"<?xml version='1.0' encoding='UTF-8'?>\n")
+    root = None
+    depth = 0
+    # Top level child waiting for its tail, which is only known once the next sibling or the end of the root is parsed
+    pending = None
+    indented = True
+    for event, elem in etree.iterparse(args.input_file, events=("start", "end", "comment", "pi")):
+        if event == "start":
+            depth += 1
+            if depth == 1:
+                root = elem
+                start_tag = etree.tostring(etree.Element(root.tag, dict(root.attrib), nsmap=root.nsmap))
+                root_name = start_tag[1:].split(b" ", 1)[0].rstrip(b"/>")
+                out.write(start_tag[:-2] + b">")
+            elif depth == 2:
+                if pending is not None:
+                    write_child(out, pending, indented)
+                elif root.text is None:
+                    indented = False
+                else:
+                    out.write(root.text.encode("UTF-8"))
+                pending = None
+            continue
+
+        if event in ("comment", "pi"):
+            if depth == 0:
+                # Comments and processing instructions around the root are written on their own line
+                if root is not None:
+                    out.write(b"\n")
+                out.write(etree.tostring(elem, encoding="UTF-8"))
+                if root is None:
+                    out.write(b"\n")
+            elif depth == 1:
+                if pending is not None:
+                    write_child(out, pending, indented)
+                elif root.text is None:
+                    indented = False
+                else:
+                    out.write(root.text.encode("UTF-8"))
+                pending = elem
+            continue
+
+        depth -= 1
+        if depth == 1:
+            update_element(elem)
+            pending = elem
+            # Drop the children written so far, the pending child is kept until its tail is known
+            while elem.getprevious() is not None:
+                del root[0]
+        elif depth == 0:
+            if pending is not None:
+                write_child(out, pending, indented)
+                if not indented:
+                    out.write(b"\n")
+            elif root.text is not None:
+                out.write(root.text.encode("UTF-8"))
+            out.write(b"</" + root_name + b">")
+    out.write(b"\n")
+
 print(f"\n✅ Map shifted and rotated. Output saved to: {args.output_file}")
@@ -19,16 +19,25 @@ applies a transformation to the coordinates, and writes the modified data to a n
 The script can be run from the command line with the following arguments:
 - input_file: The path to the input XODR file.
 - output_file: The path to the output XODR file.
+- --lat/--lon: The new geoReference origin (defaults to the original origin).
+- --angle: The rotation in degrees (defaults to 0).
+All transformable attributes are first collected into arrays, transformed with one vectorized
+pyproj/NumPy call per attribute kind, and then written back to their elements.
+When input_file is a directory, every .xodr file in it is transformed into the output_file
+directory using a process pool.
 Dependency:
-- pip install pyproj argparse lxml
+- pip install pyproj argparse lxml numpy
 Usage:
-    python3 xodr_transform.py <input_file> <output_file>
+    python3 xodr_transform.py <input_file> <output_file> [--lat <lat>] [--lon <lon>] [--angle <degrees>]
+    python3 xodr_transform.py <input_dir> <output_dir> [--lat <lat>] [--lon <lon>] [--angle <degrees>] [--jobs <n>]
 """
 
 from lxml import etree
 from pyproj import CRS, Transformer
+from array import array
 import math
 import re
+import numpy as np
 
 
 def extract_lat_lon_from_georeference(geo_text):
@@ -68,17 +77,45 @@ def transform_hdg(hdg, angle_deg):
     return hdg + math.radians(angle_deg)
 
 
-def transform_xodr_file(input_path, output_path):
+def collect_transformable(root):
+    """Collects every transformable attribute into typed arrays, keeping the element each value came from."""
+    latlon_elems, lats, lons = [], array("d"), array("d")
+    xy_elems, xs, ys = [], array("d"), array("d")
+    hdg_elems, hdgs = [], array("d")
+
+    for elem in root.iter():
+        lat = elem.attrib.get("lat")
+        lon = elem.attrib.get("lon")
+        x = elem.attrib.get("x")
+        y = elem.attrib.get("y")
+        hdg = elem.attrib.get("hdg")
+
+        if lat and lon:
+            latlon_elems.append(elem)
+            lats.append(float(lat))
+            lons.append(float(lon))
+
+        if x and y:
+            xy_elems.append(elem)
+            xs.append(float(x))
+            ys.append(float(y))
+
+        if hdg:
+            hdg_elems.append(elem)
+            hdgs.append(float(hdg))
+
+    return (
+        (latlon_elems, np.frombuffer(lats), np.frombuffer(lons)),
+        (xy_elems, np.frombuffer(xs), np.frombuffer(ys)),
+        (hdg_elems, np.frombuffer(hdgs)),
+    )
+
+
+def transform_xodr_file(input_path, output_path, new_lat=None, new_lon=None, angle_deg=0.0):
+    """Transforms one XODR file. new_lat/new_lon default to the file's current geoReference origin."""
     tree = etree.parse(input_path)
     root = tree.getroot()
 
-    ### INPUT REQUIRED ###
-    # Adjust these values as needed
-    new_lat = None
-    new_lon = None
-    angle_deg = 0.0
-    ######################
-
     # Get original lat/lon from geoReference tag
     geo_ref_tag = root.find("header/geoReference")
     if geo_ref_tag is None or not geo_ref_tag.text:
@@ -100,46 +137,61 @@ def transform_xodr_file(input_path, output_path):
     transformer_to_utm = Transformer.from_crs("EPSG:4326", crs_orig, always_xy=True)
     transformer_from_utm = Transformer.from_crs("EPSG:4326", crs_new, always_xy=True)
 
-    for elem in root.iter():
-        lat = elem.attrib.get("lat")
-        lon = elem.attrib.get("lon")
-        x = elem.attrib.get("x")
-        y = elem.attrib.get("y")
-        hdg = elem.attrib.get("hdg")
+    # Phase 1: gather all values, then transform each kind of attribute with one vectorized call
+    (latlon_elems, lats, lons), (xy_elems, xs, ys), (hdg_elems, hdgs) = collect_transformable(root)
 
-        # Transform GPS-based coordinates
-        if lat and lon:
-            lat_f = float(lat)
-            lon_f = float(lon)
-            lat_new_val, lon_new_val = transform_latlon(lat_f, lon_f, transformer_to_utm, transformer_from_utm, angle_deg)
-            elem.set("lat", f"{lat_new_val:.8f}")
-            elem.set("lon", f"{lon_new_val:.8f}")
+    # Transform GPS-based coordinates
+    lats_new, lons_new = transform_latlon(lats, lons, transformer_to_utm, transformer_from_utm, angle_deg)
+    # Transform local x, y coordinates
+    xs_rot, ys_rot = rotate(xs, ys, angle_deg)
+    # Adjust heading
+    hdgs_new = transform_hdg(hdgs, angle_deg)
 
-        # Transform local x, y coordinates
-        if x and y:
-            x_f = float(x)
-            y_f = float(y)
-            x_rot, y_rot = rotate(x_f, y_f, angle_deg)
-            elem.set("x", f"{x_rot:.8f}")
-            elem.set("y", f"{y_rot:.8f}")
+    # Phase 2: write the transformed values back to the elements they came from
+    for elem, lat_new_val, lon_new_val in zip(latlon_elems, lats_new.tolist(), lons_new.tolist()):
+        elem.set("lat", f"{lat_new_val:.8f}")
+        elem.set("lon", f"{lon_new_val:.8f}")
 
-        # Adjust heading
-        if hdg:
-            hdg_f = float(hdg)
-            hdg_new = transform_hdg(hdg_f, angle_deg)
-            elem.set("hdg", f"{hdg_new:.8f}")
+    for elem, x_rot, y_rot in zip(xy_elems, xs_rot.tolist(), ys_rot.tolist()):
+        elem.set("x", f"{x_rot:.8f}")
+        elem.set("y", f"{y_rot:.8f}")
+
+    for elem, hdg_new in zip(hdg_elems, hdgs_new.tolist()):
+        elem.set("hdg", f"{hdg_new:.8f}")
 
     # Write modified XML
     tree.write(output_path, encoding="UTF-8", xml_declaration=True)
+    return output_path
 
 
 if __name__ == "__main__":
     import argparse
+    import os
+    from concurrent.futures import ProcessPoolExecutor
 
     parser = argparse.ArgumentParser(description="Transform XODR GPS-coordinates with a new geoReference and rotation.")
-    parser.add_argument("input_file", help="Path to input .xodr file")
-    parser.add_argument("output_file", help="Path to output .xodr file")
+    parser.add_argument("input_file", help="Path to input .xodr file, or a directory of .xodr files")
+    parser.add_argument("output_file", help="Path to output .xodr file, or an output directory when the input is a directory")
+    parser.add_argument("--lat", type=float, default=None, help="New geoReference latitude (default: keep the original)")
+    parser.add_argument("--lon", type=float, default=None, help="New geoReference longitude (default: keep the original)")
+    parser.add_argument("--angle", type=float, default=0.0, help="Rotation in degrees, counter-clockwise (default: 0)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="Worker processes used for a directory of maps")
 
     args = parser.parse_args()
 
-    transform_xodr_file(args.input_file, args.output_file)
+    if (args.lat is None) != (args.lon is None):
+        parser.error("--lat and --lon must be given together")
+
+    if not os.path.isdir(args.input_file):
+        transform_xodr_file(args.input_file, args.output_file, args.lat, args.lon, args.angle)
+    else:
+        os.makedirs(args.output_file, exist_ok=True)
+        inputs = sorted(f for f in os.listdir(args.input_file) if f.endswith(".xodr"))
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            futures = [
+                pool.submit(transform_xodr_file, os.path.join(args.input_file, f), os.path.join(args.output_file, f),
+                            args.lat, args.lon, args.angle)
+                for f in inputs
+            ]
+            for future in futures:
+                print(f"Transformed {future.result()}")
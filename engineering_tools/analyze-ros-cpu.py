@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+import argparse
+import csv
+import json
+import math
+import os
+import struct
+from datetime import datetime
+
+import ros_launch_nodes
+
+"""
+CARMA Platform CPU Monitor Report
+Requirements:
+    - Python 3.7 or higher
+Usage:
+    1. Record a run with monitor-ros-cpu.py (CSV output or --sampler binary output)
+    2. Summarize the run:
+       python3 analyze-ros-cpu.py carma-cpu-usage-logs/cpu_usage_ros2_nodes_YYYY_MM_DD-HH_MM_SS.csv
+    3. Compare against a baseline run, for example from the previous release:
+       python3 analyze-ros-cpu.py <current run> --baseline <previous run>
+Output:
+    - One row per node (container or standalone node) with its subsystem, sample count,
+      p50/p95/p99 CPU, peak RSS and memory growth slope. Nodes growing faster than
+      --leak-threshold are flagged as possible leaks
+    - With --baseline, the change of every metric and the nodes exceeding the regression thresholds
+    - With --output, the same table written as CSV
+The input is streamed, so memory use does not depend on the size of the run.
+"""
+
+# CPU percentiles are computed from fixed width histograms so memory stays bounded on long runs
+CPU_BIN_WIDTH = 0.5  # %
+BINARY_CHUNK_RECORDS = 65536
+BYTES_PER_MB = 1024**2
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Summarize and compare monitor-ros-cpu.py runs per ROS node"
+    )
+    parser.add_argument(
+        "run", help="monitor-ros-cpu.py output, either a .csv or a sampler .bin file"
+    )
+    parser.add_argument(
+        "--baseline", "-b", help="Run to compare against, in either format"
+    )
+    parser.add_argument(
+        "--output", "-o", help="Write the summary (or comparison) table to this CSV file"
+    )
+    parser.add_argument(
+        "--launch-dir",
+        help="Directory of CARMA *.launch.py files used to map containers to subsystems",
+    )
+    parser.add_argument(
+        "--leak-threshold",
+        type=float,
+        default=50.0,
+        help="Memory growth in MB/hour above which a node is flagged as leaking (default: 50)",
+    )
+    parser.add_argument(
+        "--cpu-threshold",
+        type=float,
+        default=10.0,
+        help="Increase of p95 CPU in percentage points flagged as a regression (default: 10)",
+    )
+    parser.add_argument(
+        "--rss-threshold",
+        type=float,
+        default=20.0,
+        help="Relative increase of peak RSS in %% flagged as a regression (default: 20)",
+    )
+    return parser.parse_args()
+
+
+class NodeStats:
+    """
+    Streaming aggregate of the samples of one node
+    """
+
+    def __init__(self, key, subsystem, composable_nodes):
+        self.key = key
+        self.subsystem = subsystem
+        self.composable_nodes = composable_nodes
+        self.count = 0
+        self.cpu_histogram = {}
+        self.peak_rss = 0
+        # Running sums for the least squares fit of rss over time
+        self.t0 = None
+        self.sum_t = 0.0
+        self.sum_m = 0.0
+        self.sum_tt = 0.0
+        self.sum_tm = 0.0
+
+    def add(self, timestamp, cpu_percent, rss_bytes):
+        self.count += 1
+        cpu_bin = int(cpu_percent / CPU_BIN_WIDTH)
+        self.cpu_histogram[cpu_bin] = self.cpu_histogram.get(cpu_bin, 0) + 1
+        self.peak_rss = max(self.peak_rss, rss_bytes)
+
+        if self.t0 is None:
+            self.t0 = timestamp
+        t = (timestamp - self.t0) / 3600.0  # hours
+        m = rss_bytes / BYTES_PER_MB
+        self.sum_t += t
+        self.sum_m += m
+        self.sum_tt += t * t
+        self.sum_tm += t * m
+
+    def cpu_percentile(self, percentile):
+        if self.count == 0:
+            return math.nan
+        rank = percentile / 100.0 * self.count
+        seen = 0
+        for cpu_bin in sorted(self.cpu_histogram):
+            seen += self.cpu_histogram[cpu_bin]
+            if seen >= rank:
+                return (cpu_bin + 0.5) * CPU_BIN_WIDTH
+        return (max(self.cpu_histogram) + 0.5) * CPU_BIN_WIDTH
+
+    def rss_slope(self):
+        """
+        Memory growth in MB/hour
+        """
+        denominator = self.count * self.sum_tt - self.sum_t * self.sum_t
+        if self.count < 2 or denominator <= 0.0:
+            return 0.0
+        return (self.count * self.sum_tm - self.sum_t * self.sum_m) / denominator
+
+    def summary(self):
+        return {
+            "node": self.key,
+            "subsystem": self.subsystem or "",
+            "samples": self.count,
+            "cpu_p50": self.cpu_percentile(50),
+            "cpu_p95": self.cpu_percentile(95),
+            "cpu_p99": self.cpu_percentile(99),
+            "peak_rss_mb": self.peak_rss / BYTES_PER_MB,
+            "rss_slope_mb_per_hour": self.rss_slope(),
+            "composable_nodes": " ".join(self.composable_nodes),
+        }
+
+
+class RunAggregator:
+    """
+    Groups samples by node, falling back to the process name and first argument for processes without a ROS node name
+    PIDs are not used in the keys so that nodes can be matched between runs
+    """
+
+    def __init__(self):
+        self.nodes = {}
+
+    def stats_for(self, name, cmdline, node, subsystem, composable_nodes):
+        key = node
+        if not key:
+            args = cmdline.split()
+            key = f"{name} {os.path.basename(args[1])}" if len(args) > 1 else name
+        stats = self.nodes.get(key)
+        if stats is None:
+            stats = self.nodes[key] = NodeStats(key, subsystem, composable_nodes)
+        return stats
+
+    def summaries(self):
+        return sorted(
+            (stats.summary() for stats in self.nodes.values()),
+            key=lambda s: (s["subsystem"], s["node"]),
+        )
+
+
+def read_csv_run(path, launch_structure):
+    """
+    Aggregate the CSV output of monitor-ros-cpu.py
+    """
+    aggregator = RunAggregator()
+    process_stats = {}  # (pid, cmdline) -> NodeStats, avoids re-attributing every row
+
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        columns = {name: i for i, name in enumerate(header)}
+        timestamp_col = columns["Timestamp"]
+        pid_col = columns["PID"]
+        name_col = columns["Process Name"]
+        cpu_col = columns["CPU (%)"]
+        memory_col = columns["Memory (%)"]
+        cmdline_col = columns["Command Line"]
+        total_memory_col = columns["Total Memory (GB)"]
+
+        for row in reader:
+            try:
+                timestamp = datetime.fromisoformat(row[timestamp_col]).timestamp()
+                cpu_percent = float(row[cpu_col] or 0.0)
+                # The CSV only has memory as a percentage of the total, convert it back to bytes
+                rss = (
+                    float(row[memory_col] or 0.0)
+                    / 100.0
+                    * float(row[total_memory_col])
+                    * 1024**3
+                )
+            except (ValueError, IndexError):
+                continue
+
+            process_key = (row[pid_col], row[cmdline_col])
+            stats = process_stats.get(process_key)
+            if stats is None:
+                node, subsystem, nodes = ros_launch_nodes.attribute_process(
+                    row[cmdline_col], launch_structure
+                )
+                stats = process_stats[process_key] = aggregator.stats_for(
+                    row[name_col], row[cmdline_col], node, subsystem, nodes
+                )
+            stats.add(timestamp, cpu_percent, rss)
+
+    return aggregator
+
+
+def read_binary_run(path, launch_structure):
+    """
+    Aggregate the --sampler output of monitor-ros-cpu.py
+    """
+    with open(os.path.splitext(path)[0] + ".json") as f:
+        metadata = json.load(f)
+    record = struct.Struct(metadata["record_format"])
+    fields = metadata["record_fields"]
+    timestamp_i = fields.index("timestamp")
+    pid_i = fields.index("pid")
+    cpu_i = fields.index("cpu_percent")
+    rss_i = fields.index("rss_bytes")
+
+    aggregator = RunAggregator()
+    pid_stats = {}
+    for pid, info in metadata["processes"].items():
+        node, subsystem, nodes = info["node"], info["subsystem"], info["composable_nodes"]
+        if node and subsystem is None:
+            # Attribution may be missing if the monitor could not find the launch files
+            node, subsystem, nodes = ros_launch_nodes.attribute_process(
+                info["cmdline"], launch_structure
+            )
+        pid_stats[int(pid)] = aggregator.stats_for(
+            info["name"], info["cmdline"], node, subsystem, nodes
+        )
+
+    chunk_size = BINARY_CHUNK_RECORDS * record.size
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            usable = len(chunk) - len(chunk) % record.size
+            if usable == 0:
+                break
+            for values in record.iter_unpack(memoryview(chunk)[:usable]):
+                stats = pid_stats.get(values[pid_i])
+                if stats is not None:
+                    stats.add(values[timestamp_i], values[cpu_i], values[rss_i])
+
+    return aggregator
+
+
+def read_run(path, launch_structure):
+    if path.endswith(".bin"):
+        return read_binary_run(path, launch_structure).summaries()
+    return read_csv_run(path, launch_structure).summaries()
+
+
+def flag_summary(summary, leak_threshold):
+    return "LEAK?" if summary["rss_slope_mb_per_hour"] > leak_threshold else ""
+
+
+def compare_runs(baseline, current, args):
+    """
+    Join two runs by node and compute the change of every metric
+    """
+    baseline_by_node = {s["node"]: s for s in baseline}
+    current_by_node = {s["node"]: s for s in current}
+    rows = []
+    for node in sorted(set(baseline_by_node) | set(current_by_node)):
+        before = baseline_by_node.get(node)
+        after = current_by_node.get(node)
+        if before is None or after is None:
+            rows.append(
+                {
+                    "node": node,
+                    "subsystem": (after or before)["subsystem"],
+                    "flag": "NEW" if before is None else "REMOVED",
+                }
+            )
+            continue
+
+        cpu_delta = after["cpu_p95"] - before["cpu_p95"]
+        rss_delta = after["peak_rss_mb"] - before["peak_rss_mb"]
+        rss_change = (
+            100.0 * rss_delta / before["peak_rss_mb"] if before["peak_rss_mb"] else 0.0
+        )
+        flags = []
+        if cpu_delta > args.cpu_threshold:
+            flags.append("CPU")
+        if rss_change > args.rss_threshold:
+            flags.append("RSS")
+        if flag_summary(after, args.leak_threshold):
+            flags.append("LEAK?")
+        rows.append(
+            {
+                "node": node,
+                "subsystem": after["subsystem"],
+                "cpu_p95_before": before["cpu_p95"],
+                "cpu_p95_after": after["cpu_p95"],
+                "cpu_p95_delta": cpu_delta,
+                "peak_rss_mb_before": before["peak_rss_mb"],
+                "peak_rss_mb_after": after["peak_rss_mb"],
+                "peak_rss_change_percent": rss_change,
+                "rss_slope_mb_per_hour_after": after["rss_slope_mb_per_hour"],
+                "flag": " ".join(flags),
+            }
+        )
+    return rows
+
+
+def format_value(value):
+    if isinstance(value, float):
+        return f"{value:.1f}"
+    return str(value)
+
+
+def print_table(rows, columns):
+    widths = {
+        c: max([len(c)] + [len(format_value(r.get(c, ""))) for r in rows])
+        for c in columns
+    }
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for row in rows:
+        print("  ".join(format_value(row.get(c, "")).ljust(widths[c]) for c in columns))
+
+
+def write_csv(path, rows, columns):
+    with open(path, mode="w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    args = parse_args()
+    launch_structure = ros_launch_nodes.load_launch_structure(
+        ros_launch_nodes.find_launch_dir(args.launch_dir)
+    )
+
+    current = read_run(args.run, launch_structure)
+
+    if args.baseline:
+        baseline = read_run(args.baseline, launch_structure)
+        rows = compare_runs(baseline, current, args)
+        columns = [
+            "subsystem",
+            "node",
+            "cpu_p95_before",
+            "cpu_p95_after",
+            "cpu_p95_delta",
+            "peak_rss_mb_before",
+            "peak_rss_mb_after",
+            "peak_rss_change_percent",
+            "rss_slope_mb_per_hour_after",
+            "flag",
+        ]
+        print(f"Comparing {args.run} against baseline {args.baseline}")
+    else:
+        rows = current
+        for row in rows:
+            row["flag"] = flag_summary(row, args.leak_threshold)
+        columns = [
+            "subsystem",
+            "node",
+            "samples",
+            "cpu_p50",
+            "cpu_p95",
+            "cpu_p99",
+            "peak_rss_mb",
+            "rss_slope_mb_per_hour",
+            "flag",
+            "composable_nodes",
+        ]
+        print(f"Resource usage summary of {args.run}")
+
+    print_table(rows, columns)
+
+    if args.output:
+        write_csv(args.output, rows, columns)
+        print(f"Saved table to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,12 @@ import time
 import csv
 import os
 import argparse
+import json
+import struct
 from datetime import datetime
 
+import ros_launch_nodes
+
 """
 CARMA Platform CPU Monitor Script
 Requirements:
@@ -28,6 +32,14 @@ Usage:
 Output:
     - CSV file containing timestamp, process info, CPU and memory usage
     - Data can be used to analyze CARMA Platform resource utilization
+Sampler mode (--sampler):
+    - Matching processes are resolved once and their psutil handles are cached,
+      the process table is only rescanned when PIDs appear or disappear
+    - CPU, RSS, thread count and context switches are sampled at --rate Hz (10-50 Hz)
+      into a fixed size binary ring buffer which is flushed every --flush-interval seconds
+    - Output is a '.bin' file of fixed size records (see SAMPLE_RECORD) and a '.json' file
+      describing the record layout and every sampled PID, including the component container
+      it runs and the composable nodes loaded in it (parsed from carma/launch/*.launch.py)
 """
 
 # Define ROS-related keywords to filter processes
@@ -60,6 +72,18 @@ ROS_KEYWORDS = {
 # NOTE: Detection of these keywords overwrites the ROS_KEYWORDS
 EXCLUDE_KEYWORDS = {"code", "chrome", "firefox", "vscode", "gnome"}
 
+# Sampler mode record: timestamp (s), pid, cpu (%), rss (bytes), threads, voluntary and involuntary context switches
+SAMPLE_RECORD = struct.Struct("<dIfQIQQ")
+SAMPLE_FIELDS = [
+    "timestamp",
+    "pid",
+    "cpu_percent",
+    "rss_bytes",
+    "num_threads",
+    "ctx_switches_voluntary",
+    "ctx_switches_involuntary",
+]
+
 
 def parse_args():
     parser = argparse.ArgumentParser(description="Monitor CPU usage of ROS2 nodes")
@@ -74,14 +98,47 @@ def parse_args():
         "-i",
         help="Additional comma-separated patterns to include in process filtering",
     )
+    parser.add_argument(
+        "--sampler",
+        action="store_true",
+        help="Use the low overhead sampler writing binary records instead of the CSV monitor",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=20.0,
+        help="Sampler mode sampling rate in Hz (default: 20)",
+    )
+    parser.add_argument(
+        "--flush-interval",
+        type=float,
+        default=2.0,
+        help="Sampler mode seconds between ring buffer flushes to disk (default: 2)",
+    )
+    parser.add_argument(
+        "--rescan-interval",
+        type=float,
+        default=1.0,
+        help="Sampler mode seconds between checks for new or exited PIDs (default: 1)",
+    )
+    parser.add_argument(
+        "--buffer-records",
+        type=int,
+        default=65536,
+        help="Sampler mode ring buffer capacity in records (default: 65536)",
+    )
+    parser.add_argument(
+        "--launch-dir",
+        help="Directory of CARMA *.launch.py files used to map containers to composable nodes",
+    )
     return parser.parse_args()
 
 
-def setup_logging_directory(output_dir):
+def setup_logging_directory(output_dir, extension="csv"):
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
     timestamp = datetime.now().strftime("%Y_%m_%d-%H_%M_%S")
-    filename = f"cpu_usage_ros2_nodes_{timestamp}.csv"
+    filename = f"cpu_usage_ros2_nodes_{timestamp}.{extension}"
     return os.path.join(output_dir, filename)
 
 
@@ -116,6 +173,196 @@ def get_process_environment(pid):
         return False
 
 
+class SampleRingBuffer:
+    """
+    Fixed size buffer of packed SAMPLE_RECORDs, flushed to disk in order
+    If the buffer fills up before a flush the oldest unflushed records are overwritten and counted as dropped
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.buffer = bytearray(capacity * SAMPLE_RECORD.size)
+        self.written = 0  # Total records ever appended
+        self.flushed = 0  # Total records ever flushed or dropped
+        self.dropped = 0
+
+    def append(self, *values):
+        SAMPLE_RECORD.pack_into(
+            self.buffer, (self.written % self.capacity) * SAMPLE_RECORD.size, *values
+        )
+        self.written += 1
+        if self.written - self.flushed > self.capacity:
+            self.dropped += 1
+            self.flushed += 1
+
+    def flush(self, file):
+        start = self.flushed % self.capacity
+        count = self.written - self.flushed
+        end = start + count
+        view = memoryview(self.buffer)
+        if end <= self.capacity:
+            file.write(view[start * SAMPLE_RECORD.size : end * SAMPLE_RECORD.size])
+        else:
+            file.write(view[start * SAMPLE_RECORD.size :])
+            file.write(view[: (end - self.capacity) * SAMPLE_RECORD.size])
+        file.flush()
+        self.flushed = self.written
+
+
+class ProcessSampler:
+    """
+    Keeps cached psutil.Process handles of the ROS related processes and samples them
+    """
+
+    def __init__(self, launch_structure):
+        self.launch_structure = launch_structure
+        self.processes = {}  # pid -> psutil.Process
+        self.process_info = {}  # pid -> metadata written to the json file
+        self.known_pids = set()  # Every pid inspected so far, matching or not
+        self.own_pid = os.getpid()
+
+    def rescan(self):
+        """
+        Inspect only the PIDs that appeared since the last scan and forget the ones that exited
+        Returns True if the set of sampled processes changed
+        """
+        current_pids = set(psutil.pids())
+        new_pids = current_pids - self.known_pids
+        exited_pids = self.known_pids - current_pids
+        self.known_pids = current_pids
+
+        changed = False
+        for pid in exited_pids:
+            if self.processes.pop(pid, None) is not None:
+                changed = True
+
+        for pid in new_pids:
+            if pid == self.own_pid:
+                continue
+            try:
+                proc = psutil.Process(pid)
+                info = {"name": proc.name()}
+                cmdline_list = proc.cmdline()
+                cmdline = " ".join(cmdline_list) if cmdline_list else ""
+                if not is_ros_related_process(info, cmdline):
+                    continue
+                proc.cpu_percent(interval=None)  # Prime the cpu percent calculation
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+
+            node, subsystem, nodes = ros_launch_nodes.attribute_process(
+                cmdline, self.launch_structure
+            )
+            self.processes[pid] = proc
+            self.process_info[pid] = {
+                "name": info["name"],
+                "cmdline": cmdline,
+                "node": node,
+                "subsystem": subsystem,
+                "composable_nodes": nodes,
+                "first_seen": time.time(),
+            }
+            changed = True
+
+        return changed
+
+    def sample(self, ring_buffer):
+        """
+        Append one record per cached process to the ring buffer
+        Returns True if a process exited since the last rescan
+        """
+        timestamp = time.time()
+        exited = False
+        for pid, proc in self.processes.items():
+            try:
+                with proc.oneshot():
+                    cpu_percent = proc.cpu_percent(interval=None)
+                    rss = proc.memory_info().rss
+                    num_threads = proc.num_threads()
+                    ctx = proc.num_ctx_switches()
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                exited = True
+                continue
+            ring_buffer.append(
+                timestamp,
+                pid,
+                cpu_percent,
+                rss,
+                num_threads,
+                ctx.voluntary,
+                ctx.involuntary,
+            )
+        return exited
+
+
+def write_sampler_metadata(metadata_file, args, sampler, launch_dir):
+    metadata = {
+        "record_format": SAMPLE_RECORD.format,
+        "record_fields": SAMPLE_FIELDS,
+        "rate_hz": args.rate,
+        "total_cpus": os.cpu_count(),
+        "total_memory_bytes": psutil.virtual_memory().total,
+        "launch_dir": launch_dir,
+        "processes": {str(pid): info for pid, info in sampler.process_info.items()},
+    }
+    # Write then rename so a reader never sees a partially written file
+    with open(metadata_file + ".tmp", "w") as f:
+        json.dump(metadata, f, indent=2)
+    os.replace(metadata_file + ".tmp", metadata_file)
+
+
+def run_sampler(args):
+    launch_dir = ros_launch_nodes.find_launch_dir(args.launch_dir)
+    launch_structure = ros_launch_nodes.load_launch_structure(launch_dir)
+    if not launch_structure:
+        print("No CARMA launch files found, composable nodes will not be attributed to containers")
+
+    output_file = setup_logging_directory(args.output_dir, "bin")
+    metadata_file = os.path.splitext(output_file)[0] + ".json"
+
+    sampler = ProcessSampler(launch_structure)
+    ring_buffer = SampleRingBuffer(args.buffer_records)
+    period = 1.0 / args.rate
+
+    print(f"Starting to sample at {args.rate} Hz and saving to: {output_file}")
+
+    with open(output_file, mode="wb") as file:
+        sampler.rescan()
+        write_sampler_metadata(metadata_file, args, sampler, launch_dir)
+        next_sample = time.monotonic()
+        next_flush = next_sample + args.flush_interval
+        next_rescan = next_sample + args.rescan_interval
+        try:
+            while True:
+                exited = sampler.sample(ring_buffer)
+                now = time.monotonic()
+
+                if exited or now >= next_rescan:
+                    if sampler.rescan():
+                        write_sampler_metadata(metadata_file, args, sampler, launch_dir)
+                    next_rescan = now + args.rescan_interval
+
+                if now >= next_flush:
+                    ring_buffer.flush(file)
+                    next_flush = now + args.flush_interval
+
+                # Sleep until the next period, skipping periods that were missed instead of bursting
+                next_sample += period
+                if next_sample < now:
+                    next_sample = now + period
+                time.sleep(next_sample - now)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            ring_buffer.flush(file)
+            write_sampler_metadata(metadata_file, args, sampler, launch_dir)
+            if ring_buffer.dropped:
+                print(
+                    f"Dropped {ring_buffer.dropped} records, increase --buffer-records or lower --flush-interval"
+                )
+            print(f"Saved {ring_buffer.written - ring_buffer.dropped} samples to: {output_file}")
+
+
 def main():
     args = parse_args()
 
@@ -124,6 +371,10 @@ def main():
         additional_patterns = set(args.include_pattern.split(","))
         ROS_KEYWORDS.update(additional_patterns)
 
+    if args.sampler:
+        run_sampler(args)
+        return
+
     output_file = setup_logging_directory(args.output_dir)
 
     with open(output_file, mode="a") as file:
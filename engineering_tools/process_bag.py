@@ -14,8 +14,12 @@
 #  License for the specific language governing permissions and limitations under
 #  the License.
 
+import os
 import sys
 import csv
+import argparse
+import operator
+from array import array
 from bisect import bisect_left 
 from enum import Enum
 import matplotlib.pyplot as plt
@@ -25,70 +29,198 @@ import math
 import numpy as np
 
 # Usage
-# process_bag.py <file name>
+# process_bag.py <file name> [--spec <spec file>] [--output <columns .npz file>]
+#
+# The bag is read exactly once. Every message is routed to the columns registered for its topic,
+# so adding a signal to the spec does not add another scan of the bag.
+#
+# A spec file has one column per line, in the form
+#   <topic> <field path> > <column name>
+# Lines starting with # are ignored. A field path is a dotted attribute path into the message.
+# A single [] segment marks a repeated field, producing one list of values per message,
+# and a trailing () calls the final attribute (ex. target_time.to_sec()).
+# The columns of a spec file are added to the default columns, replacing default columns with the same name.
+#
+# With --spec or --output every extracted column is also saved to a .npz file (by default <bag name>_columns.npz).
+# A scalar column is saved as <column name>, a repeated field column as <column name> with its values
+# and <column name>_offsets, such that message i is values[offsets[i]:offsets[i + 1]].
 
-if len(sys.argv) < 2:
+DEFAULT_SPEC = """
+/guidance/plan_trajectory trajectory_points[].target_time.to_sec() > plan_trajectory
+/guidance/pure_pursuit/plan_trajectory trajectory_points[].target_time.to_sec() > pure_pursuit_plan_trajectory
+/guidance/carma_final_waypoints waypoints[].twist.twist.linear.x > carma_final_waypoints
+/guidance/ctrl_raw cmd.linear_velocity > ctrl_raw
+/guidance/ctrl_cmd cmd.linear_velocity > ctrl_cmd
+/hardware_interface/vehicle_cmd ctrl_cmd.linear_velocity > vehicle_cmd
+"""
+
+def compile_field_path(path):
+  """Returns a function mapping a message (or list element) to the value found at a dotted field path"""
+  call = path.endswith("()")
+  if call:
+    path = path[:-2]
+  getter = operator.attrgetter(path) if path else (lambda value: value)
+  if call:
+    return lambda value: getter(value)()
+  return getter
+
+class Column:
+  """Values of one field path extracted from every message on a topic.
+
+  Scalar columns hold one value per message in a preallocated float64 array.
+  Repeated field columns hold a flat float64 values array plus an offsets array of length messages + 1,
+  such that message i is values[offsets[i]:offsets[i + 1]].
+  """
+
+  def __init__(self, name, topic, path, message_count):
+    self.name = name
+    self.topic = topic
+    self.path = path
+    self.size = 0
+
+    list_path, repeated, item_path = path.partition("[]")
+    self.repeated = bool(repeated)
+    if self.repeated:
+      self.get_list = compile_field_path(list_path)
+      self.get_item = compile_field_path(item_path.lstrip("."))
+      self.offsets = np.zeros(message_count + 1, dtype=np.int64)
+      self.flat = array('d')
+    else:
+      self.get_value = compile_field_path(path)
+      self.values = np.empty(message_count, dtype=np.float64)
+
+  def add(self, msg):
+    # Message counts come from the bag index, so growing only happens if the bag was still being written
+    if self.repeated:
+      if self.size + 1 == len(self.offsets):
+        self.offsets = np.resize(self.offsets, 2 * len(self.offsets))
+      get_item = self.get_item
+      self.flat.extend(get_item(item) for item in self.get_list(msg))
+      self.size += 1
+      self.offsets[self.size] = len(self.flat)
+    else:
+      if self.size == len(self.values):
+        self.values = np.resize(self.values, max(2 * len(self.values), 1))
+      self.values[self.size] = self.get_value(msg)
+      self.size += 1
+
+  def finish(self):
+    if self.repeated:
+      self.offsets = self.offsets[:self.size + 1]
+      self.values = np.frombuffer(self.flat, dtype=np.float64)
+    else:
+      self.values = self.values[:self.size]
+    return self
+
+  def __len__(self):
+    return self.size
+
+  def __getitem__(self, index):
+    if self.repeated:
+      return self.values[self.offsets[index]:self.offsets[index + 1]]
+    return self.values[index]
+
+  def nth(self, n):
+    """For repeated columns, returns the n-th value of every message that has at least n + 1 values"""
+    starts = self.offsets[:-1]
+    has_nth = (self.offsets[1:] - starts) > n
+    return self.values[starts[has_nth] + n]
+
+def parse_spec(text):
+  """Returns a list of (topic, field path, column name) from spec file contents"""
+  spec = []
+  for line in text.splitlines():
+    line = line.strip()
+    if not line or line.startswith("#"):
+      continue
+    fields, _, name = line.partition(">")
+    topic, path = fields.split()
+    spec.append((topic, path, name.strip()))
+  return spec
+
+def merge_specs(base, extra):
+  """Returns base with the entries of extra added, entries of extra replacing base entries with the same column name"""
+  names = set(name for _, _, name in extra)
+  return [entry for entry in base if entry[2] not in names] + extra
+
+def save_columns(path, columns):
+  """Saves every column to a .npz file, with an extra <name>_offsets array for repeated field columns"""
+  arrays = {}
+  for name, column in columns.items():
+    arrays[name] = column.values
+    if column.repeated:
+      arrays[name + "_offsets"] = column.offsets
+  np.savez(path, **arrays)
+
+def extract_columns(bag, spec):
+  """Reads every topic in the spec in a single pass over the bag and returns a dict of column name to Column"""
+  handlers = {}
+  columns = {}
+  for topic, path, name in spec:
+    column = Column(name, topic, path, bag.get_message_count(topic_filters=[topic]))
+    handlers.setdefault(topic, []).append(column.add)
+    columns[name] = column
+
+  for topic, msg, t in bag.read_messages(topics=list(handlers)):
+    for handler in handlers[topic]:
+      handler(msg)
+
+  for column in columns.values():
+    column.finish()
+  return columns
+
+parser = argparse.ArgumentParser(description="Plot guidance trajectory and command signals recorded in a bag")
+parser.add_argument("file_name", nargs="?", help="Bag file to process")
+parser.add_argument("--spec", help="Topic to field path spec file, its columns are added to the default guidance trajectory/command signals")
+parser.add_argument("--output", help="Save the extracted columns to this .npz file. Defaults to <bag name>_columns.npz with --spec")
+args = parser.parse_args()
+
+if args.file_name is None:
   print("Need 1 arguments: process_bag.py <file name> ")
   exit()
 
+spec = parse_spec(DEFAULT_SPEC)
+if args.spec:
+  with open(args.spec, 'r') as spec_file:
+    spec = merge_specs(spec, parse_spec(spec_file.read()))
+
+output = args.output
+if output is None and args.spec:
+  output = os.path.splitext(args.file_name)[0] + "_columns.npz"
+
 print("Starting To Process Bag")
-bag = rosbag.Bag(sys.argv[1])
-
-plan_trajectory_time_steps = []
-for topic, msg, t in bag.read_messages(topics=['/guidance/plan_trajectory']):
-  # Create data to print for Plan Delegator -> Traj Executor
-  plan_trajectory_time_steps.append([])
-  for point in msg.trajectory_points:
-    plan_trajectory_time_steps[-1].append(point.target_time.to_sec())
-
-pure_pursuit_plan_trajectory_time_steps = []
-for topic, msg, t in bag.read_messages(topics=['/guidance/pure_pursuit/plan_trajectory']):
-  # Create data to print for Traj Executor -> Pure Pursuit Wrapper
-  pure_pursuit_plan_trajectory_time_steps.append([])
-  for point in msg.trajectory_points:
-    pure_pursuit_plan_trajectory_time_steps[-1].append(point.target_time.to_sec())
-
-carma_final_waypoints_times_steps = []
-first_point = []
-second_point = []
-third_point = []
-fourth_point = []
-for topic, msg, t in bag.read_messages(topics=['/guidance/carma_final_waypoints']):
-  # Create data to print for Pure Pursuit Wrapper -> Pure Pursuit
-  carma_final_waypoints_times_steps.append([])
-  i = 0
-  for point in msg.waypoints:
-    if i == 0:
-      first_point.append(point.twist.twist.linear.x)
-    elif i == 1:
-      second_point.append(point.twist.twist.linear.x)
-    elif i == 2:
-      third_point.append(point.twist.twist.linear.x)
-    elif i == 3:
-      fourth_point.append(point.twist.twist.linear.x)
-    carma_final_waypoints_times_steps[-1].append(point.twist.twist.linear.x)
-    i+=1
-
-ctrl_raw = []
-for topic, msg, t in bag.read_messages(topics=['/guidance/ctrl_raw']):
-  # Create data to print for Pure Pursuit -> Twist Filter
-  ctrl_raw.append(msg.cmd.linear_velocity)
-
-ctrl_cmd = []
-for topic, msg, t in bag.read_messages(topics=['/guidance/ctrl_cmd']):
-  # Create data to print for Twist Filter -> Twist Gate 
-  ctrl_cmd.append(msg.cmd.linear_velocity)
-
-vehicle_cmd = []
-for topic, msg, t in bag.read_messages(topics=['/hardware_interface/vehicle_cmd']):
-  # Create data to print for Twist Gate -> SSC Interface (TODO double check)
-  if msg.ctrl_cmd.linear_velocity != 0.0:
-    vehicle_cmd.append(msg.ctrl_cmd.linear_velocity)
+bag = rosbag.Bag(args.file_name)
+columns = extract_columns(bag, spec)
+bag.close()
 
 print("Done Bag Processing")
+for column in columns.values():
+  print(column.name + ": " + str(len(column)) + " messages from " + column.topic)
+
+if output is not None:
+  save_columns(output, columns)
+  print("Saved columns to " + output)
+
+# Create data to print for Plan Delegator -> Traj Executor
+plan_trajectory_time_steps = columns["plan_trajectory"]
+# Create data to print for Traj Executor -> Pure Pursuit Wrapper
+pure_pursuit_plan_trajectory_time_steps = columns["pure_pursuit_plan_trajectory"]
+# Create data to print for Pure Pursuit Wrapper -> Pure Pursuit
+carma_final_waypoints_times_steps = columns["carma_final_waypoints"]
+first_point = carma_final_waypoints_times_steps.nth(0)
+second_point = carma_final_waypoints_times_steps.nth(1)
+third_point = carma_final_waypoints_times_steps.nth(2)
+fourth_point = carma_final_waypoints_times_steps.nth(3)
+# Create data to print for Pure Pursuit -> Twist Filter
+ctrl_raw = columns["ctrl_raw"].values
+# Create data to print for Twist Filter -> Twist Gate 
+ctrl_cmd = columns["ctrl_cmd"].values
+# Create data to print for Twist Gate -> SSC Interface (TODO double check)
+vehicle_cmd = columns["vehicle_cmd"].values
+vehicle_cmd = vehicle_cmd[vehicle_cmd != 0.0]
 
 print("Graphing Data")
-# Takes list of dictionary
+# Takes a repeated field Column
 def index_plot_with_slider(figure_num, data, title, xlabel, ylabel):
 
   fig = plt.figure(figure_num)
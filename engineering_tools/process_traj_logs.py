@@ -15,66 +15,163 @@
 #  the License.
 
 import sys
-import csv
-from bisect import bisect_left 
+import os
+import argparse
+import re
+import math
+import struct
+from array import array
+from bisect import bisect_left
 from enum import Enum
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Slider
+import numpy as np
 
-def binarySearch(a, x): 
-    i = bisect_left(a, x) 
-    if i: 
-        return (i-1) 
-    else: 
-        return -1
 # Usage
-# process_traj_logs.py <file name> <start time> <end_time>
+# process_traj_logs.py <file name> <start time> <end_time> [--export <store.npz|store.parquet>] [--no-plot]
+# process_traj_logs.py --load <store.npz|store.parquet>
 #
-# Read the file until start_time is found.
-# Read the file until end_time is found
-# Grab all lines between start and end time
+# Binary search the file (by byte offset) for start_time and end_time
+# Stream only the lines between start and end time, stripping ANSI color codes as they are read
 # Print layered graphs of all trajectories between those times
-if len(sys.argv) < 4:
-  print("Need 3 arguments: process_traj_logs.py <file name> <start time> <end_time>")
-  exit()
-
-data = []
-with open(sys.argv[1], 'r') as infile, \
-     open(sys.argv[1] + ".clean", 'w') as outfile:
-    data = infile.read()
-    data = data.replace("\x1b[0m", "")
-    data = data.replace("\x1b[32m", "")
-    outfile.write(data)
-
-core_data = {
-  "times": [],
-  "content": []
-}
-with open(sys.argv[1] + ".clean", 'r') as csv_file:
-  traj_data = csv.reader(csv_file, delimiter='|')
-  i = 0
-
-  for row in traj_data:
-    if len(row) < 4:
+#
+# Every time/offset pair discovered while searching or streaming is stored in a sidecar
+# index (<file name>.idx) so later queries against the same log only need a handful of reads.
+# The index is discarded automatically if the log file changes size or modification time.
+
+ANSI_ESCAPE = re.compile(rb'\x1b\[[0-9;]*m')
+
+INDEX_SUFFIX = ".idx"
+INDEX_MAGIC = b"TRAJIDX1"
+INDEX_HEADER = struct.Struct("<8sQQQ") # magic, log size, log mtime (ns), checkpoint count
+INDEX_STRIDE = 1 << 20 # Record a checkpoint roughly every MiB streamed
+LINEAR_SCAN_BYTES = 1 << 16 # Below this range size the search switches to a forward scan
+
+def parse_line(raw):
+  """Returns (time, content) for a raw log line, or None if the line is not a trajectory log row"""
+  row = ANSI_ESCAPE.sub(b"", raw).decode("utf-8", errors="replace").split('|')
+  if len(row) < 4:
+    return None
+  try:
+    time = float(row[0].strip())
+  except ValueError:
+    return None
+  return (time, row[3].strip())
+
+class OffsetIndex:
+  """Sparse time -> byte offset checkpoints for one log file, persisted next to the log"""
+
+  def __init__(self, log_path):
+    self.path = log_path + INDEX_SUFFIX
+    stat = os.stat(log_path)
+    self.size = stat.st_size
+    self.mtime = stat.st_mtime_ns
+    self.offsets = array('Q')
+    self.times = array('d')
+    self.dirty = False
+    self.load()
+
+  def load(self):
+    try:
+      with open(self.path, 'rb') as f:
+        magic, size, mtime, count = INDEX_HEADER.unpack(f.read(INDEX_HEADER.size))
+        if magic != INDEX_MAGIC or size != self.size or mtime != self.mtime:
+          return # Stale index, it will be overwritten on save
+        self.offsets.fromfile(f, count)
+        self.times.fromfile(f, count)
+    except (OSError, EOFError, struct.error):
+      self.offsets = array('Q')
+      self.times = array('d')
+
+  def save(self):
+    if not self.dirty:
+      return
+    try:
+      with open(self.path, 'wb') as f:
+        f.write(INDEX_HEADER.pack(INDEX_MAGIC, self.size, self.mtime, len(self.offsets)))
+        self.offsets.tofile(f)
+        self.times.tofile(f)
+      self.dirty = False
+    except OSError as e:
+      print("Could not write index file " + self.path + ": " + str(e))
+
+  def add(self, offset, time):
+    i = bisect_left(self.offsets, offset)
+    if i < len(self.offsets) and self.offsets[i] == offset:
+      return
+    self.offsets.insert(i, offset)
+    self.times.insert(i, time)
+    self.dirty = True
+
+  def bounds(self, time):
+    """Returns (lo, hi) byte offsets where the line at lo is earlier than time and the line at hi is not"""
+    i = bisect_left(self.times, time)
+    lo = self.offsets[i - 1] if i > 0 else 0
+    hi = self.offsets[i] if i < len(self.offsets) else self.size
+    return (lo, hi)
+
+def first_line_at(f, offset, size):
+  """Returns (line_offset, time) of the first parseable line starting at or after offset. time is None at EOF"""
+  if offset > 0:
+    f.seek(offset - 1)
+    f.readline() # Discard the remainder of the line containing offset - 1
+  else:
+    f.seek(0)
+  while True:
+    line_offset = f.tell()
+    raw = f.readline()
+    if not raw:
+      return (size, None)
+    parsed = parse_line(raw)
+    if parsed:
+      return (line_offset, parsed[0])
+
+def locate(f, index, time):
+  """Returns the byte offset of the first line whose time is not earlier than time"""
+  lo, hi = index.bounds(time)
+  while hi - lo > LINEAR_SCAN_BYTES:
+    mid = (lo + hi) // 2
+    line_offset, line_time = first_line_at(f, mid, index.size)
+    if line_time is None or line_offset >= hi:
+      hi = mid
       continue
-    core_data["times"].append(float(row[0].strip()))
-    core_data["content"].append(row[3].strip())
-    #print(row)
-    i+=1
-    #if i == 15: # TODO remove
-    #  print(core_data)
-    #
-    #  break
-
-# Grab requested section
-start_index = max(binarySearch(core_data["times"], float(sys.argv[2])) - 1, 0)
-end_index = min(binarySearch(core_data["times"], float(sys.argv[3])) + 1, len(core_data["times"]))
-
-print("Start index: " + str(start_index))
-print("End index: " + str(end_index))
-
-core_data["times"] = core_data["times"][start_index:end_index]
-core_data["content"] = core_data["content"][start_index:end_index]
+    index.add(line_offset, line_time)
+    if line_time < time:
+      lo = line_offset
+    else:
+      hi = mid
+
+  line_offset, line_time = first_line_at(f, lo, index.size)
+  while line_time is not None and line_time < time:
+    line_offset, line_time = first_line_at(f, line_offset + 1, index.size)
+  return line_offset
+
+def read_window(file_name, start_time, end_time):
+  """Generator of (time, content) for every log row with start_time <= time <= end_time"""
+  index = OffsetIndex(file_name)
+  with open(file_name, 'rb') as f:
+    start_offset = locate(f, index, start_time)
+    end_offset = locate(f, index, math.nextafter(end_time, math.inf))
+
+    print("Start offset: " + str(start_offset))
+    print("End offset: " + str(end_offset))
+    index.save()
+
+    f.seek(start_offset)
+    offset = start_offset
+    next_checkpoint = offset
+    while offset < end_offset:
+      raw = f.readline()
+      if not raw:
+        break
+      parsed = parse_line(raw)
+      if parsed:
+        if offset >= next_checkpoint:
+          index.add(offset, parsed[0])
+          next_checkpoint = offset + INDEX_STRIDE
+        yield parsed
+      offset += len(raw)
+  index.save()
 
 # Identify required graphs
 class DataSource(Enum):
@@ -94,146 +191,249 @@ class DataSource(Enum):
   AFTER_AVERAGE = 13,
   AFTER_MIN_SPEED = 14,
   FINAL_TIMES = 15
-  
-data_source = DataSource.NONE
 
-core_data["time_steps"] = []
-
-for content in core_data["content"]:
-  if data_source == DataSource.NONE and "VehicleState" in content:
-    core_data["time_steps"].append({
-      DataSource.RAW_POINTS : [],
-      DataSource.TIME_BOUND_POINTS : [],
-      DataSource.BACK_AND_FRONT_POINTS : [],
-      DataSource.SAMPLED_POINTS : [],
-      DataSource.RAW_CURVATURES : [],
-      DataSource.PROCESSED_CURVATURES : [],
-      DataSource.CURVATURE_CONSTRAINED_SPEEDS : [],
-      DataSource.FINAL_YAWS : [],
-      DataSource.SPEED_LIMIT_CONSTRAINED_SPEEDS : [],
-      DataSource.SPEED_OP_REVERSE_STEP : [],
-      DataSource.SPEED_OP_FORWARD : [],
-      DataSource.AFTER_SPEED_OP : [],
-      DataSource.AFTER_AVERAGE : [],
-      DataSource.AFTER_MIN_SPEED : [],
-      DataSource.FINAL_TIMES : []
-    })
+# Data sources holding (x, y) points. All other data sources hold one scalar per entry
+POINT_SOURCES = {
+  DataSource.RAW_POINTS,
+  DataSource.TIME_BOUND_POINTS,
+  DataSource.BACK_AND_FRONT_POINTS,
+  DataSource.SAMPLED_POINTS
+}
 
-    data_source = DataSource.RAW_POINTS
+SERIES_SOURCES = [source for source in DataSource if source != DataSource.NONE]
+
+class TimeStepStore:
+  """Columnar storage of every DataSource series across all planning time steps.
+
+  Each series is a ragged array: a flat float64 values array (shaped (n, 2) for point sources)
+  and an offsets array of length time_steps + 1, such that time step i of the series is
+  values[offsets[i]:offsets[i + 1]]. Time steps are returned as views, never copies.
+  """
+
+  def __init__(self, values, offsets):
+    self.values = values
+    self.offsets = offsets
+
+  def __len__(self):
+    return len(self.offsets[DataSource.RAW_POINTS]) - 1
+
+  def step(self, key, index):
+    offsets = self.offsets[key]
+    return self.values[key][offsets[index]:offsets[index + 1]]
+
+  def save(self, path):
+    if path.endswith(".parquet"):
+      self.save_parquet(path)
+    else:
+      self.save_npz(path)
+
+  def save_npz(self, path):
+    arrays = {}
+    for source in SERIES_SOURCES:
+      arrays[source.name + ".values"] = self.values[source]
+      arrays[source.name + ".offsets"] = self.offsets[source]
+    np.savez(path, **arrays)
+
+  def save_parquet(self, path):
+    import pyarrow as pa # Optional dependency, only needed for parquet stores
+    import pyarrow.parquet as pq
+
+    columns = {}
+    for source in SERIES_SOURCES:
+      values = pa.array(self.values[source].reshape(-1))
+      if source in POINT_SOURCES:
+        values = pa.FixedSizeListArray.from_arrays(values, 2)
+      columns[source.name] = pa.LargeListArray.from_arrays(pa.array(self.offsets[source]), values)
+    # A single row group keeps every column in one contiguous chunk so it can be memory mapped on load
+    pq.write_table(pa.table(columns), path, row_group_size=max(len(self), 1))
+
+  @staticmethod
+  def load(path):
+    if path.endswith(".parquet"):
+      return TimeStepStore.load_parquet(path)
+    return TimeStepStore.load_npz(path)
+
+  @staticmethod
+  def load_npz(path):
+    values = {}
+    offsets = {}
+    with np.load(path) as arrays:
+      for source in SERIES_SOURCES:
+        values[source] = arrays[source.name + ".values"]
+        offsets[source] = arrays[source.name + ".offsets"]
+    return TimeStepStore(values, offsets)
+
+  @staticmethod
+  def load_parquet(path):
+    import pyarrow as pa # Optional dependency, only needed for parquet stores
+    import pyarrow.parquet as pq
+
+    table = pq.read_table(pa.memory_map(path, 'r'))
+    values = {}
+    offsets = {}
+    for source in SERIES_SOURCES:
+      column = table.column(source.name)
+      column = column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+      flat = column.values
+      if source in POINT_SOURCES:
+        values[source] = flat.values.to_numpy(zero_copy_only=True).reshape(-1, 2)
+      else:
+        values[source] = flat.to_numpy(zero_copy_only=True)
+      offsets[source] = column.offsets.to_numpy(zero_copy_only=True)
+    return TimeStepStore(values, offsets)
+
+class TimeStepStoreBuilder:
+  """Accumulates parsed values into flat typed arrays and produces a TimeStepStore"""
+
+  def __init__(self):
+    self.values = {source: array('d') for source in SERIES_SOURCES}
+    self.offsets = {source: array('q') for source in SERIES_SOURCES}
+
+  def new_step(self):
+    for source in SERIES_SOURCES:
+      self.offsets[source].append(self.count(source))
+
+  def count(self, source):
+    if source in POINT_SOURCES:
+      return len(self.values[source]) // 2
+    return len(self.values[source])
+
+  def append(self, source, *values):
+    self.values[source].extend(values)
+
+  def build(self):
+    values = {}
+    offsets = {}
+    for source in SERIES_SOURCES:
+      values[source] = np.frombuffer(self.values[source], dtype=np.float64)
+      if source in POINT_SOURCES:
+        values[source] = values[source].reshape(-1, 2)
+      offsets[source] = np.append(np.frombuffer(self.offsets[source], dtype=np.int64), self.count(source))
+    return TimeStepStore(values, offsets)
+
+
+def parse_time_steps(rows):
+  """Runs the trajectory log state machine over (time, content) rows and returns a TimeStepStore"""
+  builder = TimeStepStoreBuilder()
+  data_source = DataSource.NONE
+
+  for _, content in rows:
+    if data_source == DataSource.NONE and "VehicleState" in content:
+      builder.new_step()
+
+      data_source = DataSource.RAW_POINTS
  
-  if data_source == DataSource.RAW_POINTS and "Point:" in content and "Speed:" in content:
-    point_speed = content.split(':')
-    point = point_speed[1].split('Speed')
-    xy = point[0].split(',')
-    x = float(xy[0])
-    y = float(xy[1])
-    core_data["time_steps"][-1][DataSource.RAW_POINTS].append((x,y))
-
-  if data_source == DataSource.RAW_POINTS and "Got time_bound_points with size:" in content:
-    data_source = DataSource.TIME_BOUND_POINTS
+    if data_source == DataSource.RAW_POINTS and "Point:" in content and "Speed:" in content:
+      point_speed = content.split(':')
+      point = point_speed[1].split('Speed')
+      xy = point[0].split(',')
+      x = float(xy[0])
+      y = float(xy[1])
+      builder.append(DataSource.RAW_POINTS, x, y)
+
+    if data_source == DataSource.RAW_POINTS and "Got time_bound_points with size:" in content:
+      data_source = DataSource.TIME_BOUND_POINTS
  
-  if data_source == DataSource.TIME_BOUND_POINTS and "Point:" in content and "Speed:" in content:
-    point_speed = content.split(':')
-    point = point_speed[1].split('Speed')
-    xy = point[0].split(',')
-    x = float(xy[0])
-    y = float(xy[1])
-    core_data["time_steps"][-1][DataSource.TIME_BOUND_POINTS].append((x,y))
-
-  if data_source == DataSource.TIME_BOUND_POINTS and "Got back_and_future points with size" in content:
-    data_source = DataSource.BACK_AND_FRONT_POINTS
+    if data_source == DataSource.TIME_BOUND_POINTS and "Point:" in content and "Speed:" in content:
+      point_speed = content.split(':')
+      point = point_speed[1].split('Speed')
+      xy = point[0].split(',')
+      x = float(xy[0])
+      y = float(xy[1])
+      builder.append(DataSource.TIME_BOUND_POINTS, x, y)
+
+    if data_source == DataSource.TIME_BOUND_POINTS and "Got back_and_future points with size" in content:
+      data_source = DataSource.BACK_AND_FRONT_POINTS
  
-  if data_source == DataSource.BACK_AND_FRONT_POINTS and "Point:" in content and "Speed:" in content:
-    point_speed = content.split(':')
-    point = point_speed[1].split('Speed')
-    xy = point[0].split(',')
-    x = float(xy[0])
-    y = float(xy[1])
-    core_data["time_steps"][-1][DataSource.BACK_AND_FRONT_POINTS].append((x,y))
-
-  if data_source == DataSource.BACK_AND_FRONT_POINTS and "Got sampled points with size:" in content:
-    data_source = DataSource.SAMPLED_POINTS
+    if data_source == DataSource.BACK_AND_FRONT_POINTS and "Point:" in content and "Speed:" in content:
+      point_speed = content.split(':')
+      point = point_speed[1].split('Speed')
+      xy = point[0].split(',')
+      x = float(xy[0])
+      y = float(xy[1])
+      builder.append(DataSource.BACK_AND_FRONT_POINTS, x, y)
+
+    if data_source == DataSource.BACK_AND_FRONT_POINTS and "Got sampled points with size:" in content:
+      data_source = DataSource.SAMPLED_POINTS
  
-  if data_source == DataSource.SAMPLED_POINTS and "," in content and not ":" in content:
-    xy = content.split(',')
-    x = float(xy[0])
-    y = float(xy[1])
-    core_data["time_steps"][-1][DataSource.SAMPLED_POINTS].append((x,y))
+    if data_source == DataSource.SAMPLED_POINTS and "," in content and not ":" in content:
+      xy = content.split(',')
+      x = float(xy[0])
+      y = float(xy[1])
+      builder.append(DataSource.SAMPLED_POINTS, x, y)
  
-  if (False and data_source == DataSource.RAW_CURVATURES or data_source == DataSource.SAMPLED_POINTS) and "better_curvature[i]:" in content:
-    data_source = DataSource.RAW_CURVATURES
-    split = content.split(':')
-    c = float(split[1])
-    core_data["time_steps"][-1][DataSource.RAW_CURVATURES].append(c)
-
-  if (data_source == DataSource.PROCESSED_CURVATURES or data_source == DataSource.SAMPLED_POINTS) and "curvatures[i]:" in content:
-    data_source = DataSource.PROCESSED_CURVATURES
-    split = content.split(':')
-    c = float(split[1])
-    core_data["time_steps"][-1][DataSource.PROCESSED_CURVATURES].append(c)
+    if (False and data_source == DataSource.RAW_CURVATURES or data_source == DataSource.SAMPLED_POINTS) and "better_curvature[i]:" in content:
+      data_source = DataSource.RAW_CURVATURES
+      split = content.split(':')
+      c = float(split[1])
+      builder.append(DataSource.RAW_CURVATURES, c)
+
+    if (data_source == DataSource.PROCESSED_CURVATURES or data_source == DataSource.SAMPLED_POINTS) and "curvatures[i]:" in content:
+      data_source = DataSource.PROCESSED_CURVATURES
+      split = content.split(':')
+      c = float(split[1])
+      builder.append(DataSource.PROCESSED_CURVATURES, c)
   
-  if (data_source == DataSource.CURVATURE_CONSTRAINED_SPEEDS or data_source == DataSource.PROCESSED_CURVATURES) and "ideal_speeds:" in content:
-    data_source = DataSource.CURVATURE_CONSTRAINED_SPEEDS
-    split = content.split(':')
-    c = float(split[1])
-    core_data["time_steps"][-1][DataSource.CURVATURE_CONSTRAINED_SPEEDS].append(c)
-
-  if (data_source == DataSource.FINAL_YAWS or data_source == DataSource.CURVATURE_CONSTRAINED_SPEEDS) and "final_yaw_values[i]:" in content:
-    data_source = DataSource.FINAL_YAWS
-    split = content.split(':')
-    c = float(split[1])
-    core_data["time_steps"][-1][DataSource.FINAL_YAWS].append(c)
-
-  if (data_source == DataSource.SPEED_LIMIT_CONSTRAINED_SPEEDS or data_source == DataSource.FINAL_YAWS) and "constrained_speed_limits:" in content:
-    data_source = DataSource.SPEED_LIMIT_CONSTRAINED_SPEEDS
-    split = content.split(':')
-    c = float(split[1])
-    core_data["time_steps"][-1][DataSource.SPEED_LIMIT_CONSTRAINED_SPEEDS].append(c)
-
-  if (data_source == DataSource.SPEED_OP_REVERSE_STEP or data_source == DataSource.SPEED_LIMIT_CONSTRAINED_SPEEDS) and "only_reverse[i]:" in content:
-    data_source = DataSource.SPEED_OP_REVERSE_STEP
-    split = content.split(':')
-    c = float(split[1])
-    core_data["time_steps"][-1][DataSource.SPEED_OP_REVERSE_STEP].append(c)
+    if (data_source == DataSource.CURVATURE_CONSTRAINED_SPEEDS or data_source == DataSource.PROCESSED_CURVATURES) and "ideal_speeds:" in content:
+      data_source = DataSource.CURVATURE_CONSTRAINED_SPEEDS
+      split = content.split(':')
+      c = float(split[1])
+      builder.append(DataSource.CURVATURE_CONSTRAINED_SPEEDS, c)
+
+    if (data_source == DataSource.FINAL_YAWS or data_source == DataSource.CURVATURE_CONSTRAINED_SPEEDS) and "final_yaw_values[i]:" in content:
+      data_source = DataSource.FINAL_YAWS
+      split = content.split(':')
+      c = float(split[1])
+      builder.append(DataSource.FINAL_YAWS, c)
+
+    if (data_source == DataSource.SPEED_LIMIT_CONSTRAINED_SPEEDS or data_source == DataSource.FINAL_YAWS) and "constrained_speed_limits:" in content:
+      data_source = DataSource.SPEED_LIMIT_CONSTRAINED_SPEEDS
+      split = content.split(':')
+      c = float(split[1])
+      builder.append(DataSource.SPEED_LIMIT_CONSTRAINED_SPEEDS, c)
+
+    if (data_source == DataSource.SPEED_OP_REVERSE_STEP or data_source == DataSource.SPEED_LIMIT_CONSTRAINED_SPEEDS) and "only_reverse[i]:" in content:
+      data_source = DataSource.SPEED_OP_REVERSE_STEP
+      split = content.split(':')
+      c = float(split[1])
+      builder.append(DataSource.SPEED_OP_REVERSE_STEP, c)
   
-  if (data_source == DataSource.SPEED_OP_FORWARD or data_source == DataSource.SPEED_OP_REVERSE_STEP) and "after_forward[i]:" in content:
-    data_source = DataSource.SPEED_OP_FORWARD
-    split = content.split(':')
-    c = float(split[1])
-    core_data["time_steps"][-1][DataSource.SPEED_OP_FORWARD].append(c)
-
-  if (data_source == DataSource.AFTER_SPEED_OP or data_source == DataSource.SPEED_OP_FORWARD) and "postAccel[i]:" in content:
-    data_source = DataSource.AFTER_SPEED_OP
-    split = content.split(':')
-    c = float(split[1])
-    core_data["time_steps"][-1][DataSource.AFTER_SPEED_OP].append(c)
+    if (data_source == DataSource.SPEED_OP_FORWARD or data_source == DataSource.SPEED_OP_REVERSE_STEP) and "after_forward[i]:" in content:
+      data_source = DataSource.SPEED_OP_FORWARD
+      split = content.split(':')
+      c = float(split[1])
+      builder.append(DataSource.SPEED_OP_FORWARD, c)
+
+    if (data_source == DataSource.AFTER_SPEED_OP or data_source == DataSource.SPEED_OP_FORWARD) and "postAccel[i]:" in content:
+      data_source = DataSource.AFTER_SPEED_OP
+      split = content.split(':')
+      c = float(split[1])
+      builder.append(DataSource.AFTER_SPEED_OP, c)
   
-  if (data_source == DataSource.AFTER_AVERAGE or data_source == DataSource.AFTER_SPEED_OP) and "post_average[i]:" in content:
-    data_source = DataSource.AFTER_AVERAGE
-    split = content.split(':')
-    c = float(split[1])
-    core_data["time_steps"][-1][DataSource.AFTER_AVERAGE].append(c)
-
-  if (data_source == DataSource.AFTER_MIN_SPEED or data_source == DataSource.AFTER_AVERAGE) and "post_min_speed[i]:" in content:
-    data_source = DataSource.AFTER_MIN_SPEED
-    split = content.split(':')
-    c = float(split[1])
-    core_data["time_steps"][-1][DataSource.AFTER_MIN_SPEED].append(c)
-
-  if (data_source == DataSource.FINAL_TIMES or data_source == DataSource.AFTER_MIN_SPEED) and "times[i]:" in content:
-    data_source = DataSource.FINAL_TIMES
-    split = content.split(':')
-    c = float(split[1])
-    core_data["time_steps"][-1][DataSource.FINAL_TIMES].append(c)
-  
-  if data_source == DataSource.FINAL_TIMES and not ("times[i]:" in content):
-    data_source = DataSource.NONE
+    if (data_source == DataSource.AFTER_AVERAGE or data_source == DataSource.AFTER_SPEED_OP) and "post_average[i]:" in content:
+      data_source = DataSource.AFTER_AVERAGE
+      split = content.split(':')
+      c = float(split[1])
+      builder.append(DataSource.AFTER_AVERAGE, c)
+
+    if (data_source == DataSource.AFTER_MIN_SPEED or data_source == DataSource.AFTER_AVERAGE) and "post_min_speed[i]:" in content:
+      data_source = DataSource.AFTER_MIN_SPEED
+      split = content.split(':')
+      c = float(split[1])
+      builder.append(DataSource.AFTER_MIN_SPEED, c)
+
+    if (data_source == DataSource.FINAL_TIMES or data_source == DataSource.AFTER_MIN_SPEED) and "times[i]:" in content:
+      data_source = DataSource.FINAL_TIMES
+      split = content.split(':')
+      c = float(split[1])
+      builder.append(DataSource.FINAL_TIMES, c)
   
+    if data_source == DataSource.FINAL_TIMES and not ("times[i]:" in content):
+      data_source = DataSource.NONE
 
-print("DONE PROCESSING FILE")
-print("CREATING GRAPHS")
+  return builder.build()
 
-# Takes list of dictionary
+# Takes a TimeStepStore
 def xy_scatter_with_slider(figure_num, data, key, title, xlabel, ylabel):
 
   fig = plt.figure(figure_num)
@@ -241,23 +441,22 @@ def xy_scatter_with_slider(figure_num, data, key, title, xlabel, ylabel):
   plt.title(title)
   plt.xlabel(xlabel)
   plt.ylabel(ylabel)
-  time_step = data[0]
-  l, = plt.plot([xy[0] for xy in time_step[key]], [xy[1] for xy in time_step[key]], '.')
+  points = data.step(key, 0)
+  l, = plt.plot(points[:, 0], points[:, 1], '.')
 
   time_step_ax = plt.axes([0.20, 0.001, 0.65, 0.03])
   time_step_sldr = Slider(time_step_ax, 'Time Step', 0.0, len(data) - 1.0, valinit=0, valstep=1)
 
   def update_timestep(val):
-    time_step = data[int(time_step_sldr.val)]
-    l.set_xdata([xy[0] for xy in time_step[key]])
-    l.set_ydata([xy[1] for xy in time_step[key]])
+    points = data.step(key, int(time_step_sldr.val))
+    l.set_data(points[:, 0], points[:, 1])
     fig.canvas.draw_idle()
 
   time_step_sldr.on_changed(update_timestep)
 
   return (fig, l, time_step_sldr)
 
-# Takes list of dictionary
+# Takes a TimeStepStore
 def index_plot_with_slider(figure_num, data, key, title, xlabel, ylabel):
 
   fig = plt.figure(figure_num)
@@ -265,65 +464,95 @@ def index_plot_with_slider(figure_num, data, key, title, xlabel, ylabel):
   plt.title(title)
   plt.xlabel(xlabel)
   plt.ylabel(ylabel)
-  time_step = data[0]
-  l, = plt.plot(range(len(time_step[key])), time_step[key])
+  values = data.step(key, 0)
+  l, = plt.plot(np.arange(len(values)), values)
 
   time_step_ax = plt.axes([0.20, 0.01, 0.65, 0.03])
   time_step_sldr = Slider(time_step_ax, 'Time Step', 0.0, len(data) - 1.0, valinit=0, valstep=1)
 
   def update_timestep(val):
-    time_step = data[int(time_step_sldr.val)]
-    l.set_xdata(range(len(time_step[key])))
-    l.set_ydata(time_step[key])
+    values = data.step(key, int(time_step_sldr.val))
+    l.set_data(np.arange(len(values)), values)
     fig.canvas.draw_idle()
 
   time_step_sldr.on_changed(update_timestep)
 
   return (fig, l, time_step_sldr)
 
-plot1= xy_scatter_with_slider(1, core_data["time_steps"], DataSource.RAW_POINTS, 
+parser = argparse.ArgumentParser(description="Plot the trajectory planning stages recorded in a CARMA log")
+parser.add_argument("file_name", nargs="?", help="Log file to parse")
+parser.add_argument("start_time", nargs="?", type=float, help="First log time to include")
+parser.add_argument("end_time", nargs="?", type=float, help="Last log time to include")
+parser.add_argument("--export", metavar="STORE",
+  help="Write the parsed time steps to a columnar .npz or .parquet store for later sessions")
+parser.add_argument("--load", metavar="STORE",
+  help="Plot a store previously written with --export instead of parsing a log")
+parser.add_argument("--no-plot", action="store_true", help="Skip plotting, useful together with --export")
+args = parser.parse_args()
+
+if args.load:
+  time_steps = TimeStepStore.load(args.load)
+elif args.end_time is None:
+  print("Need 3 arguments: process_traj_logs.py <file name> <start time> <end_time>")
+  exit()
+else:
+  time_steps = parse_time_steps(read_window(args.file_name, args.start_time, args.end_time))
+  print("DONE PROCESSING FILE")
+
+print("Time steps: " + str(len(time_steps)))
+
+if args.export:
+  time_steps.save(args.export)
+  print("Exported time steps to " + args.export)
+
+if args.no_plot:
+  exit()
+
+print("CREATING GRAPHS")
+
+plot1= xy_scatter_with_slider(1, time_steps, DataSource.RAW_POINTS, 
   "Raw Downsampled Points from Lanelet Centerlines", "X (m)", "Y (m)")
 
-plot2= xy_scatter_with_slider(2, core_data["time_steps"], DataSource.TIME_BOUND_POINTS, 
+plot2= xy_scatter_with_slider(2, time_steps, DataSource.TIME_BOUND_POINTS, 
   "Time Bound Points from Lanelet Centerlines", "X (m)", "Y (m)")
 
-plot3= xy_scatter_with_slider(3, core_data["time_steps"], DataSource.BACK_AND_FRONT_POINTS, 
+plot3= xy_scatter_with_slider(3, time_steps, DataSource.BACK_AND_FRONT_POINTS, 
   "Back and front points from Lanelet Centerlines", "X (m)", "Y (m)")
 
-plot4= xy_scatter_with_slider(4, core_data["time_steps"], DataSource.SAMPLED_POINTS, 
+plot4= xy_scatter_with_slider(4, time_steps, DataSource.SAMPLED_POINTS, 
   "Sampled points from spline fitting", "X (m)", "Y (m)")
 
-plot5 = index_plot_with_slider(5, core_data["time_steps"], DataSource.RAW_CURVATURES, 
+plot5 = index_plot_with_slider(5, time_steps, DataSource.RAW_CURVATURES, 
   "Raw Curvatures", "Index", "Curvature (1/r) (m)")
 
-plot6 = index_plot_with_slider(6, core_data["time_steps"], DataSource.PROCESSED_CURVATURES, 
+plot6 = index_plot_with_slider(6, time_steps, DataSource.PROCESSED_CURVATURES, 
   "Processed Curvatures", "Index", "Curvature (1/r) (m)")
 
-plot7 = index_plot_with_slider(7, core_data["time_steps"], DataSource.CURVATURE_CONSTRAINED_SPEEDS, 
+plot7 = index_plot_with_slider(7, time_steps, DataSource.CURVATURE_CONSTRAINED_SPEEDS, 
   "Curvature constrained speeds", "Index", "Velocity (m/s)")
 
-plot8 = index_plot_with_slider(8, core_data["time_steps"], DataSource.FINAL_YAWS, 
+plot8 = index_plot_with_slider(8, time_steps, DataSource.FINAL_YAWS, 
   "Final Yaw values", "Index", "Yaw (rad)")
 
-plot9 = index_plot_with_slider(9, core_data["time_steps"], DataSource.SPEED_LIMIT_CONSTRAINED_SPEEDS, 
+plot9 = index_plot_with_slider(9, time_steps, DataSource.SPEED_LIMIT_CONSTRAINED_SPEEDS, 
   "Speed Limit Constrained Speeds", "Index", "Velocity (m/s)")
 
-plot10 = index_plot_with_slider(10, core_data["time_steps"], DataSource.SPEED_OP_REVERSE_STEP, 
+plot10 = index_plot_with_slider(10, time_steps, DataSource.SPEED_OP_REVERSE_STEP, 
   "Speed Optimization Reverse Step", "Index", "Velocity (m/s)")
 
-plot11 = index_plot_with_slider(11, core_data["time_steps"], DataSource.SPEED_OP_FORWARD, 
+plot11 = index_plot_with_slider(11, time_steps, DataSource.SPEED_OP_FORWARD, 
   "Speed Optimization Forward Step", "Index", "Velocity (m/s)")
 
-plot12 = index_plot_with_slider(12, core_data["time_steps"], DataSource.AFTER_SPEED_OP, 
+plot12 = index_plot_with_slider(12, time_steps, DataSource.AFTER_SPEED_OP, 
   "Speed Optimization Output", "Index", "Velocity (m/s)")
 
-plot13 = index_plot_with_slider(13, core_data["time_steps"], DataSource.AFTER_AVERAGE, 
+plot13 = index_plot_with_slider(13, time_steps, DataSource.AFTER_AVERAGE, 
   "Speed after Moving Average", "Index", "Velocity (m/s)")
 
-plot14 = index_plot_with_slider(14, core_data["time_steps"], DataSource.AFTER_MIN_SPEED, 
+plot14 = index_plot_with_slider(14, time_steps, DataSource.AFTER_MIN_SPEED, 
   "Speed after applying minimum speed (FINAL SPEED)", "Index", "Velocity (m/s)")
 
-plot15 = index_plot_with_slider(15, core_data["time_steps"], DataSource.FINAL_TIMES, 
+plot15 = index_plot_with_slider(15, time_steps, DataSource.FINAL_TIMES, 
   "Final Times", "Index", "Seconds (s)")
 
 plt.show()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+import ast
+import glob
+import os
+import re
+
+"""
+CARMA Platform launch structure helper
+Parses the carma/launch/*.launch.py files (without executing them) to find which
+composable nodes are loaded in which component container, and which subsystem
+(environment, guidance, localization, ...) each container or standalone node belongs to.
+Used by monitor-ros-cpu.py and analyze-ros-cpu.py to attribute process resource usage to nodes.
+"""
+
+# Default locations of the CARMA launch files: the source tree next to engineering_tools and the installed package
+DEFAULT_LAUNCH_DIRS = [
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "carma", "launch"),
+    "/opt/carma/install/carma/share/carma/launch",
+]
+
+# ROS 2 launch passes the node name of every process as a remapping argument
+NODE_NAME_ARG = re.compile(r"__node:=(\S+)")
+
+
+def _keyword_string(call, keyword):
+    for kw in call.keywords:
+        if kw.arg == keyword and isinstance(kw.value, ast.Constant):
+            return kw.value.value
+    return None
+
+
+def _call_name(call):
+    func = call.func
+    if isinstance(func, ast.Name):
+        return func.id
+    if isinstance(func, ast.Attribute):
+        return func.attr
+    return None
+
+
+def find_launch_dir(launch_dir=None):
+    """
+    Return the first existing launch directory, preferring the one given explicitly
+    """
+    candidates = [launch_dir] if launch_dir else DEFAULT_LAUNCH_DIRS
+    for candidate in candidates:
+        if candidate and os.path.isdir(candidate):
+            return os.path.normpath(candidate)
+    return None
+
+
+def load_launch_structure(launch_dir):
+    """
+    Return a dict of process node name -> {"subsystem": str, "nodes": [str]}
+    Containers map to the composable nodes loaded into them, standalone nodes map to themselves
+    """
+    structure = {}
+    if not launch_dir:
+        return structure
+
+    for launch_file in sorted(glob.glob(os.path.join(launch_dir, "*.launch.py"))):
+        subsystem = os.path.basename(launch_file)[: -len(".launch.py")]
+        with open(launch_file, "r") as f:
+            try:
+                tree = ast.parse(f.read(), filename=launch_file)
+            except SyntaxError:
+                continue
+
+        for call in ast.walk(tree):
+            if not isinstance(call, ast.Call):
+                continue
+            call_name = _call_name(call)
+            name = _keyword_string(call, "name")
+            if name is None:
+                continue
+
+            if call_name == "ComposableNodeContainer":
+                nodes = [
+                    _keyword_string(child, "name")
+                    for child in ast.walk(call)
+                    if isinstance(child, ast.Call)
+                    and _call_name(child) == "ComposableNode"
+                    and _keyword_string(child, "name") is not None
+                ]
+                structure[name] = {"subsystem": subsystem, "nodes": nodes}
+            elif call_name in ("Node", "LifecycleNode") and name not in structure:
+                structure[name] = {"subsystem": subsystem, "nodes": [name]}
+
+    return structure
+
+
+def process_node_name(cmdline):
+    """
+    Return the ROS node name a process was launched with, or None
+    """
+    match = NODE_NAME_ARG.search(cmdline)
+    return match.group(1) if match else None
+
+
+def attribute_process(cmdline, structure):
+    """
+    Return (node name, subsystem, [composable nodes]) for a process command line
+    """
+    name = process_node_name(cmdline)
+    if name is None:
+        return (None, None, [])
+    entry = structure.get(name)
+    if entry is None:
+        return (name, None, [name])
+    return (name, entry["subsystem"], entry["nodes"])
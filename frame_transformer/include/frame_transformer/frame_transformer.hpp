@@ -17,6 +17,7 @@
  */
 
 #include "frame_transformer_base.hpp"
+#include "frame_transformer/point_cloud_transform.hpp"
 #include <carma_ros2_utils/carma_lifecycle_node.hpp>
 #include <tf2/exceptions.h>
 #include <tf2_ros/transform_listener.h>
@@ -24,6 +25,7 @@
 #include <tf2_geometry_msgs/tf2_geometry_msgs.hpp>
 #include <tf2_sensor_msgs/tf2_sensor_msgs.hpp>
 #include <autoware_auto_tf2/tf2_autoware_auto_msgs_extension.hpp>
+#include <tf2_eigen/tf2_eigen.h>
 #include <chrono>
 #include <gtest/gtest_prod.h>
 
@@ -50,6 +52,26 @@ namespace frame_transformer
     // Publishers
     carma_ros2_utils::PubPtr<T> output_pub_;
 
+    //! Counters of the work done by input_callback
+    TransformStats stats_;
+
+    /**
+     * \brief Records the latency of a completed callback in stats_
+     *
+     * \param start_time The time the callback started
+     * \param bytes_copied The number of bytes of data copied by the callback
+     */
+    void record_callback(std::chrono::steady_clock::time_point start_time, uint64_t bytes_copied)
+    {
+      auto latency = std::chrono::duration_cast<std::chrono::nanoseconds>(std::chrono::steady_clock::now() - start_time).count();
+
+      stats_.callback_count++;
+      stats_.bytes_copied += bytes_copied;
+      stats_.last_latency_ns = latency;
+      stats_.total_latency_ns += latency;
+
+      RCLCPP_DEBUG_STREAM(node_->get_logger(), "Transformed message in " << latency / 1.0e6 << " ms, copied " << bytes_copied << " bytes");
+    }
 
   public:
 
@@ -101,6 +123,63 @@ namespace frame_transformer
       return true;
     }
 
+    /**
+     * \brief Helper method which looks up the transform from a source frame to the target frame at the provided time.
+     *        If config_.transform_chain is not empty the transform of each hop of the chain is looked up and they are fused into one transform.
+     *        Returns false if the provided timeout is exceeded for getting any of the transforms or a transform could not be computed
+     *
+     * \param source_frame The frame of the data to transform
+     * \param stamp The time at which to look up the transforms
+     * \param[out] transform The transform from source_frame to config_.target_frame. Its header has the target frame and the provided stamp
+     * \param timeout A timeout in ms for each lookup. If set to zero, then each lookup will be attempted only once.
+     *
+     * \return True if the lookup succeeded, false if timeout exceeded or the transform could not be computed
+     */
+    bool lookup_transform(const std::string &source_frame, const builtin_interfaces::msg::Time &stamp,
+                          geometry_msgs::msg::TransformStamped &transform, const std_ms timeout)
+    {
+      Eigen::Isometry3d fused = Eigen::Isometry3d::Identity();
+
+      try
+      {
+        std::string current_frame = source_frame;
+
+        for (size_t i = 0; i <= config_.transform_chain.size(); ++i)
+        {
+          const std::string &next_frame = i < config_.transform_chain.size() ? config_.transform_chain[i] : config_.target_frame;
+
+          auto hop = buffer_->lookupTransform(next_frame, current_frame, tf2_ros::fromMsg(stamp), timeout);
+          fused = tf2::transformToEigen(hop) * fused;
+
+          current_frame = next_frame;
+        }
+      }
+      catch (tf2::TransformException &ex)
+      {
+        std::string error = ex.what();
+        error = "Failed to get transform with exception: " + error;
+        auto& clk = *node_->get_clock(); // Separate reference required for proper throttle macro call
+        RCLCPP_WARN_THROTTLE(node_->get_logger(), clk, 1000, error.c_str());
+
+        return false;
+      }
+
+      transform = tf2::eigenToTransform(fused);
+      transform.header.frame_id = config_.target_frame;
+      transform.header.stamp = stamp;
+      transform.child_frame_id = source_frame;
+
+      return true;
+    }
+
+    /**
+     * \brief Returns the counters of the work done by input_callback
+     */
+    const TransformStats &stats() const
+    {
+      return stats_;
+    }
+
     /**
      * \brief Callback for input data. Transforms the data then republishes it
      * 
@@ -110,6 +189,8 @@ namespace frame_transformer
      */ 
     void input_callback(std::unique_ptr<T> in_msg)
     {
+      auto start_time = std::chrono::steady_clock::now();
+
       T out_msg;
 
       if (!transform(*in_msg, out_msg, config_.target_frame, std_ms(config_.timeout)))
@@ -118,36 +199,58 @@ namespace frame_transformer
       }
 
       output_pub_->publish(out_msg);
+
+      record_callback(start_time, 0);
     }
 
     // Unit Test Accessors
     FRIEND_TEST(frame_transformer_test, transform_test);
   };
 
-  // Specialization of input_callback for PointCloud2 messages to allow for preallocation of points vector
+  // Specialization of input_callback for PointCloud2 messages to avoid copying the point data
   // This is done due to the large size of that data set
+  // When possible the received message is transformed in place and forwarded, which with intra-process comms means the point data is never copied
   template <>
   inline void Transformer<sensor_msgs::msg::PointCloud2>::input_callback(std::unique_ptr<sensor_msgs::msg::PointCloud2> in_msg) {
 
-    sensor_msgs::msg::PointCloud2 out_msg;
-    out_msg.data.reserve(in_msg->data.size()); // Preallocate points vector
-    
+    auto start_time = std::chrono::steady_clock::now();
+
+    geometry_msgs::msg::TransformStamped transform;
 
-    if (!transform(*in_msg, out_msg, config_.target_frame, std_ms(config_.timeout)))
+    if (!lookup_transform(in_msg->header.frame_id, in_msg->header.stamp, transform, std_ms(config_.timeout)))
     {
       return;
     }
 
+    uint64_t bytes_copied = 0;
+
+    if (config_.in_place && transform_point_cloud_in_place(*in_msg, tf2::transformToEigen(transform)))
+    {
+      in_msg->header = transform.header;
+      stats_.in_place_count++;
+    }
+    else
+    {
+      // Fall back on the generic tf2 transform for layouts which cannot be transformed in place
+      auto out_msg = std::make_unique<sensor_msgs::msg::PointCloud2>();
+      tf2::doTransform(*in_msg, *out_msg, transform);
+
+      bytes_copied = out_msg->data.size();
+      in_msg = std::move(out_msg);
+    }
+
     // The following if block is added purely for ensuring consistency with Autoware.Auto (prevent "Malformed PointCloud2" error from ray_ground_filter)
     // It's a bit out of scope for this node to have this functionality here, 
     // but the alternative is to modify a 3rd party driver, an Autoware.Auto component, or make a new node just for this.
     // Therefore, the logic will live here until such a time as a better location presents itself.
-    if (out_msg.height == 1) // 1d point cloud
+    if (in_msg->height == 1) // 1d point cloud
     {
-      out_msg.row_step = out_msg.data.size();
+      in_msg->row_step = in_msg->data.size();
     }
 
-    output_pub_->publish(out_msg);
+    output_pub_->publish(std::move(in_msg));
+
+    record_callback(start_time, bytes_copied);
   }
 
 }
@@ -17,6 +17,8 @@
  */
 
 #include <iostream>
+#include <string>
+#include <vector>
 
 namespace frame_transformer
 {
@@ -38,6 +40,14 @@ namespace frame_transformer
     //! Timeout in ms for transform lookup. A value of 0 means lookup will occur once without blocking if it fails.
     int timeout = 0;
 
+    //! If true, point clouds are transformed directly in their received buffer and forwarded without a copy when their layout allows it
+    bool in_place = true;
+
+    //! Optional ordered list of intermediate frames between the data frame and the target frame.
+    //! The transforms of each hop are fused into a single transform so the data is only traversed once.
+    //! Only used for point clouds.
+    std::vector<std::string> transform_chain;
+
     // Stream operator for this config
     friend std::ostream &operator<<(std::ostream &output, const Config &c)
     {
@@ -46,6 +56,13 @@ namespace frame_transformer
            << "message_type: " << c.message_type << std::endl
            << "queue_size: " << c.queue_size << std::endl
            << "timeout: " << c.timeout << std::endl
+           << "in_place: " << c.in_place << std::endl
+           << "transform_chain: [ ";
+
+      for (const auto &frame : c.transform_chain)
+        output << frame << " ";
+
+      output << "]" << std::endl
            << "}" << std::endl;
       return output;
     }
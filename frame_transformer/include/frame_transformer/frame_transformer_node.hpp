@@ -76,6 +76,8 @@ namespace frame_transformer
     // Unit Test Accessors
     FRIEND_TEST(frame_transformer_test, transform_test);
     FRIEND_TEST(frame_transformer_test, point_cloud_transform_test);
+    FRIEND_TEST(frame_transformer_test, point_cloud_copy_transform_test);
+    FRIEND_TEST(frame_transformer_test, point_cloud_chain_transform_test);
 
   };
 
@@ -0,0 +1,72 @@
+#pragma once
+/*
+ * Copyright (C) 2024 LEIDOS.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may not
+ * use this file except in compliance with the License. You may obtain a copy of
+ * the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations under
+ * the License.
+ */
+
+#include <atomic>
+#include <cstdint>
+#include <Eigen/Geometry>
+#include <boost/optional.hpp>
+#include <sensor_msgs/msg/point_cloud2.hpp>
+
+namespace frame_transformer
+{
+
+  /**
+   * \brief Counters describing the work done by a transformer's input callbacks.
+   *        The counters are atomic so they can be read while callbacks execute.
+   */
+  struct TransformStats
+  {
+    //! Number of messages transformed and published
+    std::atomic<uint64_t> callback_count{0};
+
+    //! Number of point clouds which were transformed in place
+    std::atomic<uint64_t> in_place_count{0};
+
+    //! Total number of bytes of point data copied into new output messages
+    std::atomic<uint64_t> bytes_copied{0};
+
+    //! Latency of the latest callback in nanoseconds, from the start of the callback to the publication
+    std::atomic<int64_t> last_latency_ns{0};
+
+    //! Sum of the latencies of all the callbacks in nanoseconds
+    std::atomic<int64_t> total_latency_ns{0};
+  };
+
+  /**
+   * \brief Returns the byte offset of the x field of a point cloud if the x, y and z fields of each point can be transformed in place,
+   *        meaning they are contiguous little endian float32 values laid out so each point starts on a float boundary.
+   *
+   * \param cloud The point cloud to check
+   *
+   * \return The offset of the x field within a point, or boost::none if the cloud layout is not supported
+   */
+  boost::optional<uint32_t> in_place_xyz_offset(const sensor_msgs::msg::PointCloud2 &cloud);
+
+  /**
+   * \brief Transforms the x, y and z fields of every point of a point cloud directly in its data buffer.
+   *        All other fields and the header are left unchanged.
+   *
+   *        Points are processed in fixed size blocks as 3xN strided Eigen matrices so the rotation is applied with vectorized products.
+   *
+   * \param cloud The point cloud to transform
+   * \param transform The transform to apply to each point
+   *
+   * \return False if the cloud layout does not allow an in place transform, in which case the cloud is unchanged. True otherwise.
+   */
+  bool transform_point_cloud_in_place(sensor_msgs::msg::PointCloud2 &cloud, const Eigen::Isometry3d &transform);
+
+} // frame_transformer
@@ -31,6 +31,8 @@ namespace frame_transformer
     config_.target_frame = declare_parameter<std::string>("target_frame", config_.target_frame);
     config_.queue_size = declare_parameter<int>("queue_size", config_.queue_size);
     config_.timeout = declare_parameter<int>("timeout", config_.timeout);
+    config_.in_place = declare_parameter<bool>("in_place", config_.in_place);
+    config_.transform_chain = declare_parameter<std::vector<std::string>>("transform_chain", config_.transform_chain);
   }
 
   std::unique_ptr<TransformerBase> Node::build_transformer() {
@@ -82,6 +84,8 @@ namespace frame_transformer
     get_parameter<std::string>("target_frame", config_.target_frame);
     get_parameter<int>("queue_size", config_.queue_size);
     get_parameter<int>("timeout", config_.timeout);
+    get_parameter<bool>("in_place", config_.in_place);
+    get_parameter<std::vector<std::string>>("transform_chain", config_.transform_chain);
 
 
     RCLCPP_INFO_STREAM(get_logger(), "Loaded params: " << config_);
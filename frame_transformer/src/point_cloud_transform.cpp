@@ -0,0 +1,104 @@
+/*
+ * Copyright (C) 2024 LEIDOS.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may not
+ * use this file except in compliance with the License. You may obtain a copy of
+ * the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations under
+ * the License.
+ */
+#include "frame_transformer/point_cloud_transform.hpp"
+#include <algorithm>
+#include <string>
+#include <sensor_msgs/msg/point_field.hpp>
+
+namespace frame_transformer
+{
+  namespace
+  {
+    //! Number of points transformed per Eigen block. Sized so the temporary block stays on the stack
+    constexpr Eigen::Index BLOCK_SIZE = 256;
+
+    boost::optional<uint32_t> float32_field_offset(const sensor_msgs::msg::PointCloud2 &cloud, const std::string &name)
+    {
+      for (const auto &field : cloud.fields)
+      {
+        if (field.name == name && field.datatype == sensor_msgs::msg::PointField::FLOAT32 && field.count == 1)
+        {
+          return field.offset;
+        }
+      }
+      return boost::none;
+    }
+  }
+
+  boost::optional<uint32_t> in_place_xyz_offset(const sensor_msgs::msg::PointCloud2 &cloud)
+  {
+    if (cloud.is_bigendian)
+    {
+      return boost::none;
+    }
+
+    auto x_offset = float32_field_offset(cloud, "x");
+    auto y_offset = float32_field_offset(cloud, "y");
+    auto z_offset = float32_field_offset(cloud, "z");
+
+    if (!x_offset || !y_offset || !z_offset || *y_offset != *x_offset + sizeof(float) || *z_offset != *y_offset + sizeof(float))
+    {
+      return boost::none;
+    }
+
+    // Points are viewed as a strided float matrix so every point and row must start on a float boundary
+    if (*x_offset % sizeof(float) != 0 || cloud.point_step % sizeof(float) != 0 || cloud.row_step % sizeof(float) != 0)
+    {
+      return boost::none;
+    }
+
+    if (cloud.point_step < *z_offset + sizeof(float) || cloud.row_step < static_cast<uint64_t>(cloud.width) * cloud.point_step || cloud.data.size() < static_cast<uint64_t>(cloud.height) * cloud.row_step)
+    {
+      return boost::none;
+    }
+
+    return x_offset;
+  }
+
+  bool transform_point_cloud_in_place(sensor_msgs::msg::PointCloud2 &cloud, const Eigen::Isometry3d &transform)
+  {
+    auto x_offset = in_place_xyz_offset(cloud);
+    if (!x_offset)
+    {
+      return false;
+    }
+
+    const Eigen::Matrix3f rotation = transform.linear().cast<float>();
+    const Eigen::Vector3f translation = transform.translation().cast<float>();
+    const Eigen::Index stride = cloud.point_step / sizeof(float);
+
+    using PointsMap = Eigen::Map<Eigen::Matrix3Xf, Eigen::Unaligned, Eigen::OuterStride<>>;
+    using PointsBlock = Eigen::Matrix<float, 3, Eigen::Dynamic, Eigen::ColMajor, 3, BLOCK_SIZE>;
+
+    for (uint32_t row = 0; row < cloud.height; ++row)
+    {
+      float *row_start = reinterpret_cast<float *>(cloud.data.data() + static_cast<size_t>(row) * cloud.row_step + *x_offset);
+
+      for (Eigen::Index start = 0; start < cloud.width; start += BLOCK_SIZE)
+      {
+        Eigen::Index count = std::min<Eigen::Index>(BLOCK_SIZE, cloud.width - start);
+        PointsMap points(row_start + start * stride, 3, count, Eigen::OuterStride<>(stride));
+
+        // The product is evaluated into a stack block first since it reads every coordinate being overwritten
+        PointsBlock rotated = rotation * points;
+        points = rotated.colwise() + translation;
+      }
+    }
+
+    return true;
+  }
+
+} // frame_transformer
@@ -21,6 +21,7 @@
 #include <future>
 #include <thread>
 #include <chrono>
+#include <cmath>
 // Using deprecated sensor_msgs/PointCloud to convert to PointCloud2 message in unit tests
 #include <sensor_msgs/msg/point_cloud.hpp>
 #include <sensor_msgs/point_cloud_conversion.hpp>
@@ -228,6 +229,206 @@ namespace frame_transformer
         ASSERT_NEAR(readable_result.points[1].y, 5.0, 1e-6);
         ASSERT_NEAR(readable_result.points[1].z, 6.0, 1e-6);
 
+        // Verify that the cloud was transformed in place without copying its points
+        auto cast_transformer = static_cast<Transformer<sensor_msgs::msg::PointCloud2>*>(worker_node->transformer_.get());
+        ASSERT_EQ(cast_transformer->stats().callback_count, 1u);
+        ASSERT_EQ(cast_transformer->stats().in_place_count, 1u);
+        ASSERT_EQ(cast_transformer->stats().bytes_copied, 0u);
+
+    }
+
+    TEST(frame_transformer_test, point_cloud_copy_transform_test)
+    {
+
+        std::vector<std::string> remaps; // Remaps to keep topics separate from other tests
+        remaps.push_back("--ros-args");
+        remaps.push_back("-r");
+        remaps.push_back("output:=/point_cloud_copy_transform_test/output");
+        remaps.push_back("-r");
+        remaps.push_back("input:=/point_cloud_copy_transform_test/input");
+        remaps.push_back("-r");
+        remaps.push_back("__node:=point_cloud_copy_transform_test_frame_transformer");
+
+
+        rclcpp::NodeOptions options;
+        options.use_intra_process_comms(true);
+        options.arguments(remaps);
+        auto worker_node = std::make_shared<frame_transformer::Node>(options);
+
+        // Set the parameters for this test
+        worker_node->set_parameter(rclcpp::Parameter("message_type", "sensor_msgs/PointCloud2"));
+        worker_node->set_parameter(rclcpp::Parameter("target_frame", "base_link"));
+        worker_node->set_parameter(rclcpp::Parameter("queue_size", 1));
+        worker_node->set_parameter(rclcpp::Parameter("timeout", 0));
+        worker_node->set_parameter(rclcpp::Parameter("in_place", false));
+
+        worker_node->configure(); //Call configure state transition
+        worker_node->activate();  //Call activate state transition to get not read for runtime
+
+        ASSERT_TRUE(!!worker_node->transformer_);
+
+        // Build message
+
+        sensor_msgs::msg::PointCloud point_cloud;
+        point_cloud.header.frame_id = "velodyne";
+        point_cloud.header.stamp = worker_node->now();
+
+        geometry_msgs::msg::Point32 p1;
+        p1.x = 1.0;
+        p1.y = 2.0;
+        p1.z = 3.0;
+
+        point_cloud.points.push_back(p1);
+
+        std::unique_ptr<sensor_msgs::msg::PointCloud2> msg = std::make_unique<sensor_msgs::msg::PointCloud2>();
+
+        sensor_msgs::convertPointCloudToPointCloud2(point_cloud, *msg);
+
+        size_t data_size = msg->data.size();
+
+        // Create a transform with a rotation of 90 degrees about z
+        geometry_msgs::msg::TransformStamped base_link_tf;
+        base_link_tf.header.frame_id = "base_link";
+        base_link_tf.child_frame_id = "velodyne";
+        base_link_tf.transform.translation.x = 1.0;
+        base_link_tf.transform.translation.y = 0.0;
+        base_link_tf.transform.translation.z = 0.0;
+        base_link_tf.transform.rotation.x = 0.0;
+        base_link_tf.transform.rotation.y = 0.0;
+        base_link_tf.transform.rotation.z = std::sqrt(0.5);
+        base_link_tf.transform.rotation.w = std::sqrt(0.5);
+
+        worker_node->buffer_->setTransform(base_link_tf, "test_authority", true);
+
+        // create subscription to receive message after publish
+
+        sensor_msgs::msg::PointCloud2 result;
+        auto sub = worker_node->create_subscription<sensor_msgs::msg::PointCloud2>("/point_cloud_copy_transform_test/output", 1,
+            [&](sensor_msgs::msg::PointCloud2::UniquePtr msg)
+            {
+                result = *msg;
+            });
+
+        auto cast_transformer = static_cast<Transformer<sensor_msgs::msg::PointCloud2>*>(worker_node->transformer_.get());
+
+        cast_transformer->input_callback(std::move(msg)); // Trigger the callback
+
+        // Provide some time for publication to occur
+        std::this_thread::sleep_for(std::chrono::seconds(2));
+
+        rclcpp::spin_some(worker_node->get_node_base_interface()); // Spin current queue to allow for subscription callback to trigger
+
+        sensor_msgs::msg::PointCloud readable_result;
+        sensor_msgs::convertPointCloud2ToPointCloud(result, readable_result);
+
+        ASSERT_EQ(readable_result.header.frame_id, "base_link");
+        ASSERT_EQ(readable_result.points.size(), 1u);
+
+        ASSERT_NEAR(readable_result.points[0].x, -1.0, 1e-5);
+        ASSERT_NEAR(readable_result.points[0].y, 1.0, 1e-5);
+        ASSERT_NEAR(readable_result.points[0].z, 3.0, 1e-5);
+
+        // Verify that the copy was counted
+        ASSERT_EQ(cast_transformer->stats().callback_count, 1u);
+        ASSERT_EQ(cast_transformer->stats().in_place_count, 0u);
+        ASSERT_EQ(cast_transformer->stats().bytes_copied, data_size);
+    }
+
+    TEST(frame_transformer_test, point_cloud_chain_transform_test)
+    {
+
+        std::vector<std::string> remaps; // Remaps to keep topics separate from other tests
+        remaps.push_back("--ros-args");
+        remaps.push_back("-r");
+        remaps.push_back("output:=/point_cloud_chain_transform_test/output");
+        remaps.push_back("-r");
+        remaps.push_back("input:=/point_cloud_chain_transform_test/input");
+        remaps.push_back("-r");
+        remaps.push_back("__node:=point_cloud_chain_transform_test_frame_transformer");
+
+
+        rclcpp::NodeOptions options;
+        options.use_intra_process_comms(true);
+        options.arguments(remaps);
+        auto worker_node = std::make_shared<frame_transformer::Node>(options);
+
+        // Set the parameters for this test
+        worker_node->set_parameter(rclcpp::Parameter("message_type", "sensor_msgs/PointCloud2"));
+        worker_node->set_parameter(rclcpp::Parameter("target_frame", "map"));
+        worker_node->set_parameter(rclcpp::Parameter("queue_size", 1));
+        worker_node->set_parameter(rclcpp::Parameter("timeout", 0));
+        worker_node->set_parameter(rclcpp::Parameter("transform_chain", std::vector<std::string>({"base_link"})));
+
+        worker_node->configure(); //Call configure state transition
+        worker_node->activate();  //Call activate state transition to get not read for runtime
+
+        ASSERT_TRUE(!!worker_node->transformer_);
+
+        // Build message
+
+        sensor_msgs::msg::PointCloud point_cloud;
+        point_cloud.header.frame_id = "velodyne";
+        point_cloud.header.stamp = worker_node->now();
+
+        geometry_msgs::msg::Point32 p1;
+        p1.x = 1.0;
+        p1.y = 2.0;
+        p1.z = 3.0;
+
+        point_cloud.points.push_back(p1);
+
+        std::unique_ptr<sensor_msgs::msg::PointCloud2> msg = std::make_unique<sensor_msgs::msg::PointCloud2>();
+
+        sensor_msgs::convertPointCloudToPointCloud2(point_cloud, *msg);
+
+        // Create the transforms of each hop of the chain
+        geometry_msgs::msg::TransformStamped base_link_tf;
+        base_link_tf.header.frame_id = "base_link";
+        base_link_tf.child_frame_id = "velodyne";
+        base_link_tf.transform.translation.x = 1.0;
+        base_link_tf.transform.rotation.w = 1.0;
+
+        geometry_msgs::msg::TransformStamped map_tf;
+        map_tf.header.frame_id = "map";
+        map_tf.child_frame_id = "base_link";
+        map_tf.transform.translation.x = 10.0;
+        map_tf.transform.translation.y = 20.0;
+        map_tf.transform.rotation.z = std::sqrt(0.5);
+        map_tf.transform.rotation.w = std::sqrt(0.5);
+
+        worker_node->buffer_->setTransform(base_link_tf, "test_authority", true);
+        worker_node->buffer_->setTransform(map_tf, "test_authority", true);
+
+        // create subscription to receive message after publish
+
+        sensor_msgs::msg::PointCloud2 result;
+        auto sub = worker_node->create_subscription<sensor_msgs::msg::PointCloud2>("/point_cloud_chain_transform_test/output", 1,
+            [&](sensor_msgs::msg::PointCloud2::UniquePtr msg)
+            {
+                result = *msg;
+            });
+
+        auto cast_transformer = static_cast<Transformer<sensor_msgs::msg::PointCloud2>*>(worker_node->transformer_.get());
+
+        cast_transformer->input_callback(std::move(msg)); // Trigger the callback
+
+        // Provide some time for publication to occur
+        std::this_thread::sleep_for(std::chrono::seconds(2));
+
+        rclcpp::spin_some(worker_node->get_node_base_interface()); // Spin current queue to allow for subscription callback to trigger
+
+        sensor_msgs::msg::PointCloud readable_result;
+        sensor_msgs::convertPointCloud2ToPointCloud(result, readable_result);
+
+        // (1, 2, 3) is (2, 2, 3) in base_link which is (8, 22, 3) in map
+        ASSERT_EQ(readable_result.header.frame_id, "map");
+        ASSERT_EQ(readable_result.points.size(), 1u);
+
+        ASSERT_NEAR(readable_result.points[0].x, 8.0, 1e-5);
+        ASSERT_NEAR(readable_result.points[0].y, 22.0, 1e-5);
+        ASSERT_NEAR(readable_result.points[0].z, 3.0, 1e-5);
+
+        ASSERT_EQ(cast_transformer->stats().in_place_count, 1u);
     }
 }
 
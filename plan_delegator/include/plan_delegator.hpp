@@ -15,7 +15,10 @@
  * the License.
  */
 
+#include <chrono>
+#include <mutex>
 #include <unordered_map>
+#include <vector>
 #include <math.h>
 #include <rclcpp/rclcpp.hpp>
 #include <gtest/gtest_prod.h>
@@ -79,6 +82,11 @@ namespace plan_delegator
         double duration_to_signal_before_lane_change = 2.5; // (Seconds) If an upcoming lane change will begin in under this time threshold, a turn signal activation command will be published.
         int tactical_plugin_service_call_timeout = 100; // (Milliseconds) The maximum duration that Plan Delegator will wait after calling a tactical plugin's trajectory planning service; if trajectory
                                                         // generation takes longer than this, then planning will immediately end for the current trajectory planning iteration.
+        bool speculative_trajectory_planning = false; // If true, the requests which continued the previous trajectory are sent again at the start of each planning iteration,
+                                                      // concurrently with the request for the first maneuver, and their responses are used if they still start where the trajectory ends.
+        double speculation_position_tolerance = 0.5; // (Meters) Maximum distance between the starting position of a speculative request and the end of the trajectory for its response to be used
+        double speculation_speed_tolerance = 0.5; // (m/s) Maximum difference between the starting speed of a speculative request and the speed at the end of the trajectory for its response to be used
+        double speculation_time_tolerance = 0.1; // (Seconds) Maximum difference between the starting time of a speculative request and the time at the end of the trajectory for its response to be used
 
         // Stream operator for this config
         friend std::ostream &operator<<(std::ostream &output, const Config &c)
@@ -90,6 +98,11 @@ namespace plan_delegator
             << "max_trajectory_duration: " << c.max_trajectory_duration << std::endl
             << "min_crawl_speed: " << c.min_crawl_speed << std::endl
             << "duration_to_signal_before_lane_change: " << c.duration_to_signal_before_lane_change << std::endl
+            << "tactical_plugin_service_call_timeout: " << c.tactical_plugin_service_call_timeout << std::endl
+            << "speculative_trajectory_planning: " << c.speculative_trajectory_planning << std::endl
+            << "speculation_position_tolerance: " << c.speculation_position_tolerance << std::endl
+            << "speculation_speed_tolerance: " << c.speculation_speed_tolerance << std::endl
+            << "speculation_time_tolerance: " << c.speculation_time_tolerance << std::endl
             << "}" << std::endl;
         return output;
         }
@@ -104,6 +117,31 @@ namespace plan_delegator
         bool is_right_lane_change;  // Flag to indicate whether lane change is a right lane change; false if it is a left lane change
     };
 
+    /**
+     * \brief Statistics of the trajectory planning service calls made to a single tactical plugin
+     */
+    struct PlannerCallStats
+    {
+        uint64_t success_count = 0; // Number of calls which received a response in time
+        uint64_t timeout_count = 0; // Number of calls which failed to receive a response in time
+        std::chrono::nanoseconds last_latency{0}; // Time between the latest request and its response being received by planTrajectory
+        std::chrono::nanoseconds max_latency{0}; // Largest latency of all the responses
+        std::chrono::nanoseconds total_latency{0}; // Sum of the latencies of all the responses
+        uint64_t speculation_hit_count = 0; // Number of speculative requests whose response was used
+        uint64_t speculation_miss_count = 0; // Number of speculative requests discarded since they did not start where the trajectory ended
+    };
+
+    /**
+     * \brief Convenience struct for storing a trajectory planning request sent to a tactical plugin along with its response
+     */
+    struct PendingPlanRequest
+    {
+        std::string planner; // Name of the tactical plugin the request was sent to
+        std::shared_ptr<carma_planning_msgs::srv::PlanTrajectory::Request> request;
+        rclcpp::Client<carma_planning_msgs::srv::PlanTrajectory>::SharedFuture future;
+        std::chrono::steady_clock::time_point send_time;
+    };
+
     class PlanDelegator : public carma_ros2_utils::CarmaLifecycleNode
     {
         public:
@@ -166,6 +204,11 @@ namespace plan_delegator
              */
             void updateManeuverParameters(carma_planning_msgs::msg::Maneuver& maneuver);
 
+            /**
+             * \brief Returns a copy of the statistics of the trajectory planning calls made to each tactical plugin so far, keyed by plugin name
+             */
+            std::unordered_map<std::string, PlannerCallStats> getPlannerCallStats() const;
+
             ////
             // Overrides
             ////
@@ -221,6 +264,16 @@ namespace plan_delegator
             // The latest turn signal command published to turn_signal_command_pub_.
             autoware_msgs::msg::LampCmd latest_turn_signal_command_;
 
+            // Statistics of the trajectory planning calls made to each tactical plugin, keyed by plugin name
+            std::unordered_map<std::string, PlannerCallStats> planner_call_stats_;
+            mutable std::mutex planner_call_stats_mutex_;
+
+            // Requests for the maneuvers after the first one of the latest trajectory, which are sent again speculatively in the next planning iteration
+            std::vector<std::pair<std::string, std::shared_ptr<carma_planning_msgs::srv::PlanTrajectory::Request>>> previous_continuation_requests_;
+
+            // Id of the maneuver plan previous_continuation_requests_ were composed for
+            std::string previous_continuation_plan_id_;
+
             /**
              * \brief Callback function for triggering trajectory planning
              */
@@ -250,6 +303,32 @@ namespace plan_delegator
              */
             carma_planning_msgs::msg::TrajectoryPlan planTrajectory();
 
+            /**
+             * \brief Sends a trajectory planning request to a tactical plugin without waiting for the response
+             * \param planner The name of the tactical plugin
+             * \param request The request to send
+             * \return The sent request along with the future of its response
+             */
+            PendingPlanRequest sendPlanRequest(const std::string& planner, const std::shared_ptr<carma_planning_msgs::srv::PlanTrajectory::Request>& request);
+
+            /**
+             * \brief Sends again the requests which continued the previous trajectory if speculative planning is enabled and the maneuver plan is unchanged
+             * \return The sent requests, empty if none was sent
+             */
+            std::vector<PendingPlanRequest> sendSpeculativeRequests();
+
+            /**
+             * \brief Returns true if the response to a speculative request can be used in place of the response to a required request,
+             * meaning both are for the same maneuver and start from the same vehicle state within the configured tolerances.
+             * Speculative requests continue a trajectory, so they are never valid before part of the trajectory has been planned
+             * \param speculative_request The speculative request
+             * \param required_request The request composed from the trajectory planned so far
+             * \param latest_trajectory_plan The trajectory planned so far
+             */
+            bool isSpeculativeRequestValid(const carma_planning_msgs::srv::PlanTrajectory::Request& speculative_request,
+                                           const carma_planning_msgs::srv::PlanTrajectory::Request& required_request,
+                                           const carma_planning_msgs::msg::TrajectoryPlan& latest_trajectory_plan) const;
+
             /**
              * \brief Function for generating a LaneChangeInformation object from a provided lane change maneuver.
              * \param lane_change_maneuver The lane change maneuver that a LaneChangeInformation object shall be generated from.
@@ -285,5 +364,6 @@ namespace plan_delegator
             FRIEND_TEST(TestPlanDelegator, TestLaneChangeInformation);
             FRIEND_TEST(TestPlanDelegator, TestUpcomingLaneChangeAndTurnSignals);
             FRIEND_TEST(TestPlanDelegator, TestUpdateManeuverParameters);
+            FRIEND_TEST(TestPlanDelegator, TestSpeculativeRequestValidity);
     };
 }
@@ -14,6 +14,7 @@
  * the License.
  */
 
+#include <algorithm>
 #include <stdexcept>
 #include <carma_wm/Geometry.hpp>
 #include "plan_delegator.hpp"
@@ -143,6 +144,10 @@ namespace plan_delegator
         config_.min_crawl_speed = declare_parameter<double>("min_speed", config_.min_crawl_speed);
         config_.duration_to_signal_before_lane_change = declare_parameter<double>("duration_to_signal_before_lane_change", config_.duration_to_signal_before_lane_change);
         config_.tactical_plugin_service_call_timeout = declare_parameter<int>("tactical_plugin_service_call_timeout", config_.tactical_plugin_service_call_timeout);
+        config_.speculative_trajectory_planning = declare_parameter<bool>("speculative_trajectory_planning", config_.speculative_trajectory_planning);
+        config_.speculation_position_tolerance = declare_parameter<double>("speculation_position_tolerance", config_.speculation_position_tolerance);
+        config_.speculation_speed_tolerance = declare_parameter<double>("speculation_speed_tolerance", config_.speculation_speed_tolerance);
+        config_.speculation_time_tolerance = declare_parameter<double>("speculation_time_tolerance", config_.speculation_time_tolerance);
     }
 
     carma_ros2_utils::CallbackReturn PlanDelegator::handle_on_configure(const rclcpp_lifecycle::State &)
@@ -157,6 +162,10 @@ namespace plan_delegator
         get_parameter<double>("min_speed", config_.min_crawl_speed);
         get_parameter<double>("duration_to_signal_before_lane_change", config_.duration_to_signal_before_lane_change);
         get_parameter<int>("tactical_plugin_service_call_timeout", config_.tactical_plugin_service_call_timeout);
+        get_parameter<bool>("speculative_trajectory_planning", config_.speculative_trajectory_planning);
+        get_parameter<double>("speculation_position_tolerance", config_.speculation_position_tolerance);
+        get_parameter<double>("speculation_speed_tolerance", config_.speculation_speed_tolerance);
+        get_parameter<double>("speculation_time_tolerance", config_.speculation_time_tolerance);
 
         RCLCPP_INFO_STREAM(rclcpp::get_logger("plan_delegator"),"Done loading parameters: " << config_);
 
@@ -604,6 +613,17 @@ namespace plan_delegator
         // Track the index of the starting maneuver in the maneuver plan that this trajectory plan service request is for
         uint16_t current_maneuver_index = 0;
 
+        // The vehicle pose is the same for every maneuver of this trajectory so its downtrack is only computed once
+        lanelet::BasicPoint2d current_loc(latest_pose_.pose.position.x, latest_pose_.pose.position.y);
+        double current_downtrack = wm_->routeTrackPos(current_loc).downtrack;
+        RCLCPP_DEBUG_STREAM(rclcpp::get_logger("plan_delegator"),"current_downtrack" << current_downtrack);
+
+        // Requests continuing the previous trajectory are planned while the first maneuver of this trajectory is
+        std::vector<PendingPlanRequest> speculative_requests = sendSpeculativeRequests();
+
+        // Requests for the maneuvers after the first one of this trajectory
+        std::vector<std::pair<std::string, std::shared_ptr<carma_planning_msgs::srv::PlanTrajectory::Request>>> continuation_requests;
+
         // Loop through maneuver list to make service call to applicable Tactical Plugin
         while(current_maneuver_index < latest_maneuver_plan_.maneuvers.size())
         {
@@ -618,9 +638,6 @@ namespace plan_delegator
                 ++current_maneuver_index;
                 continue;
             }
-            lanelet::BasicPoint2d current_loc(latest_pose_.pose.position.x, latest_pose_.pose.position.y);
-            double current_downtrack = wm_->routeTrackPos(current_loc).downtrack;
-            RCLCPP_DEBUG_STREAM(rclcpp::get_logger("plan_delegator"),"current_downtrack" << current_downtrack);
             double maneuver_end_dist = GET_MANEUVER_PROPERTY(maneuver, end_dist);
             RCLCPP_DEBUG_STREAM(rclcpp::get_logger("plan_delegator"),"maneuver_end_dist" << maneuver_end_dist);
 
@@ -637,26 +654,63 @@ namespace plan_delegator
             // get corresponding ros service client for plan trajectory
             auto maneuver_planner = GET_MANEUVER_PROPERTY(maneuver, parameters.planning_tactical_plugin);
 
-            auto client = getPlannerClientByName(maneuver_planner);
-
             RCLCPP_DEBUG_STREAM(rclcpp::get_logger("plan_delegator"),"Current planner: " << maneuver_planner);
 
             // compose service request
             auto plan_req = composePlanTrajectoryRequest(latest_trajectory_plan, current_maneuver_index);
 
-            auto future_response = client->async_send_request(plan_req);
+            if(!latest_trajectory_plan.trajectory_points.empty())
+            {
+                continuation_requests.emplace_back(maneuver_planner, plan_req);
+            }
+
+            // Use the speculative request for this maneuver if it was sent from the state the trajectory now ends at, otherwise send the composed request
+            auto speculative_request = std::find_if(speculative_requests.begin(), speculative_requests.end(),
+                [&](const PendingPlanRequest& pending) { return pending.planner == maneuver_planner && pending.request->maneuver_index_to_plan == current_maneuver_index; });
 
-            auto future_status = future_response.wait_for(std::chrono::milliseconds(config_.tactical_plugin_service_call_timeout));
+            bool is_speculative = speculative_request != speculative_requests.end() && isSpeculativeRequestValid(*speculative_request->request, *plan_req, latest_trajectory_plan);
+
+            if(speculative_request != speculative_requests.end())
+            {
+                std::lock_guard<std::mutex> lock(planner_call_stats_mutex_);
+                if(is_speculative)
+                {
+                    planner_call_stats_[maneuver_planner].speculation_hit_count++;
+                }
+                else
+                {
+                    RCLCPP_DEBUG_STREAM(rclcpp::get_logger("plan_delegator"),"Discarding speculative request to planner: " << maneuver_planner << " since the trajectory no longer ends at its starting state");
+                    planner_call_stats_[maneuver_planner].speculation_miss_count++;
+                }
+            }
+
+            PendingPlanRequest pending = is_speculative ? *speculative_request : sendPlanRequest(maneuver_planner, plan_req);
+
+            auto future_status = pending.future.wait_until(pending.send_time + std::chrono::milliseconds(config_.tactical_plugin_service_call_timeout));
 
             if (future_status != std::future_status::ready)
             {
+                {
+                    std::lock_guard<std::mutex> lock(planner_call_stats_mutex_);
+                    planner_call_stats_[maneuver_planner].timeout_count++;
+                }
                 RCLCPP_WARN_STREAM(rclcpp::get_logger("plan_delegator"),"Unsuccessful service call to trajectory planner:" << maneuver_planner << " for plan ID " << std::string(latest_maneuver_plan_.maneuver_plan_id));
                 // if one service call fails, it should end plan immediately because it is there is no point to generate plan with empty space
                 break;
             }
 
+            {
+                std::lock_guard<std::mutex> lock(planner_call_stats_mutex_);
+                auto& stats = planner_call_stats_[maneuver_planner];
+                stats.last_latency = std::chrono::steady_clock::now() - pending.send_time;
+                stats.max_latency = std::max(stats.max_latency, stats.last_latency);
+                stats.total_latency += stats.last_latency;
+                stats.success_count++;
+                RCLCPP_DEBUG_STREAM(rclcpp::get_logger("plan_delegator"),"Planner: " << maneuver_planner << " responded in " << stats.last_latency.count() * 1e-6 << " ms");
+            }
+
             // If successful service request
-            auto plan_response = future_response.get();
+            auto plan_response = pending.future.get();
             // validate trajectory before add to the plan
             if(!isTrajectoryValid(plan_response->trajectory_plan))
             {
@@ -674,6 +728,14 @@ namespace plan_delegator
                 plan_response->trajectory_plan.trajectory_points.erase(plan_response->trajectory_plan.trajectory_points.begin());
                 RCLCPP_DEBUG_STREAM(rclcpp::get_logger("plan_delegator"),"plan_response->trajectory_plan size: " << plan_response->trajectory_plan.trajectory_points.size());
             }
+            // A speculative trajectory starts close to but not exactly at the end of the trajectory, so its points which are not after the end are removed
+            if(is_speculative)
+            {
+                rclcpp::Time end_time(latest_trajectory_plan.trajectory_points.back().target_time);
+                auto& points = plan_response->trajectory_plan.trajectory_points;
+                points.erase(points.begin(), std::find_if(points.begin(), points.end(),
+                    [&](const carma_planning_msgs::msg::TrajectoryPlanPoint& point) { return rclcpp::Time(point.target_time) > end_time; }));
+            }
             latest_trajectory_plan.trajectory_points.insert(latest_trajectory_plan.trajectory_points.end(),
                                                             plan_response->trajectory_plan.trajectory_points.begin(),
                                                             plan_response->trajectory_plan.trajectory_points.end());
@@ -700,9 +762,72 @@ namespace plan_delegator
             }
         }
 
+        if(config_.speculative_trajectory_planning)
+        {
+            previous_continuation_requests_ = continuation_requests;
+            previous_continuation_plan_id_ = latest_maneuver_plan_.maneuver_plan_id;
+        }
+
         return latest_trajectory_plan;
     }
 
+    PendingPlanRequest PlanDelegator::sendPlanRequest(const std::string& planner, const std::shared_ptr<carma_planning_msgs::srv::PlanTrajectory::Request>& request)
+    {
+        PendingPlanRequest pending;
+        pending.planner = planner;
+        pending.request = request;
+        pending.send_time = std::chrono::steady_clock::now();
+        pending.future = getPlannerClientByName(planner)->async_send_request(request);
+        return pending;
+    }
+
+    std::vector<PendingPlanRequest> PlanDelegator::sendSpeculativeRequests()
+    {
+        std::vector<PendingPlanRequest> speculative_requests;
+        if(!config_.speculative_trajectory_planning || previous_continuation_plan_id_ != latest_maneuver_plan_.maneuver_plan_id)
+        {
+            return speculative_requests;
+        }
+
+        for(const auto& planner_request : previous_continuation_requests_)
+        {
+            RCLCPP_DEBUG_STREAM(rclcpp::get_logger("plan_delegator"),"Sending speculative request to planner: " << planner_request.first
+                << " for maneuver index " << planner_request.second->maneuver_index_to_plan);
+            speculative_requests.push_back(sendPlanRequest(planner_request.first, planner_request.second));
+        }
+        return speculative_requests;
+    }
+
+    bool PlanDelegator::isSpeculativeRequestValid(const carma_planning_msgs::srv::PlanTrajectory::Request& speculative_request,
+                                                  const carma_planning_msgs::srv::PlanTrajectory::Request& required_request,
+                                                  const carma_planning_msgs::msg::TrajectoryPlan& latest_trajectory_plan) const
+    {
+        // The request for the first planned maneuver starts from the vehicle state even if earlier maneuvers were skipped
+        if(latest_trajectory_plan.trajectory_points.empty())
+        {
+            return false;
+        }
+
+        if(speculative_request.maneuver_index_to_plan != required_request.maneuver_index_to_plan)
+        {
+            return false;
+        }
+
+        double position_diff = std::hypot(speculative_request.vehicle_state.x_pos_global - required_request.vehicle_state.x_pos_global,
+                                          speculative_request.vehicle_state.y_pos_global - required_request.vehicle_state.y_pos_global);
+        double speed_diff = std::fabs(speculative_request.vehicle_state.longitudinal_vel - required_request.vehicle_state.longitudinal_vel);
+        double time_diff = std::fabs((rclcpp::Time(speculative_request.header.stamp) - rclcpp::Time(required_request.header.stamp)).seconds());
+
+        return position_diff <= config_.speculation_position_tolerance && speed_diff <= config_.speculation_speed_tolerance
+            && time_diff <= config_.speculation_time_tolerance;
+    }
+
+    std::unordered_map<std::string, PlannerCallStats> PlanDelegator::getPlannerCallStats() const
+    {
+        std::lock_guard<std::mutex> lock(planner_call_stats_mutex_);
+        return planner_call_stats_;
+    }
+
     void PlanDelegator::onTrajPlanTick()
     {
         if (!guidance_engaged)
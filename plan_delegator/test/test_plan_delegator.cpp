@@ -503,6 +503,78 @@ namespace plan_delegator{
         EXPECT_NEAR(maneuver_2.lane_change_maneuver.end_dist, 21.0, 0.01);
         EXPECT_EQ(maneuver_2.lane_change_maneuver.starting_lane_id, "1220");
     }
+    TEST(TestPlanDelegator, TestSpeculativeRequestValidity)
+    {
+        rclcpp::NodeOptions node_options;
+        auto pd = std::make_shared<plan_delegator::PlanDelegator>(node_options);
+
+        EXPECT_FALSE(pd->config_.speculative_trajectory_planning);
+        EXPECT_TRUE(pd->sendSpeculativeRequests().empty());
+        EXPECT_TRUE(pd->getPlannerCallStats().empty());
+
+        carma_planning_msgs::srv::PlanTrajectory::Request required_request;
+        required_request.maneuver_index_to_plan = 1;
+        required_request.vehicle_state.x_pos_global = 10.0;
+        required_request.vehicle_state.y_pos_global = 5.0;
+        required_request.vehicle_state.longitudinal_vel = 10.0;
+        required_request.header.stamp = rclcpp::Time(10, 0);
+
+        carma_planning_msgs::msg::TrajectoryPlan latest_trajectory_plan;
+        latest_trajectory_plan.trajectory_points.resize(2);
+
+        carma_planning_msgs::srv::PlanTrajectory::Request speculative_request = required_request;
+        speculative_request.vehicle_state.x_pos_global = 10.3;
+        speculative_request.vehicle_state.longitudinal_vel = 10.4;
+        speculative_request.header.stamp = rclcpp::Time(10, 50000000);
+        EXPECT_TRUE(pd->isSpeculativeRequestValid(speculative_request, required_request, latest_trajectory_plan));
+
+        // Different maneuver
+        speculative_request.maneuver_index_to_plan = 2;
+        EXPECT_FALSE(pd->isSpeculativeRequestValid(speculative_request, required_request, latest_trajectory_plan));
+        speculative_request.maneuver_index_to_plan = 1;
+
+        // Starting position too far
+        speculative_request.vehicle_state.y_pos_global = 5.5;
+        EXPECT_FALSE(pd->isSpeculativeRequestValid(speculative_request, required_request, latest_trajectory_plan));
+        speculative_request.vehicle_state.y_pos_global = 5.0;
+
+        // Starting speed too different
+        speculative_request.vehicle_state.longitudinal_vel = 9.4;
+        EXPECT_FALSE(pd->isSpeculativeRequestValid(speculative_request, required_request, latest_trajectory_plan));
+        speculative_request.vehicle_state.longitudinal_vel = 10.0;
+
+        // Starting time too different
+        speculative_request.header.stamp = rclcpp::Time(9, 850000000);
+        EXPECT_FALSE(pd->isSpeculativeRequestValid(speculative_request, required_request, latest_trajectory_plan));
+        speculative_request.header.stamp = required_request.header.stamp;
+
+        // When the first maneuver is skipped the request for the next one starts from the vehicle state,
+        // which must not be answered by a speculative request even if the states match
+        pd->latest_pose_.header.stamp = required_request.header.stamp;
+        pd->latest_pose_.pose.position.x = required_request.vehicle_state.x_pos_global;
+        pd->latest_pose_.pose.position.y = required_request.vehicle_state.y_pos_global;
+        pd->latest_pose_.pose.orientation.w = 1.0;
+        pd->latest_twist_.twist.linear.x = required_request.vehicle_state.longitudinal_vel;
+
+        carma_planning_msgs::msg::TrajectoryPlan empty_trajectory_plan;
+        auto first_request = pd->composePlanTrajectoryRequest(empty_trajectory_plan, 1);
+        EXPECT_TRUE(pd->isSpeculativeRequestValid(speculative_request, *first_request, latest_trajectory_plan));
+        EXPECT_FALSE(pd->isSpeculativeRequestValid(speculative_request, *first_request, empty_trajectory_plan));
+
+        // Requests continuing the previous trajectory are only sent again for the same maneuver plan
+        pd->config_.speculative_trajectory_planning = true;
+        pd->previous_continuation_plan_id_ = "plan_A";
+        pd->previous_continuation_requests_.emplace_back("plugin_A", std::make_shared<carma_planning_msgs::srv::PlanTrajectory::Request>(required_request));
+        pd->latest_maneuver_plan_.maneuver_plan_id = "plan_B";
+        EXPECT_TRUE(pd->sendSpeculativeRequests().empty());
+
+        pd->latest_maneuver_plan_.maneuver_plan_id = "plan_A";
+        auto speculative_requests = pd->sendSpeculativeRequests();
+        ASSERT_EQ(1u, speculative_requests.size());
+        EXPECT_EQ("plugin_A", speculative_requests[0].planner);
+        EXPECT_EQ(1, speculative_requests[0].request->maneuver_index_to_plan);
+    }
+
 } // namespace plan_delegator
 
     /*!
@@ -0,0 +1,114 @@
+/*
+ * Copyright (C) 2024 LEIDOS.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may not
+ * use this file except in compliance with the License. You may obtain a copy of
+ * the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations under
+ * the License.
+ */
+
+#pragma once
+
+#include <condition_variable>
+#include <memory>
+#include <mutex>
+#include <thread>
+#include <unordered_map>
+#include <vector>
+#include <boost/optional.hpp>
+#include <lanelet2_core/LaneletMap.h>
+#include <approximate_intersection/bitmap_lookup_grid.hpp>
+#include <pcl/point_types.h>
+
+namespace points_map_filter
+{
+
+  using PointT = pcl::PointXYZI;
+  using LookupGrid = approximate_intersection::BitmapLookupGrid<PointT>;
+
+  /**
+   * \brief Builds the occupancy grid of the drivable space of a lanelet2 map in a background thread.
+   *        The lanelet and area polygons of the map are rasterized into the grid, so cells between lane boundaries are occupied too.
+   *
+   *        When a new map only differs from the previously built one by some lanelets or areas, as after a geofence update,
+   *        only the cells around the changed lanelets and areas are recomputed. The grid is fully rebuilt when the cell size
+   *        or the map bounds change.
+   *
+   *        The grid in use is swapped atomically once built, so readers never wait for a build.
+   */
+  class LookupGridBuilder
+  {
+  public:
+    /**
+     * \brief Constructor. Starts the build thread.
+     */
+    LookupGridBuilder();
+
+    /**
+     * \brief Destructor. Stops the build thread, dropping any pending build.
+     */
+    ~LookupGridBuilder();
+
+    LookupGridBuilder(const LookupGridBuilder &) = delete;
+    LookupGridBuilder &operator=(const LookupGridBuilder &) = delete;
+
+    /**
+     * \brief Requests the grid of a map to be built. A request still pending when a new one is made is dropped.
+     *
+     * \param map The map to build the grid of. It must not be modified afterwards.
+     * \param cell_side_length The side length of the grid cells
+     * \param tile_side_cell_count The number of cells along the side of the grid tiles. 0 for a single dense grid
+     */
+    void request(lanelet::LaneletMapConstPtr map, double cell_side_length, int tile_side_cell_count);
+
+    /**
+     * \brief Returns the latest built grid. Before the first build this is an empty grid.
+     *
+     * \return The grid
+     */
+    std::shared_ptr<const LookupGrid> grid() const;
+
+    /**
+     * \brief Blocks until all the requested builds are complete
+     */
+    void wait() const;
+
+  private:
+    //! A build request
+    struct Request
+    {
+      lanelet::LaneletMapConstPtr map;
+      double cell_side_length;
+      int tile_side_cell_count;
+    };
+
+    //! The polygon of a lanelet or area
+    using Polygon = std::vector<PointT>;
+
+    void run();
+
+    void build(const Request &request);
+
+    //! Latest built grid, only accessed atomically
+    std::shared_ptr<const LookupGrid> grid_;
+
+    //! Polygons the latest grid was built from, keyed by lanelet or area id. Only accessed by the build thread
+    std::unordered_map<lanelet::Id, Polygon> built_polygons_;
+
+    mutable std::mutex mutex_;
+    mutable std::condition_variable condition_;
+    boost::optional<Request> pending_request_;
+    bool building_ = false;
+    bool stop_ = false;
+
+    std::thread thread_;
+  };
+
+} // points_map_filter
@@ -30,11 +30,19 @@ namespace points_map_filter
     //! The side length of the 2d cells which are used to discretize the filter space
     double cell_side_length = 3.0;
 
+    //! The number of cells along the side of the tiles of the occupancy grid. Only tiles overlapping the map are allocated. 0 uses a single dense grid
+    int tile_side_cell_count = 0;
+
+    //! The number of threads used to filter a point cloud
+    int filter_thread_count = 1;
+
     // Stream operator for this config
     friend std::ostream &operator<<(std::ostream &output, const Config &c)
     {
       output << "points_map_filter::Config { " << std::endl
            << "cell_side_length: " << c.cell_side_length << std::endl
+           << "tile_side_cell_count: " << c.tile_side_cell_count << std::endl
+           << "filter_thread_count: " << c.filter_thread_count << std::endl
            << "}" << std::endl;
       return output;
     }
@@ -22,15 +22,14 @@
 #include <autoware_lanelet2_msgs/msg/map_bin.hpp>
 #include <lanelet2_core/LaneletMap.h>
 #include <carma_ros2_utils/carma_lifecycle_node.hpp>
-#include <approximate_intersection/lookup_grid.hpp>
 #include <pcl/point_types.h>
 #include <pcl/point_cloud.h>
 #include "points_map_filter/points_map_filter_config.hpp"
+#include "points_map_filter/lookup_grid_builder.hpp"
 
 namespace points_map_filter
 {
 
-  using PointT = pcl::PointXYZI;
   using CloudT = pcl::PointCloud<PointT>;
   /**
    * \brief TODO for USER: Add class description
@@ -53,7 +52,11 @@ namespace points_map_filter
     // The lanelet2 map to be checked against
     lanelet::LaneletMapPtr map_;
 
-    approximate_intersection::LookupGrid<PointT> lookup_grid_;
+    // Builds the occupancy grid of the map in the background
+    LookupGridBuilder lookup_grid_builder_;
+
+    //! Minimum number of points filtered by each thread, below which spreading a cloud over more threads does not pay off
+    static constexpr size_t MIN_POINTS_PER_CHUNK = 10000;
 
     void recompute_lookup_grid();
 
@@ -76,6 +79,11 @@ namespace points_map_filter
 
     void map_callback(autoware_lanelet2_msgs::msg::MapBin::UniquePtr msg);
 
+    /**
+     * \brief Blocks until the lookup grid of the latest map is built. Point clouds received before are filtered with the previous grid.
+     */
+    void wait_for_lookup_grid() const;
+
     ////
     // Overrides
     ////
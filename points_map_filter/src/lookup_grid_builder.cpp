@@ -0,0 +1,281 @@
+/*
+ * Copyright (C) 2024 LEIDOS.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may not
+ * use this file except in compliance with the License. You may obtain a copy of
+ * the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations under
+ * the License.
+ */
+#include "points_map_filter/lookup_grid_builder.hpp"
+#include <algorithm>
+#include <limits>
+#include <rclcpp/rclcpp.hpp>
+
+namespace points_map_filter
+{
+  namespace
+  {
+    //! Axis aligned bounding box of a polygon
+    struct Box
+    {
+      PointT min;
+      PointT max;
+    };
+
+    Box bounding_box(const std::vector<PointT> &polygon)
+    {
+      Box box;
+      box.min.x = std::numeric_limits<float>::max();
+      box.min.y = std::numeric_limits<float>::max();
+      box.max.x = std::numeric_limits<float>::lowest();
+      box.max.y = std::numeric_limits<float>::lowest();
+
+      for (const auto &p : polygon)
+      {
+        box.min.x = std::min(box.min.x, p.x);
+        box.min.y = std::min(box.min.y, p.y);
+        box.max.x = std::max(box.max.x, p.x);
+        box.max.y = std::max(box.max.y, p.y);
+      }
+      return box;
+    }
+
+    bool overlaps(const Box &a, const Box &b)
+    {
+      return a.min.x <= b.max.x && b.min.x <= a.max.x && a.min.y <= b.max.y && b.min.y <= a.max.y;
+    }
+
+    bool same_shape(const std::vector<PointT> &a, const std::vector<PointT> &b)
+    {
+      return std::equal(a.begin(), a.end(), b.begin(), b.end(), [](const PointT &p, const PointT &q)
+                        { return p.x == q.x && p.y == q.y; });
+    }
+
+    template <class PrimitiveT>
+    std::vector<PointT> to_polygon(const PrimitiveT &polygon3d)
+    {
+      std::vector<PointT> polygon;
+      polygon.reserve(polygon3d.size());
+      for (const auto &point : polygon3d)
+      {
+        PointT p;
+        p.x = point.x();
+        p.y = point.y();
+        polygon.push_back(p);
+      }
+      return polygon;
+    }
+  }
+
+  LookupGridBuilder::LookupGridBuilder()
+      : grid_(std::make_shared<LookupGrid>()), thread_(&LookupGridBuilder::run, this)
+  {
+  }
+
+  LookupGridBuilder::~LookupGridBuilder()
+  {
+    {
+      std::lock_guard<std::mutex> lock(mutex_);
+      stop_ = true;
+    }
+    condition_.notify_all();
+    thread_.join();
+  }
+
+  void LookupGridBuilder::request(lanelet::LaneletMapConstPtr map, double cell_side_length, int tile_side_cell_count)
+  {
+    {
+      std::lock_guard<std::mutex> lock(mutex_);
+      pending_request_ = Request{map, cell_side_length, tile_side_cell_count};
+    }
+    condition_.notify_all();
+  }
+
+  std::shared_ptr<const LookupGrid> LookupGridBuilder::grid() const
+  {
+    return std::atomic_load(&grid_);
+  }
+
+  void LookupGridBuilder::wait() const
+  {
+    std::unique_lock<std::mutex> lock(mutex_);
+    condition_.wait(lock, [this]()
+                    { return stop_ || (!pending_request_ && !building_); });
+  }
+
+  void LookupGridBuilder::run()
+  {
+    std::unique_lock<std::mutex> lock(mutex_);
+
+    while (true)
+    {
+      condition_.wait(lock, [this]()
+                      { return stop_ || pending_request_; });
+
+      if (stop_)
+      {
+        return;
+      }
+
+      Request request = *pending_request_;
+      pending_request_ = boost::none;
+      building_ = true;
+
+      lock.unlock();
+      build(request);
+      lock.lock();
+
+      building_ = false;
+      condition_.notify_all();
+    }
+  }
+
+  void LookupGridBuilder::build(const Request &request)
+  {
+    // Collect the polygons of the drivable space of the map
+    std::unordered_map<lanelet::Id, Polygon> polygons;
+    polygons.reserve(request.map->laneletLayer.size() + request.map->areaLayer.size());
+
+    double min_x = std::numeric_limits<double>::max();
+    double max_x = std::numeric_limits<double>::lowest();
+    double min_y = std::numeric_limits<double>::max();
+    double max_y = std::numeric_limits<double>::lowest();
+
+    auto add_polygon = [&](lanelet::Id id, Polygon polygon)
+    {
+      for (const auto &p : polygon)
+      {
+        min_x = std::min<double>(min_x, p.x);
+        max_x = std::max<double>(max_x, p.x);
+        min_y = std::min<double>(min_y, p.y);
+        max_y = std::max<double>(max_y, p.y);
+      }
+      polygons.emplace(id, std::move(polygon));
+    };
+
+    for (const auto &lanelet : request.map->laneletLayer)
+    {
+      add_polygon(lanelet.id(), to_polygon(lanelet.polygon3d()));
+    }
+
+    for (const auto &area : request.map->areaLayer)
+    {
+      add_polygon(area.id(), to_polygon(area.outerBoundPolygon()));
+    }
+
+    if (polygons.empty())
+    {
+      RCLCPP_ERROR(rclcpp::get_logger("points_map_filter"), "Map has no lanelets or areas. Cannot compute lookup grid");
+      return;
+    }
+
+    approximate_intersection::Config intersection_config;
+    intersection_config.cell_side_length = request.cell_side_length;
+    intersection_config.tile_side_cell_count = request.tile_side_cell_count;
+
+    double three_cells = request.cell_side_length * 3;
+    intersection_config.min_x = min_x - three_cells;
+    intersection_config.max_x = max_x + three_cells;
+    intersection_config.min_y = min_y - three_cells;
+    intersection_config.max_y = max_y + three_cells;
+
+    auto current_grid = grid();
+    auto current_config = current_grid->get_config();
+
+    bool full_rebuild = built_polygons_.empty()
+      || current_config.cell_side_length != intersection_config.cell_side_length
+      || current_config.tile_side_cell_count != intersection_config.tile_side_cell_count
+      || current_config.min_x != intersection_config.min_x || current_config.max_x != intersection_config.max_x
+      || current_config.min_y != intersection_config.min_y || current_config.max_y != intersection_config.max_y;
+
+    std::shared_ptr<LookupGrid> new_grid;
+
+    if (full_rebuild)
+    {
+      RCLCPP_INFO_STREAM(rclcpp::get_logger("points_map_filter"), "Building lookup grid with map bounds of (min_x, max_x, min_y, max_y): "
+                                         << "( " << min_x << ", " << max_x << ", " << min_y << ", " << max_y << ")");
+      RCLCPP_INFO_STREAM(rclcpp::get_logger("points_map_filter"), "Expanded map bounds to: "
+                                         << "( " << intersection_config.min_x << ", " << intersection_config.max_x << ", " << intersection_config.min_y << ", " << intersection_config.max_y << ")");
+
+      new_grid = std::make_shared<LookupGrid>(intersection_config);
+
+      for (const auto &id_polygon : polygons)
+      {
+        new_grid->insert_polygon(id_polygon.second);
+      }
+    }
+    else
+    {
+      // Find the regions covered by lanelets or areas which were added, removed or reshaped
+      std::vector<Box> dirty_boxes;
+
+      for (const auto &id_polygon : built_polygons_)
+      {
+        auto polygon = polygons.find(id_polygon.first);
+        if (polygon == polygons.end() || !same_shape(polygon->second, id_polygon.second))
+        {
+          dirty_boxes.push_back(bounding_box(id_polygon.second));
+        }
+      }
+
+      for (const auto &id_polygon : polygons)
+      {
+        auto polygon = built_polygons_.find(id_polygon.first);
+        if (polygon == built_polygons_.end() || !same_shape(polygon->second, id_polygon.second))
+        {
+          dirty_boxes.push_back(bounding_box(id_polygon.second));
+        }
+      }
+
+      if (dirty_boxes.empty())
+      {
+        RCLCPP_DEBUG(rclcpp::get_logger("points_map_filter"), "Map geometry did not change. Keeping lookup grid");
+        return;
+      }
+
+      RCLCPP_INFO_STREAM(rclcpp::get_logger("points_map_filter"), "Updating lookup grid around " << dirty_boxes.size() << " changed lanelets or areas");
+
+      // Clear the dirty regions and then redraw every polygon overlapping them.
+      // The copy shares its tiles with the current grid, so only the tiles which are edited get copied
+      new_grid = std::make_shared<LookupGrid>(*current_grid);
+
+      for (const auto &box : dirty_boxes)
+      {
+        new_grid->clear(box.min, box.max);
+      }
+
+      // Cleared cells may extend up to a cell past the dirty regions, so polygons that close are redrawn too
+      float cell_side_length = intersection_config.cell_side_length;
+      for (auto &box : dirty_boxes)
+      {
+        box.min.x -= cell_side_length;
+        box.min.y -= cell_side_length;
+        box.max.x += cell_side_length;
+        box.max.y += cell_side_length;
+      }
+
+      for (const auto &id_polygon : polygons)
+      {
+        Box box = bounding_box(id_polygon.second);
+
+        if (std::any_of(dirty_boxes.begin(), dirty_boxes.end(), [&box](const Box &dirty)
+                        { return overlaps(box, dirty); }))
+        {
+          new_grid->insert_polygon(id_polygon.second);
+        }
+      }
+    }
+
+    built_polygons_ = std::move(polygons);
+
+    std::atomic_store(&grid_, std::shared_ptr<const LookupGrid>(new_grid));
+  }
+
+} // points_map_filter
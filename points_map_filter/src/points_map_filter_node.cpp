@@ -28,9 +28,10 @@
 #include <lanelet2_extension/regulatory_elements/DigitalMinimumGap.h>
 #include <lanelet2_extension/regulatory_elements/StopRule.h>
 #include <lanelet2_extension/regulatory_elements/autoware_traffic_light.h>
-#include <pcl_conversions/pcl_conversions.h>
 #include <pcl/point_types.h>
-#include <pcl/filters/experimental/functor_filter.h>
+#include <algorithm>
+#include <cstring>
+#include <future>
 
 namespace points_map_filter
 {
@@ -44,6 +45,8 @@ namespace points_map_filter
 
     // Declare parameters
     config_.cell_side_length = declare_parameter<double>("cell_side_length", config_.cell_side_length);
+    config_.tile_side_cell_count = declare_parameter<int>("tile_side_cell_count", config_.tile_side_cell_count);
+    config_.filter_thread_count = declare_parameter<int>("filter_thread_count", config_.filter_thread_count);
   }
 
   rcl_interfaces::msg::SetParametersResult Node::parameter_update_callback(const std::vector<rclcpp::Parameter> &parameters)
@@ -52,10 +55,6 @@ namespace points_map_filter
 
     if (!error)
     {
-      auto lookup_config = lookup_grid_.get_config();
-      lookup_config.cell_side_length = config_.cell_side_length;
-
-      lookup_grid_ = approximate_intersection::LookupGrid<PointT>(lookup_config);
       recompute_lookup_grid();
     }
 
@@ -73,6 +72,8 @@ namespace points_map_filter
 
     // Load parameters
     get_parameter<double>("cell_side_length", config_.cell_side_length);
+    get_parameter<int>("tile_side_cell_count", config_.tile_side_cell_count);
+    get_parameter<int>("filter_thread_count", config_.filter_thread_count);
 
     // Register runtime parameter update callback
     add_on_set_parameters_callback(std::bind(&Node::parameter_update_callback, this, std_ph::_1));
@@ -101,31 +102,116 @@ namespace points_map_filter
     return CallbackReturn::SUCCESS;
   }
 
+  namespace
+  {
+    /**
+     * \brief Returns the byte offset of a FLOAT32 field within the points of a cloud
+     *
+     * \param cloud The point cloud
+     * \param name The name of the field
+     *
+     * \return The offset of the field, or -1 if the cloud has no FLOAT32 field with this name
+     */
+    int float32_field_offset(const sensor_msgs::msg::PointCloud2 &cloud, const std::string &name)
+    {
+      for (const auto &field : cloud.fields)
+      {
+        if (field.name == name && field.datatype == sensor_msgs::msg::PointField::FLOAT32)
+        {
+          return field.offset;
+        }
+      }
+      return -1;
+    }
+  }
+
   void Node::points_callback(sensor_msgs::msg::PointCloud2::UniquePtr msg)
   {
+    // Points are tested straight from the message buffer and the surviving ones are copied to the output message as is
+    int x_offset = float32_field_offset(*msg, "x");
+    int y_offset = float32_field_offset(*msg, "y");
 
-    const auto input_cloud = pcl::make_shared<CloudT>();
-    const auto filtered_cloud = pcl::make_shared<CloudT>();
+    if (x_offset < 0 || y_offset < 0)
+    {
+      RCLCPP_ERROR(get_logger(), "Received point cloud without FLOAT32 x and y fields. It will not be filtered");
+      return;
+    }
 
-    pcl::moveFromROSMsg(*msg, *input_cloud);
+    const size_t width = msg->width;
+    const size_t point_count = width * msg->height;
+    const size_t point_step = msg->point_step;
+    const size_t row_step = msg->row_step;
+    const uint8_t *data = msg->data.data();
 
-    pcl::experimental::FilterFunction<PointT> filter =
-        [this](const CloudT &cloud, pcl::index_t idx)
+    // Hold on to the current grid so a grid built concurrently for a new map is only used from the next cloud
+    auto lookup_grid = lookup_grid_builder_.grid();
+
+    // Split the cloud in chunks filtered concurrently. Each chunk records the indexes of its surviving points
+    size_t chunk_count = std::max<size_t>(1, std::min<size_t>(config_.filter_thread_count, point_count / MIN_POINTS_PER_CHUNK));
+    size_t chunk_size = (point_count + chunk_count - 1) / chunk_count;
+
+    std::vector<std::vector<uint32_t>> kept_points(chunk_count);
+
+    auto filter_chunk = [&](size_t chunk)
     {
-      return this->lookup_grid_.intersects(cloud[idx]);
+      size_t end = std::min(point_count, (chunk + 1) * chunk_size);
+      auto &kept = kept_points[chunk];
+      kept.reserve(end - chunk * chunk_size);
+
+      for (size_t i = chunk * chunk_size; i < end; i++)
+      {
+        const uint8_t *point = data + (i / width) * row_step + (i % width) * point_step;
+
+        PointT p;
+        std::memcpy(&p.x, point + x_offset, sizeof(float));
+        std::memcpy(&p.y, point + y_offset, sizeof(float));
+
+        if (lookup_grid->intersects(p))
+        {
+          kept.push_back(i);
+        }
+      }
     };
 
-    // build the filter
-    pcl::experimental::FunctionFilter<PointT> func_filter(filter);
-    func_filter.setInputCloud(input_cloud);
+    std::vector<std::future<void>> futures;
+    for (size_t chunk = 1; chunk < chunk_count; chunk++)
+    {
+      futures.push_back(std::async(std::launch::async, filter_chunk, chunk));
+    }
+    filter_chunk(0);
+    for (auto &future : futures)
+    {
+      future.get();
+    }
 
-    // apply filter
-    func_filter.filter(*filtered_cloud);
+    size_t kept_count = 0;
+    for (const auto &kept : kept_points)
+    {
+      kept_count += kept.size();
+    }
 
-    sensor_msgs::msg::PointCloud2 out_msg;
-    pcl::toROSMsg(*filtered_cloud, out_msg);
+    auto out_msg = std::make_unique<sensor_msgs::msg::PointCloud2>();
+    out_msg->header = msg->header;
+    out_msg->height = 1;
+    out_msg->width = kept_count;
+    out_msg->fields = msg->fields;
+    out_msg->is_bigendian = msg->is_bigendian;
+    out_msg->point_step = msg->point_step;
+    out_msg->row_step = kept_count * point_step;
+    out_msg->is_dense = msg->is_dense;
+    out_msg->data.resize(kept_count * point_step);
+
+    uint8_t *out = out_msg->data.data();
+    for (const auto &kept : kept_points)
+    {
+      for (auto i : kept)
+      {
+        std::memcpy(out, data + (i / width) * row_step + (i % width) * point_step, point_step);
+        out += point_step;
+      }
+    }
 
-    filtered_points_pub_->publish(out_msg);
+    filtered_points_pub_->publish(std::move(out_msg));
   }
 
   namespace
@@ -181,14 +267,8 @@ namespace points_map_filter
       return;
     }
 
-    for (const auto &point : map_->pointLayer)
-    {
-      PointT p;
-      p.x = point.x();
-      p.y = point.y();
-      p.z = point.z();
-      lookup_grid_.insert(p);
-    }
+    // The grid is built in the background and only replaces the current one once complete
+    lookup_grid_builder_.request(map_, config_.cell_side_length, config_.tile_side_cell_count);
   }
 
   void Node::map_callback(autoware_lanelet2_msgs::msg::MapBin::UniquePtr msg)
@@ -200,45 +280,14 @@ namespace points_map_filter
 
     map_ = new_map;
 
-    approximate_intersection::Config intersection_config;
-    intersection_config.cell_side_length = config_.cell_side_length;
-
-    // TODO it would be great if lanelet2 already knew the map bounds and this iteration didn't need to happen twice
-    double min_x = std::numeric_limits<double>::max();
-    double max_x = std::numeric_limits<double>::lowest();
-    double min_y = std::numeric_limits<double>::max();
-    double max_y = std::numeric_limits<double>::lowest();
-    for (const auto &point : map_->pointLayer)
-    {
-      if (point.x() < min_x)
-        min_x = point.x();
-
-      if (point.x() > max_x)
-        max_x = point.x();
-
-      if (point.y() < min_y)
-        min_y = point.y();
-
-      if (point.y() > max_y)
-        max_y = point.y();
-    }
-
-    double three_cells = config_.cell_side_length * 3;
-    intersection_config.min_x = min_x - three_cells;
-    intersection_config.max_x = max_x + three_cells;
-    intersection_config.min_y = min_y - three_cells;
-    intersection_config.max_y = max_y + three_cells;
-
-    RCLCPP_INFO_STREAM(get_logger(), "Found base map bounds of (min_x, max_x, min_y, max_y): "
-                                         << "( " << min_x << ", " << max_x << ", " << min_y << ", " << max_y << ")");
-    RCLCPP_INFO_STREAM(get_logger(), "Expanded map bounds to: "
-                                         << "( " << intersection_config.min_x << ", " << intersection_config.max_x << ", " << intersection_config.min_y << ", " << intersection_config.max_y << ")");
-
-    lookup_grid_ = approximate_intersection::LookupGrid<PointT>(intersection_config);
-
     recompute_lookup_grid();
   }
 
+  void Node::wait_for_lookup_grid() const
+  {
+    lookup_grid_builder_.wait();
+  }
+
 } // points_map_filter
 
 #include "rclcpp_components/register_node_macro.hpp"
@@ -169,6 +169,8 @@ TEST(Testpoints_map_filter, filter_test)
 
     worker_node->map_callback(move(map_msg)); // Manually drive topic callbacks
 
+    worker_node->wait_for_lookup_grid(); // The grid is built in the background
+
 
 
     sensor_msgs::msg::PointCloud2 result;
@@ -284,6 +286,8 @@ TEST(Testpoints_map_filter, linker_test)
 
     worker_node->map_callback(move(map_msg)); // Manually drive topic callbacks
 
+    worker_node->wait_for_lookup_grid(); // The grid is built in the background
+
 
 
     sensor_msgs::msg::PointCloud2 result;
@@ -330,6 +334,168 @@ TEST(Testpoints_map_filter, linker_test)
 
 }
 
+TEST(Testpoints_map_filter, threaded_filter_test)
+{
+    lanelet::Point3d p1(lanelet::utils::getId(), 0, 0, 0);
+    lanelet::Point3d p2(lanelet::utils::getId(), 0, 3, 0);
+    lanelet::Point3d p3(lanelet::utils::getId(), 3, 3, 0);
+    lanelet::Point3d p4(lanelet::utils::getId(), 3, 0, 0);
+
+    lanelet::LineString3d left_ls(lanelet::utils::getId(), {p1, p2});
+
+    lanelet::LineString3d right_ls(lanelet::utils::getId(), {p4, p3});
+
+    auto ll = getLanelet(left_ls, right_ls);
+
+    lanelet::LaneletMapPtr map = lanelet::utils::createMap({ll}, {});
+
+    std::vector<std::string> remaps; // Remaps to keep topics separate from other tests
+    remaps.push_back("--ros-args");
+    remaps.push_back("-r");
+    remaps.push_back("filtered_points:=/points_filter_test/filtered_points3");
+    remaps.push_back("-r");
+    remaps.push_back("points_raw:=/points_filter_test/points_raw3");
+    remaps.push_back("-r");
+    remaps.push_back("lanelet2_map:=/points_filter_test/lanelet2_map3");
+    remaps.push_back("-r");
+    remaps.push_back("__node:=points_filter_test_points_map_filter3");
+
+    rclcpp::NodeOptions options;
+    options.use_intra_process_comms(true);
+    options.arguments(remaps);
+    options.parameter_overrides({ {"filter_thread_count", 4}, {"tile_side_cell_count", 2} });
+
+    auto worker_node = std::make_shared<points_map_filter::Node>(options);
+
+    worker_node->configure(); //Call configure state transition
+    worker_node->activate();  //Call activate state transition to get not read for runtime
+
+    // Enough points to be split between the threads. Every 4th point lies in the map cells
+    auto cloud = pcl::make_shared<pcl::PointCloud<pcl::PointXYZI>>();
+
+    for (size_t i = 0; i < 50000; i++) {
+        pcl::PointXYZI p;
+        p.x = (i % 4 == 0) ? 1.0 : 20.0;
+        p.y = (i % 4 == 0) ? 4.0 : -20.0;
+        p.z = 0;
+        p.intensity = i;
+        cloud->points.push_back(p);
+    }
+
+    std::unique_ptr<autoware_lanelet2_msgs::msg::MapBin> map_msg = std::make_unique<autoware_lanelet2_msgs::msg::MapBin>();
+
+    toBinMsg(map, map_msg.get());
+
+    worker_node->map_callback(move(map_msg)); // Manually drive topic callbacks
+
+    worker_node->wait_for_lookup_grid(); // The grid is built in the background
+
+    sensor_msgs::msg::PointCloud2 result;
+    auto sub = worker_node->create_subscription<sensor_msgs::msg::PointCloud2>("/points_filter_test/filtered_points3", 1,
+        [&](sensor_msgs::msg::PointCloud2::UniquePtr msg)
+        {
+            result = *msg;
+        });
+
+    sensor_msgs::msg::PointCloud2 input_points;
+    pcl::toROSMsg(*cloud, input_points);
+
+    std::unique_ptr<sensor_msgs::msg::PointCloud2> input_points_ptr = std::make_unique<sensor_msgs::msg::PointCloud2>(input_points);
+
+    worker_node->points_callback(move(input_points_ptr));
+
+    // Provide some time for publication to occur
+    std::this_thread::sleep_for(std::chrono::seconds(2));
+
+    rclcpp::spin_some(worker_node->get_node_base_interface()); // Spin current queue to allow for subscription callback to trigger
+
+    ASSERT_EQ(input_points.fields.size(), result.fields.size());
+
+    auto output_cloud = pcl::make_shared<pcl::PointCloud<pcl::PointXYZI>>();
+
+    pcl::moveFromROSMsg(result, *output_cloud);
+
+    ASSERT_EQ(output_cloud->points.size(), 12500u);
+
+    // Points keep their fields and their order
+    for (size_t i = 0; i < output_cloud->points.size(); i++) {
+        ASSERT_NEAR(output_cloud->points[i].x, 1.0, 0.00001);
+        ASSERT_NEAR(output_cloud->points[i].y, 4.0, 0.00001);
+        ASSERT_NEAR(output_cloud->points[i].intensity, i * 4.0, 0.00001);
+    }
+}
+
+namespace {
+lanelet::Lanelet getRectangleLanelet(double min_x, double min_y, double max_x, double max_y)
+{
+    lanelet::Point3d p1(lanelet::utils::getId(), min_x, min_y, 0);
+    lanelet::Point3d p2(lanelet::utils::getId(), min_x, max_y, 0);
+    lanelet::Point3d p3(lanelet::utils::getId(), max_x, max_y, 0);
+    lanelet::Point3d p4(lanelet::utils::getId(), max_x, min_y, 0);
+
+    lanelet::LineString3d left_ls(lanelet::utils::getId(), {p1, p2});
+    lanelet::LineString3d right_ls(lanelet::utils::getId(), {p4, p3});
+
+    return getLanelet(left_ls, right_ls);
+}
+
+bool intersects(const points_map_filter::LookupGridBuilder& builder, double x, double y)
+{
+    points_map_filter::PointT p;
+    p.x = x;
+    p.y = y;
+    return builder.grid()->intersects(p);
+}
+}
+
+TEST(Testpoints_map_filter, grid_builder_test)
+{
+    auto ll_1 = getRectangleLanelet(0, 0, 10, 10);
+    auto ll_2 = getRectangleLanelet(20, 0, 25, 10);
+    auto ll_3 = getRectangleLanelet(12, 2, 18, 8);
+
+    points_map_filter::LookupGridBuilder builder;
+
+    // Nothing intersects before the first map
+    ASSERT_FALSE(intersects(builder, 5, 5));
+
+    builder.request(lanelet::utils::createMap({ll_1, ll_2}, {}), 1.0, 4);
+    builder.wait();
+
+    // The whole lanelets are occupied, not just the cells of their vertices
+    ASSERT_TRUE(intersects(builder, 5, 5));
+    ASSERT_TRUE(intersects(builder, 22.5, 5));
+    ASSERT_FALSE(intersects(builder, 15, 5));
+    ASSERT_FALSE(intersects(builder, 5, 15));
+
+    auto first_grid = builder.grid();
+
+    // Adding a lanelet within the map bounds updates the existing grid
+    builder.request(lanelet::utils::createMap({ll_1, ll_2, ll_3}, {}), 1.0, 4);
+    builder.wait();
+
+    ASSERT_TRUE(intersects(builder, 5, 5));
+    ASSERT_TRUE(intersects(builder, 22.5, 5));
+    ASSERT_TRUE(intersects(builder, 15, 5));
+    ASSERT_FALSE(intersects(builder, 15, 9.5));
+
+    // The previous grid is left untouched for the readers still holding it
+    points_map_filter::PointT p;
+    p.x = 15;
+    p.y = 5;
+    ASSERT_FALSE(first_grid->intersects(p));
+
+    // Removing it clears its cells without affecting its neighbors
+    builder.request(lanelet::utils::createMap({ll_1, ll_2}, {}), 1.0, 4);
+    builder.wait();
+
+    ASSERT_TRUE(intersects(builder, 5, 5));
+    ASSERT_TRUE(intersects(builder, 9.5, 5));
+    ASSERT_TRUE(intersects(builder, 20.5, 5));
+    ASSERT_FALSE(intersects(builder, 15, 5));
+    ASSERT_FALSE(intersects(builder, 12.5, 2.5));
+}
+
 int main(int argc, char **argv)
 {
     ::testing::InitGoogleTest(&argc, argv);
@@ -0,0 +1,62 @@
+#pragma once
+
+/*
+ * Copyright (C) 2024 LEIDOS.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may not
+ * use this file except in compliance with the License. You may obtain a copy of
+ * the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations under
+ * the License.
+ */
+
+#include <vector>
+#include <approximate_intersection/bitmap_lookup_grid.hpp>
+#include <lanelet2_core/primitives/Lanelet.h>
+
+namespace yield_plugin
+{
+
+/**
+ * \brief Occupancy grid of the area covered by the lanelets of the route.
+ *        The lanelet polygons are rasterized once into a bitmap so checking if a point is on the route is a constant time cell lookup
+ *        instead of a lanelet R-tree query followed by a route membership check.
+ *
+ *        The grid is conservative: every cell overlapped by a route lanelet is occupied, so points up to one cell away from the route
+ *        may also be reported on the route.
+ */
+class RouteOccupancyGrid
+{
+public:
+  /**
+   * \brief Constructor. Rasterizes the given lanelets
+   * \param route_lanelets lanelets of the route
+   * \param cell_side_length side length of the grid cells in meters
+   */
+  RouteOccupancyGrid(const std::vector<lanelet::ConstLanelet>& route_lanelets, size_t cell_side_length);
+
+  /**
+   * \brief Returns true if the point lies in a cell overlapped by a route lanelet
+   * \param point point in the map frame
+   */
+  bool is_on_route(const lanelet::BasicPoint2d& point) const;
+
+private:
+  struct GridPoint
+  {
+    double x = 0;
+    double y = 0;
+  };
+
+  static approximate_intersection::Config grid_config(const std::vector<lanelet::ConstLanelet>& route_lanelets, size_t cell_side_length);
+
+  approximate_intersection::BitmapLookupGrid<GridPoint> grid_;
+};
+
+}  // namespace yield_plugin
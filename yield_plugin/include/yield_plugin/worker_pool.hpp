@@ -0,0 +1,89 @@
+#pragma once
+
+/*
+ * Copyright (C) 2024 LEIDOS.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may not
+ * use this file except in compliance with the License. You may obtain a copy of
+ * the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations under
+ * the License.
+ */
+
+#include <condition_variable>
+#include <functional>
+#include <future>
+#include <memory>
+#include <mutex>
+#include <queue>
+#include <thread>
+#include <type_traits>
+#include <vector>
+
+namespace yield_plugin
+{
+
+/**
+ * \brief Fixed size pool of threads executing submitted tasks in submission order.
+ *        The threads are created once and reused, so fanning work out on every planning cycle does not create new threads
+ *        and the number of concurrent tasks stays bounded regardless of how much work is submitted.
+ */
+class WorkerPool
+{
+public:
+  /**
+   * \brief Constructor. Starts the threads of the pool
+   * \param thread_count number of threads of the pool. 0 uses the number of hardware threads
+   */
+  explicit WorkerPool(size_t thread_count);
+
+  /**
+   * \brief Destructor. Finishes the tasks already submitted then joins the threads
+   */
+  ~WorkerPool();
+
+  WorkerPool(const WorkerPool&) = delete;
+  WorkerPool& operator=(const WorkerPool&) = delete;
+
+  /**
+   * \brief Queues a task for execution by the next free thread
+   * \param task callable taking no argument
+   * \return future of the result of the task. Exceptions thrown by the task are rethrown by the future
+   */
+  template <class F>
+  std::future<std::invoke_result_t<F>> submit(F&& task)
+  {
+    using ResultT = std::invoke_result_t<F>;
+
+    auto packaged_task = std::make_shared<std::packaged_task<ResultT()>>(std::forward<F>(task));
+    auto future = packaged_task->get_future();
+    {
+      std::lock_guard<std::mutex> lock(mutex_);
+      tasks_.emplace([packaged_task]() { (*packaged_task)(); });
+    }
+    condition_.notify_one();
+    return future;
+  }
+
+  /**
+   * \brief Returns the number of threads of the pool
+   */
+  size_t size() const;
+
+private:
+  void run();
+
+  std::vector<std::thread> threads_;
+  std::queue<std::function<void()>> tasks_;
+  std::mutex mutex_;
+  std::condition_variable condition_;
+  bool stop_ = false;
+};
+
+}  // namespace yield_plugin
@@ -45,6 +45,8 @@ struct YieldPluginConfig
   int acceptable_urgency = 5;                 //Minimum urgency value to consider the mobility request
   double speed_moving_average_window_size = 3.0;  //Window size for speed moving average filter
   double collision_check_radius_in_m = 150.0;  //Radius to check for potential collision
+  int collision_check_thread_count = 0;  //Number of threads checking the collisions of external objects, 0 uses the number of hardware threads
+  int route_occupancy_grid_cell_size_in_m = 1;  //Side length of the cells of the route occupancy grid used to check if objects are on the route
 
   friend std::ostream& operator<<(std::ostream& output, const YieldPluginConfig& c)
   {
@@ -70,6 +72,8 @@ struct YieldPluginConfig
           << "acceptable_urgency: " << c.acceptable_urgency << std::endl
           << "speed_moving_average_window_size: " << c.speed_moving_average_window_size << std::endl
           << "collision_check_radius_in_m: " << c.collision_check_radius_in_m << std::endl
+          << "collision_check_thread_count: " << c.collision_check_thread_count << std::endl
+          << "route_occupancy_grid_cell_size_in_m: " << c.route_occupancy_grid_cell_size_in_m << std::endl
           << "}" << std::endl;
     return output;
   }
@@ -30,6 +30,9 @@
 #include <carma_wm/WMListener.hpp>
 #include <functional>
 #include "yield_config.hpp"
+#include "yield_plugin/route_occupancy_grid.hpp"
+#include "yield_plugin/worker_pool.hpp"
+#include <mutex>
 #include <unordered_set>
 #include <carma_planning_msgs/srv/plan_trajectory.hpp>
 #include <std_msgs/msg/string.hpp>
@@ -287,7 +290,7 @@ public:
   std::optional<std::pair<carma_perception_msgs::msg::ExternalObject, double>> get_earliest_collision_object_and_time(const carma_planning_msgs::msg::TrajectoryPlan& original_tp, const std::vector<carma_perception_msgs::msg::ExternalObject>& external_objects);
 
   /**
-   * \brief Given the list of objects with predicted states, get all collision times concurrently using multi-threading
+   * \brief Given the list of objects with predicted states, get all collision times concurrently on the worker pool of the plugin
    * \param original_tp trajectory of the ego vehicle
    * \param external_objects list of external objects with predicted states
    * \param original_tp_max_speed max speed of the original_tp to efficiently traverse through possible collision combination of the two trajectories
@@ -314,6 +317,13 @@ private:
   LaneChangeStatusCB lc_status_publisher_;
   std::shared_ptr<carma_ros2_utils::CarmaLifecycleNode> nh_;
   std::set<lanelet::Id> route_llt_ids_;
+  // occupancy grid of the lanelets in route_llt_ids_ and the number of lanelets it was built from
+  std::shared_ptr<const RouteOccupancyGrid> route_grid_;
+  size_t route_grid_llt_count_ = 0;
+  // persistent threads used to check the collisions of all external objects
+  std::shared_ptr<WorkerPool> worker_pool_;
+  // guards consecutive_clearance_count_for_obstacles_ which is updated by the collision checks of every object concurrently
+  std::mutex clearance_count_mutex_;
   lanelet::Id previous_llt_id_;
   std::vector<carma_perception_msgs::msg::ExternalObject> external_objects_;
   std::unordered_map<uint32_t, int> consecutive_clearance_count_for_obstacles_;
@@ -0,0 +1,86 @@
+/*
+ * Copyright (C) 2024 LEIDOS.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may not
+ * use this file except in compliance with the License. You may obtain a copy of
+ * the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations under
+ * the License.
+ */
+
+#include "yield_plugin/route_occupancy_grid.hpp"
+#include <algorithm>
+#include <limits>
+
+namespace yield_plugin
+{
+  namespace
+  {
+    // Sparse tiles keep the memory use proportional to the route length for long diagonal routes
+    constexpr size_t GRID_TILE_SIDE_CELL_COUNT = 64;
+  }
+
+  RouteOccupancyGrid::RouteOccupancyGrid(const std::vector<lanelet::ConstLanelet>& route_lanelets, size_t cell_side_length)
+    : grid_(grid_config(route_lanelets, cell_side_length))
+  {
+    std::vector<GridPoint> polygon;
+    for (const auto& llt : route_lanelets)
+    {
+      polygon.clear();
+      for (const auto& point : llt.polygon2d().basicPolygon())
+      {
+        polygon.push_back({point.x(), point.y()});
+      }
+      grid_.insert_polygon(polygon);
+    }
+  }
+
+  bool RouteOccupancyGrid::is_on_route(const lanelet::BasicPoint2d& point) const
+  {
+    return grid_.intersects({point.x(), point.y()});
+  }
+
+  approximate_intersection::Config RouteOccupancyGrid::grid_config(const std::vector<lanelet::ConstLanelet>& route_lanelets, size_t cell_side_length)
+  {
+    double min_x = std::numeric_limits<double>::max();
+    double max_x = std::numeric_limits<double>::lowest();
+    double min_y = std::numeric_limits<double>::max();
+    double max_y = std::numeric_limits<double>::lowest();
+
+    for (const auto& llt : route_lanelets)
+    {
+      for (const auto& point : llt.polygon2d().basicPolygon())
+      {
+        min_x = std::min(min_x, point.x());
+        max_x = std::max(max_x, point.x());
+        min_y = std::min(min_y, point.y());
+        max_y = std::max(max_y, point.y());
+      }
+    }
+
+    approximate_intersection::Config config;
+    config.cell_side_length = std::max<size_t>(1, cell_side_length);
+    config.tile_side_cell_count = GRID_TILE_SIDE_CELL_COUNT;
+
+    if (route_lanelets.empty())
+    {
+      // Single cell grid which is never occupied
+      config.min_x = config.max_x = config.min_y = config.max_y = 0;
+      return config;
+    }
+
+    // Pad by a cell so the polygon edges never lie on the grid bounds
+    config.min_x = min_x - config.cell_side_length;
+    config.max_x = max_x + config.cell_side_length;
+    config.min_y = min_y - config.cell_side_length;
+    config.max_y = max_y + config.cell_side_length;
+    return config;
+  }
+
+}  // namespace yield_plugin
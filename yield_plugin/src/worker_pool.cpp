@@ -0,0 +1,77 @@
+/*
+ * Copyright (C) 2024 LEIDOS.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may not
+ * use this file except in compliance with the License. You may obtain a copy of
+ * the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations under
+ * the License.
+ */
+
+#include "yield_plugin/worker_pool.hpp"
+#include <algorithm>
+
+namespace yield_plugin
+{
+  WorkerPool::WorkerPool(size_t thread_count)
+  {
+    if (thread_count == 0)
+    {
+      thread_count = std::max(1u, std::thread::hardware_concurrency());
+    }
+
+    threads_.reserve(thread_count);
+    for (size_t i = 0; i < thread_count; ++i)
+    {
+      threads_.emplace_back(&WorkerPool::run, this);
+    }
+  }
+
+  WorkerPool::~WorkerPool()
+  {
+    {
+      std::lock_guard<std::mutex> lock(mutex_);
+      stop_ = true;
+    }
+    condition_.notify_all();
+
+    for (auto& thread : threads_)
+    {
+      thread.join();
+    }
+  }
+
+  size_t WorkerPool::size() const
+  {
+    return threads_.size();
+  }
+
+  void WorkerPool::run()
+  {
+    while (true)
+    {
+      std::function<void()> task;
+      {
+        std::unique_lock<std::mutex> lock(mutex_);
+        condition_.wait(lock, [this]() { return stop_ || !tasks_.empty(); });
+
+        // Pending tasks are still executed when stopping so no future is left without a result
+        if (tasks_.empty())
+        {
+          return;
+        }
+
+        task = std::move(tasks_.front());
+        tasks_.pop();
+      }
+      task();
+    }
+  }
+
+}  // namespace yield_plugin
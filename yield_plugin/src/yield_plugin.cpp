@@ -48,7 +48,7 @@ namespace yield_plugin
                                             LaneChangeStatusCB lc_status_publisher)
     : nh_(nh), wm_(wm), config_(config),mobility_response_publisher_(mobility_response_publisher), lc_status_publisher_(lc_status_publisher)
   {
-
+    worker_pool_ = std::make_shared<WorkerPool>(std::max(0, config_.collision_check_thread_count));
   }
 
   double get_trajectory_end_time(const carma_planning_msgs::msg::TrajectoryPlan& trajectory)
@@ -682,18 +682,11 @@ namespace yield_plugin
       curr_point.x() = trajectory2.at(j).predicted_position.position.x;
       curr_point.y() = trajectory2.at(j).predicted_position.position.y;
 
-      auto corresponding_lanelets = wm_->getLaneletsFromPoint(curr_point, 8); // some intersection can have 8 overlapping lanelets
-
-      for (const auto& llt: corresponding_lanelets)
+      // The grid is built from route_llt_ids_, so no grid means no known route
+      if (route_grid_ && route_grid_->is_on_route(curr_point))
       {
-        RCLCPP_DEBUG_STREAM(nh_->get_logger(), "Checking llt: " << llt.id());
-
-        if (route_llt_ids_.find(llt.id()) != route_llt_ids_.end())
-        {
-          on_route = true;
-          on_route_idx = j;
-          break;
-        }
+        on_route = true;
+        on_route_idx = j;
       }
       if (on_route || traj2_has_zero_speed)
         break;
@@ -782,6 +775,7 @@ namespace yield_plugin
   //TODO: Revisit this logic. Further investigation required for this logic since it currently seems like it will never return true
   bool YieldPlugin::is_object_behind_vehicle(uint32_t object_id, const rclcpp::Time& collision_time, double vehicle_downtrack, double object_downtrack)
   {
+    std::lock_guard<std::mutex> lock(clearance_count_mutex_);
     const auto previous_clearance_count = consecutive_clearance_count_for_obstacles_[object_id];
     // if the object's location is half a length of the vehicle past its rear-axle, it is considered behind
     // half a length of the vehicle to conservatively estimate the rear axle to rear bumper length
@@ -839,6 +833,7 @@ namespace yield_plugin
     if (!collision_result)
     {
       // reset the consecutive clearance counter because no collision was detected at this iteration
+      std::lock_guard<std::mutex> lock(clearance_count_mutex_);
       consecutive_clearance_count_for_obstacles_[curr_obstacle.id] = 0;
       return std::nullopt;
     }
@@ -873,9 +868,9 @@ namespace yield_plugin
     std::unordered_map<uint32_t, std::future<std::optional<rclcpp::Time>>> futures;
     std::unordered_map<uint32_t, rclcpp::Time> collision_times;
 
-    // Launch asynchronous tasks to check for collision times
+    // Queue a collision check per object on the worker pool
     for (const auto& object : external_objects) {
-      futures[object.id] = std::async(std::launch::async,[this, &original_tp, &object, &original_tp_max_speed]{
+      futures[object.id] = worker_pool_->submit([this, &original_tp, &object, &original_tp_max_speed]{
           return get_collision_time(original_tp, object, original_tp_max_speed);
         });
     }
@@ -908,6 +903,26 @@ namespace yield_plugin
       route_llt_ids_.insert(llt.id());
     }
 
+    // route_llt_ids_ only grows, so a new size means the route changed and the on-route grid must be rebuilt
+    if (!route_grid_ || route_grid_llt_count_ != route_llt_ids_.size())
+    {
+      const auto map = wm_->getMap();
+      std::vector<lanelet::ConstLanelet> route_lanelets;
+      route_lanelets.reserve(route_llt_ids_.size());
+      for (const auto& id : route_llt_ids_)
+      {
+        auto llt = map->laneletLayer.find(id);
+        if (llt != map->laneletLayer.end())
+        {
+          route_lanelets.push_back(*llt);
+        }
+      }
+
+      route_grid_ = std::make_shared<const RouteOccupancyGrid>(route_lanelets, std::max(1, config_.route_occupancy_grid_cell_size_in_m));
+      route_grid_llt_count_ = route_llt_ids_.size();
+      RCLCPP_DEBUG_STREAM(nh_->get_logger(), "Built route occupancy grid from " << route_lanelets.size() << " lanelets");
+    }
+
     RCLCPP_DEBUG_STREAM(nh_->get_logger(),"External Object List (external_objects) size: " << external_objects.size());
     const double original_max_speed = max_trajectory_speed(original_tp.trajectory_points, get_trajectory_end_time(original_tp));
     std::unordered_map<uint32_t, rclcpp::Time> collision_times = get_collision_times_concurrently(original_tp,external_objects, original_max_speed);
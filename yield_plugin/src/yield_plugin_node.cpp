@@ -49,6 +49,8 @@ namespace yield_plugin
     config_.vehicle_height = declare_parameter<double>("vehicle_height", config_.vehicle_height);
     config_.vehicle_width = declare_parameter<double>("vehicle_width", config_.vehicle_width);
     config_.vehicle_id = declare_parameter<std::string>("vehicle_id", config_.vehicle_id);
+    config_.collision_check_thread_count = declare_parameter<int>("collision_check_thread_count", config_.collision_check_thread_count);
+    config_.route_occupancy_grid_cell_size_in_m = declare_parameter<int>("route_occupancy_grid_cell_size_in_m", config_.route_occupancy_grid_cell_size_in_m);
 
   }
 
@@ -78,6 +80,8 @@ namespace yield_plugin
     get_parameter<double>("vehicle_height", config_.vehicle_height);
     get_parameter<double>("vehicle_width", config_.vehicle_width);
     get_parameter<std::string>("vehicle_id", config_.vehicle_id);
+    get_parameter<int>("collision_check_thread_count", config_.collision_check_thread_count);
+    get_parameter<int>("route_occupancy_grid_cell_size_in_m", config_.route_occupancy_grid_cell_size_in_m);
 
     RCLCPP_INFO_STREAM(get_logger(), "YieldPlugin Params: " << config_);
 
@@ -514,6 +514,59 @@ TEST(YieldPluginTest, get_collision)
   ASSERT_TRUE(collision_result != std::nullopt);
 }
 
+TEST(YieldPluginTest, route_occupancy_grid)
+{
+  auto map = carma_wm::test::buildGuidanceTestMap(100,100);
+
+  // Lanelets 1200 and 1201 cover x in [0, 100] and y in [0, 200]
+  std::vector<lanelet::ConstLanelet> route_lanelets = {map->laneletLayer.get(1200), map->laneletLayer.get(1201)};
+
+  RouteOccupancyGrid grid(route_lanelets, 1);
+
+  EXPECT_TRUE(grid.is_on_route(lanelet::BasicPoint2d(50, 50)));
+  EXPECT_TRUE(grid.is_on_route(lanelet::BasicPoint2d(0.5, 150)));
+  EXPECT_TRUE(grid.is_on_route(lanelet::BasicPoint2d(99.5, 199.5)));
+  EXPECT_FALSE(grid.is_on_route(lanelet::BasicPoint2d(150, 50)));   // lanelet 1210 is not on the route
+  EXPECT_FALSE(grid.is_on_route(lanelet::BasicPoint2d(50, 250)));   // past the end of the route
+  EXPECT_FALSE(grid.is_on_route(lanelet::BasicPoint2d(-3, 50)));
+  EXPECT_FALSE(grid.is_on_route(lanelet::BasicPoint2d(1e6, 1e6)));  // outside of the grid
+
+  RouteOccupancyGrid empty_grid({}, 1);
+  EXPECT_FALSE(empty_grid.is_on_route(lanelet::BasicPoint2d(0, 0)));
+}
+
+TEST(YieldPluginTest, worker_pool)
+{
+  WorkerPool pool(2);
+  EXPECT_EQ(pool.size(), 2u);
+
+  std::vector<std::future<int>> futures;
+  for (int i = 0; i < 20; i++)
+  {
+    futures.push_back(pool.submit([i]() {
+      if (i == 5)
+      {
+        throw std::invalid_argument("failed task");
+      }
+      return i * i;
+    }));
+  }
+
+  for (int i = 0; i < 20; i++)
+  {
+    if (i == 5)
+    {
+      EXPECT_THROW(futures[i].get(), std::invalid_argument);
+    }
+    else
+    {
+      EXPECT_EQ(futures[i].get(), i * i);
+    }
+  }
+
+  EXPECT_GE(WorkerPool(0).size(), 1u);
+}
+
 TEST(YieldPluginTest, is_object_behind_vehicle)
 {
   std::shared_ptr<carma_wm::CARMAWorldModel> wm = std::make_shared<carma_wm::CARMAWorldModel>();